@@ -0,0 +1,151 @@
+"""Dashboard open time against shop size.
+
+    python benchmarks/dashboard_page.py                         # 500 and 5000 products, 3 years
+    python benchmarks/dashboard_page.py --products 500 20000 --years 5 --rounds 5
+    python benchmarks/dashboard_page.py --headless              # panel data only, no display needed
+
+Builds the dashboard with real Tk widgets on a withdrawn root. The page shows
+placeholder cards straight away and worker threads fill the panels in, so
+"interactive" (placeholders drawn) should stay flat as the shop grows while
+"complete" (every panel filled) carries the queries and the chart. Every round
+starts with a cold query cache.
+
+Without a display (or with --headless) no widgets are built: the panels are
+fetched one after another on one connection, as the dashboard used to before
+showing anything, and then in parallel on the DashboardLoader workers.
+"""
+import argparse
+import contextlib
+import io
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'ui'))
+sys.path.insert(0, BENCH_DIR)
+
+import tkinter as tk
+
+from generate_data import generate
+from run_benchmarks import median
+
+
+def time_page(db_path, rounds):
+    """Get (median interactive ms, median complete ms)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        from main import BikeShopInventorySystem
+        from dashboard import DashboardModule
+        app = BikeShopInventorySystem.headless(db_path)
+
+    root = tk.Tk()
+    root.withdraw()
+    app.root = root
+    for name in ('show_sales_entry', 'add_product', 'show_statistics', 'show_stock_history'):
+        setattr(app, name, lambda: None)
+    module = DashboardModule(root, app)
+    interactive_times, complete_times = [], []
+    try:
+        for _ in range(rounds):
+            app.query_cache.clear()
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                frame = module.create_interface()
+                frame.pack(fill='both', expand=True)
+                root.update()
+                interactive_times.append((time.perf_counter() - start) * 1000)
+
+                while module.results is not None:
+                    root.update()
+                    time.sleep(0.001)
+                complete_times.append((time.perf_counter() - start) * 1000)
+            frame.destroy()
+    finally:
+        if module.loader is not None:
+            module.loader.stop()
+        root.destroy()
+        app.conn.close()
+    return median(interactive_times), median(complete_times)
+
+
+def time_panels(db_path, rounds):
+    """Get (median ms fetching the panels one by one, median ms fetching them on the loader)"""
+    from core import ShopDatabase, ShopReports
+    from dashboard import DashboardLoader, DashboardModule, DashboardQueries
+    from query_cache import QueryCache
+
+    query_cache = QueryCache()
+
+    def open_queries():
+        db = ShopDatabase(db_path, query_cache)
+        return DashboardQueries(ShopReports(db), db.product_repo, db.sales_repo, query_cache, db)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        queries = open_queries()
+    loader = DashboardLoader(open_queries).start()
+    sequential_times, parallel_times = [], []
+    try:
+        for _ in range(rounds):
+            query_cache.clear()
+            start = time.perf_counter()
+            for _, fetch in DashboardModule.PANELS:
+                fetch(queries)
+            sequential_times.append((time.perf_counter() - start) * 1000)
+
+            query_cache.clear()
+            results = queue.Queue()
+            start = time.perf_counter()
+            for name, fetch in DashboardModule.PANELS:
+                loader.submit(name, fetch, results)
+            for _ in DashboardModule.PANELS:
+                result = results.get()
+                if result.error is not None:
+                    raise result.error
+            parallel_times.append((time.perf_counter() - start) * 1000)
+    finally:
+        loader.stop()
+        queries.close()
+    return median(sequential_times), median(parallel_times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure dashboard open time against shop size')
+    parser.add_argument('--products', type=int, nargs='+', default=[500, 5000])
+    parser.add_argument('--years', type=float, default=3)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--headless', action='store_true', help='time the panel data only, without Tk')
+    args = parser.parse_args(argv)
+
+    headless = args.headless
+    if not headless:
+        try:
+            tk.Tk().destroy()
+        except tk.TclError as e:
+            print(f"No display ({e}); timing the panel data only")
+            headless = True
+    timer, columns = ((time_panels, ('one by one ms', 'parallel ms')) if headless
+                      else (time_page, ('interactive ms', 'complete ms')))
+
+    workdir = tempfile.mkdtemp(prefix='bikeshop_dashboard_')
+    previous_dir = os.getcwd()
+    try:
+        # Keeps the slow-query log out of the caller's directory
+        os.chdir(workdir)
+        print(f"{'products':>10} {columns[0]:>16} {columns[1]:>13}")
+        for size in args.products:
+            db_path = os.path.join(workdir, f"dashboard_{size}.db")
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate(db_path, size, args.years, args.seed)
+            first_ms, second_ms = timer(db_path, args.rounds)
+            print(f"{size:>10,} {first_ms:>16.1f} {second_ms:>13.1f}")
+    finally:
+        os.chdir(previous_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
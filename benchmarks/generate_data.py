@@ -0,0 +1,262 @@
+"""Generate a realistic bike shop database for benchmarking.
+
+    python benchmarks/generate_data.py --products 500 --years 3 --seed 42 --out bench_shop.db
+
+Sales follow a seasonal curve (spring/summer peak, December bump, busier
+weekends) with mild year-over-year growth. Every sale line has its matching
+transaction and stock movement, products are restocked when they run low, and
+service bookings cover the same period plus two weeks of upcoming
+appointments. The schema comes from ui/schema.py, so the file opens directly in
+the app. The same seed and end date always produce the same database.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ui'))
+
+from schema import DEFAULT_SERVICES, create_schema
+
+
+CATEGORIES = {
+    # category: (share of catalogue, price range, typical basket quantity)
+    'Bikes': (0.15, (8000, 85000), 1),
+    'Accessories': (0.30, (150, 4500), 2),
+    'Parts': (0.35, (80, 6500), 2),
+    'Clothing': (0.12, (350, 3800), 1),
+    'Maintenance': (0.08, (120, 1200), 3),
+}
+
+NAME_PARTS = {
+    'Bikes': (['Trail', 'Road', 'City', 'Gravel', 'Kids', 'Fat', 'Folding', 'E-'],
+              ['Runner', 'Sprint', 'Cruiser', 'Explorer', 'Climber', 'Commuter']),
+    'Accessories': (['LED', 'Alloy', 'Carbon', 'Compact', 'Pro', 'Mini'],
+                    ['Light', 'Lock', 'Bottle Cage', 'Pump', 'Bell', 'Mirror', 'Computer', 'Helmet']),
+    'Parts': (['Shimano', 'SRAM', 'Alloy', 'Steel', 'Tubeless', '11-Speed'],
+              ['Chain', 'Cassette', 'Brake Pad', 'Tire', 'Inner Tube', 'Derailleur', 'Crankset', 'Saddle']),
+    'Clothing': (['Aero', 'Thermal', 'Padded', 'Breathable', 'Rain'],
+                 ['Jersey', 'Shorts', 'Gloves', 'Jacket', 'Socks', 'Cap']),
+    'Maintenance': (['Ceramic', 'Wet', 'Dry', 'Bio', 'Pro'],
+                    ['Chain Lube', 'Degreaser', 'Grease', 'Cleaner', 'Sealant']),
+}
+
+FIRST_NAMES = ['Juan', 'Maria', 'Jose', 'Ana', 'Mark', 'Grace', 'Paolo', 'Liza', 'Carlo', 'Bea',
+               'Miguel', 'Rosa', 'Rafael', 'Carmen', 'Luis', 'Andrea', 'Nico', 'Joy', 'Ramon', 'Kim']
+LAST_NAMES = ['Santos', 'Reyes', 'Cruz', 'Bautista', 'Garcia', 'Mendoza', 'Torres', 'Flores',
+              'Villanueva', 'Ramos', 'Castillo', 'Aquino', 'Navarro', 'Domingo', 'Lopez']
+CITIES = ['Quezon City', 'Makati', 'Pasig', 'Taguig', 'Manila', 'Marikina', 'Antipolo', 'Cainta']
+
+# Relative demand by month (Jan..Dec) and weekday (Mon..Sun)
+MONTH_FACTOR = [0.7, 0.75, 0.95, 1.15, 1.25, 1.2, 1.1, 1.05, 0.9, 0.85, 0.9, 1.3]
+WEEKDAY_FACTOR = [0.8, 0.8, 0.85, 0.9, 1.1, 1.45, 1.3]
+
+BATCH_SIZE = 5000
+
+
+def make_products(rng, count):
+    """Build product rows (name, price, stock, category, product_id)"""
+    categories = list(CATEGORIES)
+    weights = [CATEGORIES[c][0] for c in categories]
+    products = []
+    for i in range(1, count + 1):
+        category = rng.choices(categories, weights)[0]
+        low, high = CATEGORIES[category][1]
+        prefixes, nouns = NAME_PARTS[category]
+        name = f"{rng.choice(prefixes)} {rng.choice(nouns)} {rng.randint(100, 999)}"
+        price = round(rng.uniform(low, high) / 10) * 10 - 0.01 if high > 1000 else round(rng.uniform(low, high), 2)
+        stock = rng.randint(5, 60) if category == 'Bikes' else rng.randint(20, 300)
+        products.append([name, price, stock, category, f"P{i:05d}"])
+    return products
+
+
+def make_customers(rng, count):
+    """Build a pool of (name, address) pairs with repeat buyers"""
+    customers = []
+    for _ in range(count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        address = f"{rng.randint(1, 999)} {rng.choice(LAST_NAMES)} St., {rng.choice(CITIES)}"
+        customers.append((name, address))
+    return customers
+
+
+def poisson(rng, mean):
+    """Knuth's Poisson sampler; fine for the small daily means used here"""
+    if mean <= 0:
+        return 0
+    limit = pow(2.718281828459045, -mean)
+    k, p = 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+class _Writer:
+    """Batches inserts per table and flushes with executemany"""
+
+    STATEMENTS = {
+        'sales': '''INSERT INTO sales (transaction_id, product_id, product_name, product_category,
+                    customer_name, customer_address, quantity, price, total, sale_date)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+        'transactions': '''INSERT INTO transactions (transaction_id, total_amount, payment_method, transaction_date)
+                           VALUES (?, ?, ?, ?)''',
+        'stock_movements': '''INSERT INTO stock_movements (product_id, product_name, movement_type, quantity,
+                              reference_id, reason, movement_date, notes)
+                              VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+        'service_bookings': '''INSERT INTO service_bookings (booking_id, service_id, service_name, customer_name,
+                               customer_contact, bike_details, booking_date, scheduled_date, scheduled_time,
+                               status, notes, price, payment_status, completed_date)
+                               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+    }
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.pending = {table: [] for table in self.STATEMENTS}
+        self.counts = {table: 0 for table in self.STATEMENTS}
+
+    def add(self, table, row):
+        rows = self.pending[table]
+        rows.append(row)
+        if len(rows) >= BATCH_SIZE:
+            self.flush(table)
+
+    def flush(self, table=None):
+        for name in ([table] if table else list(self.pending)):
+            rows = self.pending[name]
+            if rows:
+                self.cursor.executemany(self.STATEMENTS[name], rows)
+                self.counts[name] += len(rows)
+                rows.clear()
+
+
+def generate(path, products=500, years=3, seed=42, daily_transactions=25, daily_bookings=4, end_date=None):
+    """Create a populated database at path and return row counts per table"""
+    rng = random.Random(seed)
+    end = (end_date or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    start = end - timedelta(days=int(365 * years))
+
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode = MEMORY')
+    conn.execute('PRAGMA synchronous = OFF')
+    create_schema(conn)
+    cursor = conn.cursor()
+    writer = _Writer(cursor)
+
+    catalogue = make_products(rng, products)
+    customers = make_customers(rng, max(50, products * 2))
+    # A few regulars account for a large share of sales
+    customer_weights = [1.0 / (i + 1) ** 0.6 for i in range(len(customers))]
+
+    start_stamp = start.strftime('%Y-%m-%d 08:00:00')
+    for name, price, stock, category, code in catalogue:
+        cursor.execute('''INSERT INTO products (name, price, stock, category, product_id, date_added)
+                          VALUES (?, ?, ?, ?, ?, ?)''', (name, price, stock, category, code, start_stamp))
+        writer.add('stock_movements', (code, name, 'IN', stock, 'INITIAL', 'INITIAL', start_stamp,
+                                       'Initial stock when product was added to inventory'))
+
+    # Popular products sell more; bikes sell less often than parts
+    product_weights = [(1.0 / (i + 1) ** 0.8) * (0.35 if p[3] == 'Bikes' else 1.0)
+                       for i, p in enumerate(catalogue)]
+    rng.shuffle(product_weights)
+
+    cursor.executemany('''INSERT INTO services (name, description, price, duration, category, service_id)
+                          VALUES (?, ?, ?, ?, ?, ?)''', DEFAULT_SERVICES)
+
+    txn_seq = 0
+    booking_seq = 0
+    total_days = (end - start).days
+    for day_index in range(total_days + 15):
+        day = start + timedelta(days=day_index)
+        growth = 1 + 0.12 * (day_index / 365.0)
+        demand = MONTH_FACTOR[day.month - 1] * WEEKDAY_FACTOR[day.weekday()] * growth
+
+        if day_index <= total_days:
+            for _ in range(poisson(rng, daily_transactions * demand)):
+                txn_seq += 1
+                moment = day + timedelta(seconds=rng.randint(9 * 3600, 19 * 3600))
+                stamp = moment.strftime('%Y-%m-%d %H:%M:%S')
+                transaction_id = f"TXN{moment.strftime('%Y%m%d%H%M%S')}{txn_seq % 10000:04d}"
+                customer_name, customer_address = rng.choices(customers, customer_weights)[0]
+
+                total_amount = 0.0
+                lines = 1 + min(poisson(rng, 0.6), 4)
+                for product in rng.choices(catalogue, product_weights, k=lines):
+                    name, price, stock, category, code = product
+                    quantity = max(1, min(poisson(rng, CATEGORIES[category][2] - 0.5) + 1, 10))
+
+                    if stock < quantity:
+                        restock = quantity + rng.randint(10, 80)
+                        product[2] = stock = stock + restock
+                        writer.add('stock_movements', (code, name, 'IN', restock, f"RESTOCK_{day:%Y%m%d}",
+                                                       'RESTOCK', (moment - timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S'),
+                                                       f"Stock addition: {restock} units added"))
+
+                    product[2] = stock - quantity
+                    line_total = round(price * quantity, 2)
+                    total_amount += line_total
+                    writer.add('sales', (transaction_id, code, name, category, customer_name, customer_address,
+                                         quantity, price, line_total, stamp))
+                    writer.add('stock_movements', (code, name, 'OUT', quantity, transaction_id, 'SALE', stamp,
+                                                   f"Sold {quantity} units to {customer_name} (Address: {customer_address}). "
+                                                   f"New stock: {product[2]}"))
+
+                writer.add('transactions', (transaction_id, round(total_amount, 2),
+                                            rng.choice(['Cash', 'Cash', 'Cash', 'GCash', 'Card']), stamp))
+
+        # Bookings are created the same day or up to a week before the appointment
+        for _ in range(poisson(rng, daily_bookings * demand)):
+            booking_seq += 1
+            name, description, price, duration, category, service_id = rng.choice(DEFAULT_SERVICES)
+            customer_name, _ = rng.choices(customers, customer_weights)[0]
+            booked = day - timedelta(days=rng.randint(0, 7), seconds=-rng.randint(8 * 3600, 18 * 3600))
+            scheduled_time = f"{rng.randint(9, 17):02d}:{rng.choice(['00', '30'])}"
+
+            if day_index > total_days:
+                status, payment, completed = 'Pending', 'Unpaid', None
+            else:
+                status = rng.choices(['Completed', 'Cancelled', 'In Progress', 'Pending'], [85, 7, 3, 5])[0]
+                payment = 'Paid' if status == 'Completed' else 'Unpaid'
+                completed = f"{day:%Y-%m-%d} {scheduled_time}:00" if status == 'Completed' else None
+
+            writer.add('service_bookings', (
+                f"BK{booked:%Y%m%d%H%M%S}{booking_seq % 10000:04d}", service_id, name, customer_name,
+                f"09{rng.randint(100000000, 999999999)}", rng.choice(['MTB', 'Road bike', 'BMX', 'Folding bike', '']),
+                booked.strftime('%Y-%m-%d %H:%M:%S'), day.strftime('%Y-%m-%d'), scheduled_time,
+                status, '', price, payment, completed))
+
+    writer.flush()
+    cursor.executemany('UPDATE products SET stock = ? WHERE product_id = ?',
+                       [(p[2], p[4]) for p in catalogue])
+    conn.commit()
+
+    counts = {'products': len(catalogue), **writer.counts}
+    conn.close()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--out', default='bench_shop.db', help='database file to create (overwritten)')
+    parser.add_argument('--products', type=int, default=500)
+    parser.add_argument('--years', type=float, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--daily-transactions', type=float, default=25,
+                        help='average checkouts per day before seasonality')
+    parser.add_argument('--daily-bookings', type=float, default=4)
+    parser.add_argument('--end-date', help='last day of sales (YYYY-MM-DD), default today')
+    args = parser.parse_args(argv)
+
+    end_date = datetime.strptime(args.end_date, '%Y-%m-%d') if args.end_date else None
+    counts = generate(args.out, args.products, args.years, args.seed,
+                      args.daily_transactions, args.daily_bookings, end_date)
+    print(f"Wrote {args.out}: " + ', '.join(f"{count:,} {table}" for table, count in counts.items()))
+
+
+if __name__ == '__main__':
+    main()
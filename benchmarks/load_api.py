@@ -0,0 +1,162 @@
+"""Simulate several tills checking out against the API server on localhost.
+
+    python benchmarks/load_api.py                        # 8 tills x 250 checkouts on a fresh database
+    python benchmarks/load_api.py --tills 32 --checkouts 500
+    python benchmarks/load_api.py --db bench_shop.db --no-validate
+
+Starts ui/api_server.py in a subprocess on a copy of the database, then runs
+one thread per till. Each till looks its products up, validates the cart and
+records the sale over its own keep-alive connection, like the POS page does in
+remote mode. Reports checkout throughput, latency percentiles and how many
+writes the server's writer queue grouped into each commit. Afterwards the
+database is checked: stock sold must match the sale lines recorded.
+"""
+import argparse
+import os
+import random
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+UI_DIR = os.path.join(BENCH_DIR, '..', 'ui')
+sys.path.insert(0, UI_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from generate_data import generate
+from api_client import ApiClient, RemoteShop
+from api_protocol import RemoteError
+from core import CoreError
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(shop, process, timeout=15):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('API server exited during startup')
+        try:
+            return shop.health()
+        except RemoteError:
+            time.sleep(0.1)
+    raise RuntimeError('API server did not start')
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_till(url, codes, checkouts, validate, seed, results):
+    """Run one till's checkouts; appends (latencies_ms, failures) to results"""
+    shop = RemoteShop(url)
+    rng = random.Random(seed)
+    latencies = []
+    failures = 0
+    for _ in range(checkouts):
+        start = time.perf_counter()
+        try:
+            cart = []
+            for code in rng.sample(codes, rng.randint(1, 3)):
+                product = shop.product_repo.get_by_code(code)
+                cart.append({'product_id': product.product_id, 'product_name': product.name,
+                             'customer_name': 'Load Test', 'customer_address': '',
+                             'unit_price': product.price, 'quantity': 1, 'category': product.category})
+            if validate:
+                shop.checkout.validate(cart)
+            shop.checkout.record_sale(cart, 'Cash')
+            latencies.append((time.perf_counter() - start) * 1000)
+        except CoreError as e:
+            failures += 1
+            print(f"Checkout failed: {e}")
+    shop.client.close()
+    results.append((latencies, failures))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test checkout through the API server')
+    parser.add_argument('--db', help='existing database to use (a copy is used)')
+    parser.add_argument('--products', type=int, default=300)
+    parser.add_argument('--tills', type=int, default=8)
+    parser.add_argument('--checkouts', type=int, default=250, help='checkouts per till')
+    parser.add_argument('--no-validate', dest='validate', action='store_false',
+                        help='skip the validate round trip before each sale')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='bikeshop_api_load_')
+    server = None
+    try:
+        db_path = os.path.join(workdir, 'bike_shop_inventory.db')
+        if args.db:
+            shutil.copyfile(args.db, db_path)
+        else:
+            generate(db_path, args.products, 0.25, args.seed)
+
+        conn = sqlite3.connect(db_path)
+        conn.execute('UPDATE products SET stock = stock + ?', (args.tills * args.checkouts * 3,))
+        conn.commit()
+        stock_before = conn.execute('SELECT SUM(stock) FROM products').fetchone()[0]
+        lines_before = conn.execute('SELECT COALESCE(SUM(quantity), 0) FROM sales').fetchone()[0]
+        codes = [row[0] for row in conn.execute('SELECT product_id FROM products')]
+        conn.close()
+
+        port = free_port()
+        url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen([sys.executable, os.path.join(UI_DIR, 'api_server.py'),
+                                   '--db', db_path, '--port', str(port)],
+                                  cwd=workdir, stdout=subprocess.DEVNULL)
+        wait_for_server(RemoteShop(url), server)
+
+        results = []
+        threads = [threading.Thread(target=run_till,
+                                    args=(url, codes, args.checkouts, args.validate, args.seed + n, results))
+                   for n in range(args.tills)]
+        wall_start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - wall_start
+
+        health = ApiClient(url).get('/api/health')
+        latencies = sorted(latency for till_latencies, _ in results for latency in till_latencies)
+        failures = sum(failed for _, failed in results)
+        print(f"{len(latencies):,} checkouts from {args.tills} tills, {failures} failed, {wall:.2f} s")
+        print(f"{len(latencies) / wall:,.0f} checkouts/s; latency ms p50 {percentile(latencies, 0.5):.1f}, "
+              f"p95 {percentile(latencies, 0.95):.1f}, p99 {percentile(latencies, 0.99):.1f}, "
+              f"max {latencies[-1] if latencies else 0:.1f}")
+        print(f"Server: {health['requests']:,} requests, {health['writes']:,} writes in "
+              f"{health['write_batches']:,} writer batches "
+              f"({health['writes'] / max(health['write_batches'], 1):.1f} per commit)")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    try:
+        conn = sqlite3.connect(db_path)
+        stock_after = conn.execute('SELECT SUM(stock) FROM products').fetchone()[0]
+        lines_after = conn.execute('SELECT COALESCE(SUM(quantity), 0) FROM sales').fetchone()[0]
+        conn.close()
+        sold = lines_after - lines_before
+        consistent = stock_before - stock_after == sold
+        print(f"Consistency: {sold:,} units sold, stock down {stock_before - stock_after:,} "
+              f"-> {'OK' if consistent else 'MISMATCH'}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Scripted checkout load through the headless core (no Tk).
+
+    python benchmarks/load_checkout.py                           # 5,000 checkouts on a fresh database
+    python benchmarks/load_checkout.py --checkouts 20000 --batch 50
+    python benchmarks/load_checkout.py --workers 4 --wal         # one process and connection per worker
+
+Each checkout validates a random 1-3 line cart and records it with
+core.CheckoutService. --batch records that many carts per SQLite transaction
+(CheckoutService.record_sales), which is how bulk imports should drive it.
+Stock is topped up before the run so carts don't fail for lack of stock.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'ui'))
+sys.path.insert(0, BENCH_DIR)
+
+from generate_data import generate
+from core import ShopCore, CoreError
+
+
+def make_cart(rng, products):
+    """Build a cart of 1-3 lines in the POS cart format"""
+    lines = []
+    for product in rng.sample(products, rng.randint(1, 3)):
+        lines.append({'product_id': product.product_id, 'product_name': product.name,
+                      'customer_name': 'Load Test', 'customer_address': '',
+                      'unit_price': product.price, 'quantity': 1, 'category': product.category})
+    return lines
+
+
+def run_worker(db_path, checkouts, batch, seed):
+    """Record checkouts on a new connection; returns (recorded, failed, seconds)"""
+    shop = ShopCore(db_path)
+    shop.db.conn.execute('PRAGMA busy_timeout = 30000')
+    rng = random.Random(seed)
+    products = shop.db.product_repo.list_all()
+    recorded = failed = 0
+
+    start = time.perf_counter()
+    remaining = checkouts
+    while remaining > 0:
+        carts = [make_cart(rng, products) for _ in range(min(batch, remaining))]
+        remaining -= len(carts)
+        try:
+            for cart in carts:
+                shop.checkout.validate(cart)
+            recorded += len(shop.checkout.record_sales(carts))
+        except (CoreError, sqlite3.Error) as e:
+            failed += len(carts)
+            print(f"Checkout failed: {e}")
+    elapsed = time.perf_counter() - start
+
+    shop.close()
+    return recorded, failed, elapsed
+
+
+def _worker_entry(args):
+    return run_worker(*args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Drive checkouts through the headless core')
+    parser.add_argument('--db', help='existing database to load (a copy is used)')
+    parser.add_argument('--products', type=int, default=300)
+    parser.add_argument('--checkouts', type=int, default=5000, help='checkouts per worker')
+    parser.add_argument('--batch', type=int, default=1, help='carts per transaction')
+    parser.add_argument('--workers', type=int, default=1, help='parallel processes')
+    parser.add_argument('--wal', action='store_true', help='switch the copy to WAL journaling')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='bikeshop_load_')
+    previous_dir = os.getcwd()
+    try:
+        db_path = os.path.join(workdir, 'bike_shop_inventory.db')
+        if args.db:
+            shutil.copyfile(os.path.join(previous_dir, args.db), db_path)
+        else:
+            generate(db_path, args.products, 0.25, args.seed)
+
+        # Keeps the slow-query log out of the caller's directory
+        os.chdir(workdir)
+
+        conn = sqlite3.connect(db_path)
+        if args.wal:
+            conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('UPDATE products SET stock = stock + ?', (args.checkouts * args.workers * 3,))
+        conn.commit()
+        conn.close()
+
+        jobs = [(db_path, args.checkouts, args.batch, args.seed + n) for n in range(args.workers)]
+        wall_start = time.perf_counter()
+        if args.workers == 1:
+            results = [run_worker(*jobs[0])]
+        else:
+            with multiprocessing.Pool(args.workers) as pool:
+                results = pool.map(_worker_entry, jobs)
+        wall = time.perf_counter() - wall_start
+
+        recorded = sum(result[0] for result in results)
+        failed = sum(result[1] for result in results)
+        print(f"{recorded:,} checkouts recorded, {failed:,} failed, "
+              f"{args.workers} worker(s), batch {args.batch}{', WAL' if args.wal else ''}")
+        print(f"{recorded / wall:,.0f} checkouts/s overall ({wall:.2f} s)")
+        for n, (done, _, elapsed) in enumerate(results, 1):
+            print(f"  worker {n}: {done / elapsed:,.0f} checkouts/s")
+    finally:
+        os.chdir(previous_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
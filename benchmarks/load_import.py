@@ -0,0 +1,113 @@
+"""Bulk product import throughput through the headless core (no Tk).
+
+    python benchmarks/load_import.py                     # 20,000 SKUs, then a price-list update
+    python benchmarks/load_import.py --skus 50000 --chunk 5000
+    python benchmarks/load_import.py --no-baseline       # skip the row-at-a-time comparison
+
+Writes a product list CSV and imports it with core.ProductImporter into a
+fresh database, then imports a supplier price list (ID, name and new price,
+no stock column) over the same SKUs. For comparison the same price list is
+applied row at a time, one lookup and one committed UPDATE per row, which
+is what driving the Edit Product path from a script amounts to.
+"""
+import argparse
+import csv
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'ui'))
+sys.path.insert(0, BENCH_DIR)
+
+from generate_data import generate
+from core import ShopCore
+
+CATEGORIES = ('Bikes', 'Parts', 'Accessories', 'Tools')
+
+
+def write_product_list(path, skus, rng):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Product ID', 'Name', 'Price', 'Stock', 'Category'])
+        for n in range(skus):
+            writer.writerow([f"IMP{n:06d}", f"Imported Item {n}", f"{rng.uniform(50, 50000):.2f}",
+                             rng.randint(0, 40), rng.choice(CATEGORIES)])
+
+
+def write_price_list(path, skus, rng):
+    """Supplier price list: every SKU, new prices, no stock or category columns"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['SKU', 'Description', 'Unit Price'])
+        for n in range(skus):
+            writer.writerow([f"IMP{n:06d}", f"Imported Item {n}", f"{rng.uniform(50, 50000):.2f}"])
+
+
+def row_at_a_time(db_path, price_list):
+    """Apply a price list one row per transaction; returns rows updated"""
+    conn = sqlite3.connect(db_path)
+    updated = 0
+    with open(price_list, newline='', encoding='utf-8') as f:
+        rows = csv.reader(f)
+        next(rows)
+        for product_id, name, price in rows:
+            row = conn.execute('SELECT id FROM products WHERE product_id = ?', (product_id,)).fetchone()
+            if row is None:
+                continue
+            conn.execute('UPDATE products SET name = ?, price = ? WHERE id = ?', (name, float(price), row[0]))
+            conn.commit()
+            updated += 1
+    conn.close()
+    return updated
+
+
+def report(label, result):
+    print(f"{label}: {result.summary()}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure bulk product import throughput')
+    parser.add_argument('--skus', type=int, default=20000)
+    parser.add_argument('--chunk', type=int, default=1000, help='rows per transaction')
+    parser.add_argument('--no-baseline', dest='baseline', action='store_false',
+                        help='skip the row-at-a-time price update')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix='bikeshop_import_')
+    previous_dir = os.getcwd()
+    try:
+        db_path = os.path.join(workdir, 'bike_shop_inventory.db')
+        generate(db_path, 300, 0.25, args.seed)
+        product_list = os.path.join(workdir, 'products.csv')
+        price_list = os.path.join(workdir, 'prices.csv')
+        write_product_list(product_list, args.skus, rng)
+        write_price_list(price_list, args.skus, rng)
+
+        # Keeps the slow-query log out of the caller's directory
+        os.chdir(workdir)
+        shop = ShopCore(db_path)
+        report("New SKUs", shop.importer.import_file(product_list, chunk_size=args.chunk))
+        report("Dry run", shop.importer.import_file(price_list, dry_run=True, chunk_size=args.chunk))
+        report("Price list", shop.importer.import_file(price_list, chunk_size=args.chunk))
+        shop.close()
+
+        if args.baseline:
+            write_price_list(price_list, args.skus, rng)
+            start = time.perf_counter()
+            updated = row_at_a_time(db_path, price_list)
+            elapsed = time.perf_counter() - start
+            print(f"Row at a time: {updated:,} rows in {elapsed:.2f} s ({updated / elapsed:,.0f} rows/s)")
+    finally:
+        os.chdir(previous_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+"""End-to-end benchmarks for the shop's data-access paths.
+
+    python benchmarks/run_benchmarks.py                     # generate a fresh database and run everything
+    python benchmarks/run_benchmarks.py --db bench_shop.db  # reuse a generated database (copied, never modified)
+    python benchmarks/run_benchmarks.py -k period --json results.json
+
+Runs headless: the app is built with BikeShopInventorySystem.headless() and
+module data methods are called without creating any widgets, so no display is
+needed. "cold" cases clear the query cache before every call; "warm" cases
+measure the cached path.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'ui'))
+sys.path.insert(0, BENCH_DIR)
+
+from generate_data import generate
+
+
+def median(values):
+    # ui/statistics.py shadows the stdlib module, so no statistics.median here
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+class BenchmarkRunner:
+    """Times callables and collects min/median/mean per case"""
+
+    def __init__(self, pattern=None, min_time=0.5, max_rounds=200):
+        self.pattern = pattern
+        self.min_time = min_time
+        self.max_rounds = max_rounds
+        self.results = []
+
+    def run(self, name, func, setup=None, rounds=None):
+        if self.pattern and self.pattern not in name:
+            return
+        timings = []
+        sink = io.StringIO()
+        deadline = time.perf_counter() + self.min_time
+        limit = rounds or self.max_rounds
+        # The app prints progress; keep it out of the report (but still pay for it)
+        with contextlib.redirect_stdout(sink):
+            while len(timings) < limit and (len(timings) < 3 or time.perf_counter() < deadline):
+                if setup:
+                    setup()
+                start = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - start) * 1000)
+                sink.seek(0)
+                sink.truncate()
+
+        result = {
+            'name': name,
+            'rounds': len(timings),
+            'min_ms': min(timings),
+            'median_ms': median(timings),
+            'mean_ms': sum(timings) / len(timings),
+            'max_ms': max(timings),
+        }
+        self.results.append(result)
+        print(f"{name:<48} {result['rounds']:>6} {result['min_ms']:>10.3f} "
+              f"{result['median_ms']:>10.3f} {result['mean_ms']:>10.3f} {result['max_ms']:>10.3f}")
+
+
+def build_app(db_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        from main import BikeShopInventorySystem
+        from dashboard import DashboardModule
+        from sales import SalesModule
+        from services import ServicesModule
+        from stockhistory import StockHistoryModule
+
+        app = BikeShopInventorySystem.headless(db_path)
+        modules = {
+            'dashboard': DashboardModule(None, app),
+            'sales': SalesModule(None, app),
+            'services': ServicesModule(None, app),
+            'stock_history': StockHistoryModule(None, app),
+        }
+    return app, modules
+
+
+def run_suite(runner, app, modules, export_dir):
+    cache = app.query_cache
+    cold = cache.clear
+
+    years = app.get_available_years()
+    year = max(years) if years else time.strftime('%Y')
+    products = app.product_repo.list_all()
+    busiest = [p.product_id for p in sorted(products, key=lambda p: p.stock, reverse=True)[:20]]
+
+    # Checkout
+    state = {'n': 0}
+
+    def make_cart():
+        state['n'] += 1
+        lines = []
+        for offset in range(1 + state['n'] % 3):
+            product = app.product_repo.get_by_code(busiest[(state['n'] + offset) % len(busiest)])
+            lines.append({'product_id': product.product_id, 'product_name': product.name,
+                          'customer_name': 'Benchmark Customer', 'customer_address': 'Bench St.',
+                          'unit_price': product.price, 'quantity': 1, 'category': product.category})
+        return lines
+
+    def restock():
+        app.cursor.execute('UPDATE products SET stock = stock + 1000 WHERE stock < 100')
+        app.conn.commit()
+
+    def checkout():
+        cart = make_cart()
+        ok, message = app.validate_transaction(cart)
+        if ok:
+            ok, message = app.record_sale(cart)
+        if not ok:
+            raise RuntimeError(message)
+
+    restock()
+    runner.run('checkout.validate_and_record', checkout)
+
+    # Search
+    runner.run('search.products', lambda: app.product_repo.search('Chain'))
+    runner.run('search.inventory_statistics',
+               lambda: (app.product_repo.summary('Bike'), app.sales_repo.total_revenue('Bike')))
+    runner.run('search.stock_history', lambda: modules['stock_history'].get_stock_history_rows(search_term='Santos'))
+
+    # Period aggregations
+    for label, func in [
+        ('period.daily', app.get_daily_sales_data),
+        ('period.weekly', app.get_weekly_sales_data),
+        ('period.monthly', lambda: app.get_monthly_sales_data(year)),
+        ('period.yearly', app.get_yearly_sales_data),
+        ('period.specific_month', lambda: app.get_specific_month_sales_data('May', year)),
+        ('period.sales_module.daily', modules['sales'].get_daily_sales_data),
+        ('period.sales_module.monthly', lambda: modules['sales'].get_monthly_sales_data(year)),
+        ('period.services.daily', modules['services'].get_service_daily_data),
+        ('period.services.weekly', modules['services'].get_service_weekly_data),
+        ('period.services.monthly', lambda: modules['services'].get_service_monthly_data(year)),
+        ('period.services.yearly', modules['services'].get_service_yearly_data),
+        ('period.services.statistics', modules['services'].get_service_statistics),
+    ]:
+        runner.run(f"{label} (cold)", func, setup=cold)
+
+    for report_type in ('Daily', 'Weekly', 'Monthly', 'Yearly'):
+        runner.run(f"period.statistics.{report_type.lower()} (cold)",
+                   lambda rt=report_type: app.get_filtered_statistics(year, 'All Months', rt), setup=cold)
+        runner.run(f"period.statistics.{report_type.lower()} (warm)",
+                   lambda rt=report_type: app.get_filtered_statistics(year, 'All Months', rt))
+
+    # Stock history load
+    history = modules['stock_history']
+    runner.run('stock_history.all_time', history.get_stock_history_rows)
+    runner.run('stock_history.last_30_days', lambda: history.get_stock_history_rows('Last 30 Days'))
+
+    # Exports
+    sales = modules['sales']
+
+    def export(view):
+        data, filename, headers = sales.get_report_data(view, year)
+        sales.write_report(os.path.join(export_dir, filename), headers, data)
+
+    for view in ('daily', 'weekly', 'monthly', 'yearly'):
+        runner.run(f"export.{view}_report (cold)", lambda v=view: export(v), setup=cold)
+
+    # Dashboard build
+    dashboard = modules['dashboard']
+    runner.run('dashboard.data (cold)', dashboard.get_dashboard_data, setup=cold)
+    runner.run('dashboard.data (warm)', dashboard.get_dashboard_data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the shop database benchmarks')
+    parser.add_argument('--db', help='existing database to benchmark (a copy is used)')
+    parser.add_argument('--products', type=int, default=500)
+    parser.add_argument('--years', type=float, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('-k', dest='pattern', help='only run cases whose name contains this text')
+    parser.add_argument('--min-time', type=float, default=0.5, help='seconds to spend per case')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='bikeshop_bench_')
+    previous_dir = os.getcwd()
+    json_path = os.path.abspath(args.json) if args.json else None
+    try:
+        db_path = os.path.join(workdir, 'bike_shop_inventory.db')
+        if args.db:
+            shutil.copyfile(args.db, db_path)
+        else:
+            counts = generate(db_path, args.products, args.years, args.seed)
+            print("Generated " + ', '.join(f"{count:,} {table}" for table, count in counts.items()))
+
+        # Keeps the slow-query log out of the caller's directory
+        os.chdir(workdir)
+
+        app, modules = build_app(db_path)
+        runner = BenchmarkRunner(args.pattern, args.min_time)
+        print(f"{'case':<48} {'rounds':>6} {'min ms':>10} {'median ms':>10} {'mean ms':>10} {'max ms':>10}")
+        run_suite(runner, app, modules, workdir)
+        app.conn.close()
+
+        if json_path:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump({'database': args.db or 'generated', 'results': runner.results}, f, indent=2)
+    finally:
+        os.chdir(previous_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""Services page open time against booking history size.
+
+    python benchmarks/services_page.py                          # 1k, 10k and 100k bookings
+    python benchmarks/services_page.py --bookings 1000 250000 --rounds 5
+    python benchmarks/services_page.py --headless               # data only, no display needed
+
+Builds the Services page with real Tk widgets on a withdrawn root, over
+databases holding more and more booking history. Opening the page only
+loads the Available Services tab, so its time should stay flat as history
+grows; the first switch to Service History is where the history size shows.
+Every round starts with a cold query cache.
+
+Without a display (or with --headless) only the queries each tab loads on
+show are timed, through the core, without building any widgets.
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'ui'))
+sys.path.insert(0, BENCH_DIR)
+
+import tkinter as tk
+
+from generate_data import generate
+from run_benchmarks import median
+
+# Copies of generated bookings, spread back over the last few years
+PAD_BOOKINGS = '''
+    WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+    INSERT INTO service_bookings (booking_id, service_id, service_name, customer_name, customer_contact,
+                                  booking_date, status, price, payment_status)
+    SELECT printf('BKPAD%09d', n.i), b.service_id, b.service_name, b.customer_name || ' ' || (n.i % 700),
+           b.customer_contact, datetime(b.booking_date, '-' || (n.i % 1500) || ' days'), b.status, b.price,
+           b.payment_status
+    FROM n, (SELECT * FROM service_bookings ORDER BY id LIMIT 1) b
+'''
+
+
+def make_database(path, bookings, seed):
+    """Generate a small shop and pad its booking history to the given size; returns the booking count"""
+    generate(path, 100, 0.25, seed)
+    conn = sqlite3.connect(path)
+    existing = conn.execute('SELECT COUNT(*) FROM service_bookings').fetchone()[0]
+    if bookings > existing:
+        conn.execute(PAD_BOOKINGS, (bookings - existing,))
+        conn.commit()
+    count = conn.execute('SELECT COUNT(*) FROM service_bookings').fetchone()[0]
+    conn.close()
+    return count
+
+
+def time_page(db_path, rounds):
+    """Get (median page open ms, median first history tab ms)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        from main import BikeShopInventorySystem
+        from services import ServicesModule
+        app = BikeShopInventorySystem.headless(db_path)
+
+    root = tk.Tk()
+    root.withdraw()
+    app.root = root
+    open_times, history_times = [], []
+    try:
+        for _ in range(rounds):
+            app.query_cache.clear()
+            with contextlib.redirect_stdout(io.StringIO()):
+                module = ServicesModule(root, app)
+                start = time.perf_counter()
+                frame = module.create_interface()
+                frame.pack(fill='both', expand=True)
+                root.update()
+                open_times.append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                module.notebook.select(module.tab_frames['history'])
+                root.update()
+                history_times.append((time.perf_counter() - start) * 1000)
+            frame.destroy()
+    finally:
+        root.destroy()
+        app.conn.close()
+    return median(open_times), median(history_times)
+
+
+def time_tab_data(db_path, rounds):
+    """Get (median services tab ms, median history tab ms) for the tabs' queries alone"""
+    from core import ShopCore
+    from query_cache import QueryCache
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        shop = ShopCore(db_path, QueryCache())
+    open_times, history_times = [], []
+    try:
+        for _ in range(rounds):
+            shop.db.query_cache.clear()
+            # What load_visible_tab fetches: the services list on open, the bookings on the history tab
+            start = time.perf_counter()
+            shop.db.service_repo.list()
+            open_times.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            shop.db.booking_repo.list()
+            history_times.append((time.perf_counter() - start) * 1000)
+    finally:
+        shop.close()
+    return median(open_times), median(history_times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure Services page open time against booking history size')
+    parser.add_argument('--bookings', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--headless', action='store_true', help='time the tabs\' queries only, without Tk')
+    args = parser.parse_args(argv)
+
+    timer = time_tab_data if args.headless else time_page
+    if not args.headless:
+        try:
+            tk.Tk().destroy()
+        except tk.TclError as e:
+            print(f"No display ({e}); timing the tabs' queries only")
+            timer = time_tab_data
+
+    workdir = tempfile.mkdtemp(prefix='bikeshop_services_')
+    previous_dir = os.getcwd()
+    try:
+        # Keeps the slow-query log out of the caller's directory
+        os.chdir(workdir)
+        print(f"{'bookings':>10} {'open page ms':>14} {'history tab ms':>16}")
+        for size in args.bookings:
+            db_path = os.path.join(workdir, f"services_{size}.db")
+            with contextlib.redirect_stdout(io.StringIO()):
+                count = make_database(db_path, size, args.seed)
+            open_ms, history_ms = timer(db_path, args.rounds)
+            print(f"{count:>10,} {open_ms:>14.1f} {history_ms:>16.1f}")
+    finally:
+        os.chdir(previous_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
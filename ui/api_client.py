@@ -0,0 +1,141 @@
+import http.client
+import json
+import os
+import sys
+import threading
+from urllib.parse import urlsplit, urlencode
+
+from api_protocol import API_PREFIX, RemoteError, decode, decode_error
+
+
+SERVER_ENV_VAR = 'BIKESHOP_SERVER'
+SERVER_FLAG = '--server'
+TOKEN_ENV_VAR = 'BIKESHOP_API_TOKEN'
+
+
+def requested_server_url(argv=None):
+    """Get the API server URL from --server URL or BIKESHOP_SERVER, or None for local mode"""
+    argv = sys.argv if argv is None else argv
+    if SERVER_FLAG in argv:
+        index = argv.index(SERVER_FLAG)
+        if index + 1 < len(argv):
+            return argv[index + 1]
+    return os.environ.get(SERVER_ENV_VAR) or None
+
+
+class ApiClient:
+    """Keep-alive HTTP/JSON connection to an api_server"""
+
+    def __init__(self, base_url, token=None, timeout=10):
+        url = urlsplit(base_url if '://' in base_url else f"http://{base_url}")
+        self.base_url = f"{url.scheme}://{url.netloc}"
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.token = token if token is not None else os.environ.get(TOKEN_ENV_VAR)
+        self.timeout = timeout
+        self.connection = None
+        self.lock = threading.Lock()
+
+    def _request(self, method, path, body=None):
+        headers = {'Content-Type': 'application/json', 'Connection': 'keep-alive'}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        self.connection.request(method, path, body, headers)
+        response = self.connection.getresponse()
+        data = response.read()
+        if response.getheader('Connection', '').lower() == 'close':
+            self.close()
+        return response.status, json.loads(data or b'{}')
+
+    def call(self, group, method, args=(), kwargs=None, retry=True):
+        """POST /api/<group>/<method> and return the decoded result; CoreErrors are re-raised locally"""
+        body = json.dumps({'args': list(args), 'kwargs': kwargs or {}})
+        path = f"{API_PREFIX}{group}/{method}"
+        with self.lock:
+            try:
+                status, payload = self._request('POST', path, body)
+            except (http.client.HTTPException, OSError) as e:
+                self.close()
+                if not retry:
+                    raise RemoteError(f"Server {self.base_url} unavailable: {e}")
+                # A stale keep-alive connection; reconnect once
+                try:
+                    status, payload = self._request('POST', path, body)
+                except (http.client.HTTPException, OSError) as e:
+                    self.close()
+                    raise RemoteError(f"Server {self.base_url} unavailable: {e}")
+        if status != 200:
+            raise decode_error(payload)
+        return decode(payload.get('result'))
+
+    def get(self, path, **params):
+        """GET a path (e.g. /api/health) and return its result"""
+        query = f"?{urlencode(params)}" if params else ''
+        with self.lock:
+            try:
+                status, payload = self._request('GET', path + query)
+            except (http.client.HTTPException, OSError) as e:
+                self.close()
+                raise RemoteError(f"Server {self.base_url} unavailable: {e}")
+        if status != 200:
+            raise decode_error(payload)
+        return payload.get('result')
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class RemoteProxy:
+    """Stands in for a repository or core service; method calls go to the server"""
+
+    def __init__(self, client, group, writes=()):
+        self._client = client
+        self._group = group
+        self._writes = set(writes)
+
+    def __getattr__(self, method):
+        if method.startswith('_'):
+            raise AttributeError(method)
+
+        def call(*args, **kwargs):
+            # Writes aren't retried: the server may have applied one before the connection dropped
+            return self._client.call(self._group, method, args, kwargs, retry=method not in self._writes)
+        call.__name__ = method
+        return call
+
+
+class RemoteShop:
+    """The ShopCore/ShopDatabase attributes the Tk app uses, served by an api_server"""
+
+    def __init__(self, base_url, token=None):
+        self.client = ApiClient(base_url, token)
+        self.product_repo = RemoteProxy(self.client, 'products')
+        self.sales_repo = RemoteProxy(self.client, 'sales')
+        self.service_repo = RemoteProxy(self.client, 'services')
+        self.booking_repo = RemoteProxy(self.client, 'bookings')
+        # replay_sale is keyed by transaction ID, so it is safe to retry
+        self.checkout = RemoteProxy(self.client, 'checkout', writes={'record_sale', 'record_sales', 'void_sale_lines'})
+        self.inventory = RemoteProxy(self.client, 'stock', writes={'add_product', 'edit_product', 'add_stock',
+                                                                   'receive_stock', 'archive_product'})
+        self.bookings = RemoteProxy(self.client, 'booking-actions',
+                                    writes={'create_booking', 'update_status', 'mark_paid', 'cancel', 'delete_booking'})
+        self.service_catalog = RemoteProxy(self.client, 'service-catalog',
+                                           writes={'add_service', 'edit_service', 'delete_service'})
+        self.reports = RemoteProxy(self.client, 'reports')
+        self.service_reports = RemoteProxy(self.client, 'service-reports')
+        self.ledger = RemoteProxy(self.client, 'ledger', writes={'reconcile', 'checkpoint'})
+        self.scheduler = RemoteProxy(self.client, 'scheduler')
+        # Holds replace the cart's quantity, so a retried reserve can't double-count
+        self.reservations = RemoteProxy(self.client, 'reservations')
+
+    @property
+    def base_url(self):
+        return self.client.base_url
+
+    def health(self):
+        """Check the server is reachable; returns its status counters"""
+        return self.client.get('/api/health')
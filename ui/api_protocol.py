@@ -0,0 +1,108 @@
+# Wire format shared by api_server.py and api_client.py (no tkinter imports)
+from core import (CoreError, ValidationError, NotFoundError, InsufficientStockError,
+                  SaleResult, VoidResult, TransactionDetail, StockChange, StockReceipt, StatusChange, Slot)
+from repositories import (ProductRow, RecentSaleRow, TransactionRow, SaleLineRow, ServiceRow, BookingRow, BookingDetailRow,
+                          PopularServiceRow, AppointmentRow, BookingEventRow, StockDiscrepancy)
+
+
+API_PREFIX = '/api/'
+DEFAULT_PORT = 8765
+
+# group -> (attribute on ShopCore or ShopDatabase, methods callable remotely)
+READ_METHODS = {
+    'products': ('db.product_repo', {'list_all', 'search', 'get', 'get_by_code', 'list_low_stock',
+                                     'list_lowest_stock', 'get_stock', 'get_stock_by_id',
+                                     'code_exists', 'is_archived_code', 'summary',
+                                     'list_barcodes', 'get_by_scan_code'}),
+    'sales': ('db.sales_repo', {'list_recent', 'total_revenue', 'search_transactions'}),
+    'services': ('db.service_repo', {'list', 'get_full', 'code_exists', 'count_active'}),
+    'bookings': ('db.booking_repo', {'list', 'get_detail', 'get_status', 'list_popular', 'list_upcoming',
+                                     'list_events'}),
+    'checkout': ('checkout', {'validate', 'get_transaction'}),
+    'ledger': ('ledger', {'stock_as_of', 'stock_on_date', 'stock_series'}),
+    'scheduler': ('scheduler', {'resources', 'duration_of', 'next_free_slot'}),
+    'reservations': ('reservations', {'available_stock', 'held_stock'}),
+    'reports': ('reports', {'get_total_sales_count', 'get_total_products', 'get_total_sales',
+                            'get_total_stock_items', 'get_today_summary', 'get_day_summary',
+                            'get_daily_sales_data', 'get_weekly_sales_data', 'get_monthly_sales_data',
+                            'get_specific_month_sales_data', 'get_yearly_sales_data',
+                            'get_available_years', 'get_category_sales_data', 'get_top_buyers',
+                            'get_top_products', 'get_filtered_statistics', 'get_daily_breakdown',
+                            'get_weekly_breakdown', 'get_monthly_breakdown', 'get_yearly_breakdown',
+                            'get_stock_history_rows'}),
+    'service-reports': ('service_reports', {'get_service_daily_data', 'get_service_weekly_data',
+                                            'get_service_monthly_data', 'get_service_yearly_data',
+                                            'get_service_statistics', 'get_unique_customers'}),
+}
+
+# Writes all go through the server's single writer queue
+WRITE_METHODS = {
+    'checkout': ('checkout', {'record_sale', 'record_sales', 'replay_sale', 'void_sale_lines'}),
+    'stock': ('inventory', {'add_product', 'edit_product', 'add_stock', 'receive_stock', 'archive_product'}),
+    'ledger': ('ledger', {'reconcile', 'checkpoint'}),
+    'reservations': ('reservations', {'reserve', 'release', 'sweep'}),
+    'booking-actions': ('bookings', {'create_booking', 'update_status', 'mark_paid', 'cancel', 'delete_booking'}),
+    'service-catalog': ('service_catalog', {'add_service', 'edit_service', 'delete_service'}),
+}
+
+ROW_TYPES = {row_type.__name__: row_type for row_type in (
+    ProductRow, RecentSaleRow, TransactionRow, SaleLineRow, ServiceRow, BookingRow, BookingDetailRow, PopularServiceRow,
+    AppointmentRow, BookingEventRow, StockDiscrepancy, SaleResult, VoidResult, TransactionDetail, StockChange,
+    StockReceipt, StatusChange, Slot)}
+
+ERROR_STATUS = {
+    'InsufficientStockError': 409,
+    'NotFoundError': 404,
+    'ValidationError': 400,
+    'CoreError': 400,
+}
+
+
+class RemoteError(CoreError):
+    """The server couldn't be reached or refused the request"""
+
+
+def encode(value):
+    """Make a result JSON-safe; named rows keep their type name so the client can rebuild them"""
+    if hasattr(value, '_asdict'):
+        row = {field: encode(item) for field, item in value._asdict().items()}
+        row['__row__'] = type(value).__name__
+        return row
+    if isinstance(value, (list, tuple)):
+        return [encode(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): encode(item) for key, item in value.items()}
+    return value
+
+
+def decode(value, nested=False):
+    """Rebuild a result: named rows become their namedtuple, inner lists become tuples like cursor rows"""
+    if isinstance(value, list):
+        items = [decode(item, True) for item in value]
+        return tuple(items) if nested else items
+    if isinstance(value, dict):
+        row_type = ROW_TYPES.get(value.get('__row__'))
+        if row_type is not None:
+            return row_type(**{field: decode(value[field]) for field in row_type._fields})
+        return {key: decode(item) for key, item in value.items()}
+    return value
+
+
+def encode_error(error):
+    """Get (HTTP status, body) for an exception raised by a core call"""
+    name = type(error).__name__
+    body = {'error': name if name in ERROR_STATUS else 'CoreError', 'message': str(error)}
+    if isinstance(error, InsufficientStockError):
+        body['fields'] = {'product_id': error.product_id, 'product_name': error.product_name,
+                          'available': error.available, 'requested': error.requested}
+    return ERROR_STATUS.get(body['error'], 400), body
+
+
+def decode_error(body):
+    """Rebuild the CoreError a server response describes"""
+    name = body.get('error')
+    message = body.get('message', 'Request failed')
+    if name == 'InsufficientStockError' and 'fields' in body:
+        return InsufficientStockError(**body['fields'])
+    error_type = {'NotFoundError': NotFoundError, 'ValidationError': ValidationError}.get(name, RemoteError)
+    return error_type(message)
@@ -0,0 +1,314 @@
+# HTTP/JSON API so several tills and a back-office PC can share one shop database.
+#
+#     python ui/api_server.py --db bike_shop_inventory.db --host 0.0.0.0 --port 8765 --token s3cret
+#
+# Every call is POST /api/<group>/<method> with a JSON body {"args": [...], "kwargs": {...}};
+# reads can also be made as GET with query parameters, e.g.
+#
+#     curl 'http://127.0.0.1:8765/api/products/search?search_term=Chain'
+#     curl 'http://127.0.0.1:8765/api/reports/get_filtered_statistics?year=2025&report_type=Weekly'
+#     curl 'http://127.0.0.1:8765/api/reports/get_stock_history_rows?date_filter=Today'
+#     curl -X POST http://127.0.0.1:8765/api/checkout/record_sale -d '{"args": [[{...cart line...}], "Cash"]}'
+#
+# The groups and methods are listed in api_protocol.py. Reads run on a small
+# thread pool, one connection per thread. Writes are queued and applied by a
+# single writer thread, which records consecutive checkouts in one transaction
+# (group commit), so the database sees one writer no matter how many tills are
+# connected.
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qsl
+
+from core import ShopCore, CoreError, ArchivePurger, ReservationSweeper
+from query_cache import QueryCache
+from api_protocol import (API_PREFIX, DEFAULT_PORT, READ_METHODS, WRITE_METHODS,
+                          encode, encode_error)
+
+
+TOKEN_ENV_VAR = 'BIKESHOP_API_TOKEN'
+MAX_BODY_BYTES = 4 * 1024 * 1024
+REASONS = {200: 'OK', 400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found',
+           405: 'Method Not Allowed', 409: 'Conflict', 413: 'Payload Too Large',
+           500: 'Internal Server Error'}
+
+
+def resolve(core, path):
+    """Follow a dotted attribute path such as 'db.product_repo' from a ShopCore"""
+    target = core
+    for name in path.split('.'):
+        target = getattr(target, name)
+    return target
+
+
+class WriteJob:
+    """One queued write and the future its request handler is waiting on"""
+
+    def __init__(self, group, method, args, kwargs, future):
+        self.group = group
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+        self.result = None
+        self.error = None
+
+    @property
+    def is_checkout(self):
+        # Only plain (cart, payment method) calls; journaled sales carry their own ID and date
+        return (self.group == 'checkout' and self.method == 'record_sale' and not self.kwargs
+                and len(self.args) <= 2)
+
+
+class ShopServer:
+    """Asyncio HTTP server in front of ShopCore with a single writer queue"""
+
+    MAX_WRITE_BATCH = 64
+
+    def __init__(self, db_path, token=None, readers=4, wal=True):
+        self.db_path = db_path
+        self.token = token
+        self.wal = wal
+        # One cache for every connection, so the writer's invalidations reach the readers
+        self.query_cache = QueryCache()
+        self.local = threading.local()
+        self.read_executor = ThreadPoolExecutor(max_workers=readers, thread_name_prefix='api-reader')
+        self.write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='api-writer')
+        self.write_queue = None
+        self.writer_task = None
+        self.server = None
+        self.stats = {'requests': 0, 'reads': 0, 'writes': 0, 'write_batches': 0, 'errors': 0}
+
+    # Connections (sqlite connections stay on the thread that opened them)
+    def _core(self):
+        core = getattr(self.local, 'core', None)
+        if core is None:
+            core = self.local.core = ShopCore(self.db_path, self.query_cache)
+        return core
+
+    def _open_writer(self):
+        core = self._core()
+        if self.wal:
+            # Readers keep reading while the writer commits
+            core.db.conn.execute('PRAGMA journal_mode = WAL')
+            core.db.conn.execute('PRAGMA synchronous = NORMAL')
+        core.db.conn.execute('PRAGMA busy_timeout = 10000')
+        return core
+
+    # Reads
+    def _call_read(self, group, method, args, kwargs):
+        path, methods = READ_METHODS[group]
+        return encode(getattr(resolve(self._core(), path), method)(*args, **kwargs))
+
+    # Writes
+    async def _writer_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.write_queue.get()]
+            while len(batch) < self.MAX_WRITE_BATCH and not self.write_queue.empty():
+                batch.append(self.write_queue.get_nowait())
+
+            await loop.run_in_executor(self.write_executor, self._apply_writes, batch)
+            self.stats['write_batches'] += 1
+            for job in batch:
+                if job.future.cancelled():
+                    continue
+                if job.error is not None:
+                    job.future.set_exception(job.error)
+                else:
+                    job.future.set_result(job.result)
+
+    def _apply_writes(self, batch):
+        """Run queued writes in arrival order; consecutive checkouts share one commit"""
+        core = self._core()
+        pending = []
+        for job in batch:
+            if job.is_checkout and (not pending or self._payment_method(job) == self._payment_method(pending[0])):
+                pending.append(job)
+                continue
+            self._apply_checkouts(core, pending)
+            pending = [job] if job.is_checkout else []
+            if not job.is_checkout:
+                self._apply_one(core, job)
+        self._apply_checkouts(core, pending)
+
+    def _payment_method(self, job):
+        return job.args[1] if len(job.args) > 1 else 'Cash'
+
+    def _apply_checkouts(self, core, jobs):
+        if not jobs:
+            return
+        if len(jobs) > 1:
+            try:
+                results = core.checkout.record_sales([job.args[0] for job in jobs], self._payment_method(jobs[0]))
+                for job, result in zip(jobs, results):
+                    job.result = encode(result)
+                return
+            except (CoreError, sqlite3.Error):
+                # One cart spoiled the group; retry individually so only that one fails
+                pass
+        for job in jobs:
+            self._apply_one(core, job)
+
+    def _apply_one(self, core, job):
+        path, methods = WRITE_METHODS[job.group]
+        try:
+            job.result = encode(getattr(resolve(core, path), job.method)(*job.args, **job.kwargs))
+        except Exception as e:
+            job.error = e
+
+    # HTTP
+    async def dispatch(self, method, target, headers, body):
+        """Route one request; returns (status, payload)"""
+        self.stats['requests'] += 1
+        url = urlsplit(target)
+        if self.token and headers.get('authorization') != f"Bearer {self.token}":
+            return 401, {'error': 'Unauthorized', 'message': 'Missing or wrong API token'}
+        if url.path in ('/api/health', '/api/health/'):
+            return 200, {'result': {'status': 'ok', 'database': os.path.basename(self.db_path), **self.stats}}
+        if not url.path.startswith(API_PREFIX):
+            return 404, {'error': 'NotFound', 'message': f"No route for {url.path}"}
+
+        parts = url.path[len(API_PREFIX):].strip('/').split('/')
+        if len(parts) != 2:
+            return 404, {'error': 'NotFound', 'message': f"No route for {url.path}"}
+        group, name = parts
+
+        try:
+            if method == 'GET':
+                args = []
+                kwargs = {key: self._query_value(value) for key, value in parse_qsl(url.query)}
+            elif method == 'POST':
+                request = json.loads(body or b'{}')
+                args = request.get('args', [])
+                kwargs = request.get('kwargs', {})
+            else:
+                return 405, {'error': 'MethodNotAllowed', 'message': f"{method} is not supported"}
+        except (ValueError, AttributeError) as e:
+            return 400, {'error': 'BadRequest', 'message': f"Invalid JSON body: {e}"}
+
+        loop = asyncio.get_running_loop()
+        try:
+            if name in READ_METHODS.get(group, ('', ()))[1]:
+                self.stats['reads'] += 1
+                result = await loop.run_in_executor(self.read_executor, self._call_read, group, name, args, kwargs)
+            elif method == 'POST' and name in WRITE_METHODS.get(group, ('', ()))[1]:
+                self.stats['writes'] += 1
+                future = loop.create_future()
+                await self.write_queue.put(WriteJob(group, name, args, kwargs, future))
+                result = await future
+            else:
+                return 404, {'error': 'NotFound', 'message': f"Unknown method {group}/{name}"}
+        except CoreError as e:
+            self.stats['errors'] += 1
+            return encode_error(e)
+        except (sqlite3.Error, TypeError) as e:
+            self.stats['errors'] += 1
+            print(f"API error in {group}/{name}: {e}")
+            return 500, {'error': type(e).__name__, 'message': str(e)}
+        except Exception as e:
+            # Bad arguments or a bug behind one method shouldn't drop the connection without a response
+            self.stats['errors'] += 1
+            print(f"Unexpected API error in {group}/{name}: {type(e).__name__}: {e}")
+            return 500, {'error': type(e).__name__, 'message': str(e)}
+        return 200, {'result': result}
+
+    def _query_value(self, value):
+        """Query parameters are JSON when they parse (numbers, null, lists) and text otherwise"""
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one keep-alive connection"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    status, payload = 400, {'error': 'BadRequest', 'message': 'Invalid Content-Length header'}
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, payload = 413, {'error': 'PayloadTooLarge', 'message': 'Request body too large'}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    status, payload = await self.dispatch(method.upper(), target, headers, body)
+                    keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close')
+
+                data = json.dumps(payload).encode('utf-8')
+                writer.write(f"{version} {status} {REASONS.get(status, 'Error')}\r\n"
+                             f"Content-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.write_executor, self._open_writer)
+        self.write_queue = asyncio.Queue()
+        self.writer_task = asyncio.create_task(self._writer_loop())
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server
+
+    async def serve_forever(self, host='127.0.0.1', port=DEFAULT_PORT):
+        server = await self.start(host, port)
+        print(f"Bike shop API serving {self.db_path} on http://{host}:{port}{API_PREFIX}")
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the shop database over HTTP/JSON')
+    parser.add_argument('--db', default='bike_shop_inventory.db')
+    parser.add_argument('--host', default='127.0.0.1', help='use 0.0.0.0 to accept other tills on the network')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--token', default=os.environ.get(TOKEN_ENV_VAR),
+                        help=f'shared secret tills must send (default: ${TOKEN_ENV_VAR})')
+    parser.add_argument('--readers', type=int, default=4, help='read threads')
+    parser.add_argument('--no-wal', dest='wal', action='store_false', help="don't switch the database to WAL")
+    parser.add_argument('--purge-archived', type=int, metavar='DAYS',
+                        help='in the background, remove the history of products archived more than DAYS ago')
+    args = parser.parse_args(argv)
+
+    server = ShopServer(args.db, args.token, args.readers, args.wal)
+    ReservationSweeper(args.db).start()
+    if args.purge_archived is not None:
+        ArchivePurger(args.db, args.purge_archived, server.query_cache).start()
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        print("API server stopped")
+
+
+if __name__ == '__main__':
+    main()
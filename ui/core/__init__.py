@@ -0,0 +1,15 @@
+from .errors import CoreError, ValidationError, NotFoundError, InsufficientStockError
+from .database import ShopDatabase, CoreService
+from .sales import CheckoutService, SaleResult, VoidResult, TransactionDetail, new_transaction_id, check_item_fields
+from .cart import Cart, CartLine
+from .inventory import InventoryService, StockChange, StockReceipt, ReceivingSession, new_receiving_id
+from .bookings import BookingService, ServiceCatalog, StatusChange, new_booking_id, describe_event
+from .scheduling import (ServiceScheduler, DaySchedule, IntervalIndex, Slot, parse_duration,
+                         OPEN_TIME, CLOSE_TIME)
+from .reports import ShopReports, ServiceReports
+from .ledger import StockLedger, CHECKPOINT_EVERY
+from .shop import ShopCore
+from .importer import ProductImporter, ImportReport, ImportChange, ImportRejection
+from .reservations import StockReservations, ReservationSweeper, RESERVATION_MINUTES, new_cart_id
+from .purge import ArchivePurger, start_purge_if_requested
+from .journal import JOURNAL_PATH, CheckoutJournal, JournalReplayer, is_outage
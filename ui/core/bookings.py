@@ -0,0 +1,203 @@
+import itertools
+import os
+from collections import namedtuple
+from datetime import datetime
+
+from .database import CoreService
+from .errors import ValidationError, NotFoundError
+from .scheduling import ServiceScheduler
+
+
+StatusChange = namedtuple('StatusChange',
+                          'booking_id old_status new_status old_payment new_payment completed_date')
+
+_booking_sequence = itertools.count(1)
+
+
+def new_booking_id(now=None):
+    """Get a booking ID; process id and sequence keep same-second bookings unique"""
+    now = now or datetime.now()
+    return f"BK{now.strftime('%Y%m%d%H%M%S')}{os.getpid() % 1000:03d}{next(_booking_sequence) % 100000:05d}"
+
+
+class BookingService(CoreService):
+    """Service booking creation and status changes"""
+
+    def __init__(self, db, scheduler=None):
+        super().__init__(db)
+        self.scheduler = scheduler or ServiceScheduler(db)
+
+    def create_booking(self, service_id, service_name, customer_name, customer_contact, price,
+                       scheduled_date=None, scheduled_time=None, technician=None, bay=None, duration_minutes=None):
+        """Book a service for a customer; returns the new booking ID.
+
+        With a scheduled_date and scheduled_time the booking takes a technician
+        and a bay for the service's duration (any free ones unless named);
+        without, it's a walk-in with no appointment.
+        """
+        customer_name = (customer_name or '').strip()
+        if not customer_name:
+            raise ValidationError("Customer name is required!")
+        if bool(scheduled_date) != bool(scheduled_time):
+            raise ValidationError("An appointment needs both a date and a time!")
+
+        booking_id = new_booking_id()
+        self.cursor.execute('BEGIN IMMEDIATE')
+        try:
+            slot = None
+            if scheduled_date:
+                if duration_minutes is None:
+                    duration_minutes = self.scheduler.duration_of(service_id)
+                slot = self.scheduler.place(scheduled_date, scheduled_time, duration_minutes, technician, bay)
+            self.db.booking_repo.insert(booking_id, service_id, service_name, customer_name,
+                                        (customer_contact or '').strip(), price, *(slot or ()))
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+
+        self.db.invalidate_tables('service_bookings')
+        return booking_id
+
+    def update_status(self, booking_id, new_status, new_payment, note=''):
+        """Change a booking's status and payment status, adding the changes to its history.
+
+        Returns a StatusChange, or None when nothing would change.
+        """
+        current = self.db.booking_repo.get_status(booking_id)
+        if current is None:
+            raise NotFoundError(f"Booking {booking_id} not found")
+        current_status, current_payment = current
+        note = (note or '').strip()
+
+        if new_status == current_status and new_payment == current_payment and not note:
+            return None
+
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        completed_date = None
+        if new_status == 'Completed' and current_status != 'Completed':
+            completed_date = now
+
+        events = []
+        if new_status != current_status:
+            events.append((now, 'STATUS', current_status, new_status, None))
+        if new_payment != current_payment:
+            events.append((now, 'PAYMENT', current_payment, new_payment, None))
+        if note and events:
+            events[-1] = events[-1][:4] + (note,)
+        elif note:
+            events.append((now, 'NOTE', None, None, note))
+
+        try:
+            self.db.booking_repo.update_status(booking_id, new_status, new_payment, completed_date)
+            self.db.booking_repo.add_events(booking_id, events)
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+
+        self.db.invalidate_tables('service_bookings')
+        return StatusChange(booking_id, current_status, new_status, current_payment, new_payment, completed_date)
+
+    def mark_paid(self, booking_id):
+        """Set a booking's payment status to Paid"""
+        self._change(booking_id, 'PAYMENT', 'Paid', self.db.booking_repo.mark_paid)
+
+    def cancel(self, booking_id, reason=""):
+        """Cancel a booking, recording the reason in its history"""
+        self._change(booking_id, 'STATUS', 'Cancelled', self.db.booking_repo.cancel, reason)
+
+    def delete_booking(self, booking_id):
+        """Delete a booking and its history"""
+        try:
+            if self.db.booking_repo.delete(booking_id) == 0:
+                raise NotFoundError(f"Booking {booking_id} not found")
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+        self.db.invalidate_tables('service_bookings')
+
+    def _change(self, booking_id, kind, new_value, write, note=None):
+        current = self.db.booking_repo.get_status(booking_id)
+        if current is None:
+            raise NotFoundError(f"Booking {booking_id} not found")
+        old_value = current[0] if kind == 'STATUS' else current[1]
+        event = (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), kind, old_value, new_value, (note or '').strip() or None)
+        try:
+            write(booking_id)
+            self.db.booking_repo.add_events(booking_id, [event])
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+        self.db.invalidate_tables('service_bookings')
+
+
+def describe_event(event):
+    """One line of a booking's history, as the details window shows it"""
+    if event.kind == 'NOTE':
+        text = event.note or ''
+    else:
+        text = f"{event.kind.title()}: {event.from_value or '?'} → {event.to_value}"
+        if event.note:
+            text += f" - {event.note}"
+    return f"[{event.event_date[:16]}] {text}"
+
+
+class ServiceCatalog(CoreService):
+    """Adding, editing and deleting the services bookings are made for"""
+
+    def add_service(self, name, description, price, duration, category, service_id, is_active=True):
+        """Add a service to the catalog; returns its database id"""
+        service_id = self._check_code(service_id)
+        self.cursor.execute('BEGIN IMMEDIATE')
+        try:
+            if self.db.service_repo.code_exists(service_id):
+                raise ValidationError("Service ID already exists! Please use a unique Service ID.")
+            internal_id = self.db.service_repo.insert(name, description, price, duration, category,
+                                                      service_id, is_active)
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+
+        self.db.invalidate_tables('services')
+        return internal_id
+
+    def edit_service(self, internal_id, name, description, price, duration, category, service_id, is_active):
+        """Overwrite a service's details"""
+        service_id = self._check_code(service_id)
+        self.cursor.execute('BEGIN IMMEDIATE')
+        try:
+            service = self.db.service_repo.get_full(internal_id)
+            if service is None:
+                raise NotFoundError(f"Service {internal_id} not found")
+            # services columns: id, name, description, price, duration, category, service_id, ...
+            if service_id != service[6] and self.db.service_repo.code_exists(service_id):
+                raise ValidationError("Service ID already exists! Please use a unique Service ID.")
+            self.db.service_repo.update(internal_id, name, description, price, duration, category,
+                                        service_id, is_active)
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+
+        self.db.invalidate_tables('services')
+
+    def delete_service(self, internal_id):
+        """Delete a service from the catalog; its bookings keep the service name"""
+        try:
+            self.db.service_repo.delete(internal_id)
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+
+        self.db.invalidate_tables('services')
+
+    def _check_code(self, service_id):
+        service_id = str(service_id).strip()
+        if not service_id:
+            raise ValidationError("Service ID is required!")
+        return service_id
@@ -0,0 +1,99 @@
+from .errors import ValidationError, NotFoundError
+from .reservations import new_cart_id
+
+
+class CartLine:
+    """One product in a cart"""
+
+    __slots__ = ('product_id', 'product_name', 'unit_price', 'quantity', 'category', 'price_cents')
+
+    def __init__(self, product_id, product_name, unit_price, category, quantity=0):
+        self.product_id = product_id
+        self.product_name = product_name
+        self.unit_price = unit_price
+        self.category = category
+        self.quantity = quantity
+        self.price_cents = round(unit_price * 100)
+
+    @property
+    def line_total(self):
+        return self.quantity * self.price_cents / 100
+
+
+class Cart:
+    """The POS cart, keyed by product ID code.
+
+    Adding, changing and removing a line are dict operations, and the
+    subtotal and unit count are kept up to date as lines change (in cents,
+    so hundreds of changes don't drift), so nothing re-walks the cart.
+    items() gives the cart-line dicts CheckoutService expects, and cart_id
+    names the cart's stock reservations (StockReservations).
+    """
+
+    def __init__(self, cart_id=None):
+        self.cart_id = cart_id or new_cart_id()
+        self.lines = {}
+        self.subtotal_cents = 0
+        self.unit_count = 0
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __iter__(self):
+        return iter(self.lines.values())
+
+    def __contains__(self, product_id):
+        return product_id in self.lines
+
+    def get(self, product_id):
+        return self.lines.get(product_id)
+
+    @property
+    def subtotal(self):
+        return self.subtotal_cents / 100
+
+    def add(self, product_id, product_name, unit_price, category, quantity=1):
+        """Add units of a product, merging with its line; returns (line, True if the line is new)"""
+        if quantity <= 0:
+            raise ValidationError("Quantity must be greater than 0!")
+        line = self.lines.get(product_id)
+        is_new = line is None
+        if is_new:
+            line = self.lines[product_id] = CartLine(product_id, product_name, unit_price, category)
+        self._change(line, quantity)
+        return line, is_new
+
+    def set_quantity(self, product_id, quantity):
+        """Set a line's quantity; returns the line"""
+        if quantity <= 0:
+            raise ValidationError("Quantity must be greater than 0!")
+        line = self.lines.get(product_id)
+        if line is None:
+            raise NotFoundError(f"{product_id} is not in the cart")
+        self._change(line, quantity - line.quantity)
+        return line
+
+    def remove(self, product_id):
+        """Take a line out of the cart; returns it, or None if it wasn't there"""
+        line = self.lines.pop(product_id, None)
+        if line is not None:
+            self.subtotal_cents -= line.quantity * line.price_cents
+            self.unit_count -= line.quantity
+        return line
+
+    def clear(self):
+        self.lines.clear()
+        self.subtotal_cents = 0
+        self.unit_count = 0
+
+    def _change(self, line, delta):
+        line.quantity += delta
+        self.subtotal_cents += delta * line.price_cents
+        self.unit_count += delta
+
+    def items(self, customer_name='', customer_address=''):
+        """Get the cart as CheckoutService cart-line dicts"""
+        return [{'product_id': line.product_id, 'product_name': line.product_name,
+                 'customer_name': customer_name, 'customer_address': customer_address,
+                 'unit_price': line.unit_price, 'quantity': line.quantity, 'category': line.category}
+                for line in self.lines.values()]
@@ -0,0 +1,51 @@
+from db_instrumentation import connect
+from query_cache import QueryCache
+from repositories import ProductRepo, SalesRepo, StockMovementRepo, ServiceRepo, BookingRepo, ReservationRepo
+from schema import create_inventory_schema, create_services_schema
+
+
+class ShopDatabase:
+    """One connection with its repositories and query cache.
+
+    sqlite connections aren't shared across threads, so scripts that run
+    work in parallel open one ShopDatabase per thread or process.
+    """
+
+    def __init__(self, db_path='bike_shop_inventory.db', query_cache=None):
+        self.db_path = db_path
+        self.conn = connect(db_path)
+        self.cursor = self.conn.cursor()
+        self.query_cache = query_cache if query_cache is not None else QueryCache()
+
+        self.product_repo = ProductRepo(self)
+        self.sales_repo = SalesRepo(self)
+        self.movement_repo = StockMovementRepo(self)
+        self.reservation_repo = ReservationRepo(self)
+        self.service_repo = ServiceRepo(self)
+        self.booking_repo = BookingRepo(self)
+
+        create_inventory_schema(self.cursor)
+        create_services_schema(self.cursor)
+        self.conn.commit()
+
+    def invalidate_tables(self, *tables):
+        """Bump table versions after a write so cached getters recompute"""
+        self.query_cache.bump(*tables)
+
+    def close(self):
+        self.conn.close()
+
+
+class CoreService:
+    """Base for the core services: work through a ShopDatabase's repositories"""
+
+    def __init__(self, db):
+        self.db = db
+
+    @property
+    def cursor(self):
+        return self.db.cursor
+
+    @property
+    def query_cache(self):
+        return self.db.query_cache
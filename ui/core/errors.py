@@ -0,0 +1,22 @@
+class CoreError(Exception):
+    """Base class for business-rule failures raised by the core services"""
+
+
+class ValidationError(CoreError):
+    """Input that can never succeed as given (missing fields, bad quantities)"""
+
+
+class NotFoundError(CoreError):
+    """A product, service or booking that doesn't exist"""
+
+
+class InsufficientStockError(ValidationError):
+    """Not enough stock on hand for a sale"""
+
+    def __init__(self, product_id, product_name, available, requested):
+        self.product_id = product_id
+        self.product_name = product_name
+        self.available = available
+        self.requested = requested
+        super().__init__(f"Insufficient stock for {product_name}. "
+                         f"Available: {available}, Requested: {requested}")
@@ -0,0 +1,269 @@
+import csv
+import itertools
+import os
+import time
+from collections import namedtuple
+
+from .database import CoreService
+from .errors import ValidationError
+
+
+IMPORT_CHUNK_SIZE = 1000
+
+# Header spellings accepted for each field, compared lower-case without spaces, '_' or '-'
+COLUMN_ALIASES = {
+    'product_id': ('productid', 'id', 'sku', 'code', 'productcode', 'itemcode'),
+    'name': ('name', 'productname', 'item', 'itemname', 'description'),
+    'price': ('price', 'unitprice', 'srp', 'retailprice'),
+    'stock': ('stock', 'quantity', 'qty', 'onhand', 'stocklevel'),
+    'category': ('category', 'type'),
+    'barcode': ('barcode', 'upc', 'ean', 'gtin'),
+}
+REQUIRED_COLUMNS = ('product_id', 'name', 'price')
+
+ImportChange = namedtuple('ImportChange', 'line product_id action field old new')
+ImportRejection = namedtuple('ImportRejection', 'line product_id message')
+
+
+def read_rows(path):
+    """Stream (line number, list of cell values) from a .csv or .xlsx file, header first"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.xlsx':
+        try:
+            import openpyxl
+        except ImportError:
+            raise ValidationError("Importing .xlsx files needs openpyxl (pip install openpyxl); "
+                                  "save the sheet as CSV instead")
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            for line, values in enumerate(workbook.active.iter_rows(values_only=True), start=1):
+                yield line, ['' if value is None else value for value in values]
+        finally:
+            workbook.close()
+    else:
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for line, values in enumerate(csv.reader(f), start=1):
+                yield line, values
+
+
+def map_columns(header):
+    """Get {field: column index} from a header row; raises ValidationError for missing columns"""
+    columns = {}
+    for index, title in enumerate(header):
+        key = str(title).strip().lower().replace(' ', '').replace('_', '').replace('-', '')
+        for field, aliases in COLUMN_ALIASES.items():
+            if key in aliases and field not in columns:
+                columns[field] = index
+    missing = [field for field in REQUIRED_COLUMNS if field not in columns]
+    if missing:
+        raise ValidationError(f"Missing column(s): {', '.join(missing)}. "
+                              f"Expected headers such as Product ID, Name, Price, Stock, Category")
+    return columns
+
+
+class ImportReport:
+    """What an import did (or, for a dry run, would do)"""
+
+    def __init__(self, path, dry_run):
+        self.path = path
+        self.dry_run = dry_run
+        self.added = 0
+        self.updated = 0
+        self.restored = 0
+        self.unchanged = 0
+        self.changes = []
+        self.errors = []
+        self.seconds = 0.0
+
+    @property
+    def rows_read(self):
+        return self.added + self.updated + self.restored + self.unchanged + len(self.errors)
+
+    def summary(self):
+        text = (f"{self.rows_read:,} rows read: {self.added:,} new, {self.updated:,} updated, "
+                f"{self.restored:,} restored from archive, {self.unchanged:,} unchanged, "
+                f"{len(self.errors):,} rejected")
+        if not self.dry_run:
+            text += f" in {self.seconds:.2f} s ({self.rows_read / max(self.seconds, 1e-9):,.0f} rows/s)"
+        return text
+
+    def write_csv(self, path):
+        """Write the field-by-field diff and the rejected rows as CSV"""
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Line', 'Product ID', 'Action', 'Field', 'Old Value', 'New Value'])
+            writer.writerows(self.changes)
+            writer.writerows((error.line, error.product_id, 'rejected', '', '', error.message)
+                             for error in self.errors)
+
+
+class ProductImporter(CoreService):
+    """Bulk product import and price-list updates from CSV or XLSX.
+
+    The file is streamed in chunks. Each chunk is validated in one pass, diffed
+    against the products it names (one query), and written in one transaction:
+    an executemany upsert plus one ledger movement per stock change. Stock and
+    category columns are optional, so a supplier price list only updates prices.
+    """
+
+    def import_file(self, path, dry_run=False, chunk_size=IMPORT_CHUNK_SIZE):
+        """Import products from path; returns an ImportReport. dry_run only reports."""
+        start = time.perf_counter()
+        report = ImportReport(path, dry_run)
+        rows = read_rows(path)
+        header = next(rows, None)
+        if header is None:
+            raise ValidationError("The file is empty")
+        columns = map_columns(header[1])
+        seen = {}
+        seen_barcodes = {}
+        source = os.path.basename(path)
+
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            valid = self._validate(chunk, columns, seen, seen_barcodes, report)
+            self._apply(valid, source, dry_run, report)
+
+        if not dry_run and report.changes:
+            self.db.invalidate_tables('products', 'stock_movements')
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _validate(self, chunk, columns, seen, seen_barcodes, report):
+        """Check a chunk against the Add Product rules; returns (line, product dict) for good rows"""
+        def cell(values, field):
+            index = columns.get(field)
+            if index is None or index >= len(values):
+                return ''
+            return str(values[index]).strip()
+
+        # Barcodes are unique across all products, archived ones included
+        barcodes = [cell(values, 'barcode') for _, values in chunk]
+        owners = self.db.product_repo.get_barcode_owners([code for code in barcodes if code])
+
+        valid = []
+        for line, values in chunk:
+            if not any(str(value).strip() for value in values):
+                continue
+            product_id = cell(values, 'product_id')
+            name = cell(values, 'name')
+            stock_text = cell(values, 'stock')
+            barcode = cell(values, 'barcode') or None
+            try:
+                if not product_id:
+                    raise ValueError("Product ID is required!")
+                if not name:
+                    raise ValueError("Product name is required!")
+                if product_id in seen:
+                    raise ValueError(f"Product ID already appears on line {seen[product_id]}")
+                if barcode in seen_barcodes:
+                    raise ValueError(f"Barcode already appears on line {seen_barcodes[barcode]}")
+                if owners.get(barcode, product_id) != product_id:
+                    raise ValueError(f"Barcode {barcode} already belongs to {owners[barcode]}")
+                try:
+                    price = round(float(cell(values, 'price').replace(',', '')), 2)
+                except ValueError:
+                    raise ValueError("Invalid price value!")
+                if price < 0:
+                    raise ValueError("Price cannot be negative!")
+                stock = None
+                if stock_text:
+                    try:
+                        stock = int(float(stock_text.replace(',', '')))
+                    except ValueError:
+                        raise ValueError("Invalid stock value!")
+                    if stock < 0:
+                        raise ValueError("Stock cannot be negative!")
+            except ValueError as e:
+                report.errors.append(ImportRejection(line, product_id, str(e)))
+                continue
+
+            seen[product_id] = line
+            if barcode:
+                seen_barcodes[barcode] = line
+            valid.append((line, {'product_id': product_id, 'name': name, 'price': price, 'stock': stock,
+                                 'category': cell(values, 'category') or None, 'barcode': barcode}))
+        return valid
+
+    def _apply(self, valid, source, dry_run, report):
+        if not valid:
+            return
+        if dry_run:
+            self._diff(valid, source, report)
+            return
+        # Diff against the products as they are inside the write lock, so a sale
+        # committed since the chunk was read can't put the ledger out of step
+        # (and a barcode taken since can't fail the upsert)
+        self.cursor.execute('BEGIN IMMEDIATE')
+        try:
+            upserts, movements = self._diff(self._reject_taken_barcodes(valid, report), source, report)
+            if upserts:
+                self.db.product_repo.upsert_many(upserts)
+                self.db.movement_repo.record_many(movements)
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+
+    def _reject_taken_barcodes(self, valid, report):
+        """Reject rows whose barcode already belongs to another product; returns the rest"""
+        barcodes = [product['barcode'] for _, product in valid if product['barcode']]
+        owners = self.db.product_repo.get_barcode_owners(barcodes) if barcodes else {}
+        kept = []
+        for line, product in valid:
+            owner = owners.get(product['barcode'])
+            if owner is not None and owner != product['product_id']:
+                report.errors.append(ImportRejection(line, product['product_id'],
+                                                     f"Barcode {product['barcode']} already belongs to {owner}"))
+            else:
+                kept.append((line, product))
+        return kept
+
+    def _diff(self, valid, source, report):
+        """Count and list the chunk's changes; returns (upserts, ledger movements)"""
+        upserts = []
+        movements = []
+        if not valid:
+            return upserts, movements
+        existing = self.db.product_repo.get_many_by_code([product['product_id'] for _, product in valid])
+        for line, product in valid:
+            code = product['product_id']
+            current = existing.get(code)
+            if current is None:
+                report.added += 1
+                report.changes.append(ImportChange(line, code, 'added', '', '', product['name']))
+                stock = product['stock'] or 0
+                if stock:
+                    movements.append((code, product['name'], 'IN', stock, 'INITIAL', 'INITIAL',
+                                      f"Initial stock from import of {source}"))
+                upserts.append(product)
+                continue
+
+            row, is_active, barcode = current
+            changed = [(field, old, new) for field, old, new in (
+                ('name', row.name, product['name']),
+                ('price', row.price, product['price']),
+                ('stock', row.stock, product['stock']),
+                ('category', row.category, product['category']),
+                ('barcode', barcode, product['barcode']),
+            ) if new is not None and new != old]
+            if not changed and is_active:
+                report.unchanged += 1
+                continue
+
+            if is_active:
+                report.updated += 1
+            else:
+                report.restored += 1
+                report.changes.append(ImportChange(line, code, 'restored', 'is_active', 0, 1))
+            report.changes.extend(ImportChange(line, code, 'updated', field, old, new)
+                                  for field, old, new in changed)
+            if product['stock'] is not None and product['stock'] != row.stock:
+                difference = product['stock'] - row.stock
+                movements.append((code, product['name'], 'IN' if difference > 0 else 'OUT', abs(difference),
+                                  'IMPORT', 'IMPORT',
+                                  f"Stock set from {row.stock} to {product['stock']} by import of {source}"))
+            upserts.append(product)
+        return upserts, movements
@@ -0,0 +1,235 @@
+import itertools
+import os
+from collections import OrderedDict, namedtuple
+from datetime import datetime
+
+from .database import CoreService
+from .errors import ValidationError, NotFoundError
+
+
+StockChange = namedtuple('StockChange', 'product previous_stock new_stock')
+StockReceipt = namedtuple('StockReceipt', 'reference lines units')
+
+_receiving_sequence = itertools.count(1)
+
+
+def new_receiving_id(now=None):
+    """Get a goods-in reference; process id and sequence keep same-second deliveries unique"""
+    now = now or datetime.now()
+    return f"RCV{now.strftime('%Y%m%d%H%M%S')}{os.getpid() % 1000:03d}{next(_receiving_sequence) % 100000:05d}"
+
+
+def check_quantity(quantity):
+    """Get quantity as a positive int; raises ValidationError otherwise"""
+    try:
+        quantity = int(quantity)
+    except (TypeError, ValueError):
+        raise ValidationError("Please enter a valid quantity!")
+    if quantity <= 0:
+        raise ValidationError("Quantity must be greater than 0!")
+    return quantity
+
+
+class InventoryService(CoreService):
+    """Stock changes outside of sales"""
+
+    def add_product(self, name, price, stock, category, product_id):
+        """Add a product with its opening stock and log an INITIAL movement; returns the ProductRow"""
+        product_id = str(product_id).strip()
+        if not product_id:
+            raise ValidationError("Product ID is required!")
+        if stock < 0:
+            raise ValidationError("Stock cannot be negative!")
+
+        self.cursor.execute('BEGIN IMMEDIATE')
+        try:
+            if self.db.product_repo.code_exists(product_id):
+                if self.db.product_repo.is_archived_code(product_id):
+                    raise ValidationError("Product ID belongs to a deleted product whose history is "
+                                          "still kept! Please use a unique Product ID.")
+                raise ValidationError("Product ID already exists! Please use a unique Product ID.")
+            internal_id = self.db.product_repo.insert(name, price, stock, category, product_id)
+            if stock > 0:
+                self.db.movement_repo.record(product_id, name, 'IN', stock, 'INITIAL',
+                                             'Initial stock when product was added to inventory',
+                                             reason='INITIAL')
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+
+        self.db.invalidate_tables('products', 'stock_movements')
+        return self.db.product_repo.get(internal_id)
+
+    def add_stock(self, internal_id, quantity, notes=None):
+        """Add units to a product and log an IN movement; returns a StockChange"""
+        if quantity <= 0:
+            raise ValidationError("Quantity must be greater than 0!")
+
+        product = self.db.product_repo.get(internal_id)
+        if product is None:
+            raise NotFoundError(f"Product {internal_id} not found")
+
+        try:
+            self.db.product_repo.adjust_stock(internal_id, quantity)
+            self.db.movement_repo.record(product.product_id, product.name, 'IN', quantity,
+                                         f"STOCK_ADD_{internal_id}",
+                                         notes or f"Stock addition: {quantity} units added",
+                                         reason='RESTOCK')
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+
+        self.db.invalidate_tables('products', 'stock_movements')
+        return StockChange(product, product.stock, product.stock + quantity)
+
+    def receive_stock(self, quantities, reference=None, notes=None):
+        """Add a delivery ({product ID code: units}) in one transaction; returns a StockReceipt.
+
+        Stock goes up relatively (stock = stock + n), so sales made while the
+        delivery was being scanned aren't overwritten.
+        """
+        quantities = {code: check_quantity(quantity) for code, quantity in quantities.items()}
+        if not quantities:
+            raise ValidationError("Nothing has been scanned!")
+        reference = reference or new_receiving_id()
+
+        self.cursor.execute('BEGIN IMMEDIATE')
+        try:
+            products = self.db.product_repo.get_many_by_code(quantities)
+            missing = [code for code in quantities if not products.get(code, (None, 0))[1]]
+            if missing:
+                raise NotFoundError(f"Product(s) not found: {', '.join(missing)}")
+            self.db.product_repo.add_stock_many([(quantity, code) for code, quantity in quantities.items()])
+            self.db.movement_repo.record_many([
+                (code, products[code][0].name, 'IN', quantity, reference, 'RESTOCK',
+                 notes or f"Goods received: {quantity} units ({reference})")
+                for code, quantity in quantities.items()])
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+
+        self.db.invalidate_tables('products', 'stock_movements')
+        return StockReceipt(reference, len(quantities), sum(quantities.values()))
+
+    def edit_product(self, internal_id, name, price, category, product_id, stock_change=0):
+        """Update a product's details and move its stock by stock_change; returns a StockChange.
+
+        The stock change is relative (stock = stock + n) and its ADJUSTMENT
+        movement is worked out in the same transaction, so a sale made while
+        the product was being edited isn't overwritten.
+        """
+        product_id = str(product_id).strip()
+        if not product_id:
+            raise ValidationError("Product ID is required!")
+
+        self.cursor.execute('BEGIN IMMEDIATE')
+        try:
+            product = self.db.product_repo.get(internal_id)
+            if product is None:
+                raise NotFoundError(f"Product {internal_id} not found")
+            new_stock = product.stock + stock_change
+            if new_stock < 0:
+                raise ValidationError(f"Only {product.stock} of {product.name} left in stock, "
+                                      f"can't take away {-stock_change}")
+            if product_id != product.product_id and self.db.product_repo.code_exists(product_id):
+                raise ValidationError("Product ID already exists! Please use a unique Product ID.")
+
+            self.db.product_repo.update_details(internal_id, name, price, category, product_id)
+            if product_id != product.product_id:
+                # The ledger is keyed by product ID code; keep the history with the product
+                self.db.movement_repo.rename_product(product.product_id, product_id)
+            if stock_change:
+                self.db.product_repo.adjust_stock(internal_id, stock_change)
+                self.db.movement_repo.record(
+                    product_id, name, 'IN' if stock_change > 0 else 'OUT', abs(stock_change),
+                    f"EDIT_{internal_id}",
+                    f"Stock adjusted from {product.stock} to {new_stock} (difference: {stock_change:+d})",
+                    reason='ADJUSTMENT')
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+
+        self.db.invalidate_tables('products', 'stock_movements')
+        return StockChange(product, product.stock, new_stock)
+
+    def archive_product(self, internal_id):
+        """Delete a product from the shop's lists, keeping its sales and stock history; returns the product"""
+        product = self.db.product_repo.get(internal_id)
+        if product is None:
+            raise NotFoundError(f"Product {internal_id} not found")
+
+        try:
+            self.db.product_repo.archive(internal_id)
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+
+        self.db.invalidate_tables('products')
+        return product
+
+
+class ReceivingSession:
+    """A delivery being scanned in.
+
+    Scans only build up quantities in memory (one product lookup per new
+    barcode or ID code); lines are keyed by the product's ID code, so a
+    product scanned by barcode and by ID is one line. commit() sends the whole delivery to InventoryService.receive_stock.
+    product_repo and inventory may be local or api_client proxies.
+    """
+
+    def __init__(self, product_repo, inventory, reference=None):
+        self.product_repo = product_repo
+        self.inventory = inventory
+        self.reference = reference or new_receiving_id()
+        # product ID code -> [ProductRow, units], in scan order
+        self.lines = OrderedDict()
+        # scanned code (barcode or product ID) -> product ID code
+        self.scanned_codes = {}
+
+    def scan(self, code, quantity=1):
+        """Add units of a product by barcode or ID code; returns (product, units now on this delivery)"""
+        code = str(code).strip()
+        quantity = check_quantity(quantity)
+        line = self.lines.get(self.scanned_codes.get(code))
+        if line is None:
+            product = self.product_repo.get_by_scan_code(code)
+            if product is None:
+                raise NotFoundError(f"No product with barcode or ID {code}")
+            self.scanned_codes[code] = product.product_id
+            line = self.lines.setdefault(product.product_id, [product, 0])
+        line[1] += quantity
+        return line[0], line[1]
+
+    def set_quantity(self, code, quantity):
+        """Replace a scanned product's units (0 removes it); code is the product ID code"""
+        if code not in self.lines:
+            raise NotFoundError(f"{code} hasn't been scanned")
+        if int(quantity) == 0:
+            del self.lines[code]
+        else:
+            self.lines[code][1] = check_quantity(quantity)
+
+    def remove(self, code):
+        """Drop a scanned product; code is the product ID code"""
+        self.lines.pop(code, None)
+
+    @property
+    def total_units(self):
+        return sum(units for _, units in self.lines.values())
+
+    def __len__(self):
+        return len(self.lines)
+
+    def commit(self, notes=None):
+        """Receive everything scanned in one transaction; returns a StockReceipt"""
+        receipt = self.inventory.receive_stock({code: units for code, (_, units) in self.lines.items()},
+                                               self.reference, notes)
+        self.lines.clear()
+        self.scanned_codes.clear()
+        self.reference = new_receiving_id()
+        return receipt
@@ -0,0 +1,265 @@
+import json
+import os
+import sqlite3
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+
+from .errors import CoreError
+
+
+JOURNAL_PATH = 'checkout_journal.bin'
+
+# Each record: payload length and CRC32 (big-endian uint32s), then the JSON payload
+_HEADER = struct.Struct('>II')
+
+# Errors that mean "the database can't be reached right now" rather than "this sale is wrong"
+_OUTAGE_MESSAGES = ('locked', 'busy', 'unable to open', 'disk i/o', 'readonly', 'no such table')
+
+
+def is_outage(error):
+    """Check whether an exception means the database (or API server) is temporarily unavailable"""
+    if isinstance(error, sqlite3.OperationalError):
+        message = str(error).lower()
+        return any(text in message for text in _OUTAGE_MESSAGES)
+    if isinstance(error, sqlite3.DatabaseError) and not isinstance(error, sqlite3.IntegrityError):
+        return True
+    # api_client.RemoteError: the server is down or unreachable
+    return type(error).__name__ == 'RemoteError'
+
+
+class CheckoutJournal:
+    """Append-only, fsync'd log of checkout intents.
+
+    The POS appends an intent before touching the database, and a marker once
+    the sale is applied or rejected. Intents without a marker are pending and
+    are replayed by JournalReplayer; replay is keyed by transaction ID, so an
+    intent that did reach the database before a crash is not applied twice.
+    A torn record at the end of the file (power loss mid-write) is dropped.
+    Rejected intents are also copied to a JSON-lines file next to the journal
+    (path + '.rejected'), so compacting the journal doesn't lose them.
+    """
+
+    COMPACT_BYTES = 1024 * 1024
+
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.pending = OrderedDict()
+        # Intents the till is applying itself right now; the replayer leaves them alone
+        self.in_flight = set()
+        self.rejected_path = path + '.rejected'
+        self.rejected = []
+        self._rejected_ids = set()
+        self._load_rejected()
+        self._load()
+        self.file = open(self.path, 'ab')
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        good_offset = 0
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        offset = 0
+        while offset + _HEADER.size <= len(data):
+            length, checksum = _HEADER.unpack_from(data, offset)
+            payload = data[offset + _HEADER.size:offset + _HEADER.size + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            self._apply_record(json.loads(payload.decode('utf-8')))
+            offset += _HEADER.size + length
+            good_offset = offset
+
+        if good_offset < len(data):
+            print(f"Checkout journal: dropping {len(data) - good_offset} bytes of incomplete record")
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_offset)
+
+    def _load_rejected(self):
+        if not os.path.exists(self.rejected_path):
+            return
+        with open(self.rejected_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn last line
+                transaction_id = entry['intent']['transaction_id']
+                if transaction_id not in self._rejected_ids:
+                    self._rejected_ids.add(transaction_id)
+                    self.rejected.append((entry['intent'], entry.get('reason', '')))
+
+    def _keep_rejected(self, intent, reason):
+        # Written before the journal's 'rejected' marker, so a crash in between only means a re-reject
+        transaction_id = intent['transaction_id']
+        if transaction_id in self._rejected_ids:
+            return
+        line = json.dumps({'intent': intent, 'reason': reason}, separators=(',', ':'))
+        with open(self.rejected_path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._rejected_ids.add(transaction_id)
+        self.rejected.append((intent, reason))
+
+    def _apply_record(self, record):
+        kind = record.get('type')
+        if kind == 'intent':
+            self.pending[record['transaction_id']] = record
+        elif kind == 'applied':
+            self.pending.pop(record['transaction_id'], None)
+        elif kind == 'rejected':
+            intent = self.pending.pop(record['transaction_id'], None)
+            if intent is not None:
+                # Journals written before the .rejected file existed only have the marker
+                self._keep_rejected(intent, record.get('reason', ''))
+
+    def _append(self, record):
+        payload = json.dumps(record, separators=(',', ':')).encode('utf-8')
+        self.file.write(_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self._apply_record(record)
+
+    def append_intent(self, transaction_id, cart_items, payment_method, sale_date, in_flight=False, cart_id=None):
+        """Durably record a checkout before it is applied.
+
+        in_flight keeps the replayer off it until mark_applied, mark_rejected or release.
+        cart_id is the cart whose stock reservations the replay releases.
+        """
+        with self.lock:
+            self._append({'type': 'intent', 'transaction_id': transaction_id, 'items': cart_items,
+                          'payment_method': payment_method, 'sale_date': sale_date, 'cart_id': cart_id})
+            if in_flight:
+                self.in_flight.add(transaction_id)
+
+    def release(self, transaction_id):
+        """Hand an in-flight intent over to the replayer"""
+        with self.lock:
+            self.in_flight.discard(transaction_id)
+
+    def mark_applied(self, transaction_id):
+        with self.lock:
+            self._append({'type': 'applied', 'transaction_id': transaction_id})
+            self.in_flight.discard(transaction_id)
+            self._compact_if_drained()
+
+    def mark_rejected(self, transaction_id, reason):
+        with self.lock:
+            intent = self.pending.get(transaction_id)
+            if intent is not None:
+                self._keep_rejected(intent, reason)
+            self._append({'type': 'rejected', 'transaction_id': transaction_id, 'reason': reason})
+            self.in_flight.discard(transaction_id)
+            self._compact_if_drained()
+
+    def pending_intents(self):
+        """Get the intents still waiting to be applied, oldest first"""
+        with self.lock:
+            return [intent for transaction_id, intent in self.pending.items()
+                    if transaction_id not in self.in_flight]
+
+    def pending_count(self):
+        with self.lock:
+            return len(self.pending) - len(self.in_flight)
+
+    def _compact_if_drained(self):
+        # With nothing pending every record is history (rejections live in the .rejected file);
+        # start the file over once it's big
+        if self.pending or self.file.tell() < self.COMPACT_BYTES:
+            return
+        self.file.truncate(0)
+        self.file.seek(0)
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+class JournalReplayer:
+    """Background thread that applies pending journal intents to the database.
+
+    checkout_factory is called on the replayer's own thread and returns an
+    object with replay_sale() (a CheckoutService or an api_client proxy);
+    it's called again after an outage, since sqlite connections and HTTP
+    connections can't be shared with the UI thread.
+    """
+
+    RETRY_SECONDS = 2.0
+
+    def __init__(self, journal, checkout_factory):
+        self.journal = journal
+        self.checkout_factory = checkout_factory
+        self.online = True
+        self.last_error = None
+        self.wakeup = threading.Event()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name='checkout-replayer', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+
+    def notify(self):
+        """Wake the replayer now (a sale was just queued)"""
+        self.wakeup.set()
+
+    def _run(self):
+        checkout = None
+        while self.running:
+            self.wakeup.wait(self.RETRY_SECONDS)
+            self.wakeup.clear()
+            if not self.journal.pending_count():
+                continue
+            try:
+                if checkout is None:
+                    checkout = self.checkout_factory()
+                applied = self.drain(checkout)
+                if not self.online:
+                    print(f"Checkout journal: database reachable again, replayed {applied} queued sale(s)")
+                self.online = True
+                self.last_error = None
+            except Exception as e:
+                if not is_outage(e):
+                    print(f"Checkout journal: replay error: {e}")
+                self.online = False
+                self.last_error = str(e)
+                checkout = None
+
+    def drain(self, checkout):
+        """Apply every pending intent; returns how many were applied. Outages propagate."""
+        applied = 0
+        for intent in self.journal.pending_intents():
+            transaction_id = intent['transaction_id']
+            try:
+                # Intents journaled before carts were recorded have no cart_id
+                extra = {'cart_id': intent['cart_id']} if intent.get('cart_id') else {}
+                checkout.replay_sale(transaction_id, intent['items'], intent['payment_method'], intent['sale_date'],
+                                     **extra)
+            except CoreError as e:
+                if is_outage(e):
+                    raise
+                # The sale can never apply (e.g. the product was deleted); keep it on record
+                print(f"Checkout journal: rejected {transaction_id}: {e}")
+                self.journal.mark_rejected(transaction_id, str(e))
+                continue
+            except Exception as e:
+                if is_outage(e):
+                    raise
+                # Anything else (IntegrityError, a malformed intent) would fail the same way on
+                # every retry and hold up the sales queued behind it
+                print(f"Checkout journal: rejected {transaction_id}: {type(e).__name__}: {e}")
+                self.journal.mark_rejected(transaction_id, f"{type(e).__name__}: {e}")
+                continue
+            self.journal.mark_applied(transaction_id)
+            applied += 1
+        return applied
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+
+from query_cache import cached_query
+
+from .database import CoreService
+from .errors import ValidationError
+
+
+# Checkpoint a product once this many movements have piled up since its last one
+CHECKPOINT_EVERY = 200
+
+
+def end_of_day(as_of):
+    """Read a bare 'YYYY-MM-DD' as the last second of that day"""
+    return f"{as_of} 23:59:59" if len(as_of) == 10 else as_of
+
+
+def to_utc(local_time):
+    """Convert a local 'YYYY-MM-DD HH:MM:SS' to UTC.
+
+    movement_date is filled in by CURRENT_TIMESTAMP, which sqlite gives in UTC,
+    while callers (and sales.sale_date) count days in local time.
+    """
+    try:
+        moment = datetime.strptime(local_time.strip()[:19], '%Y-%m-%d %H:%M:%S')
+    except (AttributeError, ValueError):
+        raise ValidationError(f"Invalid time {local_time!r}, expected YYYY-MM-DD or YYYY-MM-DD HH:MM:SS")
+    return moment.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class StockLedger(CoreService):
+    """Stock derived from the append-only stock_movements ledger.
+
+    products.stock stays the O(1) snapshot the pages read; the ledger answers
+    "stock as of" and checks the snapshot. Queries start from the nearest
+    checkpoint, so they read a bounded number of movements instead of a
+    product's whole history.
+    """
+
+    def stock_as_of(self, product_id, as_of):
+        """Get a product's stock at a local 'YYYY-MM-DD HH:MM:SS' time (a bare date means the end of that day)"""
+        return self.db.movement_repo.product_stock_on_date(product_id, to_utc(end_of_day(as_of)))
+
+    @cached_query('stock_movements', 'products')
+    def stock_on_date(self, as_of):
+        """Get {product_id: stock} for every product at a local time (a bare date means the end of that day)"""
+        return dict(self.db.movement_repo.stock_on_date(to_utc(end_of_day(as_of))))
+
+    @cached_query('stock_movements', 'products', per_day=True)
+    def stock_series(self, product_id, days=365, end_date=None):
+        """Get [(date, stock at the end of that day)] for the days up to end_date (default today)"""
+        end = datetime.strptime(end_date, '%Y-%m-%d') if end_date else datetime.now()
+        end = end.replace(hour=0, minute=0, second=0, microsecond=0)
+        start = end - timedelta(days=days - 1)
+        before = to_utc((start - timedelta(days=1)).strftime('%Y-%m-%d 23:59:59'))
+
+        opening = self.db.movement_repo.product_stock_on_date(product_id, before)
+        if opening is None:
+            return []
+        # One indexed range scan; the window sum turns daily changes into running totals
+        changes = dict(self.db.movement_repo.list_cumulative_changes(
+            product_id, before, to_utc(end.strftime('%Y-%m-%d 23:59:59'))))
+
+        series = []
+        running = 0
+        for offset in range(days):
+            day = (start + timedelta(days=offset)).strftime('%Y-%m-%d')
+            running = changes.get(day, running)
+            series.append((day, opening + running))
+        return series
+
+    def reconcile(self, fix=False):
+        """Get the products whose snapshot disagrees with the ledger; with fix, reset them to the ledger"""
+        discrepancies = self.db.movement_repo.list_discrepancies()
+        if fix and discrepancies:
+            try:
+                self.db.movement_repo.sync_snapshots()
+                self.db.conn.commit()
+            except BaseException:
+                self.db.conn.rollback()
+                raise
+            self.db.invalidate_tables('products')
+        return discrepancies
+
+    def checkpoint(self, min_movements=CHECKPOINT_EVERY):
+        """Checkpoint products with enough new movements; returns how many were checkpointed"""
+        try:
+            count = self.db.movement_repo.add_checkpoints(min_movements)
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+        return count
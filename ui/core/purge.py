@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from .database import ShopDatabase
+
+
+PURGE_FLAG = '--purge-archived'
+PURGE_ENV_VAR = 'BIKESHOP_PURGE_ARCHIVED_DAYS'
+
+
+def requested_purge_days(argv=None):
+    """Get N from --purge-archived N or BIKESHOP_PURGE_ARCHIVED_DAYS, or None when purging is off"""
+    argv = sys.argv if argv is None else argv
+    value = os.environ.get(PURGE_ENV_VAR)
+    if PURGE_FLAG in argv:
+        index = argv.index(PURGE_FLAG)
+        value = argv[index + 1] if index + 1 < len(argv) else None
+    try:
+        return int(value) if value not in (None, '') else None
+    except ValueError:
+        print(f"Ignoring {PURGE_FLAG} {value}: expected a number of days")
+        return None
+
+
+class ArchivePurger:
+    """Background thread that removes the history of products archived long ago.
+
+    Work is done in small batches, each its own short transaction followed by
+    a pause, so the write lock is never held for long and tills checking out
+    in the meantime only wait for one batch.
+    """
+
+    BATCH_SIZE = 500
+    PAUSE_SECONDS = 0.2
+
+    def __init__(self, db_path, older_than_days, query_cache=None,
+                 batch_size=BATCH_SIZE, pause=PAUSE_SECONDS):
+        self.db_path = db_path
+        self.older_than_days = older_than_days
+        self.query_cache = query_cache
+        self.batch_size = batch_size
+        self.pause = pause
+        self.running = False
+        self.thread = None
+        self.totals = {'sales': 0, 'stock_movements': 0, 'products': 0}
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name='archive-purge', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+
+    def _run(self):
+        db = ShopDatabase(self.db_path, self.query_cache)
+        try:
+            self.purge(db)
+            print(f"Archive purge: removed {self.totals['sales']} sale lines, "
+                  f"{self.totals['stock_movements']} stock movements and {self.totals['products']} products")
+        except sqlite3.Error as e:
+            print(f"Archive purge stopped: {e}")
+        finally:
+            db.close()
+
+    def purge(self, db):
+        """Delete archived products' sales, then movements, then the products themselves"""
+        # archived_date is filled in by CURRENT_TIMESTAMP, which is UTC
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.older_than_days)).strftime('%Y-%m-%d %H:%M:%S')
+        # Sale lines take their amount off (or delete) their transaction header as they go
+        steps = (('sales', ('sales', 'transactions'), db.sales_repo.purge_archived_batch),
+                 ('stock_movements', ('stock_movements',), db.movement_repo.purge_archived_batch))
+        for total, tables, purge_batch in steps:
+            while self.running:
+                deleted = self._batch(db, lambda: purge_batch(cutoff, self.batch_size))
+                self.totals[total] += deleted
+                db.invalidate_tables(*tables)
+                if deleted < self.batch_size:
+                    break
+                time.sleep(self.pause)
+
+        if self.running:
+            self.totals['products'] += self._batch(db, lambda: db.product_repo.purge_archived(cutoff))
+            db.invalidate_tables('products')
+
+    def _batch(self, db, delete):
+        # A busy database isn't an error here: back off and try the batch again
+        while self.running:
+            try:
+                deleted = delete()
+                db.conn.commit()
+                return deleted
+            except sqlite3.OperationalError as e:
+                db.conn.rollback()
+                if 'locked' not in str(e) and 'busy' not in str(e):
+                    raise
+                time.sleep(self.pause * 10)
+        return 0
+
+
+def start_purge_if_requested(db_path, query_cache=None, argv=None):
+    """Start an ArchivePurger when --purge-archived DAYS or BIKESHOP_PURGE_ARCHIVED_DAYS is set"""
+    days = requested_purge_days(argv)
+    if days is None:
+        return None
+    print(f"Archive purge: removing history of products archived more than {days} days ago")
+    return ArchivePurger(db_path, days, query_cache).start()
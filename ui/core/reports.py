@@ -0,0 +1,667 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+from query_cache import cached_query
+
+from .database import CoreService
+
+
+# Every statistics panel for one sale_date range, aggregated in SQL: (panel, key, count, amount)
+# rows, each panel cut to size; UNION ALL keeps no order, so rows are ranked within their panel
+FILTERED_STATISTICS = '''
+    SELECT panel, key, count, amount FROM (
+        SELECT 'trend' AS panel, {bucket} AS key, COALESCE(SUM(quantity), 0) AS count,
+               COALESCE(SUM(total), 0.0) AS amount, ROW_NUMBER() OVER (ORDER BY {bucket}) AS rank
+        FROM sales {where}
+        GROUP BY key HAVING key IS NOT NULL
+        UNION ALL
+        SELECT 'categories', product_category, NULL, COALESCE(SUM(total), 0.0),
+               ROW_NUMBER() OVER (ORDER BY SUM(total) DESC)
+        FROM sales {where}
+        GROUP BY product_category
+        UNION ALL
+        SELECT * FROM (
+            SELECT 'top_buyers', customer_name, COUNT(DISTINCT transaction_id), COALESCE(SUM(total), 0.0),
+                   ROW_NUMBER() OVER (ORDER BY SUM(total) DESC) AS rank
+            FROM sales {where}
+            GROUP BY customer_name HAVING customer_name != '' ORDER BY rank LIMIT ?)
+        UNION ALL
+        SELECT * FROM (
+            SELECT 'top_products', product_name, COALESCE(SUM(quantity), 0), COALESCE(SUM(total), 0.0),
+                   ROW_NUMBER() OVER (ORDER BY SUM(quantity) DESC) AS rank
+            FROM sales {where}
+            GROUP BY product_name HAVING product_name != '' ORDER BY rank LIMIT ?)
+    )
+    ORDER BY panel, rank
+'''
+
+
+class ShopReports(CoreService):
+    """Sales and stock aggregations behind the dashboard, statistics and sales pages"""
+
+    @cached_query('sales')
+    def get_total_sales_count(self):
+        """Get total number of sales transactions"""
+        self.cursor.execute('SELECT COUNT(*) FROM sales')
+        return self.cursor.fetchone()[0]
+
+    @cached_query('products')
+    def get_total_products(self):
+        self.cursor.execute('SELECT COUNT(*) FROM products WHERE is_active = 1')
+        return self.cursor.fetchone()[0]
+
+    @cached_query('sales')
+    def get_total_sales(self):
+        self.cursor.execute('SELECT SUM(total) FROM sales')
+        result = self.cursor.fetchone()[0]
+        return result if result else 0
+
+    @cached_query('products')
+    def get_total_stock_items(self):
+        """Get total stock items across all products"""
+        self.cursor.execute('SELECT SUM(stock) FROM products WHERE is_active = 1')
+        result = self.cursor.fetchone()[0]
+        return result if result else 0
+
+    def get_today_summary(self):
+        """Get today's sales summary"""
+        return self.get_day_summary(datetime.now().strftime('%Y-%m-%d'))
+
+    @cached_query('sales')
+    def get_day_summary(self, day):
+        """Get the sales summary for a single day (YYYY-MM-DD)"""
+        try:
+            # Sales count
+            self.cursor.execute('''
+                SELECT COUNT(DISTINCT transaction_id) as sales_count,
+                       SUM(quantity) as items_sold,
+                       SUM(total) as revenue
+                FROM sales 
+                WHERE DATE(sale_date) = ?
+            ''', (day,))
+            result = self.cursor.fetchone()
+            
+            return {
+                'sales_count': result[0] if result[0] else 0,
+                'items_sold': result[1] if result[1] else 0,
+                'revenue': result[2] if result[2] else 0.0
+            }
+        except Exception as e:
+            print(f"Error getting today's summary: {e}")
+            return {'sales_count': 0, 'items_sold': 0, 'revenue': 0.0}
+
+    @cached_query('sales', per_day=True)
+    def get_daily_sales_data(self):
+        """Get daily sales data for the last 30 days"""
+        try:
+            self.cursor.execute('''
+                SELECT 
+                    DATE(sale_date) as date,
+                    SUM(total) as revenue,
+                    SUM(quantity) as items_sold
+                FROM sales 
+                WHERE DATE(sale_date) >= DATE('now', '-30 days')
+                GROUP BY DATE(sale_date)
+                ORDER BY date
+            ''')
+            results = self.cursor.fetchall()
+            
+            # Format dates to be more readable (MM-DD)
+            formatted_results = []
+            for row in results:
+                date_obj = datetime.strptime(row[0], '%Y-%m-%d')
+                formatted_date = date_obj.strftime('%m-%d')
+                formatted_results.append((formatted_date, row[1], row[2]))
+            
+            return formatted_results
+        except Exception as e:
+            print(f"Error getting daily sales data: {e}")
+            return []
+
+    @cached_query('sales', per_day=True)
+    def get_weekly_sales_data(self):
+        """Get weekly sales data for the last 12 weeks"""
+        try:
+            self.cursor.execute('''
+                SELECT 
+                    strftime('%Y-W%W', sale_date) as week,
+                    SUM(total) as revenue,
+                    SUM(quantity) as items_sold
+                FROM sales 
+                WHERE DATE(sale_date) >= DATE('now', '-84 days')
+                GROUP BY week
+                ORDER BY week
+            ''')
+            results = self.cursor.fetchall()
+            
+            # Format week labels (W01, W02, etc.)
+            formatted_results = []
+            for row in results:
+                week_label = f"W{row[0].split('-W')[1]}"
+                formatted_results.append((week_label, row[1], row[2]))
+            
+            return formatted_results
+        except Exception as e:
+            print(f"Error getting weekly sales data: {e}")
+            return []
+
+    @cached_query('sales')
+    def get_yearly_sales_data(self):
+        """Get yearly sales data for the last 5 years"""
+        try:
+            self.cursor.execute('''
+                SELECT 
+                    strftime('%Y', sale_date) as year,
+                    SUM(total) as revenue,
+                    SUM(quantity) as items_sold
+                FROM sales 
+                GROUP BY year
+                ORDER BY year
+            ''')
+            return self.cursor.fetchall()
+        except Exception as e:
+            print(f"Error getting yearly sales data: {e}")
+            return []
+
+    @cached_query('sales')
+    def get_available_years(self):
+        """Get list of years that have sales data"""
+        try:
+            self.cursor.execute('''
+                SELECT DISTINCT strftime('%Y', sale_date) as year
+                FROM sales 
+                WHERE sale_date IS NOT NULL
+                ORDER BY year DESC
+            ''')
+            results = self.cursor.fetchall()
+            return [row[0] for row in results] if results else [str(datetime.now().year)]
+        except Exception as e:
+            print(f"Error getting available years: {e}")
+            return [str(datetime.now().year)]
+
+    @cached_query('sales')
+    def get_monthly_sales_data(self, year=None):
+        """Get monthly sales data for a specific year"""
+        try:
+            if year is None:
+                year = datetime.now().year
+            
+            self.cursor.execute('''
+                SELECT 
+                    strftime('%m', sale_date) as month,
+                    SUM(total) as revenue,
+                    SUM(quantity) as items_sold
+                FROM sales 
+                WHERE strftime('%Y', sale_date) = ?
+                GROUP BY month
+                ORDER BY month
+            ''', (str(year),))
+            
+            results = self.cursor.fetchall()
+            
+            # Format month numbers to month names
+            month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
+                          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+            formatted_results = []
+            for row in results:
+                month_index = int(row[0]) - 1
+                month_name = month_names[month_index]
+                formatted_results.append((month_name, row[1], row[2]))
+            
+            return formatted_results
+        except Exception as e:
+            print(f"Error getting monthly sales data: {e}")
+            return []
+
+    @cached_query('sales')
+    def get_specific_month_sales_data(self, month_name, year=None):
+        """Get daily sales data for a specific month and year"""
+        try:
+            if year is None:
+                year = datetime.now().year
+            
+            # Map month names to numbers
+            month_map = {
+                'January': '01', 'February': '02', 'March': '03', 'April': '04',
+                'May': '05', 'June': '06', 'July': '07', 'August': '08',
+                'September': '09', 'October': '10', 'November': '11', 'December': '12'
+            }
+            
+            month_num = month_map.get(month_name)
+            if not month_num:
+                return []
+            
+            self.cursor.execute('''
+                SELECT 
+                    strftime('%d', sale_date) as day,
+                    SUM(total) as revenue,
+                    SUM(quantity) as items_sold
+                FROM sales 
+                WHERE strftime('%Y', sale_date) = ? AND strftime('%m', sale_date) = ?
+                GROUP BY day
+                ORDER BY day
+            ''', (str(year), month_num))
+            
+            results = self.cursor.fetchall()
+            
+            # Format day labels
+            formatted_results = []
+            for row in results:
+                day_label = f"Day {int(row[0])}"
+                formatted_results.append((day_label, row[1], row[2]))
+            
+            return formatted_results
+        except Exception as e:
+            print(f"Error getting specific month sales data: {e}")
+            return []
+
+    @cached_query('sales')
+    def get_category_sales_data(self):
+        """Get sales data by category"""
+        self.cursor.execute('''
+            SELECT product_category, SUM(total) as total_sales
+            FROM sales 
+            GROUP BY product_category
+            ORDER BY total_sales DESC
+        ''')
+        return self.cursor.fetchall()
+
+    @cached_query('sales')
+    def get_top_buyers(self, limit=10):
+        """Get top buyers by total purchase amount"""
+        try:
+            self.cursor.execute('''
+                SELECT 
+                    customer_name,
+                    COUNT(DISTINCT transaction_id) as purchase_count,
+                    SUM(total) as total_amount
+                FROM sales 
+                WHERE customer_name IS NOT NULL AND customer_name != ''
+                GROUP BY customer_name
+                ORDER BY total_amount DESC
+                LIMIT ?
+            ''', (limit,))
+            return self.cursor.fetchall()
+        except Exception as e:
+            print(f"Error getting top buyers: {e}")
+            return []
+
+    @cached_query('sales')
+    def get_top_products(self, limit=10):
+        """Get top products by quantity sold"""
+        try:
+            self.cursor.execute('''
+                SELECT 
+                    product_name,
+                    SUM(quantity) as quantity_sold,
+                    SUM(total) as total_revenue
+                FROM sales 
+                GROUP BY product_name
+                ORDER BY quantity_sold DESC
+                LIMIT ?
+            ''', (limit,))
+            return self.cursor.fetchall()
+        except Exception as e:
+            print(f"Error getting top products: {e}")
+            return []
+
+    MONTH_NUMBERS = {
+        'January': 1, 'February': 2, 'March': 3, 'April': 4,
+        'May': 5, 'June': 6, 'July': 7, 'August': 8,
+        'September': 9, 'October': 10, 'November': 11, 'December': 12
+    }
+
+    def get_stats_date_range(self, year=None, month_name='All Months', report_type='Monthly'):
+        """Translate a statistics filter into a [start, end) sale_date range (None = unbounded)"""
+        if year is None:
+            year = datetime.now().year
+        year = int(year)
+        month_num = self.MONTH_NUMBERS.get(month_name)
+
+        if month_num:
+            start = datetime(year, month_num, 1)
+            end = datetime(year + 1, 1, 1) if month_num == 12 else datetime(year, month_num + 1, 1)
+            return start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+        if report_type == 'Daily':
+            return (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d'), None
+        if report_type == 'Weekly':
+            return (datetime.now() - timedelta(days=84)).strftime('%Y-%m-%d'), None
+        if report_type == 'Yearly':
+            return None, None
+        return f"{year:04d}-01-01", f"{year + 1:04d}-01-01"
+
+    @cached_query('sales', per_day=True)
+    def get_filtered_statistics(self, year=None, month_name='All Months', report_type='Monthly', limit=10):
+        """Get every statistics panel for a filter from one range-aggregation query.
+
+        Results are memoized in the query cache's LRU keyed by the filter tuple and
+        invalidated whenever the sales table version is bumped.
+        """
+        start, end = self.get_stats_date_range(year, month_name, report_type)
+        return self._compute_filtered_statistics(start, end, month_name, report_type, limit)
+
+    def _compute_filtered_statistics(self, start, end, month_name, report_type, limit):
+        """Roll up trend, category, buyer and product stats for a sale_date range"""
+        if self.MONTH_NUMBERS.get(month_name):
+            bucket = "strftime('%d', sale_date)"
+        elif report_type == 'Daily':
+            bucket = "DATE(sale_date)"
+        elif report_type == 'Weekly':
+            bucket = "strftime('%Y-W%W', sale_date)"
+        elif report_type == 'Yearly':
+            bucket = "strftime('%Y', sale_date)"
+        else:
+            bucket = "strftime('%m', sale_date)"
+
+        conditions = []
+        params = []
+        if start:
+            conditions.append('sale_date >= ?')
+            params.append(start)
+        if end:
+            conditions.append('sale_date < ?')
+            params.append(end)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        empty = {'trend': [], 'categories': [], 'top_buyers': [], 'top_products': []}
+        try:
+            self.cursor.execute(FILTERED_STATISTICS.format(bucket=bucket, where=where),
+                                params * 3 + [limit] + params + [limit])
+            rows = self.cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Error getting filtered statistics: {e}")
+            return empty
+
+        panels = {'trend': [], 'categories': [], 'top_buyers': [], 'top_products': []}
+        for panel, key, count, amount in rows:
+            panels[panel].append((key, count, amount))
+        return {
+            'trend': [(self._format_trend_label(bucket_value, month_name, report_type), revenue, items)
+                      for bucket_value, items, revenue in panels['trend']],
+            'categories': [(category, revenue) for category, _, revenue in panels['categories']],
+            'top_buyers': panels['top_buyers'],
+            'top_products': panels['top_products']
+        }
+
+    def _format_trend_label(self, bucket_value, month_name, report_type):
+        """Format a trend bucket the same way as the per-period sales getters"""
+        if self.MONTH_NUMBERS.get(month_name):
+            return f"Day {int(bucket_value)}"
+        if report_type == 'Daily':
+            return datetime.strptime(bucket_value, '%Y-%m-%d').strftime('%m-%d')
+        if report_type == 'Weekly':
+            return f"W{bucket_value.split('-W')[1]}"
+        if report_type == 'Yearly':
+            return bucket_value
+        month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                       'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+        return month_names[int(bucket_value) - 1]
+
+    # Sales page breakdowns (with transaction counts)
+    @cached_query('sales', per_day=True)
+    def get_daily_breakdown(self):
+        """Get revenue, items and transactions per day for the last 30 days, newest first"""
+        try:
+            self.cursor.execute('''
+                SELECT 
+                    DATE(sale_date) as date,
+                    SUM(total) as revenue,
+                    SUM(quantity) as items_sold,
+                    COUNT(DISTINCT transaction_id) as transactions
+                FROM sales 
+                WHERE DATE(sale_date) >= DATE('now', '-30 days')
+                GROUP BY DATE(sale_date)
+                ORDER BY date DESC
+            ''')
+            return self.cursor.fetchall()
+        except Exception as e:
+            print(f"Error getting daily sales data: {e}")
+            return []
+
+    @cached_query('sales', per_day=True)
+    def get_weekly_breakdown(self):
+        """Get revenue, items and transactions per week for the last 12 weeks, newest first"""
+        try:
+            self.cursor.execute('''
+                SELECT 
+                    strftime('%Y-W%W', sale_date) as week,
+                    MIN(DATE(sale_date, 'weekday 0', '-6 days')) as week_start,
+                    MAX(DATE(sale_date, 'weekday 0')) as week_end,
+                    SUM(total) as revenue,
+                    SUM(quantity) as items_sold,
+                    COUNT(DISTINCT transaction_id) as transactions
+                FROM sales 
+                WHERE DATE(sale_date) >= DATE('now', '-84 days')
+                GROUP BY week
+                ORDER BY week DESC
+            ''')
+            return self.cursor.fetchall()
+        except Exception as e:
+            print(f"Error getting weekly sales data: {e}")
+            return []
+
+    @cached_query('sales')
+    def get_monthly_breakdown(self, year):
+        """Get revenue, items and transactions per month of a year"""
+        try:
+            self.cursor.execute('''
+                SELECT 
+                    strftime('%m', sale_date) as month,
+                    SUM(total) as revenue,
+                    SUM(quantity) as items_sold,
+                    COUNT(DISTINCT transaction_id) as transactions
+                FROM sales 
+                WHERE strftime('%Y', sale_date) = ?
+                GROUP BY month
+                ORDER BY month
+            ''', (str(year),))
+            return self.cursor.fetchall()
+        except Exception as e:
+            print(f"Error getting monthly sales data: {e}")
+            return []
+
+    @cached_query('sales')
+    def get_yearly_breakdown(self):
+        """Get revenue, items and transactions per year, newest first"""
+        try:
+            self.cursor.execute('''
+                SELECT 
+                    strftime('%Y', sale_date) as year,
+                    SUM(total) as revenue,
+                    SUM(quantity) as items_sold,
+                    COUNT(DISTINCT transaction_id) as transactions
+                FROM sales 
+                GROUP BY year
+                ORDER BY year DESC
+            ''')
+            return self.cursor.fetchall()
+        except Exception as e:
+            print(f"Error getting yearly sales data: {e}")
+            return []
+
+
+    # Stock history page
+    def get_stock_history_rows(self, date_filter='All Time', category_filter='All Categories',
+                               movement_filter='All Sales', search_term=None):
+        """Get sales history rows for the given filters and optional search"""
+        sales_query = '''
+            SELECT 
+                s.id,
+                DATE(s.sale_date) as sale_date,
+                TIME(s.sale_date) as sale_time,
+                s.transaction_id,
+                s.product_name,
+                s.product_id,
+                s.product_category,
+                s.customer_name,
+                COALESCE(s.customer_address, 'N/A') as customer_address,
+                'Sale (Out)' as movement_type,
+                s.quantity,
+                s.price,
+                s.total,
+                p.stock as current_stock
+            FROM sales s
+            LEFT JOIN products p ON s.product_id = p.product_id
+            WHERE 1=1
+        '''
+        
+        params = []
+        
+        # Add search filter
+        if search_term:
+            search_pattern = f"%{search_term}%"
+            sales_query += """ AND (
+                s.product_name LIKE ? OR 
+                s.customer_name LIKE ? OR 
+                s.transaction_id LIKE ?
+            )"""
+            params.extend([search_pattern, search_pattern, search_pattern])
+        
+        # Add date filter
+        if date_filter == 'Today':
+            sales_query += " AND DATE(s.sale_date) = DATE('now')"
+        elif date_filter == 'Last 7 Days':
+            sales_query += " AND DATE(s.sale_date) >= DATE('now', '-7 days')"
+        elif date_filter == 'Last 30 Days':
+            sales_query += " AND DATE(s.sale_date) >= DATE('now', '-30 days')"
+        elif date_filter == 'Last 90 Days':
+            sales_query += " AND DATE(s.sale_date) >= DATE('now', '-90 days')"
+        
+        # Add category filter
+        if category_filter != 'All Categories':
+            sales_query += " AND s.product_category = ?"
+            params.append(category_filter)
+        
+        # Add movement type filter
+        if movement_filter == 'Returns':
+            sales_query += " AND s.quantity < 0" 
+        elif movement_filter == 'Regular Sales':
+            sales_query += " AND s.quantity > 0"  
+        
+        # Order by date descending
+        sales_query += " ORDER BY s.sale_date DESC, s.id DESC"
+        
+        self.cursor.execute(sales_query, params)
+        return self.cursor.fetchall()
+
+
+# One row per period from the service rollup: totals summed over the period's days, and
+# unique customers counted over the same days of service_daily_customers
+SERVICE_PERIODS = '''
+    WITH periods AS (
+        SELECT {period} AS period, MIN(day) AS first_day, MAX(day) AS last_day,
+               SUM(revenue) AS revenue, SUM(booking_count) AS services_count
+        FROM service_daily_rollup
+        WHERE booking_count > 0 {where}
+        GROUP BY period
+    )
+    SELECT period, {extra} revenue, services_count,
+           (SELECT COUNT(DISTINCT customer_name) FROM service_daily_customers c
+            WHERE c.day BETWEEN periods.first_day AND periods.last_day) AS unique_customers
+    FROM periods
+    ORDER BY period {order}
+'''
+SERVICE_DAILY = SERVICE_PERIODS.format(period='day', extra='', where="AND day >= DATE('now', '-30 days')",
+                                       order='DESC')
+SERVICE_WEEKLY = SERVICE_PERIODS.format(
+    period="strftime('%Y-W%W', day)",
+    extra="DATE(first_day, 'weekday 0', '-6 days') AS week_start, DATE(last_day, 'weekday 0') AS week_end,",
+    where="AND day >= DATE('now', '-84 days')", order='DESC')
+SERVICE_MONTHLY = SERVICE_PERIODS.format(period="strftime('%m', day)", extra='',
+                                         where='AND day BETWEEN ? AND ?', order='')
+SERVICE_YEARLY = SERVICE_PERIODS.format(period="strftime('%Y', day)", extra='', where='', order='DESC')
+SERVICE_STATISTICS = '''
+    SELECT (SELECT COUNT(*) FROM services WHERE is_active = 1),
+           COALESCE(SUM(booking_count), 0),
+           COALESCE(SUM(pending_count), 0),
+           COALESCE(SUM(CASE WHEN day >= strftime('%Y-%m-01', 'now') THEN completed_count END), 0),
+           COALESCE(SUM(CASE WHEN day >= strftime('%Y-%m-01', 'now') THEN completed_revenue END), 0)
+    FROM service_daily_rollup
+'''
+SERVICE_UNIQUE_CUSTOMERS = '''
+    SELECT COUNT(DISTINCT customer_name) FROM service_daily_customers
+    WHERE day BETWEEN ? AND ?
+'''
+
+
+class ServiceReports(CoreService):
+    """Service booking aggregations behind the services pages.
+
+    They read service_daily_rollup and service_daily_customers, which
+    triggers on service_bookings keep current, instead of grouping every
+    booking by strftime each time.
+    """
+
+    @cached_query('service_bookings', per_day=True)
+    def get_service_daily_data(self):
+        """Get daily service data for the last 30 days"""
+        try:
+            self.cursor.execute(SERVICE_DAILY)
+            return self.cursor.fetchall()
+        except Exception as e:
+            print(f"Error getting daily service data: {e}")
+            return []
+
+    @cached_query('service_bookings', per_day=True)
+    def get_service_weekly_data(self):
+        """Get weekly service data for the last 12 weeks"""
+        try:
+            self.cursor.execute(SERVICE_WEEKLY)
+            return self.cursor.fetchall()
+        except Exception as e:
+            print(f"Error getting weekly service data: {e}")
+            return []
+
+    @cached_query('service_bookings')
+    def get_service_monthly_data(self, year):
+        """Get monthly service data for specific year"""
+        try:
+            self.cursor.execute(SERVICE_MONTHLY, (f"{year}-01-01", f"{year}-12-31"))
+            return self.cursor.fetchall()
+        except Exception as e:
+            print(f"Error getting monthly service data: {e}")
+            return []
+
+    @cached_query('service_bookings')
+    def get_service_yearly_data(self):
+        """Get yearly service data"""
+        try:
+            self.cursor.execute(SERVICE_YEARLY)
+            return self.cursor.fetchall()
+        except Exception as e:
+            print(f"Error getting yearly service data: {e}")
+            return []
+
+    @cached_query('service_bookings')
+    def get_unique_customers(self, start_date, end_date):
+        """Count distinct customers who booked between two 'YYYY-MM-DD' dates, inclusive"""
+        try:
+            self.cursor.execute(SERVICE_UNIQUE_CUSTOMERS, (start_date, end_date))
+            return self.cursor.fetchone()[0]
+        except Exception as e:
+            print(f"Error counting unique service customers: {e}")
+            return 0
+
+    @cached_query('services', 'service_bookings', per_day=True)
+    def get_service_statistics(self):
+        """Get service statistics for dashboard integration"""
+        try:
+            self.cursor.execute(SERVICE_STATISTICS)
+            total_services, total_bookings, pending, completed, revenue = self.cursor.fetchone()
+            return {
+                'total_services': total_services,
+                'total_bookings': total_bookings,
+                'pending_bookings': pending,
+                'completed_this_month': completed,
+                'revenue_this_month': revenue
+            }
+            
+        except Exception as e:
+            print(f"Error getting service statistics: {e}")
+            return {
+                'total_services': 0,
+                'total_bookings': 0,
+                'pending_bookings': 0,
+                'completed_this_month': 0,
+                'revenue_this_month': 0
+            }
@@ -0,0 +1,128 @@
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from .database import CoreService, ShopDatabase
+from .errors import ValidationError, NotFoundError, InsufficientStockError
+
+
+RESERVATION_MINUTES = 15
+
+
+def new_cart_id():
+    """Get an ID for a cart's stock holds, unique across tills"""
+    return f"CART{uuid.uuid4().hex[:16].upper()}"
+
+
+def timestamp(moment):
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+
+class StockReservations(CoreService):
+    """Short holds on stock by open carts, so two tills can't sell the same last unit.
+
+    A till holds a product's cart quantity when it's added; units held by other
+    unexpired carts aren't available to sell (CheckoutService respects them
+    too), and checkout turns the cart's holds into the sale in the same
+    transaction. Every hold renews the cart's other holds, so an abandoned cart
+    lets its stock go RESERVATION_MINUTES after its last change.
+    """
+
+    minutes = RESERVATION_MINUTES
+
+    def reserve(self, cart_id, product_id, quantity):
+        """Hold quantity units (the cart's whole quantity of the product); returns the units available
+        to this cart. Raises InsufficientStockError when other carts and sales leave too few."""
+        if quantity <= 0:
+            raise ValidationError("Quantity must be greater than 0!")
+        now = datetime.now()
+        expires_at = timestamp(now + timedelta(minutes=self.minutes))
+
+        self.cursor.execute('BEGIN IMMEDIATE')
+        try:
+            product = self.db.product_repo.get_by_code(product_id)
+            if product is None:
+                raise NotFoundError(f"Product {product_id} not found")
+            available = product.stock - self.db.reservation_repo.held_by_others(product_id, timestamp(now), cart_id)
+            if quantity > available:
+                raise InsufficientStockError(product_id, product.name, max(available, 0), quantity)
+            self.db.reservation_repo.hold(cart_id, product_id, quantity, expires_at)
+            self.db.reservation_repo.renew_cart(cart_id, expires_at)
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+        return available
+
+    def release(self, cart_id, product_id=None):
+        """Drop a cart's hold on one product, or on everything when product_id is None"""
+        try:
+            if product_id is None:
+                released = self.db.reservation_repo.release_cart(cart_id)
+            else:
+                released = self.db.reservation_repo.release(cart_id, product_id)
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+        return released
+
+    def available_stock(self, product_id, cart_id=None):
+        """Get stock minus other carts' holds, or None for an unknown product"""
+        stock = self.db.product_repo.get_stock(product_id)
+        if stock is None:
+            return None
+        return stock - self.db.reservation_repo.held_by_others(product_id, timestamp(datetime.now()), cart_id)
+
+    def held_stock(self, cart_id=None):
+        """Get {product_id: units held} by unexpired carts other than cart_id"""
+        return self.db.reservation_repo.held_stock(timestamp(datetime.now()), cart_id)
+
+    def sweep(self):
+        """Delete expired holds; returns how many"""
+        try:
+            deleted = self.db.reservation_repo.delete_expired(timestamp(datetime.now()))
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+        return deleted
+
+
+class ReservationSweeper:
+    """Background thread that clears expired holds every so often.
+
+    Expired holds are already ignored by every query; sweeping only keeps the
+    table small. A busy database just means trying again next time.
+    """
+
+    INTERVAL_SECONDS = 60.0
+
+    def __init__(self, db_path, interval=INTERVAL_SECONDS):
+        self.db_path = db_path
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name='reservation-sweeper', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def _run(self):
+        db = ShopDatabase(self.db_path)
+        try:
+            reservations = StockReservations(db)
+            while not self.stopped.wait(self.interval):
+                try:
+                    reservations.sweep()
+                except sqlite3.OperationalError as e:
+                    if 'locked' not in str(e) and 'busy' not in str(e):
+                        print(f"Reservation sweep stopped: {e}")
+                        return
+        finally:
+            db.close()
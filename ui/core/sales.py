@@ -0,0 +1,189 @@
+import itertools
+import os
+from collections import namedtuple
+from datetime import datetime
+
+from .database import CoreService
+from .errors import ValidationError, NotFoundError, InsufficientStockError
+
+
+SaleResult = namedtuple('SaleResult', 'transaction_id total_amount sale_date line_count')
+VoidResult = namedtuple('VoidResult', 'lines_deleted units_restored products_restored')
+TransactionDetail = namedtuple('TransactionDetail', 'transaction lines')
+
+REQUIRED_FIELDS = ('product_id', 'product_name', 'customer_name', 'unit_price', 'quantity')
+
+_transaction_sequence = itertools.count(1)
+
+
+def new_transaction_id(now=None):
+    """Get a transaction ID; process id and sequence keep same-second checkouts unique"""
+    now = now or datetime.now()
+    return f"TXN{now.strftime('%Y%m%d%H%M%S')}{os.getpid() % 1000:03d}{next(_transaction_sequence) % 100000:05d}"
+
+
+def check_item_fields(item):
+    """Raise ValidationError when a cart line is missing fields or has a bad quantity"""
+    if not all(field in item for field in REQUIRED_FIELDS):
+        raise ValidationError(f"Missing required fields in item: {item}")
+    if item['quantity'] <= 0:
+        raise ValidationError(f"Quantity for {item['product_name']} must be greater than 0")
+
+
+class CheckoutService(CoreService):
+    """Cart validation and sale recording.
+
+    Cart items are dicts with product_id, product_name, customer_name,
+    unit_price and quantity, plus optional category and customer_address.
+    """
+
+    def validate(self, cart_items, cart_id=None):
+        """Check every product exists and has enough stock for the whole cart, leaving out units
+        other carts (not cart_id) have reserved"""
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        requested = {}
+        for item in cart_items:
+            check_item_fields(item)
+            product_id = item['product_id']
+            product = self.db.product_repo.get_by_code(product_id)
+            if product is None:
+                raise NotFoundError(f"Product {item['product_name']} (ID: {product_id}) not found in inventory")
+
+            # The same product can appear on several lines
+            requested[product_id] = requested.get(product_id, 0) + item['quantity']
+            available = product.stock - self.db.reservation_repo.held_by_others(product_id, now, cart_id)
+            if requested[product_id] > available:
+                raise InsufficientStockError(product_id, product.name, max(available, 0), requested[product_id])
+
+    def record_sale(self, cart_items, payment_method='Cash', transaction_id=None, sale_date=None, cart_id=None):
+        """Record one sale and take its items off stock; returns a SaleResult.
+
+        transaction_id and sale_date are passed when the sale was journaled first.
+        cart_id names the cart's stock reservations: they can be sold into and are
+        released in the same transaction.
+        """
+        self._check_carts([cart_items])
+
+        def apply():
+            result = self._record(cart_items, payment_method, transaction_id, sale_date, cart_id=cart_id)
+            if cart_id:
+                self.db.reservation_repo.release_cart(cart_id)
+            return [result]
+        return self._in_transaction(apply)[0]
+
+    def record_sales(self, carts, payment_method='Cash'):
+        """Record several sales in a single transaction, all or nothing; returns a SaleResult per cart"""
+        self._check_carts(carts)
+        return self._in_transaction(
+            lambda: [self._record(cart_items, payment_method) for cart_items in carts])
+
+    def replay_sale(self, transaction_id, cart_items, payment_method, sale_date, cart_id=None):
+        """Apply a journaled sale once; returns its SaleResult, or None if it was already recorded.
+
+        The goods have already left the shop, so stock is allowed to go negative
+        here rather than losing the sale. The cart's reservations (cart_id) are
+        released in the same transaction, so they hold its stock until then.
+        """
+        self._check_carts([cart_items])
+
+        def apply():
+            result = None
+            if not self.db.sales_repo.transaction_exists(transaction_id):
+                result = self._record(cart_items, payment_method, transaction_id, sale_date, allow_oversell=True)
+            if cart_id:
+                self.db.reservation_repo.release_cart(cart_id)
+            return [result]
+        return self._in_transaction(apply)[0]
+
+    def get_transaction(self, transaction_id):
+        """Get a past sale's header and lines as a TransactionDetail"""
+        transaction_id = transaction_id.strip().upper()
+        transaction = self.db.sales_repo.get_transaction(transaction_id)
+        if transaction is None:
+            raise NotFoundError(f"No sale with transaction ID {transaction_id}")
+        return TransactionDetail(transaction, self.db.sales_repo.list_transaction_lines(transaction_id))
+
+    def void_sale_lines(self, line_ids, restore_stock=True):
+        """Delete sale lines in one transaction, optionally putting their units back in stock.
+
+        Stock is restored with one grouped update per product and one movement per
+        line; transaction totals shrink and transactions left empty are removed.
+        Returns a VoidResult.
+        """
+        if not line_ids:
+            raise ValidationError("No sale records selected")
+
+        self.cursor.execute('BEGIN IMMEDIATE')
+        try:
+            lines, units = self.db.sales_repo.stage_lines(line_ids)
+            products = 0
+            if restore_stock:
+                self.db.movement_repo.record_staged_restores()
+                products = self.db.product_repo.restore_staged_sales()
+            self.db.sales_repo.subtract_staged_from_transactions()
+            self.db.sales_repo.delete_staged_lines()
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+
+        self.db.invalidate_tables('sales', 'products', 'stock_movements', 'transactions')
+        return VoidResult(lines, units if restore_stock else 0, products)
+
+    def _check_carts(self, carts):
+        for cart_items in carts:
+            if not cart_items:
+                raise ValidationError("No items to record")
+            for item in cart_items:
+                check_item_fields(item)
+
+    def _in_transaction(self, apply):
+        # IMMEDIATE takes the write lock up front, so concurrent tills wait instead of failing mid-sale
+        self.cursor.execute('BEGIN IMMEDIATE')
+        try:
+            results = apply()
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+
+        self.db.invalidate_tables('sales', 'products', 'stock_movements', 'transactions')
+        return results
+
+    def _record(self, cart_items, payment_method, transaction_id=None, sale_date=None, allow_oversell=False,
+                cart_id=None):
+        products = self.db.product_repo
+        transaction_id = transaction_id or new_transaction_id()
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        sale_date = sale_date or now
+        total_amount = 0
+
+        for item in cart_items:
+            product_id = item['product_id']
+            quantity = item['quantity']
+
+            # Conditional decrement: checks and takes stock in one statement
+            if not products.sell_stock(product_id, quantity, allow_oversell, cart_id, now):
+                stock = products.get_stock(product_id)
+                if stock is None:
+                    raise NotFoundError(f"Product {item['product_name']} (ID: {product_id}) not found in inventory")
+                available = stock - self.db.reservation_repo.held_by_others(product_id, now, cart_id)
+                raise InsufficientStockError(product_id, item['product_name'], max(available, 0), quantity)
+
+            item_total = quantity * item['unit_price']
+            total_amount += item_total
+            customer_address = item.get('customer_address', '')
+
+            self.db.sales_repo.insert_line(transaction_id, product_id, item['product_name'],
+                                           item.get('category', 'N/A'), item['customer_name'], customer_address,
+                                           quantity, item['unit_price'], item_total, sale_date)
+
+            new_stock = products.get_stock(product_id)
+            address_note = f" (Address: {customer_address})" if customer_address else ""
+            self.db.movement_repo.record(product_id, item['product_name'], 'OUT', quantity, transaction_id,
+                                         f'Sold {quantity} units to {item["customer_name"]}{address_note}. '
+                                         f'New stock: {new_stock}',
+                                         reason='SALE')
+
+        self.db.sales_repo.insert_transaction(transaction_id, total_amount, payment_method, sale_date)
+        return SaleResult(transaction_id, total_amount, sale_date, len(cart_items))
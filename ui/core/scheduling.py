@@ -0,0 +1,256 @@
+import re
+from bisect import bisect_right
+from collections import namedtuple, defaultdict
+from datetime import datetime, timedelta
+
+from .database import CoreService
+from .errors import ValidationError
+
+
+OPEN_TIME = '08:00'
+CLOSE_TIME = '18:00'
+SLOT_MINUTES = 15
+DEFAULT_DURATION_MINUTES = 30
+SEARCH_DAYS = 14
+
+Slot = namedtuple('Slot', 'scheduled_date scheduled_time technician bay duration_minutes')
+
+DURATION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(h|hr|hrs|hours?|m|mins?|minutes?)\b')
+
+
+def parse_duration(text, default=DEFAULT_DURATION_MINUTES):
+    """Get minutes from a services.duration such as '45 minutes', '2 hours' or '1 hr 30 min'"""
+    text = (text or '').strip().lower()
+    if text.isdigit():
+        return int(text) or default
+    minutes = sum(float(amount) * (60 if unit.startswith('h') else 1)
+                  for amount, unit in DURATION_PATTERN.findall(text))
+    return int(round(minutes)) or default
+
+
+def to_minutes(clock):
+    """Get minutes past midnight from 'HH:MM'"""
+    try:
+        hours, minutes = (int(part) for part in clock.strip().split(':')[:2])
+    except (AttributeError, ValueError):
+        raise ValidationError(f"Invalid time {clock!r}, expected HH:MM")
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValidationError(f"Invalid time {clock!r}, expected HH:MM")
+    return hours * 60 + minutes
+
+
+def to_clock(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def check_date(scheduled_date):
+    """Get a 'YYYY-MM-DD' date as a date"""
+    try:
+        return datetime.strptime(scheduled_date.strip(), '%Y-%m-%d').date()
+    except (AttributeError, ValueError):
+        raise ValidationError(f"Invalid date {scheduled_date!r}, expected YYYY-MM-DD")
+
+
+class IntervalIndex:
+    """One technician's or bay's appointments on one day.
+
+    The appointments never overlap, so kept sorted by start their ends are
+    sorted too: whether a time range is free is decided by the appointments
+    either side of one bisect, and the next gap by walking on from there.
+    """
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.keys = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add(self, start, end, key):
+        """Add the [start, end) minute range booked by key"""
+        index = bisect_right(self.starts, start)
+        self.starts.insert(index, start)
+        self.ends.insert(index, end)
+        self.keys.insert(index, key)
+
+    def conflict(self, start, end):
+        """Get the key of an appointment overlapping [start, end), or None"""
+        index = bisect_right(self.starts, start)
+        if index and self.ends[index - 1] > start:
+            return self.keys[index - 1]
+        if index < len(self.starts) and self.starts[index] < end:
+            return self.keys[index]
+        return None
+
+    def next_free(self, start, length):
+        """Get the earliest time at or after start that is free for length minutes"""
+        index = bisect_right(self.starts, start)
+        if index and self.ends[index - 1] > start:
+            start = self.ends[index - 1]
+        while index < len(self.starts) and self.starts[index] < start + length:
+            start = max(start, self.ends[index])
+            index += 1
+        return start
+
+
+class DaySchedule:
+    """Every technician's and bay's IntervalIndex for one day"""
+
+    def __init__(self, scheduled_date, rows=()):
+        self.scheduled_date = scheduled_date
+        self.indexes = defaultdict(IntervalIndex)
+        for row in rows:
+            start = to_minutes(row.scheduled_time)
+            end = start + (row.duration_minutes or DEFAULT_DURATION_MINUTES)
+            # Bookings from before the scheduler have a time but no technician or bay
+            if row.technician:
+                self.indexes['Technician', row.technician].add(start, end, row.booking_id)
+            if row.bay:
+                self.indexes['Bay', row.bay].add(start, end, row.booking_id)
+
+    def conflict(self, start, end, technician, bay):
+        """Get the booking that clashes with [start, end) on the technician or the bay, or None"""
+        return (self.indexes['Technician', technician].conflict(start, end)
+                or self.indexes['Bay', bay].conflict(start, end))
+
+    def assign(self, start, end, technicians, bays):
+        """Get the first (technician, bay) both free for [start, end), or None"""
+        free_bays = [bay for bay in bays if self.indexes['Bay', bay].conflict(start, end) is None]
+        if not free_bays:
+            return None
+        for technician in technicians:
+            if self.indexes['Technician', technician].conflict(start, end) is None:
+                return technician, free_bays[0]
+        return None
+
+    def next_free(self, start, length, technicians, bays, close):
+        """Get the earliest (start, technician, bay) with both free for length minutes, ending by close"""
+        best = None
+        for technician in technicians:
+            technician_index = self.indexes['Technician', technician]
+            for bay in bays:
+                bay_index = self.indexes['Bay', bay]
+                # Alternate between the two calendars until they agree on a gap
+                candidate = start
+                while True:
+                    candidate = technician_index.next_free(candidate, length)
+                    bay_start = bay_index.next_free(candidate, length)
+                    if bay_start == candidate:
+                        break
+                    candidate = bay_start
+                if candidate + length <= close and (best is None or candidate < best[0]):
+                    best = (candidate, technician, bay)
+        return best
+
+
+class ServiceScheduler(CoreService):
+    """Appointment times for service bookings, by technician and bay.
+
+    Each day's bookings are loaded once into a DaySchedule and reused until a
+    booking changes. Booking re-checks the slot against the database inside its
+    own transaction, so two tills can't book the same technician or bay.
+    """
+
+    open_time = OPEN_TIME
+    close_time = CLOSE_TIME
+    slot_minutes = SLOT_MINUTES
+
+    def __init__(self, db):
+        super().__init__(db)
+        self.days = {}
+
+    def resources(self):
+        """Get ([technician names], [bay names])"""
+        technicians, bays = [], []
+        for resource in self.db.service_repo.list_resources():
+            (technicians if resource.kind == 'Technician' else bays).append(resource.name)
+        return technicians, bays
+
+    def duration_of(self, service_id):
+        """Get a service's duration in minutes (service_id is the services table id)"""
+        return parse_duration(self.db.service_repo.get_duration(service_id))
+
+    def day(self, scheduled_date):
+        """Get a day's DaySchedule, rebuilt only after bookings change"""
+        versions = self.query_cache.get_versions(('service_bookings',))
+        cached = self.days.get(scheduled_date)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+        schedule = DaySchedule(scheduled_date, self.db.booking_repo.list_day(scheduled_date))
+        if len(self.days) >= 64:
+            self.days.clear()
+        self.days[scheduled_date] = (versions, schedule)
+        return schedule
+
+    def next_free_slot(self, duration_minutes, start_date=None, after_time=None, technician=None, bay=None,
+                       days=SEARCH_DAYS):
+        """Get the earliest Slot from start_date (today by default) on, or None within days.
+
+        technician and bay limit the search to one of each; otherwise any free
+        pair will do. Slots start on the slot_minutes grid and never in the past.
+        """
+        if duration_minutes <= 0:
+            raise ValidationError("Duration must be greater than 0!")
+        technicians, bays = self.resources()
+        if technician:
+            technicians = [name for name in technicians if name == technician]
+        if bay:
+            bays = [name for name in bays if name == bay]
+        if not technicians or not bays:
+            raise ValidationError("No technician or bay available to schedule on")
+
+        now = datetime.now()
+        first_day = check_date(start_date) if start_date else now.date()
+        open_minutes, close_minutes = to_minutes(self.open_time), to_minutes(self.close_time)
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            start = open_minutes
+            if offset == 0 and after_time:
+                start = max(start, to_minutes(after_time))
+            if day == now.date():
+                start = max(start, now.hour * 60 + now.minute)
+            elif day < now.date():
+                continue
+            start = -(-start // self.slot_minutes) * self.slot_minutes
+            found = self.day(day.isoformat()).next_free(start, duration_minutes, technicians, bays, close_minutes)
+            if found is not None:
+                start, technician_name, bay_name = found
+                return Slot(day.isoformat(), to_clock(start), technician_name, bay_name, duration_minutes)
+        return None
+
+    def place(self, scheduled_date, scheduled_time, duration_minutes, technician=None, bay=None):
+        """Check a time against the day's bookings as they are now and fill in a free technician and bay.
+
+        Call inside the booking's transaction. Returns the Slot; raises
+        ValidationError when the time is closed, past or taken.
+        """
+        day = check_date(scheduled_date)
+        start = to_minutes(scheduled_time)
+        end = start + duration_minutes
+        if duration_minutes <= 0:
+            raise ValidationError("Duration must be greater than 0!")
+        if day < datetime.now().date():
+            raise ValidationError(f"{day.isoformat()} has already passed")
+        if start < to_minutes(self.open_time) or end > to_minutes(self.close_time):
+            raise ValidationError(f"Appointments must fit between {self.open_time} and {self.close_time} "
+                                  f"({to_clock(start)}-{to_clock(end)} doesn't)")
+
+        technicians, bays = self.resources()
+        if technician and technician not in technicians:
+            raise ValidationError(f"Unknown technician {technician}")
+        if bay and bay not in bays:
+            raise ValidationError(f"Unknown bay {bay}")
+        schedule = DaySchedule(day.isoformat(), self.db.booking_repo.list_day(day.isoformat()))
+        if technician and bay:
+            clash = schedule.conflict(start, end, technician, bay)
+            if clash is not None:
+                raise ValidationError(f"{technician} or {bay} is already booked then (booking {clash})")
+            assigned = technician, bay
+        else:
+            assigned = schedule.assign(start, end, [technician] if technician else technicians,
+                                       [bay] if bay else bays)
+            if assigned is None:
+                raise ValidationError(f"Nothing is free on {day.isoformat()} at {to_clock(start)} "
+                                      f"for {duration_minutes} minutes")
+        return Slot(day.isoformat(), to_clock(start), assigned[0], assigned[1], duration_minutes)
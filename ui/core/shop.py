@@ -0,0 +1,33 @@
+from .database import ShopDatabase
+from .sales import CheckoutService
+from .inventory import InventoryService
+from .bookings import BookingService, ServiceCatalog
+from .reports import ShopReports, ServiceReports
+from .ledger import StockLedger
+from .importer import ProductImporter
+from .reservations import StockReservations
+from .scheduling import ServiceScheduler
+
+
+class ShopCore:
+    """The shop's operations without any Tk: checkout, stock, bookings and reports.
+
+    Failures are raised as CoreError subclasses (or sqlite3.Error) rather than
+    shown in message boxes, so scripts and benchmarks can drive it directly.
+    """
+
+    def __init__(self, db_path='bike_shop_inventory.db', query_cache=None):
+        self.db = ShopDatabase(db_path, query_cache)
+        self.checkout = CheckoutService(self.db)
+        self.inventory = InventoryService(self.db)
+        self.scheduler = ServiceScheduler(self.db)
+        self.bookings = BookingService(self.db, self.scheduler)
+        self.service_catalog = ServiceCatalog(self.db)
+        self.reports = ShopReports(self.db)
+        self.service_reports = ServiceReports(self.db)
+        self.ledger = StockLedger(self.db)
+        self.importer = ProductImporter(self.db)
+        self.reservations = StockReservations(self.db)
+
+    def close(self):
+        self.db.close()
@@ -1,19 +1,214 @@
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
+from collections import namedtuple
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from datetime import datetime, timedelta
 import numpy as np
 import sqlite3
 
+from core import ShopDatabase, ShopReports
+from query_cache import cached_query
+
+
+# The dashboard shows placeholder cards at once; worker threads, each with its
+# own connection, fetch the panels in parallel and the Tk thread fills them in
+DASHBOARD_WORKERS = 4
+POLL_MS = 15
+
+PanelResult = namedtuple('PanelResult', 'name fetch_ms value error')
+
+
+class DashboardQueries:
+    """The data behind each dashboard panel, from one connection (or the app's server proxies)"""
+
+    def __init__(self, reports, product_repo, sales_repo, query_cache=None, db=None):
+        self.reports = reports
+        self.product_repo = product_repo
+        self.sales_repo = sales_repo
+        self.query_cache = query_cache
+        self.db = db
+
+    @classmethod
+    def for_app(cls, main_app):
+        """Queries through the app's own connection, or its server in remote mode"""
+        return cls(main_app.reports, main_app.product_repo, main_app.sales_repo, main_app.query_cache)
+
+    @classmethod
+    def open(cls, main_app):
+        """Queries on a new connection to the app's database, for a worker thread"""
+        if getattr(main_app, 'remote', None) is not None:
+            return cls.for_app(main_app)
+        db = ShopDatabase(main_app.db_path, main_app.query_cache)
+        return cls(ShopReports(db), db.product_repo, db.sales_repo, main_app.query_cache, db)
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+
+    def stats(self):
+        return {
+            'total_sales_count': self.reports.get_total_sales_count(),
+            'total_revenue': self.reports.get_total_sales(),
+            'total_products': self.reports.get_total_products(),
+            'total_stock_items': self.reports.get_total_stock_items()
+        }
+
+    def today(self):
+        return self.reports.get_today_summary()
+
+    @cached_query('products')
+    def stock_chart_products(self):
+        return [(p.name, p.stock, p.id) for p in self.product_repo.list_lowest_stock(10)]
+
+    @cached_query('sales')
+    def recent_sales(self, limit=5):
+        return self.sales_repo.list_recent(limit)
+
+    @cached_query('products')
+    def low_stock_products(self):
+        return [(p.id, p.name, p.price, p.stock, p.product_id) for p in self.product_repo.list_low_stock()]
+
+
+class DashboardLoader:
+    """Worker threads that fetch dashboard panels in parallel.
+
+    Each worker opens its DashboardQueries on first use and keeps it, so later
+    visits to the dashboard don't pay for opening connections. A panel's
+    PanelResult goes on the queue it was submitted with.
+    """
+
+    def __init__(self, open_queries, workers=DASHBOARD_WORKERS):
+        self.open_queries = open_queries
+        self.workers = workers
+        self.tasks = queue.Queue()
+        self.threads = []
+
+    def start(self):
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f'dashboard-{number + 1}', daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def stop(self):
+        for _ in self.threads:
+            self.tasks.put(None)
+
+    def submit(self, name, fetch, results):
+        """Queue fetch(queries) for a panel; returns at once"""
+        self.tasks.put((name, fetch, results))
+
+    def _run(self):
+        queries = None
+        try:
+            while True:
+                task = self.tasks.get()
+                if task is None:
+                    return
+                name, fetch, results = task
+                start = time.perf_counter()
+                try:
+                    if queries is None:
+                        queries = self.open_queries()
+                    value, error = fetch(queries), None
+                except Exception as e:
+                    value, error = None, e
+                results.put(PanelResult(name, (time.perf_counter() - start) * 1000, value, error))
+        finally:
+            if queries is not None:
+                queries.close()
+
+
+def stock_chart_figure(products):
+    """Build the stock levels bar chart without touching Tk, so a worker can do it; None without products"""
+    if not products:
+        return None
+    fig = Figure(figsize=(8, 5))
+    ax = fig.add_subplot()
+    fig.patch.set_facecolor('white')
+    ax.set_facecolor('white')
+
+    # Extract data
+    product_names = [product[0][:15] + '...' if len(product[0]) > 15 else product[0]
+                     for product in products]
+    stock_levels = [product[1] for product in products]
+
+    # Create color map based on stock levels
+    colors = []
+    for stock in stock_levels:
+        if stock == 0:
+            colors.append('#ef4444')  # Red for out of stock
+        elif stock <= 5:
+            colors.append('#f97316')  # Orange for low stock
+        elif stock <= 10:
+            colors.append('#eab308')  # Yellow for medium stock
+        else:
+            colors.append('#22c55e')  # Green for good stock
+
+    # Create horizontal bar chart
+    bars = ax.barh(product_names, stock_levels, color=colors, alpha=0.8)
+
+    # Customize chart
+    ax.set_xlabel('Stock Quantity', fontsize=10, color='#374151')
+    ax.set_ylabel('Products', fontsize=10, color='#374151')
+    ax.set_title('Product Stock Overview (Lowest 10)', fontsize=12, color='#1f2937', pad=20)
+
+    # Add value labels on bars
+    for bar, value in zip(bars, stock_levels):
+        ax.text(value + 0.5, bar.get_y() + bar.get_height()/2,
+                str(value), va='center', ha='left', fontsize=9, color='#374151')
+
+    # Customize grid
+    ax.grid(axis='x', alpha=0.3, linestyle='-', linewidth=0.5)
+    ax.set_axisbelow(True)
+
+    # Remove top and right spines
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_color('#d1d5db')
+    ax.spines['bottom'].set_color('#d1d5db')
+
+    # Set tick colors
+    ax.tick_params(colors='#374151', labelsize=9)
+    return fig
+
+
 class DashboardModule:
+    # (panel, what a worker runs for it), slowest first
+    PANELS = (
+        ('stock_chart', lambda queries: stock_chart_figure(queries.stock_chart_products())),
+        ('stats', DashboardQueries.stats),
+        ('recent_sales', lambda queries: queries.recent_sales(5)),
+        ('low_stock', DashboardQueries.low_stock_products),
+        ('today', DashboardQueries.today),
+    )
+
     def __init__(self, parent, main_app):
         self.parent = parent
         self.main_app = main_app
         self.frame = None
-        
+        self.loader = None
+        self.results = None
+        self.panel_bodies = {}
+        self.timings = {}
+        
+    def get_dashboard_data(self):
+        """Fetch everything the dashboard panels display (no widgets involved)"""
+        queries = DashboardQueries.for_app(self.main_app)
+        return dict(queries.stats(),
+                    stock_chart_products=queries.stock_chart_products(),
+                    recent_sales=queries.recent_sales(5),
+                    low_stock_products=queries.low_stock_products(),
+                    today=queries.today())
+
     def create_interface(self):
-        """Create the dashboard with product stock chart"""
+        """Create the dashboard with placeholder cards, filled in as each panel's data arrives"""
+        started = time.perf_counter()
+        self.panel_bodies = {}
         self.frame = ttk.Frame(self.parent, style='Content.TFrame')
         
         # Header
@@ -87,10 +282,67 @@ class DashboardModule:
         summary_frame.pack(side='right', fill='y', padx=(5, 0))
         self.create_today_summary(summary_frame)
         
+        self.load_panels(started)
         return self.frame
 
+    def load_panels(self, started):
+        """Queue every panel on the workers and start polling for their results"""
+        if self.loader is None:
+            self.loader = DashboardLoader(lambda: DashboardQueries.open(self.main_app)).start()
+        # A new queue per build, so results meant for a dashboard that's gone are dropped
+        results = self.results = queue.Queue()
+        self.placeholders_ms = (time.perf_counter() - started) * 1000
+        self.timings = {}
+        for name, fetch in self.PANELS:
+            self.loader.submit(name, fetch, results)
+        self.parent.after(POLL_MS, lambda: self.poll_panels(results, started))
+
+    def poll_panels(self, results, started):
+        """Fill in the panels that have arrived, and poll again until they all have"""
+        if results is not self.results:
+            return
+        while True:
+            try:
+                result = results.get_nowait()
+            except queue.Empty:
+                break
+            fill_start = time.perf_counter()
+            try:
+                if result.error is not None:
+                    raise result.error
+                getattr(self, f"show_{result.name}")(result.value)
+            except Exception as e:
+                print(f"Error loading dashboard {result.name}: {e}")
+                self.show_panel_error(result.name)
+            self.timings[result.name] = (result.fetch_ms, (time.perf_counter() - fill_start) * 1000)
+
+        if len(self.timings) < len(self.PANELS):
+            self.parent.after(POLL_MS, lambda: self.poll_panels(results, started))
+            return
+        self.results = None
+        panels = ', '.join(f"{name} {self.timings[name][0]:.0f}+{self.timings[name][1]:.0f}"
+                           for name, _ in self.PANELS)
+        print(f"Dashboard: placeholders {self.placeholders_ms:.0f} ms, all panels "
+              f"{(time.perf_counter() - started) * 1000:.0f} ms (fetch+fill ms: {panels})")
+
+    def show_placeholder(self, body, text="Loading..."):
+        """Replace a panel body's contents with a grey message"""
+        for child in body.winfo_children():
+            child.destroy()
+        ttk.Label(body, text=text, style='NoData.TLabel').pack(expand=True)
+
+    def show_panel_error(self, name):
+        if name == 'stats':
+            for label in self.stat_value_labels:
+                label.config(text="—")
+        elif name == 'today':
+            for label in self.today_value_labels:
+                label.config(text="—")
+        else:
+            self.show_placeholder(self.panel_bodies[name], "Error loading data")
+
     def create_product_stock_chart(self, parent):
-        """Create a bar chart showing product stock levels"""
+        """Create the stock chart card; the chart itself is built on a worker"""
         # Header
         header_frame = ttk.Frame(parent, style='Card.TFrame')
         header_frame.pack(fill='x', padx=20, pady=(15, 10))
@@ -100,109 +352,43 @@ class DashboardModule:
         # Chart frame
         chart_frame = ttk.Frame(parent, style='Card.TFrame')
         chart_frame.pack(fill='both', expand=True, padx=20, pady=(0, 15))
-        
-        # Get product data
-        try:
-            self.main_app.cursor.execute('''
-                SELECT name, stock, id FROM products 
-                ORDER BY stock ASC 
-                LIMIT 10
-            ''')
-            products = self.main_app.cursor.fetchall()
-            
-            if products:
-                # Create matplotlib figure
-                fig, ax = plt.subplots(figsize=(8, 5))
-                fig.patch.set_facecolor('white')
-                ax.set_facecolor('white')
-                
-                # Extract data
-                product_names = [product[0][:15] + '...' if len(product[0]) > 15 else product[0] 
-                               for product in products]
-                stock_levels = [product[1] for product in products]
-                
-                # Create color map based on stock levels
-                colors = []
-                for stock in stock_levels:
-                    if stock == 0:
-                        colors.append('#ef4444')  # Red for out of stock
-                    elif stock <= 5:
-                        colors.append('#f97316')  # Orange for low stock
-                    elif stock <= 10:
-                        colors.append('#eab308')  # Yellow for medium stock
-                    else:
-                        colors.append('#22c55e')  # Green for good stock
-                
-                # Create horizontal bar chart
-                bars = ax.barh(product_names, stock_levels, color=colors, alpha=0.8)
-                
-                # Customize chart
-                ax.set_xlabel('Stock Quantity', fontsize=10, color='#374151')
-                ax.set_ylabel('Products', fontsize=10, color='#374151')
-                ax.set_title('Product Stock Overview (Lowest 10)', fontsize=12, color='#1f2937', pad=20)
-                
-                # Add value labels on bars
-                for i, (bar, value) in enumerate(zip(bars, stock_levels)):
-                    ax.text(value + 0.5, bar.get_y() + bar.get_height()/2, 
-                           str(value), va='center', ha='left', fontsize=9, color='#374151')
-                
-                # Customize grid
-                ax.grid(axis='x', alpha=0.3, linestyle='-', linewidth=0.5)
-                ax.set_axisbelow(True)
-                
-                # Remove top and right spines
-                ax.spines['top'].set_visible(False)
-                ax.spines['right'].set_visible(False)
-                ax.spines['left'].set_color('#d1d5db')
-                ax.spines['bottom'].set_color('#d1d5db')
-                
-                # Set tick colors
-                ax.tick_params(colors='#374151', labelsize=9)
-                
-                # Adjust layout
-                plt.tight_layout()
-                
-                # Create canvas and add to tkinter
-                canvas = FigureCanvasTkAgg(fig, chart_frame)
-                canvas.draw()
-                canvas.get_tk_widget().pack(fill='both', expand=True)
-                
-                # Add legend
-                legend_frame = ttk.Frame(parent, style='Card.TFrame')
-                legend_frame.pack(fill='x', padx=20, pady=(0, 15))
-                
-                legend_items = [
-                    ("● Out of Stock (0)", "#ef4444"),
-                    ("● Low Stock (1-5)", "#f97316"),
-                    ("● Medium Stock (6-10)", "#eab308"),
-                    ("● Good Stock (11+)", "#22c55e")
-                ]
-                
-                for i, (text, color) in enumerate(legend_items):
-                    legend_label = ttk.Label(legend_frame, text=text, foreground=color, 
-                                           font=('Arial', 8), background='#ffffff')
-                    legend_label.pack(side='left', padx=(0, 15))
-                
-            else:
-                # No products message
-                no_data_label = ttk.Label(chart_frame, text="No products available", 
-                                        style='NoData.TLabel')
-                no_data_label.pack(expand=True)
-                
-        except Exception as e:
-            print(f"Error creating stock chart: {e}")
-            error_label = ttk.Label(chart_frame, text="Error loading chart data", 
-                                  style='NoData.TLabel')
-            error_label.pack(expand=True)
+        self.show_placeholder(chart_frame, "Loading chart...")
+        self.chart_card = parent
+        self.panel_bodies['stock_chart'] = chart_frame
+
+    def show_stock_chart(self, fig):
+        """Put the worker-built chart (None without products) on the card"""
+        chart_frame = self.panel_bodies['stock_chart']
+        if fig is None:
+            self.show_placeholder(chart_frame, "No products available")
+            return
+        for child in chart_frame.winfo_children():
+            child.destroy()
+
+        # Create canvas and add to tkinter
+        canvas = FigureCanvasTkAgg(fig, chart_frame)
+        fig.tight_layout()
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill='both', expand=True)
+
+        # Add legend
+        legend_frame = ttk.Frame(self.chart_card, style='Card.TFrame')
+        legend_frame.pack(fill='x', padx=20, pady=(0, 15))
+
+        legend_items = [
+            ("● Out of Stock (0)", "#ef4444"),
+            ("● Low Stock (1-5)", "#f97316"),
+            ("● Medium Stock (6-10)", "#eab308"),
+            ("● Good Stock (11+)", "#22c55e")
+        ]
+
+        for text, color in legend_items:
+            legend_label = ttk.Label(legend_frame, text=text, foreground=color,
+                                     font=('Arial', 8), background='#ffffff')
+            legend_label.pack(side='left', padx=(0, 15))
 
     def create_dashboard_stats_cards(self, parent):
-        """Create modern statistics cards"""
-        # Get statistics from database
-        total_sales_count = self.main_app.get_total_sales_count()
-        total_revenue = self.main_app.get_total_sales()
-        total_products = self.main_app.get_total_products()
-        total_stock_items = self.main_app.get_total_stock_items()
-        
+        """Create modern statistics cards, showing placeholders until the figures arrive"""
         # Cards frame
         cards_frame = ttk.Frame(parent, style='Content.TFrame')
         cards_frame.pack(fill='x')
@@ -211,20 +397,25 @@ class DashboardModule:
         for i in range(4):
             cards_frame.columnconfigure(i, weight=1)
         
-        # Total Sales Card
-        self.create_modern_stat_card(cards_frame, "Total Sales", str(total_sales_count), "+100%", "#3b82f6", "🛒", 0)
-        
-        # Total Revenue Card
-        self.create_modern_stat_card(cards_frame, "Total Revenue", f"₱{total_revenue:,.2f}", "-100%", "#10b981", "💰", 1)
-        
-        # Total Products Card
-        self.create_modern_stat_card(cards_frame, "Total Products", str(total_products), "0%", "#8b5cf6", "📦", 2)
-        
-        # Total Stock Card
-        self.create_modern_stat_card(cards_frame, "Total Stock", str(total_stock_items), "0%", "#f59e0b", "📊", 3)
+        self.stat_value_labels = [
+            # Total Sales Card
+            self.create_modern_stat_card(cards_frame, "Total Sales", "…", "+100%", "#3b82f6", "🛒", 0),
+            # Total Revenue Card
+            self.create_modern_stat_card(cards_frame, "Total Revenue", "…", "-100%", "#10b981", "💰", 1),
+            # Total Products Card
+            self.create_modern_stat_card(cards_frame, "Total Products", "…", "0%", "#8b5cf6", "📦", 2),
+            # Total Stock Card
+            self.create_modern_stat_card(cards_frame, "Total Stock", "…", "0%", "#f59e0b", "📊", 3)
+        ]
+
+    def show_stats(self, stats):
+        values = (str(stats['total_sales_count']), f"₱{stats['total_revenue']:,.2f}",
+                  str(stats['total_products']), str(stats['total_stock_items']))
+        for label, value in zip(self.stat_value_labels, values):
+            label.config(text=value)
 
     def create_modern_stat_card(self, parent, title, value, change, color, icon, column):
-        """Create a modern statistics card with icon and change indicator"""
+        """Create a modern statistics card with icon and change indicator; returns the value label"""
         card_frame = ttk.Frame(parent, style='Card.TFrame')
         card_frame.grid(row=0, column=column, padx=10, sticky='ew')
         
@@ -240,16 +431,18 @@ class DashboardModule:
         ttk.Label(header_frame, text=icon, font=('Arial', 16), style='CardIcon.TLabel').pack(side='right')
         
         # Value
-        ttk.Label(content_frame, text=value, style='CardValue.TLabel').pack(anchor='w')
+        value_label = ttk.Label(content_frame, text=value, style='CardValue.TLabel')
+        value_label.pack(anchor='w')
         
         # Change indicator
         change_color = '#10b981' if change.startswith('+') else '#ef4444' if change.startswith('-') else '#6b7280'
         change_label = ttk.Label(content_frame, text=change, foreground=change_color, 
                                 font=('Helvetica', 9), background='#ffffff')
         change_label.pack(anchor='w', pady=(5, 0))
+        return value_label
 
     def create_today_summary(self, parent):
-        """Create today's sales summary"""
+        """Create today's sales summary, showing placeholders until the figures arrive"""
         # Header
         header_frame = ttk.Frame(parent, style='Card.TFrame')
         header_frame.pack(fill='x', padx=20, pady=(15, 10))
@@ -260,30 +453,21 @@ class DashboardModule:
         content_frame = ttk.Frame(parent, style='Card.TFrame')
         content_frame.pack(fill='both', expand=True, padx=20, pady=(0, 15))
         
-        # Get today's data
-        today_data = self.main_app.get_today_summary()
-        
-        # Today's Sales
-        sales_frame = ttk.Frame(content_frame, style='Card.TFrame')
-        sales_frame.pack(fill='x', pady=(0, 15))
-        
-        ttk.Label(sales_frame, text="Sales Today", style='InsightTitle.TLabel').pack(anchor='w')
-        ttk.Label(sales_frame, text=str(today_data['sales_count']), style='InsightValue.TLabel').pack(anchor='w')
-        
-        # Today's Revenue
-        revenue_frame = ttk.Frame(content_frame, style='Card.TFrame')
-        revenue_frame.pack(fill='x', pady=(0, 15))
-        
-        ttk.Label(revenue_frame, text="Revenue Today", style='InsightTitle.TLabel').pack(anchor='w')
-        ttk.Label(revenue_frame, text=f"₱{today_data['revenue']:.2f}", style='InsightValue.TLabel').pack(anchor='w')
-        
-        # Items Sold
-        items_frame = ttk.Frame(content_frame, style='Card.TFrame')
-        items_frame.pack(fill='x')
-        
-        ttk.Label(items_frame, text="Items Sold", style='InsightTitle.TLabel').pack(anchor='w')
-        ttk.Label(items_frame, text=str(today_data['items_sold']), style='InsightValue.TLabel').pack(anchor='w')
+        # Today's Sales, Today's Revenue and Items Sold
+        self.today_value_labels = []
+        for title, last in (("Sales Today", False), ("Revenue Today", False), ("Items Sold", True)):
+            item_frame = ttk.Frame(content_frame, style='Card.TFrame')
+            item_frame.pack(fill='x', pady=0 if last else (0, 15))
+            
+            ttk.Label(item_frame, text=title, style='InsightTitle.TLabel').pack(anchor='w')
+            value_label = ttk.Label(item_frame, text="…", style='InsightValue.TLabel')
+            value_label.pack(anchor='w')
+            self.today_value_labels.append(value_label)
 
+    def show_today(self, today_data):
+        values = (str(today_data['sales_count']), f"₱{today_data['revenue']:.2f}", str(today_data['items_sold']))
+        for label, value in zip(self.today_value_labels, values):
+            label.config(text=value)
     
     def create_recent_sales_table(self, parent):
         """Create recent sales table - FIXED amount formatting to always show proper decimals"""
@@ -319,8 +503,12 @@ class DashboardModule:
         tree.column('Customer', width=80, anchor='center')
         #tree.column('Amount', width=80)
         
-        # Get recent sales data
-        recent_sales = self.main_app.get_recent_sales(5)
+        tree.pack(fill='both', expand=True)
+        self.recent_sales_tree = tree
+        self.panel_bodies['recent_sales'] = table_frame
+
+    def show_recent_sales(self, recent_sales):
+        tree = self.recent_sales_tree
         for i, sale in enumerate(recent_sales, 1):
             # Format date
             sale_date = sale[0]
@@ -358,8 +546,6 @@ class DashboardModule:
                 sale[3][:10] + "..." if sale[3] and len(sale[3]) > 10 else (sale[3] or "N/A"),
                 formatted_amount  # Now properly formatted with consistent decimal places
             ))
-        
-        tree.pack(fill='both', expand=True)
 
     def show_all_recent_sales(self):
         """Show all recent sales in a new window"""
@@ -834,35 +1020,37 @@ class DashboardModule:
         # Table
         table_frame = ttk.Frame(parent, style='Card.TFrame')
         table_frame.pack(fill='both', expand=True, padx=20, pady=(0, 15))
+        self.show_placeholder(table_frame)
+        self.panel_bodies['low_stock'] = table_frame
+
+    def show_low_stock(self, low_stock_products):
+        table_frame = self.panel_bodies['low_stock']
+        if not low_stock_products:
+            self.show_placeholder(table_frame, "No stock alerts")
+            return
+        for child in table_frame.winfo_children():
+            child.destroy()
+
+        columns = ('Product ID', 'Product', 'Quantity')
+        tree = ttk.Treeview(table_frame, columns=columns, show='headings', style='Dashboard.Treeview', height=6)
         
-        # Get low stock products
-        low_stock_products = self.main_app.get_low_stock_products()
+        # Configure columns
+        tree.heading('Product ID', text='Product ID', anchor='center')
+        tree.heading('Product', text='Product', anchor='center')
+        tree.heading('Quantity', text='Quantity', anchor='center')
         
-        if low_stock_products:
-            columns = ('Product ID', 'Product', 'Quantity')
-            tree = ttk.Treeview(table_frame, columns=columns, show='headings', style='Dashboard.Treeview', height=6)
-            
-            # Configure columns
-            tree.heading('Product ID', text='Product ID', anchor='center')
-            tree.heading('Product', text='Product', anchor='center')
-            tree.heading('Quantity', text='Quantity', anchor='center')
-            
-            tree.column('Product ID', width=80, anchor='center')
-            tree.column('Product', width=150, anchor='center')
-            tree.column('Quantity', width=80, anchor='center')
-            
-            for product in low_stock_products:
-                tree.insert('', 'end', values=(
-                    product[4] if len(product) > 4 else product[0], 
-                    product[1][:20] + "..." if len(product[1]) > 20 else product[1],
-                    product[3]  # stock
-                ))
-            
-            tree.pack(fill='both', expand=True)
-        else:
-            no_alerts_label = ttk.Label(table_frame, text="No stock alerts", 
-                                       style='NoData.TLabel')
-            no_alerts_label.pack(expand=True)
+        tree.column('Product ID', width=80, anchor='center')
+        tree.column('Product', width=150, anchor='center')
+        tree.column('Quantity', width=80, anchor='center')
+        
+        for product in low_stock_products:
+            tree.insert('', 'end', values=(
+                product[4] if len(product) > 4 else product[0], 
+                product[1][:20] + "..." if len(product[1]) > 20 else product[1],
+                product[3]  # stock
+            ))
+        
+        tree.pack(fill='both', expand=True)
 
     def refresh(self):
         """Refresh dashboard data"""
@@ -870,4 +1058,4 @@ class DashboardModule:
             # Destroy and recreate the dashboard
             self.frame.destroy()
             return self.create_interface()
-        return None
\ No newline at end of file
+        return None
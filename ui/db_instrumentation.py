@@ -0,0 +1,221 @@
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import namedtuple
+from logging.handlers import RotatingFileHandler
+
+
+SLOW_QUERY_LOG = 'slow_queries.log'
+SLOW_QUERY_MS = 100
+
+QueryStat = namedtuple('QueryStat', 'fingerprint calls total_ms avg_ms max_ms rows caller')
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Frames from these files are plumbing, not the code that asked for the query
+_UI_DIR = os.path.dirname(os.path.abspath(__file__))
+_SKIP_FILES = {os.path.join(_UI_DIR, 'db_instrumentation.py'),
+               os.path.join(_UI_DIR, 'query_cache.py')}
+_SKIP_DIRS = (os.path.join(_UI_DIR, 'repositories') + os.sep,
+              os.path.join(_UI_DIR, 'core') + os.sep)
+_module_names = {}
+_fingerprints = {}
+
+
+def fingerprint(sql):
+    """Normalize a statement so calls that differ only in literals group together"""
+    cached = _fingerprints.get(sql)
+    if cached is not None:
+        return cached
+    normalized = _STRING_LITERAL.sub('?', sql)
+    normalized = _NUMBER_LITERAL.sub('?', normalized)
+    normalized = _WHITESPACE.sub(' ', normalized).strip()
+    normalized = _IN_LIST.sub('(?, ...)', normalized)
+    # Most statements are constants; bound the memo for the ones built with f-strings
+    if len(_fingerprints) < 2048:
+        _fingerprints[sql] = normalized
+    return normalized
+
+
+def _calling_site():
+    """Get 'module.function' for the first frame outside the database plumbing"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        module = _module_names.get(filename)
+        if module is None:
+            path = os.path.abspath(filename)
+            if path in _SKIP_FILES or path.startswith(_SKIP_DIRS):
+                module = ''
+            else:
+                module = os.path.splitext(os.path.basename(path))[0]
+            _module_names[filename] = module
+        if module:
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+class QueryStats:
+    """Per-fingerprint counters plus the slow-query log"""
+
+    def __init__(self, slow_threshold_ms=SLOW_QUERY_MS, log_path=SLOW_QUERY_LOG):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.log_path = log_path
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self._logger = None
+
+    @property
+    def logger(self):
+        # Opened lazily so the log file only appears once something is slow
+        if self._logger is None:
+            logger = logging.getLogger('bikeshop.slow_queries')
+            logger.setLevel(logging.WARNING)
+            logger.propagate = False
+            if not logger.handlers:
+                handler = RotatingFileHandler(self.log_path, maxBytes=1024 * 1024, backupCount=3,
+                                              encoding='utf-8')
+                handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+                logger.addHandler(handler)
+            self._logger = logger
+        return self._logger
+
+    def record(self, sql, elapsed, rows, caller):
+        """Add one finished statement to the counters"""
+        key = fingerprint(sql)
+        elapsed_ms = elapsed * 1000
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self.entries[key] = [0, 0.0, 0.0, 0, {}]
+            entry[0] += 1
+            entry[1] += elapsed_ms
+            entry[2] = max(entry[2], elapsed_ms)
+            entry[3] += rows
+            entry[4][caller] = entry[4].get(caller, 0) + 1
+
+        if elapsed_ms >= self.slow_threshold_ms:
+            try:
+                self.logger.warning("%.1fms rows=%d caller=%s sql=%s", elapsed_ms, rows, caller, key)
+            except OSError as e:
+                print(f"Error writing slow query log: {e}")
+
+    def top(self, limit=50):
+        """Get the statements with the most total time, slowest first"""
+        with self.lock:
+            stats = []
+            for key, (calls, total_ms, max_ms, rows, callers) in self.entries.items():
+                caller = max(callers, key=callers.get)
+                if len(callers) > 1:
+                    caller += f" (+{len(callers) - 1})"
+                stats.append(QueryStat(key, calls, total_ms, total_ms / calls, max_ms, rows, caller))
+        stats.sort(key=lambda stat: stat.total_ms, reverse=True)
+        return stats[:limit]
+
+    def reset(self):
+        """Clear the counters"""
+        with self.lock:
+            self.entries.clear()
+            self.started = time.time()
+
+
+query_stats = QueryStats()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times each statement, including the fetches that step it.
+
+    A statement is finished when its rows are fetched with fetchall(), when the
+    cursor runs its next statement, or when it is closed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = None
+
+    def _start(self, sql):
+        self._finish()
+        self._pending = [sql, 0.0, 0, _calling_site()]
+
+    def _finish(self):
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            query_stats.record(pending[0], pending[1], pending[2], pending[3])
+
+    def _timed(self, method, *args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            if self._pending is not None:
+                self._pending[1] += time.perf_counter() - start
+
+    def execute(self, sql, parameters=()):
+        self._start(sql)
+        self._timed(super().execute, sql, parameters)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._start(sql)
+        self._timed(super().executemany, sql, seq_of_parameters)
+        return self
+
+    def executescript(self, sql_script):
+        self._start(sql_script)
+        self._timed(super().executescript, sql_script)
+        self._finish()
+        return self
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if self._pending is not None and row is not None:
+            self._pending[2] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, size if size is not None else self.arraysize)
+        if self._pending is not None:
+            self._pending[2] += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        if self._pending is not None:
+            self._pending[2] += len(rows)
+        self._finish()
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (including conn.execute) are InstrumentedCursors"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def connect(database, **kwargs):
+    """Open an instrumented sqlite connection"""
+    return sqlite3.connect(database, factory=InstrumentedConnection, **kwargs)
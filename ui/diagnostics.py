@@ -0,0 +1,134 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import datetime
+
+from db_instrumentation import query_stats
+
+
+class DiagnosticsWindow:
+    """Non-modal window listing the queries that have used the most time since startup"""
+
+    def __init__(self, parent, main_app):
+        self.main_app = main_app
+        try:
+            self.dialog = tk.Toplevel(parent)
+            self.dialog.title("Query Diagnostics")
+            self.dialog.geometry("1100x600")
+            self.dialog.transient(parent)
+            self.dialog.configure(bg='#ffffff')
+
+            # Center the dialog
+            self.dialog.update_idletasks()
+            x = (self.dialog.winfo_screenwidth() // 2) - (550)
+            y = (self.dialog.winfo_screenheight() // 2) - (300)
+            self.dialog.geometry(f"1100x600+{x}+{y}")
+
+            self.create_widgets()
+            self.refresh()
+        except Exception as e:
+            print(f"Error creating DiagnosticsWindow: {e}")
+            messagebox.showerror("Error", f"Failed to open diagnostics: {str(e)}")
+
+    def create_widgets(self):
+        main_frame = ttk.Frame(self.dialog, padding="20", style='Content.TFrame')
+        main_frame.pack(fill='both', expand=True)
+
+        ttk.Label(main_frame, text="Top Queries by Total Time",
+                  style='DialogTitle.TLabel').pack(anchor='w')
+
+        self.summary_label = ttk.Label(main_frame, text="", style='FieldLabel.TLabel')
+        self.summary_label.pack(anchor='w', pady=(5, 0))
+
+        self.cache_label = ttk.Label(main_frame, text="", style='FieldLabel.TLabel')
+        self.cache_label.pack(anchor='w', pady=(0, 10))
+
+        table_frame = ttk.Frame(main_frame, style='Content.TFrame')
+        table_frame.pack(fill='both', expand=True)
+
+        columns = ('Query', 'Calls', 'Total ms', 'Avg ms', 'Max ms', 'Rows', 'Caller')
+        self.query_tree = ttk.Treeview(table_frame, columns=columns, show='headings')
+        widths = {'Query': 520, 'Calls': 60, 'Total ms': 80, 'Avg ms': 70,
+                  'Max ms': 70, 'Rows': 70, 'Caller': 200}
+        for col in columns:
+            self.query_tree.heading(col, text=col)
+            self.query_tree.column(col, width=widths[col], anchor='w' if col in ('Query', 'Caller') else 'e')
+
+        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.query_tree.yview)
+        self.query_tree.configure(yscrollcommand=scrollbar.set)
+        self.query_tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+
+        button_frame = ttk.Frame(main_frame, style='Content.TFrame')
+        button_frame.pack(fill='x', pady=(15, 0))
+
+        ttk.Button(button_frame, text="Close", command=self.dialog.destroy,
+                   style='Secondary.TButton').pack(side='right', padx=(10, 0))
+        ttk.Button(button_frame, text="Reset", command=self.reset,
+                   style='Secondary.TButton').pack(side='right', padx=(10, 0))
+        ttk.Button(button_frame, text="Refresh", command=self.refresh,
+                   style='Primary.TButton').pack(side='right')
+        ttk.Button(button_frame, text="Check Stock Ledger", command=self.check_stock_ledger,
+                   style='Secondary.TButton').pack(side='left')
+
+        self.dialog.bind('<Escape>', lambda e: self.dialog.destroy())
+        self.dialog.bind('<F5>', lambda e: self.refresh())
+
+    def refresh(self):
+        """Reload the query table and counters"""
+        for item in self.query_tree.get_children():
+            self.query_tree.delete(item)
+
+        stats = query_stats.top()
+        for stat in stats:
+            self.query_tree.insert('', 'end', values=(
+                stat.fingerprint,
+                stat.calls,
+                f"{stat.total_ms:.1f}",
+                f"{stat.avg_ms:.2f}",
+                f"{stat.max_ms:.1f}",
+                stat.rows,
+                stat.caller
+            ))
+
+        since = datetime.fromtimestamp(query_stats.started).strftime('%Y-%m-%d %H:%M:%S')
+        total_ms = sum(stat.total_ms for stat in stats)
+        self.summary_label.config(
+            text=f"Since {since}: {len(stats)} statements, {total_ms:,.1f} ms in SQLite. "
+                 f"Queries over {query_stats.slow_threshold_ms} ms are written to {query_stats.log_path}")
+
+        cache = self.main_app.get_cache_stats()
+        self.cache_label.config(
+            text=f"Query cache: {cache['hits']} hits, {cache['misses']} misses "
+                 f"({cache['hit_rate']:.0%} hit rate), {cache['entries']} entries, "
+                 f"{cache['invalidations']} invalidations")
+
+    def check_stock_ledger(self):
+        """Compare every product's stock with the movement ledger and offer to correct it"""
+        try:
+            discrepancies = self.main_app.ledger.reconcile()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to check the stock ledger: {str(e)}", parent=self.dialog)
+            return
+        if not discrepancies:
+            messagebox.showinfo("Stock Ledger", "Every product's stock matches its movement history.",
+                                parent=self.dialog)
+            return
+
+        lines = [f"• {row.name} ({row.product_id}): stock {row.snapshot_stock}, ledger {row.ledger_stock}"
+                 for row in discrepancies[:15]]
+        if len(discrepancies) > 15:
+            lines.append(f"...and {len(discrepancies) - 15} more")
+        if messagebox.askyesno("Stock Ledger",
+                               f"{len(discrepancies)} product(s) don't match their movement history:\n\n"
+                               + "\n".join(lines) + "\n\nSet their stock to the ledger's figures?",
+                               parent=self.dialog):
+            try:
+                self.main_app.ledger.reconcile(fix=True)
+                self.main_app.refresh_products()
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to correct stock: {str(e)}", parent=self.dialog)
+
+    def reset(self):
+        """Clear the counters and start measuring again"""
+        query_stats.reset()
+        self.refresh()
@@ -1,7 +1,8 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk, messagebox, simpledialog, filedialog
 import sqlite3
 from ui_components import ProductDialog
+from core import CoreError, ReceivingSession
 
 class InventoryModule:
     def __init__(self, parent, main_app):
@@ -52,10 +53,14 @@ class InventoryModule:
                   style='Primary.TButton').pack(side='left', padx=(0, 10))
         ttk.Button(controls_frame, text="Add Stock", command=self.add_stock, 
                   style='Success.TButton').pack(side='left', padx=(0, 10))
+        ttk.Button(controls_frame, text="Receive Delivery", command=self.receive_delivery, 
+                  style='Success.TButton').pack(side='left', padx=(0, 10))
         ttk.Button(controls_frame, text="Edit Product", command=self.edit_product, 
                   style='Secondary.TButton').pack(side='left', padx=(0, 10))
         ttk.Button(controls_frame, text="Delete Product", command=self.delete_product, 
-                  style='Danger.TButton').pack(side='left')
+                  style='Danger.TButton').pack(side='left', padx=(0, 10))
+        ttk.Button(controls_frame, text="Import Products", command=self.import_products, 
+                  style='Secondary.TButton').pack(side='left')
         
         # Inventory table
         table_frame = ttk.Frame(self.frame, style='Content.TFrame')
@@ -142,67 +147,14 @@ class InventoryModule:
     def update_statistics(self, search_term=None):
         """Update the statistics display based on current view (all products or search results)"""
         try:
-            if search_term and search_term.strip():
-                # Statistics for filtered/searched products only
-                search_pattern = f"%{search_term}%"
-                
-                # Calculate total stock units for filtered products
-                self.main_app.cursor.execute('''
-                    SELECT SUM(stock) FROM products 
-                    WHERE name LIKE ? OR product_id LIKE ?
-                ''', (search_pattern, search_pattern))
-                total_stock = self.main_app.cursor.fetchone()[0] or 0
-                
-                # Calculate total inventory value for filtered products
-                self.main_app.cursor.execute('''
-                    SELECT SUM(stock * price) FROM products 
-                    WHERE name LIKE ? OR product_id LIKE ?
-                ''', (search_pattern, search_pattern))
-                total_value = self.main_app.cursor.fetchone()[0] or 0
-                
-                # Get product IDs of filtered products for revenue calculation
-                self.main_app.cursor.execute('''
-                    SELECT product_id FROM products 
-                    WHERE name LIKE ? OR product_id LIKE ?
-                ''', (search_pattern, search_pattern))
-                filtered_product_ids = [row[0] for row in self.main_app.cursor.fetchall()]
-                
-                # Calculate total revenue for filtered products only
-                if filtered_product_ids:
-                    placeholders = ','.join('?' * len(filtered_product_ids))
-                    self.main_app.cursor.execute(f'''
-                        SELECT SUM(total) FROM sales 
-                        WHERE quantity > 0 AND product_id IN ({placeholders})
-                    ''', filtered_product_ids)
-                    total_revenue = self.main_app.cursor.fetchone()[0] or 0
-                else:
-                    total_revenue = 0
-                
-                # Count filtered products
-                self.main_app.cursor.execute('''
-                    SELECT COUNT(*) FROM products 
-                    WHERE name LIKE ? OR product_id LIKE ?
-                ''', (search_pattern, search_pattern))
-                total_products = self.main_app.cursor.fetchone()[0] or 0
-                
-            else:
-                # Statistics for all products (default behavior)
-                # Calculate total stock units
-                self.main_app.cursor.execute('SELECT SUM(stock) FROM products')
-                total_stock = self.main_app.cursor.fetchone()[0] or 0
-                
-                # Calculate total inventory value (stock * price)
-                self.main_app.cursor.execute('SELECT SUM(stock * price) FROM products')
-                total_value = self.main_app.cursor.fetchone()[0] or 0
-                
-                # Calculate total revenue from sales (using 'total' column from sales table)
-                # Only count positive quantities (actual sales, not returns)
-                self.main_app.cursor.execute('SELECT SUM(total) FROM sales WHERE quantity > 0')
-                total_revenue = self.main_app.cursor.fetchone()[0] or 0
-                
-                # Count total products
-                self.main_app.cursor.execute('SELECT COUNT(*) FROM products')
-                total_products = self.main_app.cursor.fetchone()[0] or 0
+            # Filter to searched products when a search term is active
+            search_term = search_term.strip() if search_term else None
+            
+            # Stock units, inventory value (stock * price) and product count in one pass
+            total_stock, total_value, total_products = self.main_app.product_repo.summary(search_term)
+            
+            # Revenue only counts positive quantities (actual sales, not returns)
+            total_revenue = self.main_app.sales_repo.total_revenue(search_term)
             
             # Update labels
             self.total_stock_label.config(text=f"{total_stock:,}")
@@ -228,38 +180,13 @@ class InventoryModule:
         product_id = item['values'][0] 
         product_name = item['values'][1]
         current_stock = item['values'][3]
-        product_code = item['values'][5]  
         
         # Create a simple dialog for stock addition
         stock_dialog = AddStockDialog(self.main_app.root, product_name, current_stock)
         if stock_dialog.result:
             try:
                 quantity_to_add = stock_dialog.result['quantity']
-                
-                if quantity_to_add <= 0:
-                    messagebox.showerror("Error", "Quantity must be greater than 0!")
-                    return
-                
-                # Get current stock from database to ensure accuracy
-                self.main_app.cursor.execute('SELECT stock FROM products WHERE id = ?', (product_id,))
-                current_db_stock = self.main_app.cursor.fetchone()[0]
-                
-                new_stock = current_db_stock + quantity_to_add
-                
-                # Update product stock
-                self.main_app.cursor.execute('''
-                    UPDATE products SET stock = ? WHERE id = ?
-                ''', (new_stock, product_id))
-                
-                # Record stock movement
-                self.main_app.cursor.execute('''
-                    INSERT INTO stock_movements (product_id, product_name, movement_type, quantity, 
-                                            reference_id, notes)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (product_code, product_name, 'IN', quantity_to_add, 
-                      f"STOCK_ADD_{product_id}", f"Stock addition: {quantity_to_add} units added"))
-                
-                self.main_app.conn.commit()
+                change = self.main_app.inventory.add_stock(product_id, quantity_to_add)
                 
                 # Refresh display (respects current search)
                 if self.search_var and self.search_var.get().strip():
@@ -274,15 +201,28 @@ class InventoryModule:
                     
                 messagebox.showinfo("Success", 
                     f"Added {quantity_to_add} units to '{product_name}'\n"
-                    f"Previous stock: {current_db_stock}\n"
-                    f"New stock: {new_stock}")
+                    f"Previous stock: {change.previous_stock}\n"
+                    f"New stock: {change.new_stock}")
                 
+            except CoreError as e:
+                messagebox.showerror("Error", str(e))
             except sqlite3.Error as e:
                 messagebox.showerror("Error", f"Failed to add stock: {str(e)}")
-                self.main_app.conn.rollback()
             except Exception as e:
                 messagebox.showerror("Error", f"Unexpected error: {str(e)}")
 
+    def receive_delivery(self):
+        """Scan a whole delivery in and add it to stock in one go"""
+        session = ReceivingSession(self.main_app.product_repo, self.main_app.inventory)
+        dialog = ReceiveDeliveryDialog(self.main_app.root, session)
+        if dialog.receipt is None:
+            return
+        receipt = dialog.receipt
+        self.refresh()
+        self.refresh_stock_history_if_visible()
+        messagebox.showinfo("Success", f"Received {receipt.units} units across {receipt.lines} products\n"
+                                       f"Reference: {receipt.reference}")
+
     def on_search_change(self, *args):
         """Handle search input changes"""
         search_term = self.search_var.get().strip()
@@ -304,15 +244,7 @@ class InventoryModule:
                     self.inventory_tree.delete(item)
                 
                 
-                search_pattern = f"%{search_term}%"
-                self.main_app.cursor.execute('''
-                    SELECT id, name, price, stock, category, product_id 
-                    FROM products 
-                    WHERE name LIKE ? OR product_id LIKE ? 
-                    ORDER BY name
-                ''', (search_pattern, search_pattern))
-                
-                products = self.main_app.cursor.fetchall()
+                products = self.main_app.product_repo.search(search_term)
                 
                 # Insert filtered products into treeview
                 for product in products:
@@ -385,39 +317,12 @@ class InventoryModule:
                     return
                     
             
-                product_id_input = dialog.result.get('product_id', '').strip()
-                if not product_id_input:
-                    messagebox.showerror("Error", "Product ID is required!")
-                    return
-                
-                
-                self.main_app.cursor.execute('SELECT COUNT(*) FROM products WHERE product_id = ?', 
-                                (product_id_input,))
-                if self.main_app.cursor.fetchone()[0] > 0:
-                    messagebox.showerror("Error", "Product ID already exists! Please use a unique Product ID.")
-                    return
-                
-            
-                self.main_app.cursor.execute('''
-                    INSERT INTO products (name, price, stock, category, product_id)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (dialog.result['name'], 
+                # Checks the ID is free and logs the initial stock in one transaction
+                self.main_app.inventory.add_product(dialog.result['name'],
                     float(dialog.result['price']), 
                     int(dialog.result['stock']),
                     dialog.result['category'], 
-                    product_id_input))  
-                
-                # Record initial stock addition
-                if int(dialog.result['stock']) > 0:
-                    self.main_app.cursor.execute('''
-                        INSERT INTO stock_movements (product_id, product_name, movement_type, quantity, 
-                                                reference_id, notes)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (product_id_input, dialog.result['name'], 'IN', 
-                        int(dialog.result['stock']), 'INITIAL', 
-                        'Initial stock when product was added to inventory'))
-                
-                self.main_app.conn.commit()
+                    dialog.result.get('product_id', ''))
                 messagebox.showinfo("Success", f"Product '{dialog.result['name']}' added successfully!")
                 
                 # Refresh inventory display (respects current search)
@@ -431,11 +336,11 @@ class InventoryModule:
                 # Refresh stock history if it's currently displayed
                 self.refresh_stock_history_if_visible()
                 
+        except CoreError as e:
+            messagebox.showerror("Error", str(e))
         except sqlite3.IntegrityError as e:
-            self.main_app.conn.rollback()
             messagebox.showerror("Error", f"Product ID already exists or constraint violation: {str(e)}")
         except sqlite3.Error as e:
-            self.main_app.conn.rollback()
             messagebox.showerror("Error", f"Database error: {str(e)}")
         except Exception as e:
             messagebox.showerror("Error", f"Unexpected error: {str(e)}")
@@ -454,8 +359,7 @@ class InventoryModule:
         item = self.inventory_tree.item(selection[0])
         product_id = item['values'][0] 
         
-        self.main_app.cursor.execute('SELECT * FROM products WHERE id = ?', (product_id,))
-        product = self.main_app.cursor.fetchone()
+        product = self.main_app.product_repo.get(product_id)
         
         if not product:
             messagebox.showerror("Error", "Product not found!")
@@ -466,41 +370,12 @@ class InventoryModule:
         dialog = ProductDialog(self.main_app.root, "Edit Product", product)
         if dialog.result:
             try:
-                new_stock = int(dialog.result['stock'])
-                stock_difference = new_stock - old_stock
-                
-                # Get the original product_id from the database
-                original_product_id = product[5]  
-                
-                # Format the product_id to ensure consistency
-                formatted_product_id = str(dialog.result['product_id']).strip()
-                
-                if formatted_product_id != original_product_id:
-                    self.main_app.cursor.execute('SELECT COUNT(*) FROM products WHERE product_id = ?', 
-                                    (formatted_product_id,))
-                    if self.main_app.cursor.fetchone()[0] > 0:
-                        messagebox.showerror("Error", "Product ID already exists! Please use a unique Product ID.")
-                        return
-                
-                self.main_app.cursor.execute('''
-                    UPDATE products SET name = ?, price = ?, stock = ?, category = ?, product_id = ?
-                    WHERE id = ?
-                ''', (dialog.result['name'], float(dialog.result['price']), new_stock,
-                    dialog.result['category'], formatted_product_id, product_id))
-                
-                # Record stock movement if stock changed
-                if stock_difference != 0:
-                    movement_type = 'IN' if stock_difference > 0 else 'OUT'
-                    notes = f"Stock adjusted from {old_stock} to {new_stock} (difference: {stock_difference:+d})"
-                    
-                    self.main_app.cursor.execute('''
-                        INSERT INTO stock_movements (product_id, product_name, movement_type, quantity, 
-                                                reference_id, notes)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (formatted_product_id, dialog.result['name'], movement_type, 
-                        abs(stock_difference), f"EDIT_{product_id}", notes))
-                
-                self.main_app.conn.commit()
+                # Apply the change the user made, not the absolute figure: other tills may
+                # have sold some while the dialog was open
+                stock_change = int(dialog.result['stock']) - old_stock
+                self.main_app.inventory.edit_product(product_id, dialog.result['name'],
+                                                     float(dialog.result['price']), dialog.result['category'],
+                                                     dialog.result['product_id'], stock_change)
                 
                 # Refresh display (respects current search)
                 if self.search_var and self.search_var.get().strip():
@@ -515,12 +390,12 @@ class InventoryModule:
                     
                 messagebox.showinfo("Success", "Product updated successfully!")
                 
+            except CoreError as e:
+                messagebox.showerror("Error", str(e))
             except sqlite3.IntegrityError:
                 messagebox.showerror("Error", "Product ID already exists!")
-                self.main_app.conn.rollback()
             except sqlite3.Error as e:
                 messagebox.showerror("Error", f"Failed to update product: {str(e)}")
-                self.main_app.conn.rollback()
 
     def delete_product(self):
         if not hasattr(self, 'inventory_tree'):
@@ -536,21 +411,11 @@ class InventoryModule:
         product_id = item['values'][0]
         product_name = item['values'][1]
         
-        if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete '{product_name}'?"):
+        if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete '{product_name}'?\n\n"
+                               f"Its sales and stock history are kept for reports."):
             try:
-                # First get the product_id for the sales deletion
-                self.main_app.cursor.execute('SELECT product_id FROM products WHERE id = ?', (product_id,))
-                product_code = self.main_app.cursor.fetchone()
-                
-                if product_code:
-                    # Delete related sales records first
-                    self.main_app.cursor.execute('DELETE FROM sales WHERE product_id = ?', (product_code[0],))
-                    # Delete related stock movements
-                    self.main_app.cursor.execute('DELETE FROM stock_movements WHERE product_id = ?', (product_code[0],))
-                    
-                # Delete the product
-                self.main_app.cursor.execute('DELETE FROM products WHERE id = ?', (product_id,))
-                self.main_app.conn.commit()
+                # Archive rather than delete: history stays, and it's one indexed update
+                self.main_app.inventory.archive_product(product_id)
                 
                 # Refresh display 
                 if self.search_var and self.search_var.get().strip():
@@ -564,9 +429,48 @@ class InventoryModule:
                 self.refresh_stock_history_if_visible()
                     
                 messagebox.showinfo("Success", "Product deleted successfully!")
+            except CoreError as e:
+                messagebox.showerror("Error", f"Failed to delete product: {str(e)}")
             except sqlite3.Error as e:
                 messagebox.showerror("Error", f"Failed to delete product: {str(e)}")
-                self.main_app.conn.rollback()
+
+    def import_products(self):
+        """Add or update products from a CSV/XLSX product or price list"""
+        if self.main_app.importer is None:
+            messagebox.showwarning("Warning", "Product imports run on the PC that holds the shop database.")
+            return
+        path = filedialog.askopenfilename(title="Import Products",
+                                          filetypes=[("Product lists", "*.csv *.xlsx"),
+                                                     ("CSV files", "*.csv"), ("Excel files", "*.xlsx")])
+        if not path:
+            return
+        try:
+            preview = self.main_app.importer.import_file(path, dry_run=True)
+            if not preview.changes:
+                messagebox.showinfo("Import Products", f"Nothing to import.\n\n{preview.summary()}")
+                return
+            if not messagebox.askyesno("Confirm Import", f"{preview.summary()}.\n\n"
+                                       f"Rejected rows are skipped. Apply these changes?"):
+                return
+            report = self.main_app.importer.import_file(path)
+        except CoreError as e:
+            messagebox.showerror("Error", f"Failed to import products: {str(e)}")
+            return
+        except (OSError, UnicodeDecodeError, sqlite3.Error) as e:
+            messagebox.showerror("Error", f"Failed to import products: {str(e)}")
+            return
+        print(f"Imported {path}: {report.summary()}")
+
+        self.refresh()
+        self.refresh_stock_history_if_visible()
+        if messagebox.askyesno("Import Complete", f"{report.summary()}.\n\nSave a report of the changes?"):
+            report_path = filedialog.asksaveasfilename(title="Save Import Report", defaultextension=".csv",
+                                                       filetypes=[("CSV files", "*.csv")])
+            if report_path:
+                try:
+                    report.write_csv(report_path)
+                except OSError as e:
+                    messagebox.showerror("Error", f"Failed to save report: {str(e)}")
 
     def refresh_products(self):
         """Refresh the inventory display"""
@@ -577,8 +481,7 @@ class InventoryModule:
                     self.inventory_tree.delete(item)
                 
                 # Get all products from database
-                self.main_app.cursor.execute('SELECT id, name, price, stock, category, product_id FROM products ORDER BY name')
-                products = self.main_app.cursor.fetchall()
+                products = self.main_app.product_repo.list_all()
                 
                 # Insert products into treeview
                 for product in products:
@@ -694,4 +597,115 @@ class AddStockDialog:
             messagebox.showerror("Error", "Please enter a valid quantity!")
     
     def cancel_clicked(self):
-        self.dialog.destroy()
\ No newline at end of file
+        self.dialog.destroy()
+
+
+class ReceiveDeliveryDialog:
+    """Goods-in: scan or type product IDs, then receive everything in one transaction"""
+
+    def __init__(self, parent, session):
+        self.session = session
+        self.receipt = None
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Receive Delivery")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+
+        self.dialog.update_idletasks()
+        x = (self.dialog.winfo_screenwidth() // 2) - (640 // 2)
+        y = (self.dialog.winfo_screenheight() // 2) - (480 // 2)
+        self.dialog.geometry(f"640x480+{x}+{y}")
+
+        main_frame = ttk.Frame(self.dialog, padding="20")
+        main_frame.pack(fill='both', expand=True)
+
+        ttk.Label(main_frame, text=f"Delivery {session.reference}",
+                 font=('Arial', 12, 'bold')).pack(anchor='w', pady=(0, 10))
+
+        # Scanners type the code and press Enter; Qty applies to each scan
+        scan_frame = ttk.Frame(main_frame)
+        scan_frame.pack(fill='x', pady=(0, 10))
+        ttk.Label(scan_frame, text="Product ID:").pack(side='left')
+        self.code_var = tk.StringVar()
+        self.code_entry = ttk.Entry(scan_frame, textvariable=self.code_var, width=25)
+        self.code_entry.pack(side='left', padx=(5, 15))
+        ttk.Label(scan_frame, text="Qty:").pack(side='left')
+        self.quantity_var = tk.StringVar(value="1")
+        ttk.Entry(scan_frame, textvariable=self.quantity_var, width=6).pack(side='left', padx=(5, 15))
+        ttk.Button(scan_frame, text="Add", command=self.scan).pack(side='left')
+
+        columns = ('Product ID', 'Name', 'Current Stock', 'Receiving')
+        self.tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=12)
+        for column, width in zip(columns, (120, 260, 100, 90)):
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=width)
+        self.tree.pack(fill='both', expand=True)
+
+        self.total_label = ttk.Label(main_frame, text="0 products, 0 units")
+        self.total_label.pack(anchor='w', pady=(10, 0))
+
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill='x', pady=(10, 0))
+        ttk.Button(button_frame, text="Receive All", command=self.commit).pack(side='right', padx=(10, 0))
+        ttk.Button(button_frame, text="Cancel", command=self.cancel_clicked).pack(side='right')
+        ttk.Button(button_frame, text="Remove Line", command=self.remove_line).pack(side='left')
+
+        self.code_entry.bind('<Return>', lambda e: self.scan())
+        self.dialog.bind('<Escape>', lambda e: self.cancel_clicked())
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel_clicked)
+        self.code_entry.focus()
+
+        self.dialog.wait_window()
+
+    def scan(self):
+        code = self.code_var.get().strip()
+        if not code:
+            return
+        try:
+            product, units = self.session.scan(code, self.quantity_var.get().strip() or 1)
+        except CoreError as e:
+            messagebox.showerror("Error", str(e), parent=self.dialog)
+            return
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Failed to look up product: {str(e)}", parent=self.dialog)
+            return
+
+        # One row per product, keyed by its product ID (not the scanned barcode), so repeat scans update in place
+        values = (product.product_id, product.name, product.stock, units)
+        if self.tree.exists(product.product_id):
+            self.tree.item(product.product_id, values=values)
+        else:
+            self.tree.insert('', 'end', iid=product.product_id, values=values)
+        self.tree.see(product.product_id)
+        self.code_var.set("")
+        self.quantity_var.set("1")
+        self.update_total()
+
+    def remove_line(self):
+        for code in self.tree.selection():
+            self.session.remove(code)
+            self.tree.delete(code)
+        self.update_total()
+
+    def update_total(self):
+        self.total_label.config(text=f"{len(self.session)} products, {self.session.total_units} units")
+
+    def commit(self):
+        if not len(self.session):
+            messagebox.showwarning("Warning", "Scan at least one product first.", parent=self.dialog)
+            return
+        try:
+            self.receipt = self.session.commit()
+        except CoreError as e:
+            messagebox.showerror("Error", str(e), parent=self.dialog)
+            return
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Failed to receive delivery: {str(e)}", parent=self.dialog)
+            return
+        self.dialog.destroy()
+
+    def cancel_clicked(self):
+        if len(self.session) and not messagebox.askyesno(
+                "Discard Delivery", "Discard the scanned items?", parent=self.dialog):
+            return
+        self.dialog.destroy()
@@ -1,5 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import os
 import sqlite3
 from datetime import datetime, timedelta
 from dashboard import DashboardModule
@@ -10,20 +11,47 @@ from inventory import InventoryModule
 from services import ServicesModule
 from sales import SalesModule  # ADDED: Import the SalesModule
 from ui_components import create_styles, ModernSidebar
+from query_cache import QueryCache, cached_query
+from core import (ShopCore, CoreError, NotFoundError, new_transaction_id, check_item_fields,
+                  JOURNAL_PATH, CheckoutJournal, JournalReplayer, is_outage, start_purge_if_requested,
+                  ReservationSweeper)
+from api_client import RemoteShop, requested_server_url
+from diagnostics import DiagnosticsWindow
+from receipts import ReceiptPrintQueue, requested_printer
+from ui_profiler import start_profiler_if_requested
 
 class BikeShopInventorySystem:
     def __init__(self, root):
         self.root = root
+
+        # Opt-in callback profiler (--profile or BIKESHOP_PROFILE=1); must wrap Tk before widgets exist
+        self.profiler = start_profiler_if_requested(root)
+
         screen_width = self.root.winfo_screenwidth()
         screen_height = self.root.winfo_screenheight()
         self.root.title("Bike Shop Inventory")
         self.root.geometry(f"{screen_width}x{screen_height}")
         self.root.configure(bg='#f8fafc')
         
+        # Remote mode (--server URL or BIKESHOP_SERVER): an api_server shared by every till owns the data
+        self.server_url = requested_server_url()
+
+        # Shared result cache for read-only getters. In remote mode the server caches instead;
+        # local entries would never see other tills' sales.
+        self.query_cache = QueryCache(max_entries=0) if self.server_url else QueryCache()
+        
         # Create modern styles
         create_styles()
         
         self.init_database()
+        self.start_checkout_journal()
+
+        # Opt-in cleanup of long-archived products' history (--purge-archived DAYS)
+        self.purger = None if self.server_url else start_purge_if_requested(self.db_path, self.query_cache)
+        # Expired cart holds; in remote mode the server sweeps
+        self.reservation_sweeper = None if self.server_url else ReservationSweeper(self.db_path).start()
+        # Receipts render and print on their own thread (--receipt-printer PATH, else PDFs in receipts/)
+        self.receipt_queue = ReceiptPrintQueue(requested_printer()).start()
         self.create_main_interface()
         
         # Initialize modules
@@ -32,6 +60,9 @@ class BikeShopInventorySystem:
         # Show default page
         self.show_sales_entry() 
 
+        # Query diagnostics (Ctrl+Shift+D)
+        self.root.bind_all('<Control-Shift-D>', lambda e: self.show_diagnostics())
+
     def init_modules(self):
         """Initialize all the modular components"""
         self.dashboard_module = DashboardModule(self.content_frame, self)
@@ -50,85 +81,103 @@ class BikeShopInventorySystem:
         self.services_frame = None
         self.sales_frame = None  # ADDED: Sales frame reference
 
-    def init_database(self):
+    @classmethod
+    def headless(cls, db_path='bike_shop_inventory.db'):
+        """Create the app's data layer without a Tk root (scripts and benchmarks)"""
+        app = cls.__new__(cls)
+        app.root = None
+        app.profiler = None
+        app.query_cache = QueryCache()
+        app.init_database(db_path)
+        return app
+
+    def init_database(self, db_path='bike_shop_inventory.db'):
         """Initialize SQLite database and create tables - UPDATED with customer name and address support"""
-        self.conn = sqlite3.connect('bike_shop_inventory.db')
-        self.cursor = self.conn.cursor()
-
-        # Create products table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS products (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                price REAL NOT NULL DEFAULT 0.0,
-                stock INTEGER NOT NULL DEFAULT 0,
-                category TEXT DEFAULT 'Bikes',
-                product_id TEXT UNIQUE NOT NULL,
-                date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS sales (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                transaction_id TEXT NOT NULL,
-                product_id TEXT,
-                product_name TEXT,
-                product_category TEXT,
-                customer_name TEXT,
-                customer_address TEXT,
-                quantity INTEGER,
-                price REAL,
-                total REAL,
-                sale_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        # Business logic lives in core; modules reach it through these attributes
+        self.db_path = db_path
+        self.core = ShopCore(db_path, self.query_cache)
+        db = self.core.db
+        self.conn = db.conn
+        self.cursor = db.cursor
+
+        self.product_repo = db.product_repo
+        self.sales_repo = db.sales_repo
+        self.movement_repo = db.movement_repo
+        self.service_repo = db.service_repo
+        self.booking_repo = db.booking_repo
+
+        self.checkout = self.core.checkout
+        self.inventory = self.core.inventory
+        self.bookings = self.core.bookings
+        self.service_catalog = self.core.service_catalog
+        self.scheduler = self.core.scheduler
+        self.reports = self.core.reports
+        self.service_reports = self.core.service_reports
+        self.ledger = self.core.ledger
+        self.importer = self.core.importer
+        self.reservations = self.core.reservations
+        print("Database initialized successfully with customer name and address support")
 
         try:
-            self.cursor.execute("PRAGMA table_info(sales)")
-            columns = [column[1] for column in self.cursor.fetchall()]
-            
-            if 'customer_address' not in columns:
-                self.cursor.execute("ALTER TABLE sales ADD COLUMN customer_address TEXT DEFAULT ''")
-                self.conn.commit()
-                print("Added customer_address column to sales table")
-                
-            # Add customer_name column if it doesn't exist
-            if 'customer_name' not in columns:
-                self.cursor.execute("ALTER TABLE sales ADD COLUMN customer_name TEXT DEFAULT ''")
-                self.conn.commit()
-                print("Added customer_name column to sales table")
-                
-        except Exception as e:
-            print(f"Error checking/adding columns: {str(e)}")
-
-        # Create transactions table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS transactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                transaction_id TEXT UNIQUE NOT NULL,
-                total_amount REAL NOT NULL,
-                payment_method TEXT DEFAULT 'Cash',
-                transaction_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS stock_movements (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                product_id TEXT NOT NULL,
-                product_name TEXT,
-                movement_type TEXT NOT NULL, -- 'IN', 'OUT', 'ADJUSTMENT'
-                quantity INTEGER NOT NULL,
-                reference_id TEXT, -- transaction_id for sales, or other reference
-                reason TEXT, -- 'SALE', 'RESTOCK', 'RETURN', 'DAMAGE', etc.
-                movement_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                notes TEXT
-            )
-        ''')
-
-        self.conn.commit()
-        print("Database initialized successfully with customer name and address support")
+            checkpointed = self.ledger.checkpoint()
+            if checkpointed:
+                print(f"Stock ledger: checkpointed {checkpointed} product(s)")
+        except sqlite3.Error as e:
+            print(f"Error checkpointing stock ledger: {e}")
+
+        if getattr(self, 'server_url', None):
+            self.connect_remote(self.server_url)
+
+    def connect_remote(self, server_url):
+        """Route products, checkout, stock, bookings and reports through an API server"""
+        remote = RemoteShop(server_url)
+        try:
+            remote.health()
+        except CoreError as e:
+            print(f"Error connecting to {server_url}: {e}")
+            messagebox.showerror("Server Unavailable",
+                                 f"Could not reach the shop server at {server_url}.\n\n"
+                                 f"This till is using its local database.")
+            return
+
+        self.remote = remote
+        for name in ('product_repo', 'sales_repo', 'service_repo', 'booking_repo',
+                     'checkout', 'inventory', 'bookings', 'service_catalog', 'reports', 'service_reports', 'ledger',
+                     'reservations', 'scheduler'):
+            setattr(self, name, getattr(remote, name))
+        # Stock movements are logged by the server's services; nothing here may write the local ledger
+        self.movement_repo = None
+        # Imports read a file on this PC; run them on the server's PC instead
+        self.importer = None
+        if self.root is not None:
+            self.root.title(f"Bike Shop Inventory - {remote.base_url}")
+        print(f"Connected to shop server at {remote.base_url}")
+
+    def start_checkout_journal(self, journal_path=JOURNAL_PATH):
+        """Journal checkouts locally so the till keeps selling when the database is unreachable"""
+        self.journal = CheckoutJournal(journal_path)
+        self.replayer = JournalReplayer(self.journal, self.open_replay_checkout).start()
+        pending = self.journal.pending_count()
+        if pending:
+            print(f"Checkout journal: {pending} queued sale(s) from a previous session, replaying")
+            self.replayer.notify()
+
+    def open_replay_checkout(self):
+        """Open a checkout service for the replayer thread, on its own connection"""
+        if getattr(self, 'remote', None) is not None:
+            return RemoteShop(self.remote.base_url).checkout
+        # sqlite would quietly create an empty database in place of a missing one
+        if not os.path.exists(self.db_path):
+            raise sqlite3.OperationalError(f"unable to open database file {self.db_path}")
+        return ShopCore(self.db_path, self.query_cache).checkout
+
+    def is_offline(self):
+        """Check whether checkouts are currently being queued in the journal"""
+        return getattr(self, 'replayer', None) is not None and not self.replayer.online
+
+    def pending_sales_count(self):
+        """Get how many queued sales are waiting to be replayed"""
+        return self.journal.pending_count() if getattr(self, 'journal', None) else 0
 
     def create_main_interface(self):
         """Create the main interface with sidebar and content area"""
@@ -208,354 +257,97 @@ class BikeShopInventorySystem:
             if frame:
                 frame.pack_forget()
 
-    # Database helper methods for modules
+    # Query cache helpers
+    def invalidate_tables(self, *tables):
+        """Bump table versions after a write so cached getters recompute"""
+        self.query_cache.bump(*tables)
+
+    def get_cache_stats(self):
+        """Get query cache hit/miss counters for diagnostics"""
+        return self.query_cache.stats()
+
+    # Reports (see core.reports)
     def get_total_sales_count(self):
-        """Get total number of sales transactions"""
-        self.cursor.execute('SELECT COUNT(*) FROM sales')
-        return self.cursor.fetchone()[0]
+        return self.reports.get_total_sales_count()
 
     def get_total_products(self):
-        self.cursor.execute('SELECT COUNT(*) FROM products')
-        return self.cursor.fetchone()[0]
+        return self.reports.get_total_products()
 
     def get_total_sales(self):
-        self.cursor.execute('SELECT SUM(total) FROM sales')
-        result = self.cursor.fetchone()[0]
-        return result if result else 0
+        return self.reports.get_total_sales()
 
     def get_total_stock_items(self):
-        """Get total stock items across all products"""
-        self.cursor.execute('SELECT SUM(stock) FROM products')
-        result = self.cursor.fetchone()[0]
-        return result if result else 0
+        return self.reports.get_total_stock_items()
 
     def get_today_summary(self):
-        """Get today's sales summary"""
-        today = datetime.now().strftime('%Y-%m-%d')
-        try:
-            # Sales count
-            self.cursor.execute('''
-                SELECT COUNT(DISTINCT transaction_id) as sales_count,
-                       SUM(quantity) as items_sold,
-                       SUM(total) as revenue
-                FROM sales 
-                WHERE DATE(sale_date) = ?
-            ''', (today,))
-            result = self.cursor.fetchone()
-            
-            return {
-                'sales_count': result[0] if result[0] else 0,
-                'items_sold': result[1] if result[1] else 0,
-                'revenue': result[2] if result[2] else 0.0
-            }
-        except Exception as e:
-            print(f"Error getting today's summary: {e}")
-            return {'sales_count': 0, 'items_sold': 0, 'revenue': 0.0}
+        return self.reports.get_today_summary()
 
-    def get_monthly_sales_data(self):
-        """Get monthly sales data for the current year"""
-        try:
-            current_year = datetime.now().year
-            self.cursor.execute('''
-                SELECT 
-                    strftime('%m', sale_date) as month,
-                    SUM(total) as revenue,
-                    SUM(quantity) as items_sold
-                FROM sales 
-                WHERE strftime('%Y', sale_date) = ?
-                GROUP BY month
-                ORDER BY month
-            ''', (str(current_year),))
-            
-            results = self.cursor.fetchall()
-            
-            # Format month numbers to month names
-            month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                        'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-            formatted_results = []
-            for row in results:
-                month_index = int(row[0]) - 1
-                month_name = month_names[month_index]
-                formatted_results.append((month_name, row[1], row[2]))
-            
-            return formatted_results
-        except Exception as e:
-            print(f"Error getting monthly sales data: {e}")
-            return []
-        
-    def get_specific_month_sales_data(self, month_name):
-        """Get daily sales data for a specific month"""
-        try:
-            current_year = datetime.now().year
-            
-            # Map month names to numbers
-            month_map = {
-                'January': '01', 'February': '02', 'March': '03', 'April': '04',
-                'May': '05', 'June': '06', 'July': '07', 'August': '08',
-                'September': '09', 'October': '10', 'November': '11', 'December': '12'
-            }
-            
-            month_num = month_map.get(month_name)
-            if not month_num:
-                return []
-            
-            self.cursor.execute('''
-                SELECT 
-                    strftime('%d', sale_date) as day,
-                    SUM(total) as revenue,
-                    SUM(quantity) as items_sold
-                FROM sales 
-                WHERE strftime('%Y', sale_date) = ? AND strftime('%m', sale_date) = ?
-                GROUP BY day
-                ORDER BY day
-            ''', (str(current_year), month_num))
-            
-            results = self.cursor.fetchall()
-            
-            # Format day labels
-            formatted_results = []
-            for row in results:
-                day_label = f"Day {int(row[0])}"
-                formatted_results.append((day_label, row[1], row[2]))
-            
-            return formatted_results
-        except Exception as e:
-            print(f"Error getting specific month sales data: {e}")
-            return []
+    def get_day_summary(self, day):
+        return self.reports.get_day_summary(day)
 
     def get_daily_sales_data(self):
-        """Get daily sales data for the last 30 days"""
-        try:
-            self.cursor.execute('''
-                SELECT 
-                    DATE(sale_date) as date,
-                    SUM(total) as revenue,
-                    SUM(quantity) as items_sold
-                FROM sales 
-                WHERE DATE(sale_date) >= DATE('now', '-30 days')
-                GROUP BY DATE(sale_date)
-                ORDER BY date
-            ''')
-            results = self.cursor.fetchall()
-            
-            # Format dates to be more readable (MM-DD)
-            formatted_results = []
-            for row in results:
-                date_obj = datetime.strptime(row[0], '%Y-%m-%d')
-                formatted_date = date_obj.strftime('%m-%d')
-                formatted_results.append((formatted_date, row[1], row[2]))
-            
-            return formatted_results
-        except Exception as e:
-            print(f"Error getting daily sales data: {e}")
-            return []
+        return self.reports.get_daily_sales_data()
 
     def get_weekly_sales_data(self):
-        """Get weekly sales data for the last 12 weeks"""
-        try:
-            self.cursor.execute('''
-                SELECT 
-                    strftime('%Y-W%W', sale_date) as week,
-                    SUM(total) as revenue,
-                    SUM(quantity) as items_sold
-                FROM sales 
-                WHERE DATE(sale_date) >= DATE('now', '-84 days')
-                GROUP BY week
-                ORDER BY week
-            ''')
-            results = self.cursor.fetchall()
-            
-            # Format week labels (W01, W02, etc.)
-            formatted_results = []
-            for row in results:
-                week_label = f"W{row[0].split('-W')[1]}"
-                formatted_results.append((week_label, row[1], row[2]))
-            
-            return formatted_results
-        except Exception as e:
-            print(f"Error getting weekly sales data: {e}")
-            return []
-
-    def get_yearly_sales_data(self):
-        """Get yearly sales data for the last 5 years"""
-        try:
-            self.cursor.execute('''
-                SELECT 
-                    strftime('%Y', sale_date) as year,
-                    SUM(total) as revenue,
-                    SUM(quantity) as items_sold
-                FROM sales 
-                GROUP BY year
-                ORDER BY year
-            ''')
-            return self.cursor.fetchall()
-        except Exception as e:
-            print(f"Error getting yearly sales data: {e}")
-            return []
-
-    def get_available_years(self):
-        """Get list of years that have sales data"""
-        try:
-            self.cursor.execute('''
-                SELECT DISTINCT strftime('%Y', sale_date) as year
-                FROM sales 
-                WHERE sale_date IS NOT NULL
-                ORDER BY year DESC
-            ''')
-            results = self.cursor.fetchall()
-            return [row[0] for row in results] if results else [str(datetime.now().year)]
-        except Exception as e:
-            print(f"Error getting available years: {e}")
-            return [str(datetime.now().year)]
+        return self.reports.get_weekly_sales_data()
 
     def get_monthly_sales_data(self, year=None):
-        """Get monthly sales data for a specific year"""
-        try:
-            if year is None:
-                year = datetime.now().year
-            
-            self.cursor.execute('''
-                SELECT 
-                    strftime('%m', sale_date) as month,
-                    SUM(total) as revenue,
-                    SUM(quantity) as items_sold
-                FROM sales 
-                WHERE strftime('%Y', sale_date) = ?
-                GROUP BY month
-                ORDER BY month
-            ''', (str(year),))
-            
-            results = self.cursor.fetchall()
-            
-            # Format month numbers to month names
-            month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-            formatted_results = []
-            for row in results:
-                month_index = int(row[0]) - 1
-                month_name = month_names[month_index]
-                formatted_results.append((month_name, row[1], row[2]))
-            
-            return formatted_results
-        except Exception as e:
-            print(f"Error getting monthly sales data: {e}")
-            return []
+        return self.reports.get_monthly_sales_data(year)
 
     def get_specific_month_sales_data(self, month_name, year=None):
-        """Get daily sales data for a specific month and year"""
-        try:
-            if year is None:
-                year = datetime.now().year
-            
-            # Map month names to numbers
-            month_map = {
-                'January': '01', 'February': '02', 'March': '03', 'April': '04',
-                'May': '05', 'June': '06', 'July': '07', 'August': '08',
-                'September': '09', 'October': '10', 'November': '11', 'December': '12'
-            }
-            
-            month_num = month_map.get(month_name)
-            if not month_num:
-                return []
-            
-            self.cursor.execute('''
-                SELECT 
-                    strftime('%d', sale_date) as day,
-                    SUM(total) as revenue,
-                    SUM(quantity) as items_sold
-                FROM sales 
-                WHERE strftime('%Y', sale_date) = ? AND strftime('%m', sale_date) = ?
-                GROUP BY day
-                ORDER BY day
-            ''', (str(year), month_num))
-            
-            results = self.cursor.fetchall()
-            
-            # Format day labels
-            formatted_results = []
-            for row in results:
-                day_label = f"Day {int(row[0])}"
-                formatted_results.append((day_label, row[1], row[2]))
-            
-            return formatted_results
-        except Exception as e:
-            print(f"Error getting specific month sales data: {e}")
-            return []
+        return self.reports.get_specific_month_sales_data(month_name, year)
+
+    def get_yearly_sales_data(self):
+        return self.reports.get_yearly_sales_data()
+
+    def get_available_years(self):
+        return self.reports.get_available_years()
 
     def get_category_sales_data(self):
-        """Get sales data by category"""
-        self.cursor.execute('''
-            SELECT product_category, SUM(total) as total_sales
-            FROM sales 
-            GROUP BY product_category
-            ORDER BY total_sales DESC
-        ''')
-        return self.cursor.fetchall()
+        return self.reports.get_category_sales_data()
 
     def get_top_buyers(self, limit=10):
-        """Get top buyers by total purchase amount"""
-        try:
-            self.cursor.execute('''
-                SELECT 
-                    customer_name,
-                    COUNT(DISTINCT transaction_id) as purchase_count,
-                    SUM(total) as total_amount
-                FROM sales 
-                WHERE customer_name IS NOT NULL AND customer_name != ''
-                GROUP BY customer_name
-                ORDER BY total_amount DESC
-                LIMIT ?
-            ''', (limit,))
-            return self.cursor.fetchall()
-        except Exception as e:
-            print(f"Error getting top buyers: {e}")
-            return []
+        return self.reports.get_top_buyers(limit)
 
     def get_top_products(self, limit=10):
-        """Get top products by quantity sold"""
-        try:
-            self.cursor.execute('''
-                SELECT 
-                    product_name,
-                    SUM(quantity) as quantity_sold,
-                    SUM(total) as total_revenue
-                FROM sales 
-                GROUP BY product_name
-                ORDER BY quantity_sold DESC
-                LIMIT ?
-            ''', (limit,))
-            return self.cursor.fetchall()
-        except Exception as e:
-            print(f"Error getting top products: {e}")
-            return []
+        return self.reports.get_top_products(limit)
+
+    def get_filtered_statistics(self, year=None, month_name='All Months', report_type='Monthly', limit=10):
+        return self.reports.get_filtered_statistics(year, month_name, report_type, limit)
 
+    @cached_query('products')
     def get_low_stock_products(self):
         """Get products with low stock"""
-        self.cursor.execute('''
-            SELECT id, name, price, stock, product_id 
-            FROM products 
-            WHERE stock < 10 
-            ORDER BY stock ASC
-            LIMIT 10
-        ''')
-        return self.cursor.fetchall()
+        return [(p.id, p.name, p.price, p.stock, p.product_id)
+                for p in self.product_repo.list_low_stock()]
 
+    @cached_query('sales')
     def get_recent_sales(self, limit=10):
         """Get recent sales for display - UPDATED to include customer name and address"""
         try:
-            self.cursor.execute('''
-                SELECT sale_date, product_name, product_id, customer_name, 
-                       COALESCE(customer_address, 'N/A') as customer_address, 
-                       quantity, total
-                FROM sales 
-                ORDER BY sale_date DESC 
-                LIMIT ?
-            ''', (limit,))
-            return self.cursor.fetchall()
+            return self.sales_repo.list_recent(limit)
         except sqlite3.Error as e:
             print(f"Error getting recent sales: {e}")
             return []
 
+    def search_transactions(self, prefix='', limit=50):
+        """Get the latest sales whose transaction ID starts with prefix"""
+        try:
+            return self.sales_repo.search_transactions(prefix, limit)
+        except sqlite3.Error as e:
+            print(f"Error searching transactions: {e}")
+            return []
+
+    def get_transaction(self, transaction_id):
+        """Get a past sale's header and lines, or None if there's no such sale"""
+        try:
+            return self.checkout.get_transaction(transaction_id)
+        except NotFoundError:
+            return None
+        except (CoreError, sqlite3.Error) as e:
+            print(f"Error getting transaction {transaction_id}: {e}")
+            return None
+
     def add_product(self):
         """Delegate to inventory module"""
         if hasattr(self, 'inventory_module'):
@@ -567,15 +359,12 @@ class BikeShopInventorySystem:
             self.inventory_module.refresh_products()
 
     # POS Integration methods
+    @cached_query('products')
     def get_all_products(self):
         """Get all products from the database"""
         try:
-            self.cursor.execute('''
-                SELECT product_id, name, price, stock, category 
-                FROM products 
-                ORDER BY name
-            ''')
-            return self.cursor.fetchall()
+            return [(p.product_id, p.name, p.price, p.stock, p.category)
+                    for p in self.product_repo.list_all()]
         except sqlite3.Error as e:
             print(f"Error getting all products: {e}")
             return []
@@ -583,12 +372,8 @@ class BikeShopInventorySystem:
     def get_product_by_id(self, product_id):
         """Get product details by product_id"""
         try:
-            self.cursor.execute('''
-                SELECT name, price, stock, category 
-                FROM products 
-                WHERE product_id = ?
-            ''', (product_id,))
-            return self.cursor.fetchone()
+            product = self.product_repo.get_by_code(product_id)
+            return (product.name, product.price, product.stock, product.category) if product else None
         except sqlite3.Error as e:
             print(f"Error getting product {product_id}: {e}")
             return None
@@ -596,20 +381,52 @@ class BikeShopInventorySystem:
     def get_current_stock(self, product_id):
         """Get current stock for a product"""
         try:
-            self.cursor.execute('SELECT stock FROM products WHERE product_id = ?', (product_id,))
-            result = self.cursor.fetchone()
-            return result[0] if result else 0
+            return self.product_repo.get_stock(product_id) or 0
         except sqlite3.Error as e:
             print(f"Error getting current stock for {product_id}: {e}")
             return 0
 
+    def hold_stock(self, cart_id, product_id, quantity):
+        """Reserve a cart's quantity of a product against other tills; returns (success, message)"""
+        try:
+            self.reservations.reserve(cart_id, product_id, quantity)
+        except (CoreError, sqlite3.Error) as e:
+            if is_outage(e):
+                # Selling offline: the sale is checked when the journal replays it
+                return True, "Offline - not reserved"
+            if isinstance(e, sqlite3.Error):
+                return False, f"Database error: {str(e)}"
+            return False, str(e)
+        return True, "Reserved"
+
+    def release_stock(self, cart_id, product_id=None):
+        """Drop a cart's hold on a product (or all its holds); they expire anyway if this fails"""
+        try:
+            self.reservations.release(cart_id, product_id)
+        except (CoreError, sqlite3.Error) as e:
+            print(f"Error releasing reservation for {cart_id}: {e}")
+
+    def get_held_stock(self, cart_id=None):
+        """Get {product_id: units} held by other tills' carts"""
+        try:
+            return self.reservations.held_stock(cart_id)
+        except (CoreError, sqlite3.Error) as e:
+            print(f"Error getting reserved stock: {e}")
+            return {}
+
+    def get_available_stock(self, product_id, cart_id=None):
+        """Get stock for a product less what other tills' carts hold"""
+        try:
+            return self.reservations.available_stock(product_id, cart_id) or 0
+        except (CoreError, sqlite3.Error) as e:
+            print(f"Error getting available stock for {product_id}: {e}")
+            return self.get_current_stock(product_id)
+
     def check_stock_availability(self, product_id, quantity):
         """Check if enough stock is available for a product"""
         try:
-            self.cursor.execute('SELECT stock FROM products WHERE product_id = ?', (product_id,))
-            result = self.cursor.fetchone()
-            if result:
-                current_stock = result[0]
+            current_stock = self.product_repo.get_stock(product_id)
+            if current_stock is not None:
                 print(f"Stock check for {product_id}: Current={current_stock}, Requested={quantity}")
                 return current_stock >= quantity
             else:
@@ -620,134 +437,94 @@ class BikeShopInventorySystem:
             return False
 
    
-    def validate_transaction(self, cart_items):
+    def validate_transaction(self, cart_items, cart_id=None):
         """Validate that all products in cart exist and have sufficient stock"""
-        for item in cart_items:
-            product_id = item['product_id']
-            
-            # Check if product exists
-            self.cursor.execute('SELECT name, stock FROM products WHERE product_id = ?', (product_id,))
-            product = self.cursor.fetchone()
-            
-            if not product:
-                return False, f"Product {item['product_name']} (ID: {product_id}) not found in inventory"
-            
-            # Check stock availability
-            product_name, stock = product
-            if item['quantity'] > stock:
-                return False, f"Insufficient stock for {product_name}. Available: {stock}, Requested: {item['quantity']}"
-        
+        if self.is_offline():
+            # Don't wait on an unreachable database; the sale is queued and checked on replay
+            return True, "Offline - validation skipped"
+        try:
+            self.checkout.validate(cart_items, cart_id)
+        except (CoreError, sqlite3.Error) as e:
+            if getattr(self, 'journal', None) is not None and is_outage(e):
+                return True, "Offline - validation skipped"
+            if isinstance(e, sqlite3.Error):
+                return False, f"Database error: {str(e)}"
+            return False, str(e)
         return True, "Validation successful"
 
-    def record_sale(self, cart_items, payment_method='Cash'):
+    def new_transaction_id(self):
+        """Get a unique transaction ID"""
+        return new_transaction_id()
+
+    def record_sale(self, cart_items, payment_method='Cash', cart_id=None):
         """Record a sale transaction and update inventory - UPDATED with customer address support"""
         try:
             print(f"Recording sale with {len(cart_items)} items")
-            
-            # Validate input
-            if not cart_items:
-                return False, "No items to record"
-            
-            # Generate unique transaction ID
-            transaction_id = f"TXN{datetime.now().strftime('%Y%m%d%H%M%S')}"
-            total_amount = 0
-            sale_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Start transaction
-            self.cursor.execute('BEGIN TRANSACTION')
-            
-            # Validate and process each item
-            for item in cart_items:
-                required_fields = ['product_id', 'product_name', 'customer_name', 'unit_price', 'quantity']
-                if not all(field in item for field in required_fields):
-                    self.cursor.execute('ROLLBACK')
-                    return False, f"Missing required fields in item: {item}"
-                
-                # Validate stock availability
-                if not self.check_stock_availability(item['product_id'], item['quantity']):
-                    current_stock = self.get_current_stock(item['product_id'])
-                    self.cursor.execute('ROLLBACK')
-                    return False, f"Insufficient stock for {item['product_name']}. Available: {current_stock}, Requested: {item['quantity']}"
-                
-                # Calculate item total
-                item_total = item['quantity'] * item['unit_price']
-                total_amount += item_total
-                
-                # Get customer address (might be empty)
-                customer_address = item.get('customer_address', '')
-                
-                # Insert into sales table
-                self.cursor.execute('''
-                    INSERT INTO sales (transaction_id, product_id, product_name, product_category, 
-                                    customer_name, customer_address, quantity, price, total, sale_date)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (transaction_id, item['product_id'], item['product_name'], 
-                    item.get('category', 'N/A'), item['customer_name'], customer_address,
-                    item['quantity'], item['unit_price'], item_total, sale_date))
-                
-                # Update product stock
-                self.cursor.execute('''
-                    UPDATE products 
-                    SET stock = stock - ? 
-                    WHERE product_id = ?
-                ''', (item['quantity'], item['product_id']))
-                
-                # Verify the update worked
-                if self.cursor.rowcount == 0:
-                    self.cursor.execute('ROLLBACK')
-                    return False, f"Failed to update stock for product {item['product_id']}"
-                
-                # Get updated stock for logging
-                self.cursor.execute('SELECT stock FROM products WHERE product_id = ?', (item['product_id'],))
-                updated_stock = self.cursor.fetchone()
-                
-                if updated_stock is None:
-                    self.cursor.execute('ROLLBACK')
-                    return False, f"Product {item['product_id']} not found after stock update"
-                
-                if updated_stock[0] < 0:
-                    self.cursor.execute('ROLLBACK')
-                    return False, f"Stock would become negative for {item['product_name']}"
-                
-                # Record stock movement 
-                address_note = f" (Address: {customer_address})" if customer_address else ""
-                self.cursor.execute('''
-                    INSERT INTO stock_movements (product_id, product_name, movement_type, quantity, 
-                                            reference_id, reason, notes)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (item['product_id'], item['product_name'], 'OUT', 
-                    item['quantity'], transaction_id, 'SALE', 
-                    f'Sold {item["quantity"]} units to {item["customer_name"]}{address_note}. New stock: {updated_stock[0]}'))
-            
-            # Insert into transactions table
-            self.cursor.execute('''
-                INSERT INTO transactions (transaction_id, total_amount, payment_method, transaction_date)
-                VALUES (?, ?, ?, ?)
-            ''', (transaction_id, total_amount, payment_method, sale_date))
-            
-            # Commit the transaction
-            self.cursor.execute('COMMIT')
-            
-            print(f"Sale recorded successfully. Transaction ID: {transaction_id}, Total: ₱{total_amount:.2f}")
-            return True, transaction_id
-            
+            if getattr(self, 'journal', None) is not None:
+                return self.record_journaled_sale(cart_items, payment_method, cart_id)
+            sale = self.checkout.record_sale(cart_items, payment_method, cart_id=cart_id)
+            print(f"Sale recorded successfully. Transaction ID: {sale.transaction_id}, Total: ₱{sale.total_amount:.2f}")
+            return True, sale.transaction_id
+            
+        except CoreError as e:
+            print(f"Sale not recorded: {e}")
+            return False, str(e)
         except sqlite3.Error as e:
-            self.cursor.execute('ROLLBACK')
             print(f"Database error in record_sale: {e}")
             return False, f"Database error: {str(e)}"
         except Exception as e:
-            self.cursor.execute('ROLLBACK')
             print(f"Unexpected error in record_sale: {e}")
             import traceback
             traceback.print_exc()
             return False, f"Unexpected error: {str(e)}"
 
+    def record_journaled_sale(self, cart_items, payment_method, cart_id=None):
+        """Write the sale to the journal first, then to the database; queue it if the database is down"""
+        for item in cart_items:
+            check_item_fields(item)
+        transaction_id = new_transaction_id()
+        sale_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.journal.append_intent(transaction_id, cart_items, payment_method, sale_date, in_flight=True,
+                                   cart_id=cart_id)
+
+        if not self.replayer.online:
+            return self.queue_sale(transaction_id)
+        try:
+            sale = self.checkout.record_sale(cart_items, payment_method, transaction_id, sale_date, cart_id)
+        except (CoreError, sqlite3.Error) as e:
+            if is_outage(e):
+                print(f"Database unavailable ({e})")
+                self.replayer.online = False
+                return self.queue_sale(transaction_id)
+            self.journal.mark_rejected(transaction_id, str(e))
+            raise
+        self.journal.mark_applied(transaction_id)
+        print(f"Sale recorded successfully. Transaction ID: {sale.transaction_id}, Total: ₱{sale.total_amount:.2f}")
+        return True, sale.transaction_id
+
+    def queue_sale(self, transaction_id):
+        """Leave a journaled sale for the replayer; it releases the cart's reservations when the sale applies"""
+        self.journal.release(transaction_id)
+        self.replayer.notify()
+        print(f"Sale {transaction_id} queued offline ({self.journal.pending_count()} waiting)")
+        return True, transaction_id
+
+    def show_diagnostics(self):
+        """Open the query diagnostics window"""
+        DiagnosticsWindow(self.root, self)
+
     def logout(self):
         """Handle logout"""
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
             self.root.quit()
 
     def __del__(self):
+        if getattr(self, 'replayer', None) is not None:
+            self.replayer.stop()
+        if getattr(self, 'receipt_queue', None) is not None:
+            self.receipt_queue.stop()
+        if getattr(getattr(self, 'dashboard_module', None), 'loader', None) is not None:
+            self.dashboard_module.loader.stop()
         if hasattr(self, 'conn'):
             self.conn.close()
 
@@ -1,15 +1,25 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-from datetime import datetime
+from scanner import ScanDetector
+from core import Cart
+from receipts import make_receipt
+from transactions import TransactionLookupWindow
+
+# Typing in the search box refilters the list once the keys stop for this long
+FILTER_DELAY_MS = 150
 
 class PointOfSaleModule:
     def __init__(self, parent, main_app):
         self.parent = parent
         self.main_app = main_app
         self.frame = None
-        self.cart_items = []
+        self.cart = Cart()
         self.current_customer = ""
         self.all_products = [] 
+        # Barcode and product ID -> product, for scans that skip the product list
+        self.scan_lookup = {}
+        self.scan_detector = ScanDetector()
+        self.filter_job = None
         
     def create_interface(self):
         """Create the Point of Sale interface"""
@@ -80,8 +90,9 @@ class PointOfSaleModule:
         self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var, 
                                      style='Modern.TEntry', width=20)
         self.search_entry.pack(side='left', padx=(0, 10))
-        self.search_entry.bind('<KeyRelease>', self.apply_filters)
-        self.search_entry.bind('<Return>', self.add_first_product)
+        self.search_entry.bind('<Key>', self.on_search_key)
+        self.search_entry.bind('<KeyRelease>', self.schedule_filters)
+        self.search_entry.bind('<Return>', self.on_search_return)
         
         ttk.Button(search_frame, text="Add", command=self.add_selected_product,
                   style='Primary.TButton').pack(side='left')
@@ -199,11 +210,17 @@ class PointOfSaleModule:
         # Checkout button
         ttk.Button(checkout_frame, text="💳 CHECKOUT", command=self.process_checkout,
                   style='Success.TButton').pack(fill='x', pady=(10, 0))
+        ttk.Button(checkout_frame, text="🔍 Find Transaction / Reprint",
+                  command=lambda: TransactionLookupWindow(self.frame, self.main_app),
+                  style='Secondary.TButton').pack(fill='x', pady=(8, 0))
         
         # Load products and categories
         self.load_products()
         self.load_categories()
         
+        # The cart outlives the page, so show what's already in it
+        self.refresh_cart()
+        
         # Focus customer entry
         self.customer_entry.focus()
         
@@ -303,6 +320,71 @@ class PointOfSaleModule:
         # Display filtered products
         self.display_products(filtered_products)
     
+    def on_search_key(self, event):
+        self.scan_detector.key(event.char, event.time)
+
+    def schedule_filters(self, event=None):
+        """Refilter once typing pauses, so a burst of keys (a scan) doesn't rebuild the list per key"""
+        if event is not None and event.keysym == 'Return':
+            return
+        if self.filter_job is not None:
+            self.frame.after_cancel(self.filter_job)
+        self.filter_job = self.frame.after(FILTER_DELAY_MS, self.run_scheduled_filters)
+
+    def run_scheduled_filters(self):
+        self.filter_job = None
+        self.apply_filters()
+
+    def cancel_scheduled_filters(self):
+        if self.filter_job is not None:
+            self.frame.after_cancel(self.filter_job)
+            self.filter_job = None
+
+    def on_search_return(self, event):
+        """Enter in the search box: add a scanned item directly, else the first listed product"""
+        code = self.scan_detector.finish(event.time)
+        if code:
+            self.cancel_scheduled_filters()
+            # Take the scanned code back out of the search box; the list never saw it
+            text = self.search_var.get()
+            if text.endswith(code):
+                self.search_var.set(text[:-len(code)])
+                self.search_entry.icursor('end')
+            self.add_scanned_product(code)
+            return 'break'
+        if self.filter_job is not None:
+            self.cancel_scheduled_filters()
+            self.apply_filters()
+        self.add_first_product()
+        return 'break'
+
+    def build_scan_lookup(self):
+        """Index the loaded products by product ID and barcode"""
+        lookup = {product.product_id: product for product in self.all_products}
+        try:
+            for barcode, product_id in self.main_app.product_repo.list_barcodes():
+                if product_id in lookup:
+                    lookup[barcode] = lookup[product_id]
+        except Exception as e:
+            print(f"Error loading barcodes: {e}")
+        self.scan_lookup = lookup
+
+    def add_scanned_product(self, code):
+        """Add one unit of a scanned barcode or product ID without touching the product list"""
+        product = self.scan_lookup.get(code)
+        if product is None:
+            # Added since the list was loaded, or a code typed differently; one indexed lookup
+            try:
+                product = self.main_app.product_repo.get_by_scan_code(code)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to look up {code}: {str(e)}")
+                return
+            if product is None:
+                messagebox.showwarning("Warning", f"No product with barcode or ID '{code}'.")
+                return
+            self.scan_lookup[code] = product
+        self.add_product_to_cart(product)
+
     def add_first_product(self, event=None):
         """Add the first product in the filtered list"""
         children = self.product_tree.get_children()
@@ -334,63 +416,66 @@ class PointOfSaleModule:
         
         # Get the complete product info from database
         try:
-            self.main_app.cursor.execute('SELECT id, name, price, stock, category, product_id FROM products WHERE id = ?', (internal_id,))
-            product = self.main_app.cursor.fetchone()
+            product = self.main_app.product_repo.get(internal_id)
             
             if not product:
                 messagebox.showerror("Error", "Product not found in database!")
                 return
-                
-            product_id = product[5]  
-            product_name = product[1]
-            price = float(product[2])
-            stock = int(product[3])
-            category = product[4] if product[4] else 'General'
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to get product details: {str(e)}")
             return
         
-        if stock <= 0:
-            messagebox.showwarning("Warning", f"'{product_name}' is out of stock!")
+        if not self.add_product_to_cart(product):
             return
         
-        # Check if product already in cart
-        for i, cart_item in enumerate(self.cart_items):
-            if cart_item['product_id'] == product_id: 
-                current_qty = cart_item['quantity']
-                if current_qty < stock:
-                    self.cart_items[i]['quantity'] += 1
-                    self.refresh_cart()
-                    return
-                else:
-                    messagebox.showwarning("Warning", f"Cannot add more. Only {stock} units available.")
-                    return
-        
-        # Add new item to cart
-        cart_item = {
-            'product_id': product_id,  
-            'product_name': product_name,
-            'customer_name': self.customer_var.get().strip(),
-            'unit_price': price,
-            'quantity': 1,
-            'category': category
-        }
-        
-        self.cart_items.append(cart_item)
-        self.refresh_cart()
-        
         # Clear search and focus back to search
         self.search_var.set("")
         self.apply_filters()
         self.search_entry.focus()
 
+    def add_product_to_cart(self, product):
+        """Add one unit of a product to the cart; returns True when it was added"""
+        if not self.customer_var.get().strip():
+            messagebox.showwarning("Warning", "Please enter customer name first.")
+            self.customer_entry.focus()
+            return False
+        
+        product_id = product[5]  
+        product_name = product[1]
+        price = float(product[2])
+        stock = int(product[3])
+        category = product[4] if product[4] else 'General'
+        
+        if stock <= 0:
+            messagebox.showwarning("Warning", f"'{product_name}' is out of stock!")
+            return False
+        
+        line = self.cart.get(product_id)
+        if line is not None and line.quantity >= stock:
+            messagebox.showwarning("Warning", f"Cannot add more. Only {stock} units available.")
+            return False
+        
+        # Hold the units so another till can't sell them while this customer is served
+        held, message = self.main_app.hold_stock(self.cart.cart_id, product_id, (line.quantity if line else 0) + 1)
+        if not held:
+            messagebox.showwarning("Warning", f"Cannot add '{product_name}':\n{message}")
+            return False
+        
+        line, is_new = self.cart.add(product_id, product_name, price, category)
+        self.show_cart_line(line, is_new)
+        return True
+
 
     def load_products(self):
         """Load all products into memory and display"""
         try:
-            self.main_app.cursor.execute('SELECT id, name, price, stock, category, product_id FROM products ORDER BY name')
-            self.all_products = self.main_app.cursor.fetchall()
+            # Show what's available to sell: stock less other tills' open carts
+            held = self.main_app.get_held_stock(self.cart.cart_id)
+            self.all_products = [product._replace(stock=product.stock - held[product.product_id])
+                                 if product.product_id in held else product
+                                 for product in self.main_app.product_repo.list_all()]
+            self.build_scan_lookup()
             self.display_products(self.all_products)
                 
         except Exception as e:
@@ -425,31 +510,29 @@ class PointOfSaleModule:
         # Update product count
         self.product_count_var.set(f"Products: {len(products)}")
     
+    def cart_row_values(self, line):
+        name = line.product_name[:20] + "..." if len(line.product_name) > 20 else line.product_name
+        return (name, line.quantity, f"₱{line.unit_price:.2f}", f"₱{line.line_total:.2f}")
+
+    def show_cart_line(self, line, is_new=False):
+        """Insert or update one cart row (keyed by product ID) and the totals"""
+        if is_new or not self.cart_tree.exists(line.product_id):
+            self.cart_tree.insert('', 'end', iid=line.product_id, values=self.cart_row_values(line))
+        else:
+            self.cart_tree.item(line.product_id, values=self.cart_row_values(line))
+        self.cart_tree.see(line.product_id)
+        self.update_cart_totals()
+
+    def update_cart_totals(self):
+        self.total_var.set(f"₱{self.cart.subtotal:,.2f}")
+        self.cart_count_var.set(f"Items: {len(self.cart)}")
+
     def refresh_cart(self):
-        """Refresh cart display and calculate total"""
-        # Clear cart tree
-        for item in self.cart_tree.get_children():
-            self.cart_tree.delete(item)
-        
-        total = 0
-        
-        # Add items to cart tree
-        for cart_item in self.cart_items:
-            item_total = cart_item['quantity'] * cart_item['unit_price']
-            total += item_total
-            
-            self.cart_tree.insert('', 'end', values=(
-                cart_item['product_name'][:20] + "..." if len(cart_item['product_name']) > 20 else cart_item['product_name'],
-                cart_item['quantity'],
-                f"₱{cart_item['unit_price']:.2f}",
-                f"₱{item_total:.2f}"
-            ))
-        
-        # Update total display
-        self.total_var.set(f"₱{total:,.2f}")
-        
-        # Update cart count
-        self.cart_count_var.set(f"Items: {len(self.cart_items)}")
+        """Rebuild the whole cart display (changes to single lines use show_cart_line)"""
+        self.cart_tree.delete(*self.cart_tree.get_children())
+        for line in self.cart:
+            self.cart_tree.insert('', 'end', iid=line.product_id, values=self.cart_row_values(line))
+        self.update_cart_totals()
     
     def remove_cart_item(self, event=None):
         """Remove selected item from cart"""
@@ -457,14 +540,13 @@ class PointOfSaleModule:
         if not selection:
             return
         
-        # Get the index of selected item
-        selected_index = self.cart_tree.index(selection[0])
-        
-        # Remove from cart_items list
-        if 0 <= selected_index < len(self.cart_items):
-            removed_item = self.cart_items.pop(selected_index)
-            self.refresh_cart()
-            print(f"Removed {removed_item['product_name']} from cart")
+        for product_id in selection:
+            removed = self.cart.remove(product_id)
+            self.cart_tree.delete(product_id)
+            self.main_app.release_stock(self.cart.cart_id, product_id)
+            if removed is not None:
+                print(f"Removed {removed.product_name} from cart")
+        self.update_cart_totals()
     
     def edit_cart_item_quantity(self, event=None):
         """Edit quantity of cart item"""
@@ -472,37 +554,39 @@ class PointOfSaleModule:
         if not selection:
             return
         
-        selected_index = self.cart_tree.index(selection[0])
-        if not (0 <= selected_index < len(self.cart_items)):
+        line = self.cart.get(selection[0])
+        if line is None:
             return
         
-        cart_item = self.cart_items[selected_index]
-        
-        # Get available stock
-        current_stock = self.main_app.get_current_stock(cart_item['product_id'])
+        # Get available stock (less what other tills' carts hold)
+        current_stock = self.main_app.get_available_stock(line.product_id, self.cart.cart_id)
         
         # Ask for new quantity
         new_qty = simpledialog.askinteger(
             "Edit Quantity",
-            f"Enter new quantity for {cart_item['product_name']}:\n(Available stock: {current_stock})",
-            initialvalue=cart_item['quantity'],
+            f"Enter new quantity for {line.product_name}:\n(Available stock: {current_stock})",
+            initialvalue=line.quantity,
             minvalue=1,
             maxvalue=current_stock
         )
         
-        if new_qty and new_qty != cart_item['quantity']:
-            self.cart_items[selected_index]['quantity'] = new_qty
-            self.refresh_cart()
+        if new_qty and new_qty != line.quantity:
+            held, message = self.main_app.hold_stock(self.cart.cart_id, line.product_id, new_qty)
+            if not held:
+                messagebox.showwarning("Warning", message)
+                return
+            self.show_cart_line(self.cart.set_quantity(line.product_id, new_qty))
     
     def clear_cart(self):
         """Clear all items from cart"""
-        if self.cart_items and messagebox.askyesno("Confirm", "Clear all items from cart?"):
-            self.cart_items.clear()
+        if len(self.cart) and messagebox.askyesno("Confirm", "Clear all items from cart?"):
+            self.cart.clear()
+            self.main_app.release_stock(self.cart.cart_id)
             self.refresh_cart()
     
     def process_checkout(self):
         """Process the checkout"""
-        if not self.cart_items:
+        if not len(self.cart):
             messagebox.showwarning("Warning", "Cart is empty!")
             return
         
@@ -515,26 +599,23 @@ class PointOfSaleModule:
         customer_name = self.customer_var.get().strip()
         customer_address = self.address_var.get().strip()  
         
-        for item in self.cart_items:
-            item['customer_name'] = customer_name
-            item['customer_address'] = customer_address  
+        cart_items = self.cart.items(customer_name, customer_address)
         
         # Validate transaction
-        is_valid, message = self.main_app.validate_transaction(self.cart_items)
+        is_valid, message = self.main_app.validate_transaction(cart_items, self.cart.cart_id)
         if not is_valid:
             messagebox.showerror("Validation Error", message)
             return
         
         # Show checkout confirmation with detailed items list
-        total = sum(item['quantity'] * item['unit_price'] for item in self.cart_items)
+        total = self.cart.subtotal
         
         # Get customer address for display
         address_display = f"Address: {customer_address}\n" if customer_address else ""
         
-        items_detail = "Items:\n"
-        for item in self.cart_items:
-            item_total = item['quantity'] * item['unit_price']
-            items_detail += f"• {item['quantity']}x {item['product_name']} @ ₱{item['unit_price']:.2f} = ₱{item_total:.2f}\n"
+        items_detail = "Items:\n" + "".join(
+            f"• {line.quantity}x {line.product_name} @ ₱{line.unit_price:.2f} = ₱{line.line_total:.2f}\n"
+            for line in self.cart)
 
         confirmation_message = (f"Customer: {customer_name}\n"
                             f"{address_display}\n"
@@ -545,205 +626,64 @@ class PointOfSaleModule:
 
         if messagebox.askyesno("Confirm Checkout", confirmation_message):
             
-            # Make a copy of cart items for receipt before clearing
-            cart_items_copy = self.cart_items.copy()
-            
             # Process the sale
-            success, result = self.main_app.record_sale(self.cart_items, self.payment_var.get())
+            success, result = self.main_app.record_sale(cart_items, self.payment_var.get(), self.cart.cart_id)
             
             if success:
-                messagebox.showinfo("Success", 
-                                f"Sale completed successfully!\n"
-                                f"Transaction ID: {result}\n"
-                                f"Total: ₱{total:,.2f}")
+                offline = self.main_app.is_offline()
+                if offline:
+                    messagebox.showinfo("Saved Offline",
+                                    f"The database is unavailable, so this sale was saved on this till\n"
+                                    f"and will be recorded automatically when it's back.\n\n"
+                                    f"Transaction ID: {result}\n"
+                                    f"Total: ₱{total:,.2f}\n"
+                                    f"Queued sales: {self.main_app.pending_sales_count()}")
+                else:
+                    messagebox.showinfo("Success", 
+                                    f"Sale completed successfully!\n"
+                                    f"Transaction ID: {result}\n"
+                                    f"Total: ₱{total:,.2f}")
                 
                 # Clear cart and reset customer
-                self.cart_items.clear()
+                self.cart.clear()
                 self.customer_var.set("")
                 self.address_var.set("")  
                 self.refresh_cart()
-                self.load_products()  
+                if offline:
+                    self.take_sold_stock(cart_items)
+                else:
+                    self.load_products()  
                 self.customer_entry.focus()
                 
                 # Print receipt option 
                 if messagebox.askyesno("Print Receipt", "Would you like to print a receipt?"):
-                    self.print_receipt(result, customer_name, customer_address, total, cart_items_copy)
+                    self.print_receipt(result, customer_name, customer_address, total, cart_items)
                     
             else:
                 messagebox.showerror("Error", f"Failed to process sale:\n{result}")
     
-    def print_receipt(self, transaction_id, customer_name, customer_address, total, cart_items=None):
-        """Show receipt in a popup window with detailed product list"""
+    def take_sold_stock(self, cart_items):
+        """Update the in-memory stock after a queued sale (the database can't be re-read while offline)"""
+        sold = {}
+        for item in cart_items:
+            sold[item['product_id']] = sold.get(item['product_id'], 0) + item['quantity']
+        self.all_products = [product._replace(stock=product.stock - sold[product.product_id])
+                             if product.product_id in sold else product
+                             for product in self.all_products]
+        self.build_scan_lookup()
+        self.apply_filters()
 
+    def print_receipt(self, transaction_id, customer_name, customer_address, total, cart_items=None,
+                      payment_method=None):
+        """Queue a receipt on the receipt printer; the till carries on with the next sale"""
         if cart_items is None:
-            cart_items = self.cart_items
+            cart_items = self.cart.items(customer_name, customer_address)
+        receipt = make_receipt(transaction_id, cart_items, payment_method or self.payment_var.get(),
+                               customer_name, customer_address, total)
+        self.main_app.receipt_queue.submit(receipt)
+        print(f"Receipt {transaction_id} queued ({self.main_app.receipt_queue.pending()} waiting)")
+        return receipt
 
-        receipt_window = tk.Toplevel(self.frame)
-        receipt_window.title("Receipt")
-        receipt_window.geometry("450x650")
-        receipt_window.configure(bg='white')
-        receipt_window.transient(self.frame)
-        receipt_window.grab_set()
-        
-        # Center the window
-        receipt_window.update_idletasks()
-        x = (receipt_window.winfo_screenwidth() // 2) - (450 // 2)
-        y = (receipt_window.winfo_screenheight() // 2) - (650 // 2)
-        receipt_window.geometry(f"450x650+{x}+{y}")
-        
-        # Create main frame with scrollbar
-        main_frame = ttk.Frame(receipt_window)
-        main_frame.pack(fill='both', expand=True, padx=10, pady=10)
-        
-        # Create canvas and scrollbar for scrolling
-        canvas = tk.Canvas(main_frame, bg='white')
-        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Receipt content in scrollable frame
-        receipt_frame = ttk.Frame(scrollable_frame)
-        receipt_frame.pack(fill='both', expand=True, padx=15, pady=15)
-        
-        # Header
-        header_frame = ttk.Frame(receipt_frame)
-        header_frame.pack(fill='x', pady=(0, 15))
-        
-        ttk.Label(header_frame, text="BIKE SHOP", font=('Arial', 18, 'bold')).pack()
-        ttk.Label(header_frame, text="Official Sales Receipt", font=('Arial', 12)).pack(pady=(5, 0))
-        ttk.Label(header_frame, text="=" * 50, font=('Courier', 10)).pack(pady=(5, 0))
-        
-        # Transaction info
-        info_frame = ttk.Frame(receipt_frame)
-        info_frame.pack(fill='x', pady=(0, 15))
-        
-        ttk.Label(info_frame, text=f"Receipt #: {transaction_id}", font=('Arial', 10, 'bold')).pack(anchor='w')
-        ttk.Label(info_frame, text=f"Date: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", font=('Arial', 10)).pack(anchor='w', pady=(2, 0))
-        ttk.Label(info_frame, text=f"Customer: {customer_name}", font=('Arial', 10, 'bold')).pack(anchor='w', pady=(5, 0))
-        
-        if customer_address:
-            ttk.Label(info_frame, text=f"Address: {customer_address}", font=('Arial', 10)).pack(anchor='w', pady=(2, 0))
-        
-        ttk.Label(info_frame, text=f"Payment Method: {self.payment_var.get()}", font=('Arial', 10)).pack(anchor='w', pady=(2, 0))
-        
-        # Separator
-        ttk.Label(receipt_frame, text="=" * 50, font=('Courier', 10)).pack(pady=(10, 5))
-        
-        # Items header
-        items_header_frame = ttk.Frame(receipt_frame)
-        items_header_frame.pack(fill='x', pady=(0, 5))
-        ttk.Label(items_header_frame, text="ITEMS PURCHASED:", font=('Arial', 12, 'bold')).pack(anchor='w')
-        
-        # Items detail
-        items_frame = ttk.Frame(receipt_frame)
-        items_frame.pack(fill='x', pady=(0, 10))
-        
-        total_items = 0
-        for i, item in enumerate(cart_items, 1):
-            item_total = item['quantity'] * item['unit_price']
-            total_items += item['quantity']
-            
-            # Item number and name
-            item_name_frame = ttk.Frame(items_frame)
-            item_name_frame.pack(fill='x', pady=(5 if i > 1 else 0, 0))
-            
-            ttk.Label(item_name_frame, 
-                    text=f"{i}. {item['product_name']}", 
-                    font=('Arial', 11, 'bold')).pack(anchor='w')
-            
-            # Category if available
-            if 'category' in item and item['category']:
-                ttk.Label(item_name_frame, 
-                        text=f"   Category: {item['category']}", 
-                        font=('Arial', 9), 
-                        foreground='gray').pack(anchor='w')
-            
-            # Quantity, price, and total
-            item_detail_frame = ttk.Frame(items_frame)
-            item_detail_frame.pack(fill='x', pady=(2, 0))
-            
-            ttk.Label(item_detail_frame, 
-                    text=f"   Qty: {item['quantity']} × ₱{item['unit_price']:,.2f} each", 
-                    font=('Arial', 10)).pack(anchor='w')
-            
-            ttk.Label(item_detail_frame, 
-                    text=f"   Subtotal: ₱{item_total:,.2f}", 
-                    font=('Arial', 10, 'bold')).pack(anchor='w')
-        
-        # Summary section
-        ttk.Label(receipt_frame, text="=" * 50, font=('Courier', 10)).pack(pady=(15, 5))
-        
-        summary_frame = ttk.Frame(receipt_frame)
-        summary_frame.pack(fill='x', pady=(0, 15))
-        
-        ttk.Label(summary_frame, text=f"Total Items: {total_items}", font=('Arial', 11)).pack(anchor='w')
-        ttk.Label(summary_frame, text=f"Total Products: {len(cart_items)}", font=('Arial', 11)).pack(anchor='w', pady=(2, 0))
-        
-        # Total amount (highlighted)
-        total_frame = ttk.Frame(receipt_frame)
-        total_frame.pack(fill='x', pady=(10, 0))
-        
-        ttk.Label(total_frame, text="=" * 50, font=('Courier', 10)).pack()
-        ttk.Label(total_frame, text=f"TOTAL AMOUNT: ₱{total:,.2f}", 
-                font=('Arial', 16, 'bold'), foreground='blue').pack(pady=(5, 5))
-        ttk.Label(total_frame, text="=" * 50, font=('Courier', 10)).pack()
-        
-        # Footer
-        footer_frame = ttk.Frame(receipt_frame)
-        footer_frame.pack(fill='x', pady=(20, 0))
-        
-        ttk.Label(footer_frame, text="Thank you for choosing Bike Shop!", 
-                font=('Arial', 12, 'bold')).pack(pady=(0, 5))
-        ttk.Label(footer_frame, text="Have a great ride!", 
-                font=('Arial', 10, 'italic')).pack(pady=(0, 10))
-        ttk.Label(footer_frame, text="For questions or concerns, please contact us.", 
-                font=('Arial', 9)).pack()
-        
-        # Pack canvas and scrollbar
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Button frame at bottom
-        button_frame = ttk.Frame(receipt_window)
-        button_frame.pack(fill='x', padx=10, pady=(0, 10))
-        
-        # Print and Close buttons
-        btn_frame = ttk.Frame(button_frame)
-        btn_frame.pack()
-        
-        ttk.Button(btn_frame, text="Print Receipt", 
-                command=lambda: self.actual_print_receipt(receipt_window),
-                style='Primary.TButton').pack(side='left', padx=(0, 10))
-        
-        ttk.Button(btn_frame, text="Close", 
-                command=receipt_window.destroy,
-                style='Secondary.TButton').pack(side='left')
-        
-        # Bind mouse wheel to canvas for scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        canvas.bind("<MouseWheel>", _on_mousewheel)
-        
-        # Focus on close button
-        receipt_window.focus_set()
-    
-    def actual_print_receipt(self, receipt_window):
-        """Handle actual printing of receipt"""
-        try:
-            # This would integrate with your system's printing functionality
-            #messagebox.showinfo("Print", "Receipt sent to printer!\n(Print functionality would be implemented here)")
-            receipt_window.destroy()
-        except Exception as e:
-            messagebox.showerror("Print Error", f"Failed to print receipt: {str(e)}")
-    
     def refresh(self):
         """Refresh the POS interface"""
         if self.frame:
@@ -0,0 +1,157 @@
+import functools
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+
+class QueryCache:
+    """LRU cache for read-only query results, invalidated by per-table version counters.
+
+    Every entry remembers the versions of the tables it was computed from. Write
+    paths call bump() for the tables they touch, so the next lookup sees a newer
+    version and recomputes instead of serving stale data.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.table_versions = {}
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    def get_versions(self, tables):
+        """Get the current version tuple for a set of tables"""
+        with self.lock:
+            return tuple(self.table_versions.get(table, 0) for table in tables)
+
+    def bump(self, *tables):
+        """Mark tables as modified so dependent entries are recomputed"""
+        with self.lock:
+            for table in tables:
+                self.table_versions[table] = self.table_versions.get(table, 0) + 1
+            self.invalidations += 1
+
+    def lookup(self, key, versions):
+        """Return (found, value) for a key computed at the given table versions"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == versions:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            self.misses += 1
+            return False, None
+
+    def store(self, key, versions, value):
+        """Store a value computed at the given table versions"""
+        with self.lock:
+            self.entries[key] = (versions, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached entries (counters are kept)"""
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Get hit/miss counters for diagnostics"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+                'entries': len(self.entries),
+                'invalidations': self.invalidations,
+                'table_versions': dict(self.table_versions)
+            }
+
+
+def _find_cache(owner):
+    """Locate the shared QueryCache from the app or from a module's main_app"""
+    cache = getattr(owner, 'query_cache', None)
+    if cache is None:
+        cache = getattr(getattr(owner, 'main_app', None), 'query_cache', None)
+    return cache
+
+
+_MUTABLE = (list, dict, set)
+
+
+def _has_mutable(value):
+    """Check whether value is, or a tuple holding, a list, dict or set"""
+    if isinstance(value, _MUTABLE):
+        return True
+    if isinstance(value, tuple):
+        for item in value:
+            if isinstance(item, _MUTABLE) or (isinstance(item, tuple) and _has_mutable(item)):
+                return True
+    return False
+
+
+def _is_nested(value):
+    """Check whether a result has mutable containers below its top level (rows of plain values don't)"""
+    if isinstance(value, list):
+        return any(_has_mutable(item) for item in value)
+    if isinstance(value, dict):
+        return any(_has_mutable(item) for item in value.values())
+    return isinstance(value, tuple) and _has_mutable(value)
+
+
+def _copy_result(value, nested=True):
+    """Hand out copies of containers so callers can't mutate cached results.
+
+    Nested results are copied all the way down; tuples (rows, namedtuples) are
+    only rebuilt when they hold a mutable container.
+    """
+    if not nested:
+        if isinstance(value, list):
+            return list(value)
+        if isinstance(value, dict):
+            return dict(value)
+        return value
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    if isinstance(value, set):
+        return set(value)
+    if isinstance(value, tuple) and _has_mutable(value):
+        items = [_copy_result(item) for item in value]
+        return type(value)(*items) if hasattr(value, '_fields') else tuple(items)
+    return value
+
+
+def cached_query(*tables, per_day=False):
+    """Cache a getter's result keyed by method and arguments.
+
+    tables lists the tables the query reads; per_day adds today's date to the
+    key for queries relative to 'now' (last 30 days, today's summary, ...).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = _find_cache(self)
+            if cache is None:
+                return func(self, *args, **kwargs)
+
+            key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+            if per_day:
+                key += (datetime.now().strftime('%Y-%m-%d'),)
+
+            versions = cache.get_versions(tables)
+            found, entry = cache.lookup(key, versions)
+            if found:
+                return _copy_result(*entry)
+
+            value = func(self, *args, **kwargs)
+            # Checked once here, so hits on flat results (lists of rows) stay a shallow copy
+            nested = _is_nested(value)
+            cache.store(key, versions, (value, nested))
+            return _copy_result(value, nested)
+        return wrapper
+    return decorator
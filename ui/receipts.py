@@ -0,0 +1,288 @@
+# Receipt rendering and printing without Tk: one layout rendered as plain text,
+# ESC/POS bytes for thermal printers, or a single-page PDF, and a print queue
+# that does the rendering and device writes on a worker thread.
+#
+#     python ui/main.py --receipt-printer /dev/usb/lp0     # or BIKESHOP_RECEIPT_PRINTER
+#
+# Without a printer, receipts are saved as PDFs in receipts/.
+import functools
+import os
+import queue
+import sys
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+
+PRINTER_ENV_VAR = 'BIKESHOP_RECEIPT_PRINTER'
+PRINTER_FLAG = '--receipt-printer'
+RECEIPTS_DIR = 'receipts'
+SHOP_NAME = 'BIKE SHOP'
+
+# 80 mm paper: 42 characters of the printer's default font, 226 pt in a PDF
+RECEIPT_WIDTH = 42
+
+Receipt = namedtuple('Receipt', 'transaction_id sale_date customer_name customer_address payment_method items total')
+
+# (style, text): style is one of title, bold, normal, rule, total
+ReceiptLine = namedtuple('ReceiptLine', 'style text')
+
+
+def requested_printer(argv=None):
+    """Get the receipt printer device or file from --receipt-printer PATH or BIKESHOP_RECEIPT_PRINTER"""
+    argv = sys.argv if argv is None else argv
+    if PRINTER_FLAG in argv:
+        index = argv.index(PRINTER_FLAG)
+        if index + 1 < len(argv):
+            return argv[index + 1]
+    return os.environ.get(PRINTER_ENV_VAR) or None
+
+
+def make_receipt(transaction_id, cart_items, payment_method, customer_name='', customer_address='',
+                 total=None, sale_date=None):
+    """Build a Receipt from POS cart-line dicts"""
+    if total is None:
+        total = sum(item['quantity'] * item['unit_price'] for item in cart_items)
+    return Receipt(transaction_id, sale_date or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                   customer_name, customer_address, payment_method, list(cart_items), total)
+
+
+def money(amount):
+    return f"₱{amount:,.2f}"
+
+
+def two_columns(left, right, width):
+    """Left text and right-aligned text on one line, the left cut short if needed"""
+    room = width - len(right) - 1
+    if len(left) > room:
+        left = left[:max(room - 1, 0)] + '~'
+    return f"{left:<{room}} {right}"
+
+
+def wrap(text, width, indent=''):
+    """Word-wrap text to width"""
+    lines, line = [], ''
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if len(candidate) > width and line:
+            lines.append(line)
+            line = indent + word
+        else:
+            line = candidate
+    if line:
+        lines.append(line)
+    return lines
+
+
+# The fixed parts of every receipt only depend on the paper width
+@functools.lru_cache(maxsize=8)
+def _header(width):
+    return (ReceiptLine('title', SHOP_NAME.center(width)),
+            ReceiptLine('normal', 'Official Sales Receipt'.center(width)),
+            ReceiptLine('rule', '=' * width))
+
+
+@functools.lru_cache(maxsize=8)
+def _footer(width):
+    lines = [ReceiptLine('rule', '=' * width)]
+    for style, text in (('bold', 'Thank you for choosing Bike Shop!'),
+                        ('normal', 'Have a great ride!'),
+                        ('normal', 'For questions or concerns, please contact us.')):
+        lines.extend(ReceiptLine(style, line.center(width)) for line in wrap(text, width))
+    return tuple(lines)
+
+
+def layout(receipt, width=RECEIPT_WIDTH):
+    """Lay a receipt out as ReceiptLines of at most width characters"""
+    lines = list(_header(width))
+    sale_date = datetime.strptime(receipt.sale_date[:19], '%Y-%m-%d %H:%M:%S')
+    lines.append(ReceiptLine('bold', f"Receipt #: {receipt.transaction_id}"))
+    lines.append(ReceiptLine('normal', f"Date: {sale_date.strftime('%b %d, %Y %I:%M %p')}"))
+    if receipt.customer_name:
+        lines.extend(ReceiptLine('normal', text) for text in wrap(f"Customer: {receipt.customer_name}", width, '  '))
+    if receipt.customer_address:
+        lines.extend(ReceiptLine('normal', text) for text in wrap(f"Address: {receipt.customer_address}", width, '  '))
+    lines.append(ReceiptLine('normal', f"Payment: {receipt.payment_method}"))
+    lines.append(ReceiptLine('rule', '-' * width))
+
+    units = 0
+    for item in receipt.items:
+        units += item['quantity']
+        lines.extend(ReceiptLine('normal', text) for text in wrap(item['product_name'], width, '  '))
+        lines.append(ReceiptLine('normal', two_columns(f"  {item['quantity']} x {money(item['unit_price'])}",
+                                                       money(item['quantity'] * item['unit_price']), width)))
+
+    lines.append(ReceiptLine('rule', '-' * width))
+    lines.append(ReceiptLine('normal', two_columns('Items', f"{units} ({len(receipt.items)} products)", width)))
+    lines.append(ReceiptLine('total', two_columns('TOTAL', money(receipt.total), width)))
+    lines.extend(_footer(width))
+    return lines
+
+
+def render_text(receipt, width=RECEIPT_WIDTH):
+    """Render a receipt as plain text"""
+    return '\n'.join(line.text for line in layout(receipt, width)) + '\n'
+
+
+# ESC/POS commands
+ESC_INIT = b'\x1b@'
+ESC_BOLD_ON, ESC_BOLD_OFF = b'\x1bE\x01', b'\x1bE\x00'
+GS_DOUBLE, GS_NORMAL = b'\x1d!\x11', b'\x1d!\x00'
+GS_FEED_AND_CUT = b'\x1dVB\x03'
+ESC_STYLES = {'title': (GS_DOUBLE + ESC_BOLD_ON, ESC_BOLD_OFF + GS_NORMAL),
+              'bold': (ESC_BOLD_ON, ESC_BOLD_OFF),
+              'total': (ESC_BOLD_ON, ESC_BOLD_OFF)}
+
+
+def printable(text):
+    # The peso sign isn't in the printers' code pages or the PDF standard fonts
+    return text.replace('₱', 'P')
+
+
+def render_escpos(receipt, width=RECEIPT_WIDTH, cut=True):
+    """Render a receipt as an ESC/POS byte stream (code page 437)"""
+    out = [ESC_INIT]
+    for line in layout(receipt, width):
+        on, off = ESC_STYLES.get(line.style, (b'', b''))
+        # Double-size text takes two columns per character
+        text = line.text.strip().center(width // 2) if line.style == 'title' else line.text
+        out.append(on + printable(text).encode('cp437', errors='replace') + off + b'\n')
+    if cut:
+        out.append(GS_FEED_AND_CUT)
+    return b''.join(out)
+
+
+# PDF: one page as wide as the paper and as tall as the receipt, in the built-in Courier fonts
+PDF_FONT_SIZE = 9
+PDF_LEADING = 11
+PDF_MARGIN = 10
+PDF_FONTS = {'title': ('F2', 14), 'bold': ('F2', PDF_FONT_SIZE), 'total': ('F2', 11)}
+
+
+@functools.lru_cache(maxsize=1)
+def _pdf_font_objects():
+    return (b'<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>',
+            b'<< /Type /Font /Subtype /Type1 /BaseFont /Courier-Bold /Encoding /WinAnsiEncoding >>')
+
+
+def _pdf_string(text):
+    text = printable(text).replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    return text.encode('cp1252', errors='replace')
+
+
+def render_pdf(receipt, width=RECEIPT_WIDTH):
+    """Render a receipt as a single-page PDF"""
+    lines = layout(receipt, width)
+    # Courier glyphs are 0.6 em wide
+    page_width = int(width * PDF_FONT_SIZE * 0.6) + 2 * PDF_MARGIN
+    page_height = len(lines) * PDF_LEADING + 2 * PDF_MARGIN + 10
+
+    content = [b'BT']
+    y = page_height - PDF_MARGIN - PDF_LEADING
+    for line in lines:
+        font, size = PDF_FONTS.get(line.style, ('F1', PDF_FONT_SIZE))
+        text = line.text.strip() if line.style == 'title' else line.text
+        x = PDF_MARGIN
+        if line.style == 'title':
+            x = max(PDF_MARGIN, (page_width - len(text) * size * 0.6) / 2)
+        content.append(f"/{font} {size} Tf 1 0 0 1 {x:.1f} {y} Tm (".encode('ascii') + _pdf_string(text) + b') Tj')
+        y -= PDF_LEADING
+    content.append(b'ET')
+    stream = b'\n'.join(content)
+
+    regular, bold = _pdf_font_objects()
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {page_width} {page_height}] "
+         f"/Resources << /Font << /F1 4 0 R /F2 5 0 R >> >> /Contents 6 0 R >>").encode('ascii'),
+        regular,
+        bold,
+        f"<< /Length {len(stream)} >>\nstream\n".encode('ascii') + stream + b'\nendstream',
+    ]
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode('ascii') + body + b'\nendobj\n'
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('ascii')
+    out += b''.join(f"{offset:010d} 00000 n \n".encode('ascii') for offset in offsets)
+    out += (f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+            f"startxref\n{xref}\n%%EOF\n").encode('ascii')
+    return bytes(out)
+
+
+PrintJob = namedtuple('PrintJob', 'receipt outputs')
+
+
+class ReceiptPrintQueue:
+    """Renders and prints receipts on a worker thread, so the till moves on to the next sale.
+
+    outputs per job: 'printer' writes ESC/POS to the printer path (a device such
+    as /dev/usb/lp0, or a file), 'pdf' and 'text' save into receipts_dir. A
+    failed job is kept in failed with its error and doesn't stop the queue.
+    """
+
+    def __init__(self, printer=None, receipts_dir=RECEIPTS_DIR, width=RECEIPT_WIDTH):
+        self.printer = printer
+        self.receipts_dir = receipts_dir
+        self.width = width
+        self.jobs = queue.Queue()
+        self.printed = 0
+        self.failed = []
+        self.thread = None
+
+    @property
+    def default_outputs(self):
+        return ('printer',) if self.printer else ('pdf',)
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name='receipt-printer', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.jobs.put(None)
+
+    def submit(self, receipt, outputs=None):
+        """Queue a receipt; returns at once"""
+        self.jobs.put(PrintJob(receipt, tuple(outputs or self.default_outputs)))
+
+    def pending(self):
+        return self.jobs.qsize()
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            try:
+                for output in job.outputs:
+                    self.write(job.receipt, output)
+                self.printed += 1
+            except Exception as e:
+                # Any failure (a bad render as much as a missing printer) fails this job, not the queue
+                print(f"Receipt {job.receipt.transaction_id} not printed: {e}")
+                self.failed.append((job, str(e)))
+
+    def write(self, receipt, output):
+        """Render one output of a receipt; returns the path written"""
+        if output == 'printer':
+            if not self.printer:
+                raise ValueError("No receipt printer configured")
+            # Devices take one write per receipt; append keeps earlier receipts when it's a file
+            with open(self.printer, 'ab') as f:
+                f.write(render_escpos(receipt, self.width))
+            return self.printer
+
+        renderers = {'pdf': (render_pdf, 'wb'), 'text': (render_text, 'w')}
+        if output not in renderers:
+            raise ValueError(f"Unknown receipt output {output}")
+        render, mode = renderers[output]
+        os.makedirs(self.receipts_dir, exist_ok=True)
+        path = os.path.join(self.receipts_dir, f"{receipt.transaction_id}.{output if output == 'pdf' else 'txt'}")
+        data = render(receipt, self.width)
+        with open(path, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+            f.write(data)
+        return path
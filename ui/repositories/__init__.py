@@ -0,0 +1,8 @@
+from .base import BaseRepo, QueryTiming, get_query_timings, reset_query_timings
+from .products import ProductRepo, ProductRow
+from .sales import SalesRepo, RecentSaleRow, TransactionRow, SaleLineRow
+from .stock_movements import StockMovementRepo, StockDiscrepancy
+from .services import ServiceRepo, ServiceRow, ResourceRow
+from .reservations import ReservationRepo
+from .bookings import (BookingRepo, BookingRow, BookingDetailRow, PopularServiceRow, AppointmentRow, ScheduledRow,
+                       BookingEventRow)
@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import namedtuple
+
+
+QueryTiming = namedtuple('QueryTiming', 'name calls total_ms max_ms rows')
+
+_timings = {}
+_timings_lock = threading.Lock()
+
+
+def record_timing(name, elapsed, rows):
+    """Add one execution of a named query to the timing table"""
+    with _timings_lock:
+        entry = _timings.get(name)
+        if entry is None:
+            entry = _timings[name] = [0, 0.0, 0.0, 0]
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] = max(entry[2], elapsed)
+        entry[3] += rows
+
+
+def get_query_timings():
+    """Get per-query timings, slowest total first"""
+    with _timings_lock:
+        timings = [QueryTiming(name, calls, total * 1000, longest * 1000, rows)
+                   for name, (calls, total, longest, rows) in _timings.items()]
+    return sorted(timings, key=lambda timing: timing.total_ms, reverse=True)
+
+
+def reset_query_timings():
+    """Clear the timing table"""
+    with _timings_lock:
+        _timings.clear()
+
+
+class BaseRepo:
+    """Shared plumbing for repositories.
+
+    Repositories run on the app's shared cursor so their writes join whatever
+    transaction the caller has open; committing stays with the caller. Every
+    statement is a module-level constant, so sqlite's per-connection statement
+    cache hands back the same prepared statement on each call.
+    """
+
+    def __init__(self, main_app):
+        self.main_app = main_app
+
+    @property
+    def cursor(self):
+        return self.main_app.cursor
+
+    def _timed(self, name, run):
+        start = time.perf_counter()
+        result, rows = run()
+        record_timing(f"{type(self).__name__}.{name}", time.perf_counter() - start, rows)
+        return result
+
+    def fetch_all(self, name, sql, params=(), row_type=None):
+        """Run a query and return every row, as row_type instances when given"""
+        def run():
+            self.cursor.execute(sql, params)
+            rows = self.cursor.fetchall()
+            if row_type is not None:
+                rows = [row_type._make(row) for row in rows]
+            return rows, len(rows)
+        return self._timed(name, run)
+
+    def fetch_one(self, name, sql, params=(), row_type=None):
+        """Run a query and return the first row or None"""
+        def run():
+            self.cursor.execute(sql, params)
+            row = self.cursor.fetchone()
+            if row is not None and row_type is not None:
+                row = row_type._make(row)
+            return row, 1 if row is not None else 0
+        return self._timed(name, run)
+
+    def fetch_value(self, name, sql, params=(), default=None):
+        """Run a query and return the first column of the first row"""
+        row = self.fetch_one(name, sql, params)
+        if row is None or row[0] is None:
+            return default
+        return row[0]
+
+    def execute(self, name, sql, params=()):
+        """Run a write statement and return the affected row count"""
+        def run():
+            self.cursor.execute(sql, params)
+            return self.cursor.rowcount, max(self.cursor.rowcount, 0)
+        return self._timed(name, run)
+
+    def execute_many(self, name, sql, seq_of_params):
+        """Run a write statement for every parameter tuple"""
+        def run():
+            self.cursor.executemany(sql, seq_of_params)
+            return self.cursor.rowcount, max(self.cursor.rowcount, 0)
+        return self._timed(name, run)
@@ -0,0 +1,146 @@
+from collections import namedtuple
+
+from .base import BaseRepo
+
+
+BookingRow = namedtuple('BookingRow',
+                        'id booking_id booking_date customer_name service_name '
+                        'customer_contact status payment_status price')
+BookingDetailRow = namedtuple('BookingDetailRow',
+                              'id booking_id service_id service_name customer_name customer_contact '
+                              'bike_details booking_date scheduled_date scheduled_time status '
+                              'notes payment_status price completed_date technician bay duration_minutes')
+PopularServiceRow = namedtuple('PopularServiceRow', 'service_name booking_count')
+AppointmentRow = namedtuple('AppointmentRow',
+                            'booking_id customer_name service_name scheduled_date scheduled_time')
+ScheduledRow = namedtuple('ScheduledRow', 'booking_id scheduled_time duration_minutes technician bay')
+BookingEventRow = namedtuple('BookingEventRow', 'event_date kind from_value to_value note')
+
+BOOKING_COLUMNS = '''id, booking_id, booking_date, customer_name, service_name,
+                     customer_contact, status, payment_status, price'''
+
+SELECT_ALL = f'SELECT {BOOKING_COLUMNS} FROM service_bookings ORDER BY booking_date DESC'
+SELECT_BY_STATUS = f'''
+    SELECT {BOOKING_COLUMNS} FROM service_bookings
+    WHERE status = ?
+    ORDER BY booking_date DESC
+'''
+SELECT_DETAIL = '''
+    SELECT id, booking_id, service_id, service_name, customer_name, customer_contact,
+           bike_details, booking_date, scheduled_date, scheduled_time, status,
+           notes, payment_status, price, completed_date, technician, bay, duration_minutes
+    FROM service_bookings
+    WHERE booking_id = ?
+'''
+SELECT_POPULAR = '''
+    SELECT service_name, COUNT(*) as booking_count
+    FROM service_bookings
+    GROUP BY service_name
+    ORDER BY booking_count DESC
+    LIMIT ?
+'''
+SELECT_UPCOMING = '''
+    SELECT booking_id, customer_name, service_name, scheduled_date, scheduled_time
+    FROM service_bookings
+    WHERE status IN ('Pending', 'In Progress')
+    AND scheduled_date BETWEEN date('now') AND ?
+    ORDER BY scheduled_date, scheduled_time
+'''
+SELECT_DAY = '''
+    SELECT booking_id, scheduled_time, duration_minutes, technician, bay
+    FROM service_bookings
+    WHERE scheduled_date = ? AND scheduled_time IS NOT NULL
+    AND status != 'Cancelled'
+    ORDER BY scheduled_time
+'''
+INSERT = '''
+    INSERT INTO service_bookings
+    (booking_id, service_id, service_name, customer_name, customer_contact, price,
+     scheduled_date, scheduled_time, technician, bay, duration_minutes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+SELECT_STATUS = 'SELECT status, payment_status FROM service_bookings WHERE booking_id = ?'
+UPDATE_STATUS = 'UPDATE service_bookings SET status = ?, payment_status = ? WHERE booking_id = ?'
+UPDATE_STATUS_COMPLETED = '''
+    UPDATE service_bookings SET status = ?, payment_status = ?, completed_date = ?
+    WHERE booking_id = ?
+'''
+MARK_PAID = "UPDATE service_bookings SET payment_status = 'Paid' WHERE booking_id = ?"
+CANCEL = "UPDATE service_bookings SET status = 'Cancelled' WHERE booking_id = ?"
+DELETE = 'DELETE FROM service_bookings WHERE booking_id = ?'
+DELETE_EVENTS = 'DELETE FROM booking_events WHERE booking_id = ?'
+SELECT_EVENTS = '''
+    SELECT event_date, kind, from_value, to_value, note
+    FROM booking_events
+    WHERE booking_id = ?
+    ORDER BY id
+'''
+INSERT_EVENT = '''
+    INSERT INTO booking_events (booking_id, event_date, kind, from_value, to_value, note)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+
+class BookingRepo(BaseRepo):
+    """Queries against the service_bookings table"""
+
+    def list(self, status=None):
+        """Get bookings newest first, optionally limited to one status"""
+        if status:
+            return self.fetch_all('list_by_status', SELECT_BY_STATUS, (status,), row_type=BookingRow)
+        return self.fetch_all('list', SELECT_ALL, row_type=BookingRow)
+
+    def get_detail(self, booking_id):
+        """Get every field of a booking by its booking ID code"""
+        return self.fetch_one('get_detail', SELECT_DETAIL, (booking_id,), row_type=BookingDetailRow)
+
+    def list_popular(self, limit=5):
+        """Get the most booked services"""
+        return self.fetch_all('list_popular', SELECT_POPULAR, (limit,), row_type=PopularServiceRow)
+
+    def list_upcoming(self, end_date):
+        """Get open appointments scheduled between today and end_date"""
+        return self.fetch_all('list_upcoming', SELECT_UPCOMING, (end_date,), row_type=AppointmentRow)
+
+    def list_day(self, scheduled_date):
+        """Get the appointments that take up time on a day (not cancelled), in time order"""
+        return self.fetch_all('list_day', SELECT_DAY, (scheduled_date,), row_type=ScheduledRow)
+
+    def insert(self, booking_id, service_id, service_name, customer_name, customer_contact, price,
+               scheduled_date=None, scheduled_time=None, technician=None, bay=None, duration_minutes=None):
+        """Insert a new booking; walk-ins have no schedule"""
+        return self.execute('insert', INSERT,
+                            (booking_id, service_id, service_name, customer_name, customer_contact, price,
+                             scheduled_date, scheduled_time, technician, bay, duration_minutes))
+
+    def get_status(self, booking_id):
+        """Get (status, payment_status) for a booking, or None"""
+        return self.fetch_one('get_status', SELECT_STATUS, (booking_id,))
+
+    def update_status(self, booking_id, status, payment_status, completed_date=None):
+        """Overwrite a booking's status and payment status; completed_date is only set when given"""
+        if completed_date is not None:
+            return self.execute('update_status_completed', UPDATE_STATUS_COMPLETED,
+                                (status, payment_status, completed_date, booking_id))
+        return self.execute('update_status', UPDATE_STATUS, (status, payment_status, booking_id))
+
+    def mark_paid(self, booking_id):
+        """Set a booking's payment status to Paid"""
+        return self.execute('mark_paid', MARK_PAID, (booking_id,))
+
+    def cancel(self, booking_id):
+        """Set a booking's status to Cancelled"""
+        return self.execute('cancel', CANCEL, (booking_id,))
+
+    def delete(self, booking_id):
+        """Delete a booking and its history"""
+        self.execute('delete_events', DELETE_EVENTS, (booking_id,))
+        return self.execute('delete', DELETE, (booking_id,))
+
+    def list_events(self, booking_id):
+        """Get a booking's history, oldest first"""
+        return self.fetch_all('list_events', SELECT_EVENTS, (booking_id,), row_type=BookingEventRow)
+
+    def add_events(self, booking_id, events):
+        """Append (event_date, kind, from_value, to_value, note) events to a booking's history"""
+        return self.execute_many('add_events', INSERT_EVENT, [(booking_id,) + tuple(event) for event in events])
@@ -0,0 +1,223 @@
+import json
+from collections import namedtuple
+
+from .base import BaseRepo
+
+
+ProductRow = namedtuple('ProductRow', 'id name price stock category product_id')
+
+PRODUCT_COLUMNS = 'id, name, price, stock, category, product_id'
+
+# Archived (deleted) products keep their row for history; everything the pages list skips them
+SELECT_ALL = f'SELECT {PRODUCT_COLUMNS} FROM products WHERE is_active = 1 ORDER BY name'
+SELECT_BY_ID = f'SELECT {PRODUCT_COLUMNS} FROM products WHERE id = ?'
+SELECT_BY_CODE = f'SELECT {PRODUCT_COLUMNS} FROM products WHERE product_id = ? AND is_active = 1'
+SEARCH = f'''
+    SELECT {PRODUCT_COLUMNS} FROM products
+    WHERE is_active = 1 AND (name LIKE ? OR product_id LIKE ?)
+    ORDER BY name
+'''
+SELECT_LOW_STOCK = f'''
+    SELECT {PRODUCT_COLUMNS} FROM products
+    WHERE is_active = 1 AND stock < ?
+    ORDER BY stock ASC
+    LIMIT ?
+'''
+SELECT_LOWEST_STOCK = f'SELECT {PRODUCT_COLUMNS} FROM products WHERE is_active = 1 ORDER BY stock ASC LIMIT ?'
+SELECT_STOCK = 'SELECT stock FROM products WHERE product_id = ? AND is_active = 1'
+SELECT_STOCK_BY_ID = 'SELECT stock FROM products WHERE id = ?'
+CODE_EXISTS = 'SELECT 1 FROM products WHERE product_id = ? LIMIT 1'
+SELECT_BARCODES = 'SELECT barcode, product_id FROM products WHERE is_active = 1 AND barcode IS NOT NULL'
+# A scanned code is either a barcode or a product ID; both are uniquely indexed
+SELECT_BY_SCAN_CODE = f'''
+    SELECT {PRODUCT_COLUMNS} FROM products
+    WHERE is_active = 1 AND (barcode = ? OR product_id = ?)
+    LIMIT 1
+'''
+SET_BARCODE = 'UPDATE products SET barcode = ? WHERE id = ?'
+SUMMARY = '''
+    SELECT COALESCE(SUM(stock), 0), COALESCE(SUM(stock * price), 0), COUNT(*)
+    FROM products
+    WHERE is_active = 1
+'''
+SEARCH_SUMMARY = '''
+    SELECT COALESCE(SUM(stock), 0), COALESCE(SUM(stock * price), 0), COUNT(*)
+    FROM products
+    WHERE is_active = 1 AND (name LIKE ? OR product_id LIKE ?)
+'''
+INSERT = '''
+    INSERT INTO products (name, price, stock, category, product_id)
+    VALUES (?, ?, ?, ?, ?)
+'''
+UPDATE_DETAILS = 'UPDATE products SET name = ?, price = ?, category = ?, product_id = ? WHERE id = ?'
+ADJUST_STOCK = 'UPDATE products SET stock = stock + ? WHERE id = ?'
+ADD_STOCK_BY_CODE = 'UPDATE products SET stock = stock + ? WHERE product_id = ? AND is_active = 1'
+# Units held by other carts' unexpired reservations aren't for sale
+SELL_STOCK = '''
+    UPDATE products SET stock = stock - :quantity
+    WHERE product_id = :product_id AND is_active = 1
+      AND stock - (SELECT COALESCE(SUM(quantity), 0) FROM stock_reservations
+                   WHERE product_id = :product_id AND cart_id != :cart_id
+                     AND expires_at > COALESCE(:now, datetime('now', 'localtime'))) >= :quantity
+'''
+OVERSELL_STOCK = 'UPDATE products SET stock = stock - ? WHERE product_id = ?'
+ARCHIVE = 'UPDATE products SET is_active = 0, archived_date = CURRENT_TIMESTAMP WHERE id = ? AND is_active = 1'
+IS_ARCHIVED_CODE = 'SELECT 1 FROM products WHERE product_id = ? AND is_active = 0 LIMIT 1'
+# Archived products whose sales and movements have all been purged
+PURGE_ARCHIVED = '''
+    DELETE FROM products
+    WHERE is_active = 0 AND archived_date <= ?
+      AND NOT EXISTS (SELECT 1 FROM sales WHERE sales.product_id = products.product_id)
+      AND NOT EXISTS (SELECT 1 FROM stock_movements m WHERE m.product_id = products.product_id)
+'''
+DELETE = 'DELETE FROM products WHERE id = ?'
+# json_each keeps the statement text fixed however many codes are passed
+SELECT_MANY_BY_CODE = f'''
+    SELECT {PRODUCT_COLUMNS}, is_active, barcode FROM products
+    WHERE product_id IN (SELECT value FROM json_each(?))
+'''
+# Archived products keep their barcodes, and idx_products_barcode covers them too
+SELECT_BARCODE_OWNERS = '''
+    SELECT barcode, product_id FROM products
+    WHERE barcode IN (SELECT value FROM json_each(?))
+'''
+# Stock and category are optional in imports: NULL keeps the current value
+UPSERT = '''
+    INSERT INTO products (name, price, stock, category, product_id, barcode)
+    VALUES (:name, :price, COALESCE(:stock, 0), COALESCE(:category, 'Bikes'), :product_id, :barcode)
+    ON CONFLICT(product_id) DO UPDATE SET
+        name = excluded.name,
+        price = excluded.price,
+        stock = COALESCE(:stock, products.stock),
+        category = COALESCE(:category, products.category),
+        barcode = COALESCE(:barcode, products.barcode),
+        is_active = 1,
+        archived_date = NULL
+'''
+RESTORE_STAGED_SALES = '''
+    UPDATE products SET stock = stock + sold.quantity
+    FROM (
+        SELECT product_id, SUM(quantity) AS quantity FROM sales
+        WHERE id IN (SELECT id FROM staged_sale_lines)
+        GROUP BY product_id
+    ) sold
+    WHERE products.product_id = sold.product_id
+'''
+
+
+class ProductRepo(BaseRepo):
+    """Queries against the products table"""
+
+    def list_all(self):
+        """Get every product ordered by name"""
+        return self.fetch_all('list_all', SELECT_ALL, row_type=ProductRow)
+
+    def search(self, search_term):
+        """Get products whose name or product ID contains the search term"""
+        pattern = f"%{search_term}%"
+        return self.fetch_all('search', SEARCH, (pattern, pattern), row_type=ProductRow)
+
+    def get(self, internal_id):
+        """Get a product by its database id"""
+        return self.fetch_one('get', SELECT_BY_ID, (internal_id,), row_type=ProductRow)
+
+    def get_by_code(self, product_id):
+        """Get a product by its product ID code"""
+        return self.fetch_one('get_by_code', SELECT_BY_CODE, (product_id,), row_type=ProductRow)
+
+    def list_low_stock(self, threshold=10, limit=10):
+        """Get the products with the least stock below a threshold"""
+        return self.fetch_all('list_low_stock', SELECT_LOW_STOCK, (threshold, limit), row_type=ProductRow)
+
+    def list_lowest_stock(self, limit=10):
+        """Get the products with the least stock"""
+        return self.fetch_all('list_lowest_stock', SELECT_LOWEST_STOCK, (limit,), row_type=ProductRow)
+
+    def get_stock(self, product_id):
+        """Get the stock for a product ID code, or None when it doesn't exist"""
+        return self.fetch_value('get_stock', SELECT_STOCK, (product_id,))
+
+    def get_stock_by_id(self, internal_id):
+        """Get the stock for a database id, or None when it doesn't exist"""
+        return self.fetch_value('get_stock_by_id', SELECT_STOCK_BY_ID, (internal_id,))
+
+    def code_exists(self, product_id):
+        """Check whether a product ID code is already taken"""
+        return self.fetch_one('code_exists', CODE_EXISTS, (product_id,)) is not None
+
+    def summary(self, search_term=None):
+        """Get (total stock units, total stock value, product count), optionally filtered"""
+        if search_term:
+            pattern = f"%{search_term}%"
+            return self.fetch_one('search_summary', SEARCH_SUMMARY, (pattern, pattern))
+        return self.fetch_one('summary', SUMMARY)
+
+    def insert(self, name, price, stock, category, product_id):
+        """Insert a product and return its database id"""
+        self.execute('insert', INSERT, (name, price, stock, category, product_id))
+        return self.cursor.lastrowid
+
+    def update_details(self, internal_id, name, price, category, product_id):
+        """Overwrite a product's editable fields other than stock (see adjust_stock)"""
+        return self.execute('update_details', UPDATE_DETAILS, (name, price, category, product_id, internal_id))
+
+    def adjust_stock(self, internal_id, delta):
+        """Add delta (may be negative) to a product's stock"""
+        return self.execute('adjust_stock', ADJUST_STOCK, (delta, internal_id))
+
+    def add_stock_many(self, quantities):
+        """Add stock for (units, product ID code) pairs"""
+        return self.execute_many('add_stock_many', ADD_STOCK_BY_CODE, quantities)
+
+    def sell_stock(self, product_id, quantity, allow_oversell=False, cart_id=None, now=None):
+        """Take quantity off a product's stock only if that much is on hand and not held by
+        carts other than cart_id (or always, when allow_oversell); True when the product was updated"""
+        if allow_oversell:
+            return self.execute('oversell_stock', OVERSELL_STOCK, (quantity, product_id)) == 1
+        return self.execute('sell_stock', SELL_STOCK, {'quantity': quantity, 'product_id': product_id,
+                                                       'cart_id': cart_id or '', 'now': now}) == 1
+
+    def restore_staged_sales(self):
+        """Put the units of the staged sale lines (SalesRepo.stage_lines) back in stock, one update per product"""
+        return self.execute('restore_staged_sales', RESTORE_STAGED_SALES)
+
+    def get_many_by_code(self, product_ids):
+        """Get {product_id: (ProductRow, is_active, barcode)} for the given codes, archived products included"""
+        rows = self.fetch_all('get_many_by_code', SELECT_MANY_BY_CODE, (json.dumps(list(product_ids)),))
+        return {row[5]: (ProductRow._make(row[:6]), row[6], row[7]) for row in rows}
+
+    def get_barcode_owners(self, barcodes):
+        """Get {barcode: product ID code} for the given barcodes that are taken, archived products included"""
+        return dict(self.fetch_all('get_barcode_owners', SELECT_BARCODE_OWNERS, (json.dumps(list(barcodes)),)))
+
+    def upsert_many(self, products):
+        """Insert or update products (dicts with name, price, stock, category, barcode, product_id) by product ID"""
+        return self.execute_many('upsert_many', UPSERT, products)
+
+    def list_barcodes(self):
+        """Get (barcode, product_id) for every active product with a barcode"""
+        return self.fetch_all('list_barcodes', SELECT_BARCODES)
+
+    def get_by_scan_code(self, code):
+        """Get the active product whose barcode or product ID code is code"""
+        return self.fetch_one('get_by_scan_code', SELECT_BY_SCAN_CODE, (code, code), row_type=ProductRow)
+
+    def set_barcode(self, internal_id, barcode):
+        """Set (or, with None, clear) a product's barcode"""
+        return self.execute('set_barcode', SET_BARCODE, (barcode, internal_id))
+
+    def archive(self, internal_id):
+        """Hide a product from every list while keeping its row and history; True when it was active"""
+        return self.execute('archive', ARCHIVE, (internal_id,)) == 1
+
+    def is_archived_code(self, product_id):
+        """Check whether a product ID code belongs to an archived product"""
+        return self.fetch_one('is_archived_code', IS_ARCHIVED_CODE, (product_id,)) is not None
+
+    def purge_archived(self, cutoff):
+        """Delete products archived before cutoff that have no history left"""
+        return self.execute('purge_archived', PURGE_ARCHIVED, (cutoff,))
+
+    def delete(self, internal_id):
+        """Delete a product by its database id"""
+        return self.execute('delete', DELETE, (internal_id,))
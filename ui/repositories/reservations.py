@@ -0,0 +1,56 @@
+from .base import BaseRepo
+
+
+# One hold per cart and product; holding again replaces the quantity and pushes the expiry out
+HOLD = '''
+    INSERT INTO stock_reservations (cart_id, product_id, quantity, expires_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(cart_id, product_id) DO UPDATE SET
+        quantity = excluded.quantity,
+        expires_at = excluded.expires_at
+'''
+RENEW_CART = 'UPDATE stock_reservations SET expires_at = ? WHERE cart_id = ?'
+RELEASE = 'DELETE FROM stock_reservations WHERE cart_id = ? AND product_id = ?'
+RELEASE_CART = 'DELETE FROM stock_reservations WHERE cart_id = ?'
+DELETE_EXPIRED = 'DELETE FROM stock_reservations WHERE expires_at <= ?'
+# Units other carts hold on one product; a range scan on (product_id, expires_at)
+HELD_BY_OTHERS = '''
+    SELECT COALESCE(SUM(quantity), 0) FROM stock_reservations
+    WHERE product_id = ? AND expires_at > ? AND cart_id != ?
+'''
+HELD_STOCK = '''
+    SELECT product_id, SUM(quantity) FROM stock_reservations
+    WHERE expires_at > ? AND cart_id != ?
+    GROUP BY product_id
+'''
+
+
+class ReservationRepo(BaseRepo):
+    """Queries against stock_reservations: short-lived holds on stock by open carts"""
+
+    def hold(self, cart_id, product_id, quantity, expires_at):
+        """Hold quantity units of a product for a cart until expires_at"""
+        return self.execute('hold', HOLD, (cart_id, product_id, quantity, expires_at))
+
+    def renew_cart(self, cart_id, expires_at):
+        """Move the expiry of all of a cart's holds"""
+        return self.execute('renew_cart', RENEW_CART, (expires_at, cart_id))
+
+    def release(self, cart_id, product_id):
+        return self.execute('release', RELEASE, (cart_id, product_id))
+
+    def release_cart(self, cart_id):
+        """Drop every hold of a cart"""
+        return self.execute('release_cart', RELEASE_CART, (cart_id,))
+
+    def delete_expired(self, now):
+        """Delete holds that expired at or before now"""
+        return self.execute('delete_expired', DELETE_EXPIRED, (now,))
+
+    def held_by_others(self, product_id, now, cart_id=''):
+        """Get the units of a product held by unexpired carts other than cart_id"""
+        return self.fetch_value('held_by_others', HELD_BY_OTHERS, (product_id, now, cart_id or ''))
+
+    def held_stock(self, now, cart_id=''):
+        """Get {product_id: units held} over unexpired carts other than cart_id"""
+        return dict(self.fetch_all('held_stock', HELD_STOCK, (now, cart_id or '')))
@@ -0,0 +1,163 @@
+from collections import namedtuple
+
+from .base import BaseRepo
+
+
+RecentSaleRow = namedtuple('RecentSaleRow',
+                           'sale_date product_name product_id customer_name customer_address quantity total')
+TransactionRow = namedtuple('TransactionRow', 'transaction_id total_amount payment_method transaction_date')
+SaleLineRow = namedtuple('SaleLineRow', 'id product_id product_name category customer_name customer_address '
+                                        'quantity price total sale_date')
+
+SELECT_RECENT = '''
+    SELECT sale_date, product_name, product_id, customer_name,
+           COALESCE(customer_address, 'N/A') as customer_address,
+           quantity, total
+    FROM sales
+    ORDER BY sale_date DESC
+    LIMIT ?
+'''
+TOTAL_REVENUE = 'SELECT SUM(total) FROM sales WHERE quantity > 0'
+SEARCH_REVENUE = '''
+    SELECT SUM(total) FROM sales
+    WHERE quantity > 0 AND product_id IN (
+        SELECT product_id FROM products
+        WHERE name LIKE ? OR product_id LIKE ?
+    )
+'''
+INSERT_LINE = '''
+    INSERT INTO sales (transaction_id, product_id, product_name, product_category,
+                       customer_name, customer_address, quantity, price, total, sale_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+INSERT_TRANSACTION = '''
+    INSERT INTO transactions (transaction_id, total_amount, payment_method, transaction_date)
+    VALUES (?, ?, ?, ?)
+'''
+TRANSACTION_EXISTS = 'SELECT 1 FROM transactions WHERE transaction_id = ? LIMIT 1'
+TRANSACTION_COLUMNS = 'transaction_id, total_amount, payment_method, transaction_date'
+SELECT_TRANSACTION = f'SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE transaction_id = ?'
+SELECT_TRANSACTION_LINES = '''
+    SELECT id, product_id, product_name, product_category, customer_name,
+           COALESCE(customer_address, ''), quantity, price, total, sale_date
+    FROM sales
+    WHERE transaction_id = ?
+    ORDER BY id
+'''
+# A range on the UNIQUE index: sqlite won't serve LIKE 'x%' from an index (LIKE ignores case)
+SEARCH_TRANSACTIONS = f'''
+    SELECT {TRANSACTION_COLUMNS} FROM transactions
+    WHERE transaction_id >= ? AND transaction_id < ?
+    ORDER BY transaction_id DESC
+    LIMIT ?
+'''
+DELETE_FOR_PRODUCT = 'DELETE FROM sales WHERE product_id = ?'
+# Bulk voids: the line IDs go into a temp table so every step is one set-based statement
+STAGED_LINES = 'staged_sale_lines'
+CREATE_STAGED_LINES = f'CREATE TEMP TABLE IF NOT EXISTS {STAGED_LINES} (id INTEGER PRIMARY KEY)'
+CLEAR_STAGED_LINES = f'DELETE FROM {STAGED_LINES}'
+STAGE_LINE = f'INSERT OR IGNORE INTO {STAGED_LINES} (id) VALUES (?)'
+STAGE_ARCHIVED_BATCH = f'''
+    INSERT OR IGNORE INTO {STAGED_LINES} (id)
+    SELECT s.id FROM products p
+    JOIN sales s ON s.product_id = p.product_id
+    WHERE p.is_active = 0 AND p.archived_date <= ?
+    LIMIT ?
+'''
+STAGED_SUMMARY = f'''
+    SELECT COUNT(*), COALESCE(SUM(quantity), 0)
+    FROM sales WHERE id IN (SELECT id FROM {STAGED_LINES})
+'''
+SUBTRACT_STAGED_FROM_TRANSACTIONS = f'''
+    UPDATE transactions SET total_amount = total_amount - voided.total
+    FROM (
+        SELECT transaction_id, SUM(total) AS total FROM sales
+        WHERE id IN (SELECT id FROM {STAGED_LINES})
+        GROUP BY transaction_id
+    ) voided
+    WHERE transactions.transaction_id = voided.transaction_id
+'''
+# Transactions whose every line is staged; run before the lines are deleted
+DELETE_EMPTIED_TRANSACTIONS = f'''
+    DELETE FROM transactions
+    WHERE transaction_id IN (SELECT transaction_id FROM sales WHERE id IN (SELECT id FROM {STAGED_LINES}))
+      AND NOT EXISTS (
+          SELECT 1 FROM sales
+          WHERE sales.transaction_id = transactions.transaction_id
+            AND sales.id NOT IN (SELECT id FROM {STAGED_LINES}))
+'''
+DELETE_STAGED_LINES = f'DELETE FROM sales WHERE id IN (SELECT id FROM {STAGED_LINES})'
+
+
+class SalesRepo(BaseRepo):
+    """Queries against the sales table"""
+
+    def list_recent(self, limit=10):
+        """Get the latest sale lines"""
+        return self.fetch_all('list_recent', SELECT_RECENT, (limit,), row_type=RecentSaleRow)
+
+    def total_revenue(self, search_term=None):
+        """Get revenue from positive-quantity sales, optionally for matching products only"""
+        if search_term:
+            pattern = f"%{search_term}%"
+            return self.fetch_value('search_revenue', SEARCH_REVENUE, (pattern, pattern), default=0)
+        return self.fetch_value('total_revenue', TOTAL_REVENUE, default=0)
+
+    def insert_line(self, transaction_id, product_id, product_name, category,
+                    customer_name, customer_address, quantity, price, total, sale_date):
+        """Insert one sale line"""
+        return self.execute('insert_line', INSERT_LINE,
+                            (transaction_id, product_id, product_name, category,
+                             customer_name, customer_address, quantity, price, total, sale_date))
+
+    def insert_transaction(self, transaction_id, total_amount, payment_method, transaction_date):
+        """Insert the header row for a sale"""
+        return self.execute('insert_transaction', INSERT_TRANSACTION,
+                            (transaction_id, total_amount, payment_method, transaction_date))
+
+    def transaction_exists(self, transaction_id):
+        """Check whether a sale with this transaction ID has been recorded"""
+        return self.fetch_one('transaction_exists', TRANSACTION_EXISTS, (transaction_id,)) is not None
+
+    def get_transaction(self, transaction_id):
+        """Get a sale's header row"""
+        return self.fetch_one('get_transaction', SELECT_TRANSACTION, (transaction_id,), row_type=TransactionRow)
+
+    def list_transaction_lines(self, transaction_id):
+        """Get a sale's lines in the order they were rung up"""
+        return self.fetch_all('list_transaction_lines', SELECT_TRANSACTION_LINES, (transaction_id,),
+                              row_type=SaleLineRow)
+
+    def search_transactions(self, prefix='', limit=50):
+        """Get the latest sales whose transaction ID starts with prefix (IDs are upper case)"""
+        prefix = prefix.strip().upper()
+        return self.fetch_all('search_transactions', SEARCH_TRANSACTIONS,
+                              (prefix, prefix + '\U0010ffff', limit), row_type=TransactionRow)
+
+    def delete_for_product(self, product_id):
+        """Delete every sale line for a product ID code"""
+        return self.execute('delete_for_product', DELETE_FOR_PRODUCT, (product_id,))
+
+    def purge_archived_batch(self, cutoff, limit):
+        """Delete up to limit sale lines of products archived before cutoff, fixing their transaction headers"""
+        self.execute('create_staged_lines', CREATE_STAGED_LINES)
+        self.execute('clear_staged_lines', CLEAR_STAGED_LINES)
+        self.execute('stage_archived_batch', STAGE_ARCHIVED_BATCH, (cutoff, limit))
+        self.subtract_staged_from_transactions()
+        return self.delete_staged_lines()
+
+    def stage_lines(self, line_ids):
+        """Put sale line IDs in the staged_sale_lines temp table; returns (lines, units) found"""
+        self.execute('create_staged_lines', CREATE_STAGED_LINES)
+        self.execute('clear_staged_lines', CLEAR_STAGED_LINES)
+        self.execute_many('stage_line', STAGE_LINE, [(line_id,) for line_id in line_ids])
+        return self.fetch_one('staged_summary', STAGED_SUMMARY)
+
+    def subtract_staged_from_transactions(self):
+        """Take the staged lines' totals off their transaction headers"""
+        return self.execute('subtract_staged_from_transactions', SUBTRACT_STAGED_FROM_TRANSACTIONS)
+
+    def delete_staged_lines(self):
+        """Delete the staged sale lines and any transaction left without lines"""
+        self.execute('delete_emptied_transactions', DELETE_EMPTIED_TRANSACTIONS)
+        return self.execute('delete_staged_lines', DELETE_STAGED_LINES)
@@ -0,0 +1,71 @@
+from collections import namedtuple
+
+from .base import BaseRepo
+
+
+ServiceRow = namedtuple('ServiceRow', 'id service_id name category price duration is_active')
+ResourceRow = namedtuple('ResourceRow', 'name kind')
+
+SERVICE_COLUMNS = 'id, service_id, name, category, price, duration, is_active'
+
+SELECT_ALL = f'SELECT {SERVICE_COLUMNS} FROM services ORDER BY category, name'
+SELECT_BY_CATEGORY = f'SELECT {SERVICE_COLUMNS} FROM services WHERE category = ? ORDER BY name'
+SELECT_FULL_BY_ID = 'SELECT * FROM services WHERE id = ?'
+CODE_EXISTS = 'SELECT 1 FROM services WHERE service_id = ? LIMIT 1'
+COUNT_ACTIVE = 'SELECT COUNT(*) FROM services WHERE is_active = 1'
+INSERT = '''
+    INSERT INTO services (name, description, price, duration, category, service_id, is_active)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+UPDATE = '''
+    UPDATE services SET name = ?, description = ?, price = ?, duration = ?,
+           category = ?, service_id = ?, is_active = ?
+    WHERE id = ?
+'''
+DELETE = 'DELETE FROM services WHERE id = ?'
+SELECT_DURATION = 'SELECT duration FROM services WHERE id = ?'
+SELECT_RESOURCES = 'SELECT name, kind FROM service_resources WHERE is_active = 1 ORDER BY kind, name'
+
+
+class ServiceRepo(BaseRepo):
+    """Queries against the services table"""
+
+    def list(self, category=None):
+        """Get services, optionally limited to one category"""
+        if category:
+            return self.fetch_all('list_by_category', SELECT_BY_CATEGORY, (category,), row_type=ServiceRow)
+        return self.fetch_all('list', SELECT_ALL, row_type=ServiceRow)
+
+    def get_full(self, internal_id):
+        """Get every column of a service, in table order, for the edit dialog"""
+        return self.fetch_one('get_full', SELECT_FULL_BY_ID, (internal_id,))
+
+    def get_duration(self, internal_id):
+        """Get a service's duration text, such as '45 minutes', or None"""
+        return self.fetch_value('get_duration', SELECT_DURATION, (internal_id,))
+
+    def list_resources(self):
+        """Get the technicians and bays that bookings can be scheduled on"""
+        return self.fetch_all('list_resources', SELECT_RESOURCES, row_type=ResourceRow)
+
+    def code_exists(self, service_id):
+        """Check whether a service ID code is already taken"""
+        return self.fetch_one('code_exists', CODE_EXISTS, (service_id,)) is not None
+
+    def count_active(self):
+        """Count services currently offered"""
+        return self.fetch_value('count_active', COUNT_ACTIVE, default=0)
+
+    def insert(self, name, description, price, duration, category, service_id, is_active=True):
+        """Insert a service and return its database id"""
+        self.execute('insert', INSERT, (name, description, price, duration, category, service_id, is_active))
+        return self.cursor.lastrowid
+
+    def update(self, internal_id, name, description, price, duration, category, service_id, is_active):
+        """Overwrite a service's editable fields"""
+        return self.execute('update', UPDATE,
+                            (name, description, price, duration, category, service_id, is_active, internal_id))
+
+    def delete(self, internal_id):
+        """Delete a service by its database id"""
+        return self.execute('delete', DELETE, (internal_id,))
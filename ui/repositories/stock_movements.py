@@ -0,0 +1,172 @@
+from collections import namedtuple
+
+from .base import BaseRepo
+
+
+StockDiscrepancy = namedtuple('StockDiscrepancy', 'product_id name snapshot_stock ledger_stock')
+
+# A movement's effect on stock: IN adds, OUT takes away, ADJUSTMENT carries its own sign
+SIGNED_QUANTITY = "CASE movement_type WHEN 'OUT' THEN -quantity ELSE quantity END"
+
+# Each product's most recent checkpoint (sqlite returns the MAX(id) row's other columns)
+LATEST_CHECKPOINTS = 'SELECT product_id, stock, movement_id, MAX(id) FROM stock_checkpoints GROUP BY product_id'
+
+INSERT = '''
+    INSERT INTO stock_movements (product_id, product_name, movement_type, quantity,
+                                 reference_id, reason, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+DELETE_FOR_PRODUCT = 'DELETE FROM stock_movements WHERE product_id = ?'
+DELETE_CHECKPOINTS_FOR_PRODUCT = 'DELETE FROM stock_checkpoints WHERE product_id = ?'
+RENAME_PRODUCT = 'UPDATE stock_movements SET product_id = ? WHERE product_id = ?'
+PURGE_ARCHIVED_BATCH = '''
+    DELETE FROM stock_movements WHERE id IN (
+        SELECT m.id FROM products p
+        JOIN stock_movements m ON m.product_id = p.product_id
+        WHERE p.is_active = 0 AND p.archived_date <= ?
+        LIMIT ?
+    )
+'''
+PURGE_ARCHIVED_CHECKPOINTS = '''
+    DELETE FROM stock_checkpoints WHERE product_id IN (
+        SELECT product_id FROM products WHERE is_active = 0 AND archived_date <= ?
+    )
+'''
+RENAME_CHECKPOINTS = 'UPDATE stock_checkpoints SET product_id = ? WHERE product_id = ?'
+RECORD_STAGED_RESTORES = '''
+    INSERT INTO stock_movements (product_id, product_name, movement_type, quantity,
+                                 reference_id, reason, notes)
+    SELECT s.product_id, s.product_name, 'IN', s.quantity, 'RESTORE_' || s.id, 'SALE_DELETION',
+           'Stock restored due to deletion of sale record ' || s.transaction_id
+    FROM sales s
+    JOIN staged_sale_lines staged ON staged.id = s.id
+    JOIN products p ON p.product_id = s.product_id
+'''
+
+# Stock at :as_of per product: from its last checkpoint at or before :as_of forward,
+# else back from its first later checkpoint, else summed from the first movement.
+# Each branch is one range scan on (product_id, movement_date) or (product_id, id).
+STOCK_ON_DATE = f'''
+    WITH earlier AS (
+        SELECT product_id, stock, movement_id, MAX(id) FROM stock_checkpoints
+        WHERE checkpoint_date <= :as_of GROUP BY product_id
+    ), later AS (
+        SELECT product_id, stock, movement_id, MIN(id) FROM stock_checkpoints
+        WHERE checkpoint_date > :as_of GROUP BY product_id
+    )
+    SELECT p.product_id, CASE
+        WHEN earlier.product_id IS NOT NULL THEN earlier.stock + (
+            SELECT COALESCE(SUM({SIGNED_QUANTITY}), 0) FROM stock_movements m
+            WHERE m.product_id = p.product_id AND m.id > earlier.movement_id AND m.movement_date <= :as_of)
+        WHEN later.product_id IS NOT NULL THEN later.stock - (
+            SELECT COALESCE(SUM({SIGNED_QUANTITY}), 0) FROM stock_movements m
+            WHERE m.product_id = p.product_id AND m.id <= later.movement_id AND m.movement_date > :as_of)
+        ELSE (
+            SELECT COALESCE(SUM({SIGNED_QUANTITY}), 0) FROM stock_movements m
+            WHERE m.product_id = p.product_id AND m.movement_date <= :as_of)
+    END AS stock
+    FROM products p
+    LEFT JOIN earlier ON earlier.product_id = p.product_id
+    LEFT JOIN later ON later.product_id = p.product_id
+'''
+STOCK_ON_DATE_FOR_PRODUCT = f'{STOCK_ON_DATE} WHERE p.product_id = :product_id'
+# Running total of a product's daily net movements over a (UTC) movement_date range,
+# by local day
+DAILY_STOCK_CHANGES = f'''
+    SELECT day, SUM(change) OVER (ORDER BY day ROWS UNBOUNDED PRECEDING)
+    FROM (
+        SELECT DATE(movement_date, 'localtime') AS day, SUM({SIGNED_QUANTITY}) AS change
+        FROM stock_movements
+        WHERE product_id = ? AND movement_date > ? AND movement_date <= ?
+        GROUP BY day
+    )
+    ORDER BY day
+'''
+LEDGER_STOCK = f'''
+    SELECT p.product_id, p.name, p.stock,
+           COALESCE(checkpoint.stock, 0) + COALESCE(SUM({SIGNED_QUANTITY}), 0) AS ledger_stock
+    FROM products p
+    LEFT JOIN ({LATEST_CHECKPOINTS}) checkpoint ON checkpoint.product_id = p.product_id
+    LEFT JOIN stock_movements m
+           ON m.product_id = p.product_id AND m.id > COALESCE(checkpoint.movement_id, 0)
+    GROUP BY p.id
+'''
+SELECT_DISCREPANCIES = f'SELECT * FROM ({LEDGER_STOCK}) WHERE stock != ledger_stock ORDER BY product_id'
+INSERT_CHECKPOINTS = f'''
+    INSERT INTO stock_checkpoints (product_id, stock, movement_id, checkpoint_date)
+    SELECT m.product_id, COALESCE(checkpoint.stock, 0) + SUM({SIGNED_QUANTITY}),
+           MAX(m.id), MAX(m.movement_date)
+    FROM stock_movements m
+    LEFT JOIN ({LATEST_CHECKPOINTS}) checkpoint ON checkpoint.product_id = m.product_id
+    WHERE m.id > COALESCE(checkpoint.movement_id, 0)
+    GROUP BY m.product_id
+    HAVING COUNT(*) >= ?
+'''
+SYNC_SNAPSHOTS = f'''
+    UPDATE products SET stock = ledger.ledger_stock
+    FROM ({LEDGER_STOCK}) ledger
+    WHERE products.product_id = ledger.product_id AND products.stock != ledger.ledger_stock
+'''
+
+
+class StockMovementRepo(BaseRepo):
+    """Queries against the stock ledger: stock_movements and stock_checkpoints"""
+
+    def record(self, product_id, product_name, movement_type, quantity,
+               reference_id=None, notes=None, reason=None):
+        """Insert one stock movement"""
+        return self.execute('record', INSERT,
+                            (product_id, product_name, movement_type, quantity,
+                             reference_id, reason, notes))
+
+    def record_many(self, movements):
+        """Insert movements given as (product_id, product_name, movement_type, quantity,
+        reference_id, reason, notes) tuples"""
+        return self.execute_many('record_many', INSERT, movements)
+
+    def delete_for_product(self, product_id):
+        """Delete every movement and checkpoint for a product ID code"""
+        self.execute('delete_checkpoints_for_product', DELETE_CHECKPOINTS_FOR_PRODUCT, (product_id,))
+        return self.execute('delete_for_product', DELETE_FOR_PRODUCT, (product_id,))
+
+    def rename_product(self, old_product_id, new_product_id):
+        """Move a product's ledger over to its new ID code"""
+        self.execute('rename_checkpoints', RENAME_CHECKPOINTS, (new_product_id, old_product_id))
+        return self.execute('rename_product', RENAME_PRODUCT, (new_product_id, old_product_id))
+
+    def purge_archived_batch(self, cutoff, limit):
+        """Delete up to limit movements of products archived before cutoff (checkpoints go with the last batch)"""
+        deleted = self.execute('purge_archived_batch', PURGE_ARCHIVED_BATCH, (cutoff, limit))
+        if deleted < limit:
+            self.execute('purge_archived_checkpoints', PURGE_ARCHIVED_CHECKPOINTS, (cutoff,))
+        return deleted
+
+    def record_staged_restores(self):
+        """Log an IN movement for each staged sale line (SalesRepo.stage_lines) whose product still exists"""
+        return self.execute('record_staged_restores', RECORD_STAGED_RESTORES)
+
+    def stock_on_date(self, as_of):
+        """Get (product_id, stock) for every product at a 'YYYY-MM-DD HH:MM:SS' UTC time"""
+        return self.fetch_all('stock_on_date', STOCK_ON_DATE, {'as_of': as_of})
+
+    def product_stock_on_date(self, product_id, as_of):
+        """Get one product's stock at a 'YYYY-MM-DD HH:MM:SS' UTC time, or None if there's no such product"""
+        row = self.fetch_one('product_stock_on_date', STOCK_ON_DATE_FOR_PRODUCT,
+                             {'product_id': product_id, 'as_of': as_of})
+        return row[1] if row is not None else None
+
+    def list_cumulative_changes(self, product_id, after, until):
+        """Get (day, net change since after) for each day with movements in (after, until]"""
+        return self.fetch_all('list_cumulative_changes', DAILY_STOCK_CHANGES, (product_id, after, until))
+
+    def list_discrepancies(self):
+        """Get products whose stock snapshot disagrees with the ledger"""
+        return self.fetch_all('list_discrepancies', SELECT_DISCREPANCIES, row_type=StockDiscrepancy)
+
+    def add_checkpoints(self, min_movements):
+        """Checkpoint every product with at least min_movements movements since its last checkpoint"""
+        return self.execute('add_checkpoints', INSERT_CHECKPOINTS, (min_movements,))
+
+    def sync_snapshots(self):
+        """Set products.stock to the ledger's stock wherever they differ"""
+        return self.execute('sync_snapshots', SYNC_SNAPSHOTS)
@@ -146,81 +146,16 @@ class SalesModule:
             widget.destroy()
 
     def get_daily_sales_data(self):
-        """Get daily sales data for the last 30 days"""
-        try:
-            self.main_app.cursor.execute('''
-                SELECT 
-                    DATE(sale_date) as date,
-                    SUM(total) as revenue,
-                    SUM(quantity) as items_sold,
-                    COUNT(DISTINCT transaction_id) as transactions
-                FROM sales 
-                WHERE DATE(sale_date) >= DATE('now', '-30 days')
-                GROUP BY DATE(sale_date)
-                ORDER BY date DESC
-            ''')
-            return self.main_app.cursor.fetchall()
-        except Exception as e:
-            print(f"Error getting daily sales data: {e}")
-            return []
+        return self.main_app.reports.get_daily_breakdown()
 
     def get_weekly_sales_data(self):
-        """Get weekly sales data for the last 12 weeks"""
-        try:
-            self.main_app.cursor.execute('''
-                SELECT 
-                    strftime('%Y-W%W', sale_date) as week,
-                    MIN(DATE(sale_date, 'weekday 0', '-6 days')) as week_start,
-                    MAX(DATE(sale_date, 'weekday 0')) as week_end,
-                    SUM(total) as revenue,
-                    SUM(quantity) as items_sold,
-                    COUNT(DISTINCT transaction_id) as transactions
-                FROM sales 
-                WHERE DATE(sale_date) >= DATE('now', '-84 days')
-                GROUP BY week
-                ORDER BY week DESC
-            ''')
-            return self.main_app.cursor.fetchall()
-        except Exception as e:
-            print(f"Error getting weekly sales data: {e}")
-            return []
+        return self.main_app.reports.get_weekly_breakdown()
 
     def get_monthly_sales_data(self, year):
-        """Get monthly sales data for specific year"""
-        try:
-            self.main_app.cursor.execute('''
-                SELECT 
-                    strftime('%m', sale_date) as month,
-                    SUM(total) as revenue,
-                    SUM(quantity) as items_sold,
-                    COUNT(DISTINCT transaction_id) as transactions
-                FROM sales 
-                WHERE strftime('%Y', sale_date) = ?
-                GROUP BY month
-                ORDER BY month
-            ''', (str(year),))
-            return self.main_app.cursor.fetchall()
-        except Exception as e:
-            print(f"Error getting monthly sales data: {e}")
-            return []
+        return self.main_app.reports.get_monthly_breakdown(year)
 
     def get_yearly_sales_data(self):
-        """Get yearly sales data"""
-        try:
-            self.main_app.cursor.execute('''
-                SELECT 
-                    strftime('%Y', sale_date) as year,
-                    SUM(total) as revenue,
-                    SUM(quantity) as items_sold,
-                    COUNT(DISTINCT transaction_id) as transactions
-                FROM sales 
-                GROUP BY year
-                ORDER BY year DESC
-            ''')
-            return self.main_app.cursor.fetchall()
-        except Exception as e:
-            print(f"Error getting yearly sales data: {e}")
-            return []
+        return self.main_app.reports.get_yearly_breakdown()
 
     def display_daily_summary(self, data):
         """Display daily sales summary"""
@@ -797,43 +732,43 @@ class SalesModule:
         
         ttk.Label(msg_frame, text=message, style='Placeholder.TLabel', justify='center').pack(expand=True)
 
+    def get_report_data(self, view, year=None):
+        """Get (rows, default filename, headers) for a report view without touching widgets"""
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if view == 'daily':
+            return (self.get_daily_sales_data(), f"daily_sales_report_{stamp}.csv",
+                    ['Date', 'Revenue', 'Items_Sold', 'Transactions'])
+        if view == 'weekly':
+            return (self.get_weekly_sales_data(), f"weekly_sales_report_{stamp}.csv",
+                    ['Week', 'Week_Start', 'Week_End', 'Revenue', 'Items_Sold', 'Transactions'])
+        if view == 'monthly':
+            return (self.get_monthly_sales_data(year), f"monthly_sales_report_{year}_{stamp}.csv",
+                    ['Month', 'Revenue', 'Items_Sold', 'Transactions'])
+        return (self.get_yearly_sales_data(), f"yearly_sales_report_{stamp}.csv",
+                ['Year', 'Revenue', 'Items_Sold', 'Transactions'])
+
+    def write_report(self, filename, headers, data):
+        """Write report rows as CSV"""
+        csv_content = ','.join(headers) + '\n'
+        for row in data:
+            csv_content += ','.join(str(field) for field in row) + '\n'
+        
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(csv_content)
+
     def export_sales_report(self):
         """Export sales report to CSV"""
         try:
             # Get current view data
-            if self.current_view == 'daily':
-                data = self.get_daily_sales_data()
-                filename = f"daily_sales_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-                headers = ['Date', 'Revenue', 'Items_Sold', 'Transactions']
-                
-            elif self.current_view == 'weekly':
-                data = self.get_weekly_sales_data()
-                filename = f"weekly_sales_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-                headers = ['Week', 'Week_Start', 'Week_End', 'Revenue', 'Items_Sold', 'Transactions']
-                
-            elif self.current_view == 'monthly':
-                year = int(self.year_var.get())
-                data = self.get_monthly_sales_data(year)
-                filename = f"monthly_sales_report_{year}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-                headers = ['Month', 'Revenue', 'Items_Sold', 'Transactions']
-                
-            elif self.current_view == 'yearly':
-                data = self.get_yearly_sales_data()
-                filename = f"yearly_sales_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-                headers = ['Year', 'Revenue', 'Items_Sold', 'Transactions']
+            year = int(self.year_var.get()) if self.current_view == 'monthly' else None
+            data, filename, headers = self.get_report_data(self.current_view, year)
             
             if not data:
                 messagebox.showinfo("Export", "No data available to export.")
                 return
             
-            # Create CSV content
-            csv_content = ','.join(headers) + '\n'
-            for row in data:
-                csv_content += ','.join(str(field) for field in row) + '\n'
-            
             # Save to file
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(csv_content)
+            self.write_report(filename, headers, data)
             
             messagebox.showinfo("Export Successful", f"Sales report exported to {filename}")
             
@@ -0,0 +1,34 @@
+# Keyboard-wedge barcode scanners "type" the code and press Enter. They type a
+# key every few milliseconds, where people take 100 ms or more, so the gap
+# between keystrokes tells a scan from someone typing in the same box.
+
+
+class ScanDetector:
+    """Collects keystrokes and decides, on Enter, whether they were a scan"""
+
+    def __init__(self, max_gap_ms=40, min_length=4):
+        self.max_gap_ms = max_gap_ms
+        self.min_length = min_length
+        self.buffer = []
+        self.last_time = None
+
+    def key(self, char, time_ms):
+        """Record a printable keystroke (Tk event.char and event.time)"""
+        if not char or not char.isprintable():
+            return
+        if self.last_time is not None and time_ms - self.last_time > self.max_gap_ms:
+            # A pause: whatever came before was typed by hand
+            self.buffer = []
+        self.buffer.append(char)
+        self.last_time = time_ms
+
+    def finish(self, time_ms):
+        """Call on Enter; returns the scanned code, or None if the keys were typed by hand"""
+        code = ''.join(self.buffer).strip()
+        fast = self.last_time is not None and time_ms - self.last_time <= self.max_gap_ms
+        self.reset()
+        return code if fast and len(code) >= self.min_length else None
+
+    def reset(self):
+        self.buffer = []
+        self.last_time = None
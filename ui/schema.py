@@ -0,0 +1,420 @@
+# Schema shared by the app, the data generator and the benchmarks (no tkinter imports)
+import re
+
+DEFAULT_SERVICES = [
+    ('Basic Tune-Up', 'Complete bike inspection, adjustment of brakes, gears, and bearings', 500.00, '1 hour', 'General', 'SRV001'),
+    ('Full Bike Service', 'Comprehensive service including cleaning, lubrication, and full adjustment', 1000.00, '2 hours', 'General', 'SRV002'),
+    ('Wheel Truing', 'Straightening and tensioning of wheel', 300.00, '45 minutes', 'Wheels', 'SRV003'),
+    ('Brake Service', 'Brake pad replacement and adjustment', 250.00, '30 minutes', 'Brakes', 'SRV004'),
+    ('Drivetrain Cleaning', 'Deep cleaning of chain, cassette, and chainrings', 350.00, '1 hour', 'Drivetrain', 'SRV005'),
+    ('Basic Bike Wash', 'External cleaning and basic lubrication', 200.00, '30 minutes', 'Cleaning', 'SRV006'),
+    ('Suspension Service', 'Fork and shock maintenance', 800.00, '2 hours', 'Suspension', 'SRV007'),
+    ('Bike Assembly', 'Complete bike assembly from box', 1500.00, '3 hours', 'Assembly', 'SRV008')
+]
+
+# Who and where the work is done; every scheduled booking takes one technician and one bay
+DEFAULT_RESOURCES = [
+    ('Technician 1', 'Technician'),
+    ('Technician 2', 'Technician'),
+    ('Bay 1', 'Bay'),
+    ('Bay 2', 'Bay')
+]
+
+
+def create_inventory_schema(cursor):
+    """Create the products, sales, transactions, stock_movements and stock_checkpoints tables"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            price REAL NOT NULL DEFAULT 0.0,
+            stock INTEGER NOT NULL DEFAULT 0,
+            category TEXT DEFAULT 'Bikes',
+            product_id TEXT UNIQUE NOT NULL,
+            date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sales (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            transaction_id TEXT NOT NULL,
+            product_id TEXT,
+            product_name TEXT,
+            product_category TEXT,
+            customer_name TEXT,
+            customer_address TEXT,
+            quantity INTEGER,
+            price REAL,
+            total REAL,
+            sale_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Deleted products are archived (is_active = 0) so their sales history survives
+    cursor.execute("PRAGMA table_info(products)")
+    columns = [column[1] for column in cursor.fetchall()]
+    if 'is_active' not in columns:
+        cursor.execute("ALTER TABLE products ADD COLUMN is_active INTEGER NOT NULL DEFAULT 1")
+        cursor.execute("ALTER TABLE products ADD COLUMN archived_date TIMESTAMP")
+        print("Added is_active and archived_date columns to products table")
+    if 'barcode' not in columns:
+        cursor.execute("ALTER TABLE products ADD COLUMN barcode TEXT")
+        print("Added barcode column to products table")
+    # Scanner lookups: a barcode names one product (product_id is already UNIQUE)
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_products_barcode ON products(barcode) '
+                   'WHERE barcode IS NOT NULL')
+
+    # Older databases predate the customer columns
+    cursor.execute("PRAGMA table_info(sales)")
+    columns = [column[1] for column in cursor.fetchall()]
+    if 'customer_address' not in columns:
+        cursor.execute("ALTER TABLE sales ADD COLUMN customer_address TEXT DEFAULT ''")
+        print("Added customer_address column to sales table")
+    if 'customer_name' not in columns:
+        cursor.execute("ALTER TABLE sales ADD COLUMN customer_name TEXT DEFAULT ''")
+        print("Added customer_name column to sales table")
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            transaction_id TEXT UNIQUE NOT NULL,
+            total_amount REAL NOT NULL,
+            payment_method TEXT DEFAULT 'Cash',
+            transaction_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stock_movements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            product_id TEXT NOT NULL,
+            product_name TEXT,
+            movement_type TEXT NOT NULL, -- 'IN', 'OUT', 'ADJUSTMENT'
+            quantity INTEGER NOT NULL,
+            reference_id TEXT, -- transaction_id for sales, or other reference
+            reason TEXT, -- 'SALE', 'RESTOCK', 'RETURN', 'DAMAGE', etc.
+            movement_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            notes TEXT
+        )
+    ''')
+
+    # Range scans on sale_date back the statistics filters
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sales_sale_date ON sales(sale_date)')
+    # Lines of one transaction (voids, receipts)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sales_transaction_id ON sales(transaction_id)')
+    # One product's sales (archive purge, per-product history)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sales_product_id ON sales(product_id)')
+
+    # stock_movements is the stock ledger; products.stock is a snapshot of it. A checkpoint
+    # holds a product's stock after every movement up to movement_id, so stock at any point
+    # is the nearest checkpoint plus (or minus) the movements in between.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stock_checkpoints (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            product_id TEXT NOT NULL,
+            stock INTEGER NOT NULL,
+            movement_id INTEGER NOT NULL, -- last stock_movements.id included
+            checkpoint_date TIMESTAMP NOT NULL -- movement_date of that movement
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_stock_checkpoints_product ON stock_checkpoints(product_id, id)')
+    # Also covers (product_id, id) range scans, since the rowid is part of every index
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_stock_movements_product ON stock_movements(product_id)')
+    # Point-in-time stock and the stock-over-time chart scan one product's movements by date
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_stock_movements_product_date '
+                   'ON stock_movements(product_id, movement_date)')
+
+    # Open carts hold stock for a few minutes so two tills can't sell the same last unit;
+    # available to sell = stock - unexpired holds of other carts
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stock_reservations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            cart_id TEXT NOT NULL,
+            product_id TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            expires_at TIMESTAMP NOT NULL,
+            UNIQUE (cart_id, product_id)
+        )
+    ''')
+    # Covering index for the held-units sum, so the check never touches the table
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_stock_reservations_product '
+                   'ON stock_reservations(product_id, expires_at, cart_id, quantity)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_stock_reservations_expires ON stock_reservations(expires_at)')
+
+    cursor.execute('SELECT 1 FROM stock_checkpoints LIMIT 1')
+    if cursor.fetchone() is None:
+        open_stock_ledger(cursor)
+
+
+def open_stock_ledger(cursor):
+    """Backfill missing movement reasons and checkpoint every product's current stock.
+
+    Databases from before the ledger have gaps in their movement history, so
+    the opening checkpoint takes products.stock as given.
+    """
+    cursor.execute('''
+        UPDATE stock_movements SET reason = CASE
+            WHEN reference_id = 'INITIAL' THEN 'INITIAL'
+            WHEN reference_id LIKE 'STOCK_ADD_%' THEN 'RESTOCK'
+            WHEN reference_id LIKE 'EDIT_%' THEN 'ADJUSTMENT'
+            WHEN reference_id LIKE 'RESTORE_%' THEN 'SALE_DELETION'
+            WHEN movement_type = 'OUT' THEN 'SALE'
+            ELSE 'ADJUSTMENT'
+        END
+        WHERE reason IS NULL
+    ''')
+    cursor.execute('''
+        INSERT INTO stock_checkpoints (product_id, stock, movement_id, checkpoint_date)
+        SELECT p.product_id, p.stock, COALESCE(MAX(m.id), 0),
+               COALESCE(MAX(m.movement_date), p.date_added, CURRENT_TIMESTAMP)
+        FROM products p
+        LEFT JOIN stock_movements m ON m.product_id = p.product_id
+        GROUP BY p.id
+    ''')
+
+
+def create_services_schema(cursor):
+    """Create the services, service_bookings, booking_events and service_resources tables"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS services (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            description TEXT,
+            price REAL NOT NULL DEFAULT 0.0,
+            duration TEXT DEFAULT '30 minutes',
+            category TEXT DEFAULT 'Service',
+            service_id TEXT UNIQUE NOT NULL,
+            is_active BOOLEAN DEFAULT 1,
+            date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS service_bookings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            booking_id TEXT UNIQUE NOT NULL,
+            service_id TEXT NOT NULL,
+            service_name TEXT NOT NULL,
+            customer_name TEXT NOT NULL,
+            customer_contact TEXT,
+            bike_details TEXT,
+            booking_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            scheduled_date TEXT,
+            scheduled_time TEXT,
+            status TEXT DEFAULT 'Pending',
+            notes TEXT,
+            price REAL NOT NULL,
+            payment_status TEXT DEFAULT 'Unpaid',
+            completed_date TIMESTAMP
+        )
+    ''')
+
+    # Older databases predate the scheduler columns
+    cursor.execute("PRAGMA table_info(service_bookings)")
+    columns = [column[1] for column in cursor.fetchall()]
+    if 'technician' not in columns:
+        cursor.execute("ALTER TABLE service_bookings ADD COLUMN technician TEXT")
+        cursor.execute("ALTER TABLE service_bookings ADD COLUMN bay TEXT")
+        cursor.execute("ALTER TABLE service_bookings ADD COLUMN duration_minutes INTEGER")
+        print("Added technician, bay and duration_minutes columns to service_bookings table")
+    # One day's appointments in time order (scheduler, upcoming appointments)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_service_bookings_schedule '
+                   'ON service_bookings(scheduled_date, scheduled_time)')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS service_resources (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            kind TEXT NOT NULL, -- 'Technician' or 'Bay'
+            is_active INTEGER NOT NULL DEFAULT 1,
+            UNIQUE (kind, name)
+        )
+    ''')
+    cursor.execute('SELECT 1 FROM service_resources LIMIT 1')
+    if cursor.fetchone() is None:
+        cursor.executemany('INSERT INTO service_resources (name, kind) VALUES (?, ?)', DEFAULT_RESOURCES)
+
+    # A booking's history, one row per change; service_bookings.notes is no longer written
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS booking_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            booking_id TEXT NOT NULL,
+            event_date TIMESTAMP NOT NULL,
+            kind TEXT NOT NULL, -- 'STATUS', 'PAYMENT' or 'NOTE'
+            from_value TEXT,
+            to_value TEXT,
+            note TEXT
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_booking_events_booking ON booking_events(booking_id, id)')
+
+    cursor.execute('SELECT 1 FROM booking_events LIMIT 1')
+    if cursor.fetchone() is None:
+        split_booking_notes(cursor)
+
+    create_service_rollup(cursor)
+
+
+# Notes lines written before booking_events:
+#   [2024-05-01 14:30] Status: Pending → Completed | Payment: Unpaid → Paid - Done early
+# and cancellations appended as ' | Cancelled: <reason>'
+NOTE_LINE = re.compile(r'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2})\] ?(.*)$')
+NOTE_CHANGE = re.compile(r'(Status|Payment): (.*?) → (.*?)(?= \| (?:Status|Payment): | - |$)')
+CANCELLED_MARK = ' | Cancelled: '
+
+
+def parse_booking_notes(notes, booking_date):
+    """Split a notes blob into (event_date, kind, from_value, to_value, note) tuples"""
+    events = []
+    event_date = str(booking_date or '')[:19]
+    for line in notes.split('\n'):
+        line, *cancellations = line.split(CANCELLED_MARK)
+        match = NOTE_LINE.match(line.strip())
+        if match:
+            event_date = f"{match.group(1)}:00"
+            rest, changes = match.group(2), []
+            change = NOTE_CHANGE.match(rest)
+            while change:
+                changes.append((event_date, change.group(1).upper(), change.group(2), change.group(3), None))
+                rest = rest[change.end():]
+                if not rest.startswith(' | '):
+                    break
+                rest = rest[3:]
+                change = NOTE_CHANGE.match(rest)
+            note = (rest[3:] if rest.startswith(' - ') else rest).strip() or None
+            if changes:
+                changes[-1] = changes[-1][:4] + (note,)
+                events.extend(changes)
+            elif note:
+                events.append((event_date, 'NOTE', None, None, note))
+        elif line.strip():
+            events.append((event_date, 'NOTE', None, None, line.strip()))
+        # Cancellations didn't record a time; they happened after the line they follow
+        for reason in cancellations:
+            events.append((event_date, 'STATUS', None, 'Cancelled', reason.strip() or None))
+    return events
+
+
+def split_booking_notes(cursor):
+    """Move every booking's notes blob into booking_events, then clear it"""
+    cursor.execute('''
+        SELECT booking_id, booking_date, notes FROM service_bookings
+        WHERE notes IS NOT NULL AND notes != ''
+        ORDER BY id
+    ''')
+    events = [(booking_id,) + event
+              for booking_id, booking_date, notes in cursor.fetchall()
+              for event in parse_booking_notes(notes, booking_date)]
+    if not events:
+        return
+    cursor.executemany('''
+        INSERT INTO booking_events (booking_id, event_date, kind, from_value, to_value, note)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', events)
+    cursor.execute("UPDATE service_bookings SET notes = NULL WHERE notes IS NOT NULL AND notes != ''")
+    print(f"Moved booking notes into {len(events)} booking events")
+
+
+# Adds (sign = 1) or takes away (sign = -1) one booking row's share of its day's totals
+_ROLLUP_APPLY = '''
+        INSERT INTO service_daily_rollup (day, booking_count, revenue, pending_count, completed_count,
+                                          completed_revenue)
+        VALUES (DATE({row}.booking_date), {sign}, {sign} * {row}.price, {sign} * ({row}.status = 'Pending'),
+                {sign} * ({row}.status = 'Completed'),
+                {sign} * (CASE WHEN {row}.status = 'Completed' THEN {row}.price ELSE 0 END))
+        ON CONFLICT(day) DO UPDATE SET
+            booking_count = booking_count + excluded.booking_count,
+            revenue = revenue + excluded.revenue,
+            pending_count = pending_count + excluded.pending_count,
+            completed_count = completed_count + excluded.completed_count,
+            completed_revenue = completed_revenue + excluded.completed_revenue;
+        INSERT INTO service_daily_customers (day, customer_name, booking_count)
+        VALUES (DATE({row}.booking_date), {row}.customer_name, {sign})
+        ON CONFLICT(day, customer_name) DO UPDATE SET booking_count = booking_count + excluded.booking_count;
+'''
+_ROLLUP_PRUNE = '''
+        DELETE FROM service_daily_customers
+        WHERE day = DATE(OLD.booking_date) AND customer_name = OLD.customer_name AND booking_count <= 0;
+'''
+
+
+def create_service_rollup(cursor):
+    """Create the per-day service booking totals, kept up to date by triggers, and fill them if empty"""
+    # Totals by DATE(booking_date); pending and completed counts follow status changes
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS service_daily_rollup (
+            day TEXT PRIMARY KEY,
+            booking_count INTEGER NOT NULL DEFAULT 0,
+            revenue REAL NOT NULL DEFAULT 0,
+            pending_count INTEGER NOT NULL DEFAULT 0,
+            completed_count INTEGER NOT NULL DEFAULT 0,
+            completed_revenue REAL NOT NULL DEFAULT 0
+        )
+    ''')
+    # Each day's distinct customers, so unique customers over any range is a count over a few rows a day
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS service_daily_customers (
+            day TEXT NOT NULL,
+            customer_name TEXT NOT NULL,
+            booking_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, customer_name)
+        ) WITHOUT ROWID
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS service_bookings_rollup_insert AFTER INSERT ON service_bookings
+        BEGIN
+            {_ROLLUP_APPLY.format(row='NEW', sign=1)}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS service_bookings_rollup_delete AFTER DELETE ON service_bookings
+        BEGIN
+            {_ROLLUP_APPLY.format(row='OLD', sign=-1)}
+            {_ROLLUP_PRUNE}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS service_bookings_rollup_update
+        AFTER UPDATE OF booking_date, customer_name, status, price ON service_bookings
+        BEGIN
+            {_ROLLUP_APPLY.format(row='OLD', sign=-1)}
+            {_ROLLUP_PRUNE}
+            {_ROLLUP_APPLY.format(row='NEW', sign=1)}
+        END
+    ''')
+
+    cursor.execute('SELECT 1 FROM service_daily_rollup LIMIT 1')
+    if cursor.fetchone() is None:
+        rebuild_service_rollup(cursor)
+
+
+def rebuild_service_rollup(cursor):
+    """Recompute the service rollup tables from service_bookings"""
+    cursor.execute('DELETE FROM service_daily_rollup')
+    cursor.execute('DELETE FROM service_daily_customers')
+    cursor.execute('''
+        INSERT INTO service_daily_rollup (day, booking_count, revenue, pending_count, completed_count,
+                                          completed_revenue)
+        SELECT DATE(booking_date), COUNT(*), SUM(price), SUM(status = 'Pending'), SUM(status = 'Completed'),
+               SUM(CASE WHEN status = 'Completed' THEN price ELSE 0 END)
+        FROM service_bookings
+        WHERE booking_date IS NOT NULL
+        GROUP BY DATE(booking_date)
+    ''')
+    cursor.execute('''
+        INSERT INTO service_daily_customers (day, customer_name, booking_count)
+        SELECT DATE(booking_date), customer_name, COUNT(*)
+        FROM service_bookings
+        WHERE booking_date IS NOT NULL
+        GROUP BY DATE(booking_date), customer_name
+    ''')
+
+
+def create_schema(conn):
+    """Create every table the app uses and commit"""
+    cursor = conn.cursor()
+    create_inventory_schema(cursor)
+    create_services_schema(cursor)
+    conn.commit()
@@ -4,6 +4,9 @@ from datetime import datetime
 import sqlite3
 import matplotlib.animation as animation
 from matplotlib.animation import FuncAnimation
+from query_cache import cached_query
+from schema import DEFAULT_SERVICES, create_services_schema
+from core import CoreError, parse_duration, describe_event
 
 class ServiceDialog:
     def __init__(self, parent, title, service_data=None):
@@ -186,12 +189,20 @@ class ServiceDialog:
             print(f"Error in ServiceDialog.cancel(): {e}")
 
 class ServicesModule:
+    # Notebook tabs, in order; each loads its data the first time it's shown
+    TABS = ('services', 'history', 'sales')
+
     def __init__(self, parent, main_app):
         self.parent = parent
         self.main_app = main_app
         self.frame = None
         self.init_services_database()
         
+        # Tabs whose data is missing or out of date, loaded when next shown
+        self.notebook = None
+        self.tab_frames = {}
+        self.dirty_tabs = set(self.TABS)
+        
         # NEW: Initialize variables for service sales
         self.sales_period_var = None
         self.service_year_var = None
@@ -204,23 +215,13 @@ class ServicesModule:
         
     def insert_default_services(self):
         """Insert default services into the database"""
-        default_services = [
-            ('Basic Tune-Up', 'Complete bike inspection, adjustment of brakes, gears, and bearings', 500.00, '1 hour', 'General', 'SRV001'),
-            ('Full Bike Service', 'Comprehensive service including cleaning, lubrication, and full adjustment', 1000.00, '2 hours', 'General', 'SRV002'),
-            ('Wheel Truing', 'Straightening and tensioning of wheel', 300.00, '45 minutes', 'Wheels', 'SRV003'),
-            ('Brake Service', 'Brake pad replacement and adjustment', 250.00, '30 minutes', 'Brakes', 'SRV004'),
-            ('Drivetrain Cleaning', 'Deep cleaning of chain, cassette, and chainrings', 350.00, '1 hour', 'Drivetrain', 'SRV005'),
-            ('Basic Bike Wash', 'External cleaning and basic lubrication', 200.00, '30 minutes', 'Cleaning', 'SRV006'),
-            ('Suspension Service', 'Fork and shock maintenance', 800.00, '2 hours', 'Suspension', 'SRV007'),
-            ('Bike Assembly', 'Complete bike assembly from box', 1500.00, '3 hours', 'Assembly', 'SRV008')
-        ]
-        
         try:
             self.main_app.cursor.executemany('''
                 INSERT INTO services (name, description, price, duration, category, service_id)
                 VALUES (?, ?, ?, ?, ?, ?)
-            ''', default_services)
+            ''', DEFAULT_SERVICES)
             self.main_app.conn.commit()
+            self.main_app.invalidate_tables('services')
             print("Default services inserted successfully")
         except sqlite3.Error as e:
             print(f"Error inserting default services: {e}")
@@ -228,41 +229,7 @@ class ServicesModule:
     def init_services_database(self):
         """Initialize services-related database tables"""
         try:
-            # Create services table
-            self.main_app.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS services (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    description TEXT,
-                    price REAL NOT NULL DEFAULT 0.0,
-                    duration TEXT DEFAULT '30 minutes',
-                    category TEXT DEFAULT 'Service',
-                    service_id TEXT UNIQUE NOT NULL,
-                    is_active BOOLEAN DEFAULT 1,
-                    date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create service_bookings table
-            self.main_app.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS service_bookings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    booking_id TEXT UNIQUE NOT NULL,
-                    service_id TEXT NOT NULL,
-                    service_name TEXT NOT NULL,
-                    customer_name TEXT NOT NULL,
-                    customer_contact TEXT,
-                    bike_details TEXT,
-                    booking_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    scheduled_date TEXT,
-                    scheduled_time TEXT,
-                    status TEXT DEFAULT 'Pending',
-                    notes TEXT,
-                    price REAL NOT NULL,
-                    payment_status TEXT DEFAULT 'Unpaid',
-                    completed_date TIMESTAMP
-                )
-            ''')
+            create_services_schema(self.main_app.cursor)
             
             # Insert default services if table is empty
             self.main_app.cursor.execute('SELECT COUNT(*) FROM services')
@@ -286,10 +253,14 @@ class ServicesModule:
         
         ttk.Label(header_frame, text="Services", style='PageTitle.TLabel').pack(side='left')
         
-        # Tab control for Services and Service History
+        # Tab control for Services and Service History. Tabs are built empty and
+        # load their data on first view, so opening the page doesn't wait for
+        # the booking history or the sales charts.
+        self.dirty_tabs = set(self.TABS)
         try:
             notebook = ttk.Notebook(self.frame)
             notebook.pack(fill='both', expand=True, padx=30, pady=(0, 20))
+            self.notebook = notebook
             
             # Services tab
             services_tab = ttk.Frame(notebook, style='Content.TFrame')
@@ -306,13 +277,54 @@ class ServicesModule:
             notebook.add(sales_tab, text='Service Sales')
             self.create_service_sales_tab(sales_tab)
             
+            self.tab_frames = {'services': services_tab, 'history': history_tab, 'sales': sales_tab}
+            notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+            self.load_visible_tab()
+            
         except Exception as e:
             print(f"Error creating notebook: {e}")
             # Fall back to simple frame if notebook fails
+            self.notebook = None
             self.create_services_tab(self.frame)
+            self.load_services()
         
         return self.frame
 
+    def visible_tab(self):
+        """Get the name of the tab on show, or None"""
+        if self.notebook is None or not self.frame.winfo_exists():
+            return None
+        selected = self.notebook.select()
+        for name, tab in self.tab_frames.items():
+            if str(tab) == selected:
+                return name
+        return None
+
+    def on_tab_changed(self, event=None):
+        self.load_visible_tab()
+
+    def load_visible_tab(self):
+        """Load the tab on show if it hasn't been loaded since its data last changed"""
+        name = self.visible_tab()
+        if name in self.dirty_tabs:
+            self.dirty_tabs.discard(name)
+            self.load_tab(name)
+
+    def load_tab(self, name):
+        if name == 'services':
+            self.load_services()
+        elif name == 'history':
+            self.load_service_history()
+        elif name == 'sales':
+            self.update_service_year_selector()
+            self.load_service_sales_data()
+
+    def mark_dirty(self, *tabs):
+        """Note that tabs' data changed: the one on show reloads now, the others when next shown"""
+        self.dirty_tabs.update(tabs or self.TABS)
+        if self.frame is not None:
+            self.load_visible_tab()
+
     def create_service_sales_tab(self, parent):
         """Create the service sales analysis tab with charts and time period analysis"""
         # Header
@@ -373,9 +385,7 @@ class ServicesModule:
         self.service_detailed_frame = ttk.Frame(self.service_sales_notebook, style='Content.TFrame')
         self.service_sales_notebook.add(self.service_detailed_frame, text="Detailed Data")
         
-        # Initialize year selector and load data
-        self.update_service_year_selector()
-        self.load_service_sales_data()
+        # The year selector and data are filled in when the tab is first shown (load_tab)
 
     def update_service_year_selector(self):
         """Update available years in the service year selector"""
@@ -442,81 +452,16 @@ class ServicesModule:
             widget.destroy()
 
     def get_service_daily_data(self):
-        """Get daily service data for the last 30 days"""
-        try:
-            self.main_app.cursor.execute('''
-                SELECT 
-                    DATE(booking_date) as date,
-                    SUM(price) as revenue,
-                    COUNT(*) as services_count,
-                    COUNT(DISTINCT customer_name) as unique_customers
-                FROM service_bookings 
-                WHERE DATE(booking_date) >= DATE('now', '-30 days')
-                GROUP BY DATE(booking_date)
-                ORDER BY date DESC
-            ''')
-            return self.main_app.cursor.fetchall()
-        except Exception as e:
-            print(f"Error getting daily service data: {e}")
-            return []
+        return self.main_app.service_reports.get_service_daily_data()
 
     def get_service_weekly_data(self):
-        """Get weekly service data for the last 12 weeks"""
-        try:
-            self.main_app.cursor.execute('''
-                SELECT 
-                    strftime('%Y-W%W', booking_date) as week,
-                    MIN(DATE(booking_date, 'weekday 0', '-6 days')) as week_start,
-                    MAX(DATE(booking_date, 'weekday 0')) as week_end,
-                    SUM(price) as revenue,
-                    COUNT(*) as services_count,
-                    COUNT(DISTINCT customer_name) as unique_customers
-                FROM service_bookings 
-                WHERE DATE(booking_date) >= DATE('now', '-84 days')
-                GROUP BY week
-                ORDER BY week DESC
-            ''')
-            return self.main_app.cursor.fetchall()
-        except Exception as e:
-            print(f"Error getting weekly service data: {e}")
-            return []
+        return self.main_app.service_reports.get_service_weekly_data()
 
     def get_service_monthly_data(self, year):
-        """Get monthly service data for specific year"""
-        try:
-            self.main_app.cursor.execute('''
-                SELECT 
-                    strftime('%m', booking_date) as month,
-                    SUM(price) as revenue,
-                    COUNT(*) as services_count,
-                    COUNT(DISTINCT customer_name) as unique_customers
-                FROM service_bookings 
-                WHERE strftime('%Y', booking_date) = ?
-                GROUP BY month
-                ORDER BY month
-            ''', (str(year),))
-            return self.main_app.cursor.fetchall()
-        except Exception as e:
-            print(f"Error getting monthly service data: {e}")
-            return []
+        return self.main_app.service_reports.get_service_monthly_data(year)
 
     def get_service_yearly_data(self):
-        """Get yearly service data"""
-        try:
-            self.main_app.cursor.execute('''
-                SELECT 
-                    strftime('%Y', booking_date) as year,
-                    SUM(price) as revenue,
-                    COUNT(*) as services_count,
-                    COUNT(DISTINCT customer_name) as unique_customers
-                FROM service_bookings 
-                GROUP BY year
-                ORDER BY year DESC
-            ''')
-            return self.main_app.cursor.fetchall()
-        except Exception as e:
-            print(f"Error getting yearly service data: {e}")
-            return []
+        return self.main_app.service_reports.get_service_yearly_data()
 
     def display_service_daily_summary(self, data):
         """Display daily service sales summary"""
@@ -1312,9 +1257,6 @@ class ServicesModule:
                 command=self.book_selected_service,
                 style='Success.TButton').pack(side='left', padx=(0, 10))
         
-        # Load services
-        self.load_services()
-
     def create_service_history_tab(self, parent):
         """Create the service history tab with search"""
         # History controls
@@ -1389,8 +1331,6 @@ class ServicesModule:
         history_table_frame.grid_rowconfigure(0, weight=1)
         history_table_frame.grid_columnconfigure(0, weight=1)
         
-        # Load service history
-        self.load_service_history()
 
 
     def search_services(self):
@@ -1542,20 +1482,9 @@ class ServicesModule:
             category_filter = self.category_filter_var.get() if hasattr(self, 'category_filter_var') else 'All Categories'
             
             if category_filter == 'All Categories':
-                self.main_app.cursor.execute('''
-                    SELECT id, service_id, name, category, price, duration, is_active
-                    FROM services 
-                    ORDER BY category, name
-                ''')
+                services = self.main_app.service_repo.list()
             else:
-                self.main_app.cursor.execute('''
-                    SELECT id, service_id, name, category, price, duration, is_active
-                    FROM services 
-                    WHERE category = ?
-                    ORDER BY name
-                ''', (category_filter,))
-            
-            services = self.main_app.cursor.fetchall()
+                services = self.main_app.service_repo.list(category_filter)
             
             for service in services:
                 status = 'Active' if service[6] else 'Inactive'
@@ -1584,22 +1513,9 @@ class ServicesModule:
             status_filter = self.status_filter_var.get() if hasattr(self, 'status_filter_var') else 'All Status'
             
             if status_filter == 'All Status':
-                self.main_app.cursor.execute('''
-                    SELECT id, booking_id, booking_date, customer_name, service_name, 
-                        customer_contact, status, payment_status, price
-                    FROM service_bookings 
-                    ORDER BY booking_date DESC
-                ''')
+                bookings = self.main_app.booking_repo.list()
             else:
-                self.main_app.cursor.execute('''
-                    SELECT id, booking_id, booking_date, customer_name, service_name, 
-                        customer_contact, status, payment_status, price
-                    FROM service_bookings 
-                    WHERE status = ?
-                    ORDER BY booking_date DESC
-                ''', (status_filter,))
-            
-            bookings = self.main_app.cursor.fetchall()
+                bookings = self.main_app.booking_repo.list(status_filter)
             
             for booking in bookings:
                 # Format date
@@ -1656,6 +1572,7 @@ class ServicesModule:
             service_id = service_data[1]     # Service ID 
             service_name = service_data[2]   # Service name
             price_str = service_data[4]      # Price string with ₱ symbol
+            duration = parse_duration(str(service_data[5]))
             
             # Clean and convert price
             price = float(price_str.replace('₱', '').replace(',', ''))
@@ -1663,19 +1580,19 @@ class ServicesModule:
             print(f"Service: ID={service_db_id}, Name={service_name}, Price={price}")
             
             # Open booking dialog with corrected parameters
-            self.open_booking_dialog(service_db_id, service_name, price)
+            self.open_booking_dialog(service_db_id, service_name, price, duration)
             
         except Exception as e:
             print(f"Error in book_selected_service: {e}")
             messagebox.showerror("Error", f"Failed to initiate booking: {str(e)}")
     
-    def open_booking_dialog(self, service_id, service_name, price):
+    def open_booking_dialog(self, service_id, service_name, price, duration=30):
         """Open service booking dialog - SIMPLIFIED VERSION with fixed height"""
         try:
             # Create dialog window with smaller height
             dialog = tk.Toplevel()
             dialog.title("Book Service")
-            dialog.geometry("480x500")  
+            dialog.geometry("480x720")  
             dialog.configure(bg='white')
             dialog.resizable(False, False)
             dialog.minsize(480, 350)  
@@ -1688,8 +1605,8 @@ class ServicesModule:
             # Center the dialog
             dialog.update_idletasks()
             x = (dialog.winfo_screenwidth() // 2) - (480 // 2)
-            y = (dialog.winfo_screenheight() // 2) - (500 // 2)  # Changed from 400 to 350
-            dialog.geometry(f"480x500+{x}+{y}")
+            y = (dialog.winfo_screenheight() // 2) - (720 // 2)
+            dialog.geometry(f"480x720+{x}+{y}")
             
             # Main content frame
             content_frame = tk.Frame(dialog, bg='white', padx=30, pady=20)  # Reduced pady
@@ -1718,6 +1635,8 @@ class ServicesModule:
                     font=('Arial', 11, 'bold'), bg='#f8fafc', fg='#1e293b').pack(anchor='w', pady=2)
             tk.Label(details_content, text=f"Price: ₱{price:.2f}", 
                     font=('Arial', 11, 'bold'), bg='#f8fafc', fg='#059669').pack(anchor='w', pady=2)
+            tk.Label(details_content, text=f"Duration: {duration} minutes", 
+                    font=('Arial', 10), bg='#f8fafc', fg='#374151').pack(anchor='w', pady=2)
             
             # Customer information card
             customer_card = tk.Frame(content_frame, bg='white', relief='solid', bd=1)
@@ -1764,6 +1683,82 @@ class ServicesModule:
                                     validate='key', validatecommand=vcmd)
             contact_entry.pack(fill='x', pady=(0, 5))  # Reduced bottom padding
 
+            # Appointment card: leave the time blank for a walk-in
+            appointment_card = tk.Frame(content_frame, bg='white', relief='solid', bd=1)
+            appointment_card.pack(fill='x', pady=(0, 5))
+            
+            appointment_header = tk.Frame(appointment_card, bg='#f59e0b', height=35)
+            appointment_header.pack(fill='x')
+            appointment_header.pack_propagate(False)
+            
+            tk.Label(appointment_header, text="📅 Appointment", 
+                    font=('Arial', 12, 'bold'), bg='#f59e0b', fg='white').pack(pady=8)
+            
+            appointment_content = tk.Frame(appointment_card, bg='white', padx=20, pady=10)
+            appointment_content.pack(fill='x')
+            appointment_content.columnconfigure(1, weight=1)
+            appointment_content.columnconfigure(3, weight=1)
+            
+            try:
+                technicians, bays = self.main_app.scheduler.resources()
+            except Exception as e:
+                print(f"Error loading technicians and bays: {e}")
+                technicians, bays = [], []
+            
+            date_var = tk.StringVar(value=datetime.now().strftime('%Y-%m-%d'))
+            time_var = tk.StringVar()
+            technician_var = tk.StringVar(value='Any')
+            bay_var = tk.StringVar(value='Any')
+            
+            tk.Label(appointment_content, text="Date:", font=('Arial', 10, 'bold'),
+                    bg='white', fg='#374151').grid(row=0, column=0, sticky='w', pady=3)
+            tk.Entry(appointment_content, textvariable=date_var, font=('Arial', 10), relief='solid', bd=1,
+                    width=12).grid(row=0, column=1, sticky='ew', padx=(5, 10), pady=3)
+            tk.Label(appointment_content, text="Time:", font=('Arial', 10, 'bold'),
+                    bg='white', fg='#374151').grid(row=0, column=2, sticky='w', pady=3)
+            tk.Entry(appointment_content, textvariable=time_var, font=('Arial', 10), relief='solid', bd=1,
+                    width=8).grid(row=0, column=3, sticky='ew', padx=(5, 0), pady=3)
+            
+            tk.Label(appointment_content, text="Technician:", font=('Arial', 10, 'bold'),
+                    bg='white', fg='#374151').grid(row=1, column=0, sticky='w', pady=3)
+            ttk.Combobox(appointment_content, textvariable=technician_var, values=['Any'] + list(technicians),
+                         state='readonly', width=12).grid(row=1, column=1, sticky='ew', padx=(5, 10), pady=3)
+            tk.Label(appointment_content, text="Bay:", font=('Arial', 10, 'bold'),
+                    bg='white', fg='#374151').grid(row=1, column=2, sticky='w', pady=3)
+            ttk.Combobox(appointment_content, textvariable=bay_var, values=['Any'] + list(bays),
+                         state='readonly', width=8).grid(row=1, column=3, sticky='ew', padx=(5, 0), pady=3)
+            
+            slot_label = tk.Label(appointment_content, text="Leave the time blank for a walk-in",
+                                 font=('Arial', 9), bg='white', fg='#6b7280')
+            slot_label.grid(row=2, column=0, columnspan=3, sticky='w', pady=(5, 0))
+            
+            def chosen(var):
+                return None if var.get() == 'Any' else var.get()
+            
+            def find_next_slot():
+                try:
+                    slot = self.main_app.scheduler.next_free_slot(
+                        duration, date_var.get().strip() or None, time_var.get().strip() or None,
+                        chosen(technician_var), chosen(bay_var))
+                except CoreError as e:
+                    messagebox.showerror("Error", str(e), parent=dialog)
+                    return
+                except Exception as e:
+                    print(f"Error finding a free slot: {e}")
+                    messagebox.showerror("Error", f"Failed to find a free slot: {str(e)}", parent=dialog)
+                    return
+                if slot is None:
+                    slot_label.config(text="No free slot in the next two weeks", fg='#dc2626')
+                    return
+                date_var.set(slot.scheduled_date)
+                time_var.set(slot.scheduled_time)
+                technician_var.set(slot.technician)
+                bay_var.set(slot.bay)
+                slot_label.config(text=f"Free: {slot.technician}, {slot.bay}", fg='#059669')
+            
+            tk.Button(appointment_content, text="Next Free Slot", command=find_next_slot,
+                     bg='#f59e0b', fg='white', font=('Arial', 9, 'bold'), relief='flat',
+                     padx=10, pady=3, cursor='hand2').grid(row=2, column=3, sticky='e', pady=(5, 0))
             
             # Action buttons
             button_container = tk.Frame(content_frame, bg='white')
@@ -1771,38 +1766,32 @@ class ServicesModule:
             
             def confirm_booking():
                 try:
-                    # Validate required fields
-                    if not customer_var.get().strip():
-                        messagebox.showerror("Error", "Customer name is required!")
-                        customer_entry.focus_set()
-                        return
-                    
-                    # Generate unique booking ID
-                    booking_id = f"BK{datetime.now().strftime('%Y%m%d%H%M%S')}"
-                    
-                    # Insert booking into database
-                    self.main_app.cursor.execute('''
-                        INSERT INTO service_bookings 
-                        (booking_id, service_id, service_name, customer_name, customer_contact, price)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (booking_id, service_id, service_name, customer_var.get().strip(),
-                        contact_var.get().strip(), price))
-                    
-                    self.main_app.conn.commit()
+                    scheduled_time = time_var.get().strip()
+                    scheduled_date = date_var.get().strip() if scheduled_time else None
+                    booking_id = self.main_app.bookings.create_booking(service_id, service_name,
+                                                                       customer_var.get(),
+                                                                       contact_var.get(), price,
+                                                                       scheduled_date, scheduled_time or None,
+                                                                       chosen(technician_var), chosen(bay_var),
+                                                                       duration)
                     
+                    appointment = f"Appointment: {scheduled_date} {scheduled_time}\n" if scheduled_time else ""
                     # Show success message
                     messagebox.showinfo("Success", 
                                     f"Service booked successfully!\n\n"
                                     f"Booking ID: {booking_id}\n"
                                     f"Customer: {customer_var.get()}\n"
                                     f"Service: {service_name}\n"
+                                    f"{appointment}"
                                     f"Price: ₱{price:.2f}")
                     
                     # Close dialog and refresh history
                     dialog.destroy()
-                    self.load_service_history()
-                    self.load_service_sales_data()  # Refresh sales tab too
+                    self.mark_dirty('history', 'sales')
                     
+                except CoreError as e:
+                    messagebox.showerror("Error", str(e))
+                    customer_entry.focus_set()
                 except Exception as e:
                     print(f"Error confirming booking: {e}")
                     messagebox.showerror("Error", f"Failed to book service: {str(e)}")
@@ -1834,36 +1823,25 @@ class ServicesModule:
         dialog = ServiceDialog(self.main_app.root, "Add Service")
         if dialog.result:
             try:
-                # Check if service_id already exists
-                self.main_app.cursor.execute('SELECT COUNT(*) FROM services WHERE service_id = ?', 
-                                           (dialog.result['service_id'],))
-                if self.main_app.cursor.fetchone()[0] > 0:
-                    messagebox.showerror("Error", "Service ID already exists! Please use a unique Service ID.")
-                    return
-                
-                # Insert the service
-                self.main_app.cursor.execute('''
-                    INSERT INTO services (name, description, price, duration, category, service_id, is_active)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (dialog.result['name'], 
+                # Checks the service ID is free in the same transaction
+                self.main_app.service_catalog.add_service(dialog.result['name'], 
                       dialog.result['description'], 
                       dialog.result['price'],
                       dialog.result['duration'], 
                       dialog.result['category'], 
                       dialog.result['service_id'],
-                      1))  # Active by default
+                      1)  # Active by default
                 
-                self.main_app.conn.commit()
                 messagebox.showinfo("Success", f"Service '{dialog.result['name']}' added successfully!")
                 
                 # Refresh services display
                 self.load_services()
                 
+            except CoreError as e:
+                messagebox.showerror("Error", str(e))
             except sqlite3.IntegrityError as e:
-                self.main_app.conn.rollback()
                 messagebox.showerror("Error", f"Service ID already exists or constraint violation: {str(e)}")
             except sqlite3.Error as e:
-                self.main_app.conn.rollback()
                 messagebox.showerror("Error", f"Database error: {str(e)}")
             except Exception as e:
                 messagebox.showerror("Error", f"Unexpected error: {str(e)}")
@@ -1880,8 +1858,7 @@ class ServicesModule:
             service_id = item['values'][0]  # Hidden database ID
             
             # Get current service data
-            self.main_app.cursor.execute('SELECT * FROM services WHERE id = ?', (service_id,))
-            service = self.main_app.cursor.fetchone()
+            service = self.main_app.service_repo.get_full(service_id)
             
             if not service:
                 messagebox.showerror("Error", "Service not found!")
@@ -1892,24 +1869,19 @@ class ServicesModule:
             if dialog.result:
                 try:
                     # Update the service
-                    self.main_app.cursor.execute('''
-                        UPDATE services SET name = ?, description = ?, price = ?, duration = ?, 
-                               category = ?, service_id = ?, is_active = ?
-                        WHERE id = ?
-                    ''', (dialog.result['name'], dialog.result['description'], dialog.result['price'],
-                          dialog.result['duration'], dialog.result['category'], dialog.result['service_id'],
-                          dialog.result['is_active'], service_id))
+                    self.main_app.service_catalog.edit_service(service_id, dialog.result['name'],
+                          dialog.result['description'], dialog.result['price'], dialog.result['duration'],
+                          dialog.result['category'], dialog.result['service_id'], dialog.result['is_active'])
                     
-                    self.main_app.conn.commit()
                     self.load_services()
                     messagebox.showinfo("Success", "Service updated successfully!")
                     
+                except CoreError as e:
+                    messagebox.showerror("Error", f"Failed to update service: {str(e)}")
                 except sqlite3.IntegrityError:
                     messagebox.showerror("Error", "Service ID already exists!")
-                    self.main_app.conn.rollback()
                 except sqlite3.Error as e:
                     messagebox.showerror("Error", f"Failed to update service: {str(e)}")
-                    self.main_app.conn.rollback()
                     
         except Exception as e:
             messagebox.showerror("Error", f"Failed to edit service: {str(e)}")
@@ -1927,8 +1899,7 @@ class ServicesModule:
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete '{service_name}'?"):
             try:
                 service_id = item['values'][0]  # Hidden ID
-                self.main_app.cursor.execute('DELETE FROM services WHERE id = ?', (service_id,))
-                self.main_app.conn.commit()
+                self.main_app.service_catalog.delete_service(service_id)
                 messagebox.showinfo("Deleted", f"'{service_name}' has been deleted.")
                 self.load_services()
             except Exception as e:
@@ -2205,77 +2176,29 @@ class ServicesModule:
             
             def update_status():
                 try:
-                    new_status = status_var.get()
-                    new_payment = payment_var.get()
-                    update_notes = notes_text.get('1.0', tk.END).strip()
+                    change = self.main_app.bookings.update_status(booking_id, status_var.get(), payment_var.get(),
+                                                                  notes_text.get('1.0', tk.END))
                     
-                    # Check if anything changed
-                    if new_status == current_status and new_payment == current_payment and not update_notes:
+                    if change is None:
                         messagebox.showinfo("No Changes", "No changes were made to the booking.")
                         return
                     
-                    # Prepare update data
-                    completed_date = None
-                    if new_status == 'Completed' and current_status != 'Completed':
-                        completed_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    elif new_status != 'Completed' and current_status == 'Completed':
-                        completed_date = None
-                    
-                    # Build update notes
-                    status_log = []
-                    if new_status != current_status:
-                        status_log.append(f"Status: {current_status} → {new_status}")
-                    if new_payment != current_payment:
-                        status_log.append(f"Payment: {current_payment} → {new_payment}")
-                    
-                    # Get existing notes
-                    self.main_app.cursor.execute('''
-                        SELECT notes FROM service_bookings WHERE booking_id = ?
-                    ''', (booking_id,))
-                    existing_notes = self.main_app.cursor.fetchone()[0] or ""
-                    
-                    # Combine notes
-                    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M')
-                    new_note_entry = f"\n[{timestamp}] " + " | ".join(status_log)
-                    if update_notes:
-                        new_note_entry += f" - {update_notes}"
-                    
-                    final_notes = existing_notes + new_note_entry
-                    
-                    # Update database
-                    update_query = '''
-                        UPDATE service_bookings 
-                        SET status = ?, payment_status = ?, notes = ?
-                    '''
-                    update_params = [new_status, new_payment, final_notes]
-                    
-                    if completed_date is not None:
-                        update_query += ', completed_date = ?'
-                        update_params.append(completed_date)
-                    
-                    update_query += ' WHERE booking_id = ?'
-                    update_params.append(booking_id)
-                    
-                    self.main_app.cursor.execute(update_query, update_params)
-                    self.main_app.conn.commit()
-                    
                     # Show success message
                     changes = []
-                    if new_status != current_status:
-                        changes.append(f"✅ Status: {new_status}")
-                    if new_payment != current_payment:
-                        changes.append(f"💰 Payment: {new_payment}")
+                    if change.new_status != change.old_status:
+                        changes.append(f"✅ Status: {change.new_status}")
+                    if change.new_payment != change.old_payment:
+                        changes.append(f"💰 Payment: {change.new_payment}")
                     
                     success_msg = f"Booking {booking_id} updated successfully!\n\n" + "\n".join(changes)
-                    if completed_date:
-                        success_msg += f"\n🎉 Completed: {completed_date}"
+                    if change.completed_date:
+                        success_msg += f"\n🎉 Completed: {change.completed_date}"
                     
                     messagebox.showinfo("Update Successful", success_msg)
                     
                     # Close dialog and refresh
                     dialog.destroy()
-                    self.load_service_history()
-                    self.load_service_sales_data()  # Refresh sales tab too
+                    self.mark_dirty('history', 'sales')
                     
                 except Exception as e:
                     print(f"Error updating booking status: {e}")
@@ -2334,18 +2257,14 @@ class ServicesModule:
         booking_id = item['values'][1]  # Get booking_id from the tree
         
         try:
-            # Fixed SQL query with correct column order
-            self.main_app.cursor.execute('''
-                SELECT id, booking_id, service_id, service_name, customer_name, customer_contact,
-                    bike_details, booking_date, scheduled_date, scheduled_time, status, 
-                    notes, payment_status, price, completed_date
-                FROM service_bookings 
-                WHERE booking_id = ?
-            ''', (booking_id,))
-            
-            booking = self.main_app.cursor.fetchone()
+            booking = self.main_app.booking_repo.get_detail(booking_id)
             
             if booking:
+                # Bookings from before booking_events may still have a notes blob
+                history = [describe_event(event) for event in self.main_app.booking_repo.list_events(booking_id)]
+                if booking.notes:
+                    history.insert(0, booking.notes.strip())
+                
                 # Format the booking date properly
                 booking_date = booking[7]  # booking_date
                 if isinstance(booking_date, str):
@@ -2526,6 +2445,8 @@ class ServicesModule:
                     ("Booking Date:", formatted_booking_date),
                     ("Scheduled Date:", scheduled_date),
                     ("Scheduled Time:", scheduled_time),
+                    ("Technician / Bay:", f"{booking.technician} / {booking.bay}" if booking.technician
+                     else 'Not assigned'),
                     ("Completed Date:", formatted_completed),
                 ]
                 
@@ -2598,7 +2519,7 @@ class ServicesModule:
                         fg=payment_color, bg='white').pack(side='left')
                 
                 # Notes section (if available)
-                if booking[11]:  # notes
+                if history:
                     notes_card = tk.Frame(content, bg='white', relief='solid', bd=1)
                     notes_card.pack(fill='x', pady=(0, 15))
                     
@@ -2622,7 +2543,7 @@ class ServicesModule:
                     notes_text_scroll = tk.Scrollbar(notes_text_frame, orient='vertical', command=notes_text.yview)
                     notes_text.configure(yscrollcommand=notes_text_scroll.set)
                     
-                    notes_text.insert('1.0', booking[11])
+                    notes_text.insert('1.0', '\n'.join(history))
                     notes_text.configure(state='disabled')  # Make read-only
                     
                     notes_text.pack(side='left', fill='both', expand=True)
@@ -2692,22 +2613,15 @@ class ServicesModule:
                                 f"Service: {service_name}"):
                 
                 # Delete the record
-                self.main_app.cursor.execute('''
-                    DELETE FROM service_bookings 
-                    WHERE booking_id = ?
-                ''', (booking_id,))
-                
-                self.main_app.conn.commit()
+                self.main_app.bookings.delete_booking(booking_id)
                 messagebox.showinfo("Success", "Service record has been deleted successfully!")
                 
                 # Refresh the history view
-                self.load_service_history()
-                self.load_service_sales_data()  # Refresh sales tab too
+                self.mark_dirty('history', 'sales')
                 
         except Exception as e:
             print(f"Error deleting service record: {e}")
             messagebox.showerror("Error", f"Failed to delete service record: {str(e)}")
-            self.main_app.conn.rollback()
 
     def refresh_service_history(self):
         """Refresh service history"""
@@ -2715,79 +2629,25 @@ class ServicesModule:
     
     def get_service_statistics(self):
         """Get service statistics for dashboard integration"""
-        try:
-            stats = {}
-            
-            # Total services offered
-            self.main_app.cursor.execute('SELECT COUNT(*) FROM services WHERE is_active = 1')
-            stats['total_services'] = self.main_app.cursor.fetchone()[0]
-            
-            # Total bookings
-            self.main_app.cursor.execute('SELECT COUNT(*) FROM service_bookings')
-            stats['total_bookings'] = self.main_app.cursor.fetchone()[0]
-            
-            # Pending bookings
-            self.main_app.cursor.execute("SELECT COUNT(*) FROM service_bookings WHERE status = 'Pending'")
-            stats['pending_bookings'] = self.main_app.cursor.fetchone()[0]
-            
-            # Completed bookings this month
-            self.main_app.cursor.execute('''
-                SELECT COUNT(*) FROM service_bookings 
-                WHERE status = 'Completed' 
-                AND strftime('%Y-%m', booking_date) = strftime('%Y-%m', 'now')
-            ''')
-            stats['completed_this_month'] = self.main_app.cursor.fetchone()[0]
-            
-            # Revenue from services this month
-            self.main_app.cursor.execute('''
-                SELECT SUM(price) FROM service_bookings 
-                WHERE status = 'Completed' 
-                AND strftime('%Y-%m', booking_date) = strftime('%Y-%m', 'now')
-            ''')
-            result = self.main_app.cursor.fetchone()[0]
-            stats['revenue_this_month'] = result if result else 0
-            
-            return stats
-            
-        except Exception as e:
-            print(f"Error getting service statistics: {e}")
-            return {
-                'total_services': 0,
-                'total_bookings': 0,
-                'pending_bookings': 0,
-                'completed_this_month': 0,
-                'revenue_this_month': 0
-            }
+        return self.main_app.service_reports.get_service_statistics()
     
+    @cached_query('service_bookings')
     def get_popular_services(self, limit=5):
         """Get most popular services by booking count"""
         try:
-            self.main_app.cursor.execute('''
-                SELECT service_name, COUNT(*) as booking_count
-                FROM service_bookings 
-                GROUP BY service_name
-                ORDER BY booking_count DESC
-                LIMIT ?
-            ''', (limit,))
-            return self.main_app.cursor.fetchall()
+            return self.main_app.booking_repo.list_popular(limit)
         except Exception as e:
             print(f"Error getting popular services: {e}")
             return []
     
+    @cached_query('service_bookings', per_day=True)
     def get_upcoming_appointments(self, days=7):
         """Get upcoming service appointments"""
         try:
             from datetime import datetime, timedelta
             end_date = (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d')
             
-            self.main_app.cursor.execute('''
-                SELECT booking_id, customer_name, service_name, scheduled_date, scheduled_time
-                FROM service_bookings 
-                WHERE status IN ('Pending', 'In Progress')
-                AND scheduled_date BETWEEN date('now') AND ?
-                ORDER BY scheduled_date, scheduled_time
-            ''', (end_date,))
-            return self.main_app.cursor.fetchall()
+            return self.main_app.booking_repo.list_upcoming(end_date)
         except Exception as e:
             print(f"Error getting upcoming appointments: {e}")
             return []
@@ -2795,12 +2655,8 @@ class ServicesModule:
     def mark_booking_paid(self, booking_id):
         """Mark a booking as paid"""
         try:
-            self.main_app.cursor.execute('''
-                UPDATE service_bookings 
-                SET payment_status = 'Paid'
-                WHERE booking_id = ?
-            ''', (booking_id,))
-            self.main_app.conn.commit()
+            self.main_app.bookings.mark_paid(booking_id)
+            self.mark_dirty('history', 'sales')
             return True
         except Exception as e:
             print(f"Error marking booking as paid: {e}")
@@ -2809,12 +2665,8 @@ class ServicesModule:
     def cancel_booking(self, booking_id, reason=""):
         """Cancel a service booking"""
         try:
-            self.main_app.cursor.execute('''
-                UPDATE service_bookings 
-                SET status = 'Cancelled', notes = COALESCE(notes, '') || ' | Cancelled: ' || ?
-                WHERE booking_id = ?
-            ''', (reason, booking_id))
-            self.main_app.conn.commit()
+            self.main_app.bookings.cancel(booking_id, reason)
+            self.mark_dirty('history', 'sales')
             return True
         except Exception as e:
             print(f"Error cancelling booking: {e}")
@@ -2864,8 +2716,6 @@ class ServicesModule:
     def refresh(self):
         """Refresh the services interface"""
         if self.frame:
-            self.load_services()
-            self.load_service_history()
-            self.load_service_sales_data()  
+            self.mark_dirty()
             return self.frame
         return None
\ No newline at end of file
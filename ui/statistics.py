@@ -100,6 +100,30 @@ class StatisticsModule:
         self.month_var.set('All Months')
         self.update_statistics()
 
+    def get_current_filter(self):
+        """Get the (year, month, report type) filter tuple"""
+        selected_year = self.year_var.get() if hasattr(self, 'year_var') else None
+        selected_month = self.month_var.get() if hasattr(self, 'month_var') else 'All Months'
+        report_type = self.report_type_var.get() if hasattr(self, 'report_type_var') else 'Monthly'
+        return selected_year, selected_month, report_type
+
+    def get_current_statistics(self):
+        """Get all panel data for the current filter (memoized by the main app)"""
+        return self.main_app.get_filtered_statistics(*self.get_current_filter())
+
+    def get_period_label(self):
+        """Describe the date range covered by the current filter"""
+        selected_year, selected_month, report_type = self.get_current_filter()
+        if selected_month != 'All Months':
+            return f"{selected_month} {selected_year}"
+        if report_type == 'Daily':
+            return "Last 30 Days"
+        if report_type == 'Weekly':
+            return "Last 12 Weeks"
+        if report_type == 'Yearly':
+            return "All Years"
+        return str(selected_year)
+
     def create_sales_trend_chart(self, parent):
         """Create sales trend chart based on filters with animation"""
         report_type = self.report_type_var.get() if hasattr(self, 'report_type_var') else 'Monthly'
@@ -127,20 +151,16 @@ class StatisticsModule:
         ax = fig.add_subplot(111)
         
         # Get sales data based on selection
+        sales_data = self.get_current_statistics()['trend']
         if selected_month != 'All Months':
-            sales_data = self.main_app.get_specific_month_sales_data(selected_month, selected_year)
             xlabel = 'Day'
         elif report_type == 'Daily':
-            sales_data = self.main_app.get_daily_sales_data()
             xlabel = 'Date'
         elif report_type == 'Weekly':
-            sales_data = self.main_app.get_weekly_sales_data()
             xlabel = 'Week'
         elif report_type == 'Yearly':
-            sales_data = self.main_app.get_yearly_sales_data()
             xlabel = 'Year'
         else:  # Monthly
-            sales_data = self.main_app.get_monthly_sales_data(selected_year)
             xlabel = 'Month'
         
         canvas = FigureCanvasTkAgg(fig, master=chart_frame)
@@ -215,7 +235,7 @@ class StatisticsModule:
         header_frame = ttk.Frame(parent, style='Card.TFrame')
         header_frame.pack(fill='x', padx=20, pady=(15, 0))
         
-        ttk.Label(header_frame, text="Sales by Category", style='SectionTitle.TLabel').pack(side='left')
+        ttk.Label(header_frame, text=f"Sales by Category - {self.get_period_label()}", style='SectionTitle.TLabel').pack(side='left')
         
         # Chart area
         chart_frame = ttk.Frame(parent, style='Card.TFrame')
@@ -225,8 +245,8 @@ class StatisticsModule:
         fig = plt.Figure(figsize=(4, 5), dpi=100, facecolor='white')  
         ax = fig.add_subplot(111)
         
-        # Get category sales data
-        category_data = self.main_app.get_category_sales_data()
+        # Get category sales data for the selected period
+        category_data = self.get_current_statistics()['categories']
         
         canvas = FigureCanvasTkAgg(fig, master=chart_frame)
         canvas.get_tk_widget().pack(fill='both', expand=True)
@@ -331,7 +351,7 @@ class StatisticsModule:
         header_frame = ttk.Frame(parent, style='Card.TFrame')
         header_frame.pack(fill='x', padx=20, pady=(15, 10))
         
-        ttk.Label(header_frame, text="Top Buyers", style='SectionTitle.TLabel').pack(side='left')
+        ttk.Label(header_frame, text=f"Top Buyers - {self.get_period_label()}", style='SectionTitle.TLabel').pack(side='left')
         
         # Table with scrollbar
         table_frame = ttk.Frame(parent, style='Card.TFrame')
@@ -360,8 +380,8 @@ class StatisticsModule:
         tree.column('Purchases', width=80, anchor='w')
         tree.column('Total Amount', width=100, anchor='w')
         
-        # Get top buyers data
-        top_buyers = self.main_app.get_top_buyers()
+        # Get top buyers data for the selected period
+        top_buyers = self.get_current_statistics()['top_buyers']
         for i, buyer in enumerate(top_buyers, 1):
             tree.insert('', 'end', values=(
                 f"{i:02d}",
@@ -379,7 +399,7 @@ class StatisticsModule:
         header_frame = ttk.Frame(parent, style='Card.TFrame')
         header_frame.pack(fill='x', padx=20, pady=(15, 10))
         
-        ttk.Label(header_frame, text="Top Products", style='SectionTitle.TLabel').pack(side='left')
+        ttk.Label(header_frame, text=f"Top Products - {self.get_period_label()}", style='SectionTitle.TLabel').pack(side='left')
         
         # Table with scrollbar
         table_frame = ttk.Frame(parent, style='Card.TFrame')
@@ -408,8 +428,8 @@ class StatisticsModule:
         tree.column('Sold', width=60, anchor='e')
         tree.column('Revenue', width=100, anchor='e')
         
-        # Get top products data
-        top_products = self.main_app.get_top_products()
+        # Get top products data for the selected period
+        top_products = self.get_current_statistics()['top_products']
         for i, product in enumerate(top_products, 1):
             tree.insert('', 'end', values=(
                 f"{i:02d}",
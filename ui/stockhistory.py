@@ -1,7 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import sqlite3
+import time
 from datetime import datetime, timedelta
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from core import CoreError
 
 class StockHistoryModule:
     def __init__(self, parent, main_app):
@@ -81,6 +85,9 @@ class StockHistoryModule:
         # Delete button
         ttk.Button(buttons_frame, text="Delete Selected", command=self.delete_stock_history,
                 style='Danger.TButton').pack(side='right', padx=(0, 10))
+
+        ttk.Button(buttons_frame, text="Stock Over Time", command=self.show_stock_chart,
+                style='Secondary.TButton').pack(side='right', padx=(0, 10))
         
         # Stock history table
         table_frame = ttk.Frame(self.frame, style='Content.TFrame')
@@ -184,65 +191,7 @@ class StockHistoryModule:
             category_filter = self.stock_category_var.get() if hasattr(self, 'stock_category_var') else 'All Categories'
             movement_filter = self.movement_type_var.get() if hasattr(self, 'movement_type_var') else 'All Sales'
             
-            sales_query = '''
-                SELECT 
-                    s.id,
-                    DATE(s.sale_date) as sale_date,
-                    TIME(s.sale_date) as sale_time,
-                    s.transaction_id,
-                    s.product_name,
-                    s.product_id,
-                    s.product_category,
-                    s.customer_name,
-                    COALESCE(s.customer_address, 'N/A') as customer_address,
-                    'Sale (Out)' as movement_type,
-                    s.quantity,
-                    s.price,
-                    s.total,
-                    p.stock as current_stock
-                FROM sales s
-                LEFT JOIN products p ON s.product_id = p.product_id
-                WHERE 1=1
-            '''
-            
-            params = []
-            
-            # Add search filter
-            search_pattern = f"%{search_term}%"
-            sales_query += """ AND (
-                s.product_name LIKE ? OR 
-                s.customer_name LIKE ? OR 
-                s.transaction_id LIKE ?
-            )"""
-            params.extend([search_pattern, search_pattern, search_pattern])
-            
-            # Add date filter
-            if date_filter == 'Today':
-                sales_query += " AND DATE(s.sale_date) = DATE('now')"
-            elif date_filter == 'Last 7 Days':
-                sales_query += " AND DATE(s.sale_date) >= DATE('now', '-7 days')"
-            elif date_filter == 'Last 30 Days':
-                sales_query += " AND DATE(s.sale_date) >= DATE('now', '-30 days')"
-            elif date_filter == 'Last 90 Days':
-                sales_query += " AND DATE(s.sale_date) >= DATE('now', '-90 days')"
-            
-            # Add category filter
-            if category_filter != 'All Categories':
-                sales_query += " AND s.product_category = ?"
-                params.append(category_filter)
-            
-            # Add movement type filter
-            if movement_filter == 'Returns':
-                sales_query += " AND s.quantity < 0" 
-            elif movement_filter == 'Regular Sales':
-                sales_query += " AND s.quantity > 0"  
-            
-            # Order by date descending
-            sales_query += " ORDER BY s.sale_date DESC, s.id DESC"
-            
-            # Execute query
-            self.main_app.cursor.execute(sales_query, params)
-            history_data = self.main_app.cursor.fetchall()
+            history_data = self.get_stock_history_rows(date_filter, category_filter, movement_filter, search_term)
             
             # Insert data into treeview
             total_transactions = 0
@@ -321,6 +270,14 @@ class StockHistoryModule:
         # Open edit dialog
         self.edit_customer_info()
 
+    def show_stock_chart(self):
+        """Chart stock over time for the selected row's product (or the first product)"""
+        product_id = None
+        selection = self.stock_history_tree.selection()
+        if selection:
+            product_id = self.stock_history_tree.item(selection[0])['values'][5]
+        StockChartDialog(self.main_app.root, self.main_app, product_id)
+
     def edit_customer_info(self):
         """Edit customer name and address for selected sale record"""
         if not hasattr(self, 'stock_history_tree'):
@@ -370,6 +327,7 @@ class StockHistoryModule:
                       sales_id))
                 
                 self.main_app.conn.commit()
+                self.main_app.invalidate_tables('sales')
                 
                 # Refresh the display
                 self.refresh_stock_history()
@@ -405,10 +363,13 @@ class StockHistoryModule:
                 'transaction_id': values[3],
                 'product_name': values[4],
                 'customer_name': values[7],
-                'movement_type': values[9]
+                'movement_type': values[9],
+                'quantity': int(str(values[10]).replace(',', ''))
             })
+        total_units = sum(item['quantity'] for item in selected_items)
+        product_count = len({item['product_name'] for item in selected_items})
         
-        # Confirmation dialog
+        # One decision for the whole selection: delete and restore, delete only, or cancel
         if len(selected_items) == 1:
             item = selected_items[0]
             message = (f"Are you sure you want to delete this sale record?\n\n"
@@ -416,83 +377,32 @@ class StockHistoryModule:
                       f"Transaction ID: {item['transaction_id']}\n"
                       f"Product: {item['product_name']}\n"
                       f"Customer: {item['customer_name']}\n"
-                      f"Type: {item['movement_type']}\n\n"
-                      f"⚠️ Warning: This action cannot be undone!")
+                      f"Type: {item['movement_type']}\n\n")
         else:
-            message = (f"Are you sure you want to delete {len(selected_items)} sale records?\n\n"
-                      f"⚠️ Warning: This action cannot be undone!")
-        
-        if not messagebox.askyesno("Confirm Delete", message):
+            message = f"Are you sure you want to delete {len(selected_items)} sale records?\n\n"
+        message += (f"Restore {total_units} unit(s) of {product_count} product(s) back to inventory?\n\n"
+                    f"Yes - delete and restore stock\n"
+                    f"No - delete without restoring stock\n"
+                    f"Cancel - keep the records\n\n"
+                    f"⚠️ Warning: This action cannot be undone!")
+        
+        restore_stock = messagebox.askyesnocancel("Confirm Delete", message)
+        if restore_stock is None:
             return
         
         try:
-            deleted_count = 0
-            failed_deletions = []
-            
-            for item in selected_items:
-                sales_id = item['sales_id']
-                transaction_id = item['transaction_id']
-                
-                try:
-                    self.main_app.cursor.execute('''
-                        SELECT product_id, quantity, product_name 
-                        FROM sales 
-                        WHERE id = ?
-                    ''', (sales_id,))
-                    sale_details = self.main_app.cursor.fetchone()
-                    
-                    if sale_details:
-                        product_id, quantity, product_name = sale_details
-                        
-                        restore_stock = messagebox.askyesno(
-                            "Restore Stock", 
-                            f"Do you want to restore {quantity} units of '{product_name}' back to inventory?\n\n"
-                            f"This will add {quantity} units to the current stock level."
-                        )
-                        
-                        # Delete the sales record
-                        self.main_app.cursor.execute('DELETE FROM sales WHERE id = ?', (sales_id,))
-                        
-                        if restore_stock:
-                            # Add stock back to the product
-                            self.main_app.cursor.execute('''
-                                UPDATE products 
-                                SET stock = stock + ? 
-                                WHERE product_id = ?
-                            ''', (quantity, product_id))
-                            
-                            self.main_app.cursor.execute('''
-                                INSERT INTO stock_movements (product_id, product_name, movement_type, quantity, 
-                                                           reference_id, reason, notes)
-                                VALUES (?, ?, ?, ?, ?, ?, ?)
-                            ''', (product_id, product_name, 'IN', quantity, 
-                                  f"RESTORE_{sales_id}", 'SALE_DELETION', 
-                                  f'Stock restored due to deletion of sale record {transaction_id}'))
-                    
-                    deleted_count += 1
-                    
-                except sqlite3.Error as e:
-                    failed_deletions.append(f"Transaction {transaction_id}: {str(e)}")
-                    continue
-            
-            # Commit the changes
-            self.main_app.conn.commit()
+            result = self.main_app.checkout.void_sale_lines([item['sales_id'] for item in selected_items],
+                                                            restore_stock)
             
             # Show results
-            if deleted_count > 0:
-                if failed_deletions:
-                    message = (f"Successfully deleted {deleted_count} record(s).\n\n"
-                              f"Failed to delete {len(failed_deletions)} record(s):\n" + 
-                              "\n".join(failed_deletions))
-                    messagebox.showwarning("Partial Success", message)
-                else:
-                    messagebox.showinfo("Success", f"Successfully deleted {deleted_count} sale record(s)!")
+            if result.lines_deleted == 0:
+                messagebox.showinfo("Info", "No records were deleted.")
+            elif restore_stock:
+                messagebox.showinfo("Success", f"Successfully deleted {result.lines_deleted} sale record(s) "
+                                              f"and restored {result.units_restored} unit(s) to "
+                                              f"{result.products_restored} product(s)!")
             else:
-                if failed_deletions:
-                    message = "Failed to delete records:\n" + "\n".join(failed_deletions)
-                    messagebox.showerror("Error", message)
-                else:
-                    messagebox.showinfo("Info", "No records were deleted.")
+                messagebox.showinfo("Success", f"Successfully deleted {result.lines_deleted} sale record(s)!")
             
             # Refresh the display
             self.refresh_stock_history()
@@ -504,13 +414,18 @@ class StockHistoryModule:
                     if inventory.frame.winfo_viewable():
                         inventory.refresh_products()
                 
+        except CoreError as e:
+            messagebox.showerror("Error", f"Failed to delete stock history: {str(e)}")
         except sqlite3.Error as e:
-            self.main_app.conn.rollback()
             messagebox.showerror("Database Error", f"Failed to delete stock history: {str(e)}")
         except Exception as e:
-            self.main_app.conn.rollback()
             messagebox.showerror("Error", f"Unexpected error occurred: {str(e)}")
 
+    def get_stock_history_rows(self, date_filter='All Time', category_filter='All Categories',
+                               movement_filter='All Sales', search_term=None):
+        return self.main_app.reports.get_stock_history_rows(date_filter, category_filter,
+                                                            movement_filter, search_term)
+
     def refresh_stock_history(self):
         """Refresh the stock history display - Shows only sales transactions"""
         if not hasattr(self, 'stock_history_tree') or not self.stock_history_tree.winfo_exists():
@@ -526,54 +441,7 @@ class StockHistoryModule:
             category_filter = self.stock_category_var.get() if hasattr(self, 'stock_category_var') else 'All Categories'
             movement_filter = self.movement_type_var.get() if hasattr(self, 'movement_type_var') else 'All Sales'
             
-            sales_query = '''
-                SELECT 
-                    s.id,
-                    DATE(s.sale_date) as sale_date,
-                    TIME(s.sale_date) as sale_time,
-                    s.transaction_id,
-                    s.product_name,
-                    s.product_id,
-                    s.product_category,
-                    s.customer_name,
-                    COALESCE(s.customer_address, 'N/A') as customer_address,
-                    'Sale (Out)' as movement_type,
-                    s.quantity,
-                    s.price,
-                    s.total,
-                    p.stock as current_stock
-                FROM sales s
-                LEFT JOIN products p ON s.product_id = p.product_id
-                WHERE 1=1
-            '''
-            
-            # Add date filter
-            params = []
-            if date_filter == 'Today':
-                sales_query += " AND DATE(s.sale_date) = DATE('now')"
-            elif date_filter == 'Last 7 Days':
-                sales_query += " AND DATE(s.sale_date) >= DATE('now', '-7 days')"
-            elif date_filter == 'Last 30 Days':
-                sales_query += " AND DATE(s.sale_date) >= DATE('now', '-30 days')"
-            elif date_filter == 'Last 90 Days':
-                sales_query += " AND DATE(s.sale_date) >= DATE('now', '-90 days')"
-            
-            # Add category filter
-            if category_filter != 'All Categories':
-                sales_query += " AND s.product_category = ?"
-                params.append(category_filter)
-            
-            if movement_filter == 'Returns':
-                sales_query += " AND s.quantity < 0" 
-            elif movement_filter == 'Regular Sales':
-                sales_query += " AND s.quantity > 0"  
-            
-            # Order by date descending
-            sales_query += " ORDER BY s.sale_date DESC, s.id DESC"
-            
-            # Execute query
-            self.main_app.cursor.execute(sales_query, params)
-            history_data = self.main_app.cursor.fetchall()
+            history_data = self.get_stock_history_rows(date_filter, category_filter, movement_filter)
             
             # Insert data into treeview
             total_transactions = 0
@@ -652,6 +520,7 @@ class StockHistoryModule:
                 WHERE reference_id = 'INITIAL' AND product_id = ?
             """, (product_id,))
             self.main_app.conn.commit()
+            self.main_app.invalidate_tables('stock_movements')
             messagebox.showinfo("Success", "Initial record successfully removed")
             self.refresh_stock_history()
         except sqlite3.Error as e:
@@ -659,6 +528,93 @@ class StockHistoryModule:
             self.main_app.conn.rollback()
 
 
+class StockChartDialog:
+    """Window charting one product's end-of-day stock, rebuilt from the stock ledger"""
+
+    PERIODS = {'Last 30 Days': 30, 'Last 90 Days': 90, 'Last Year': 365, 'Last 2 Years': 730}
+
+    def __init__(self, parent, main_app, product_id=None):
+        self.main_app = main_app
+        self.canvas = None
+        self.products = {f"{product.name} ({product.product_id})": product.product_id
+                         for product in main_app.product_repo.list_all()}
+        if not self.products:
+            messagebox.showinfo("Stock Over Time", "No products available")
+            return
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Stock Over Time")
+        self.dialog.geometry("900x560")
+        self.dialog.transient(parent)
+        self.dialog.configure(bg='#ffffff')
+
+        controls = ttk.Frame(self.dialog, padding="15", style='Content.TFrame')
+        controls.pack(fill='x')
+
+        ttk.Label(controls, text="Product:", style='FieldLabel.TLabel').pack(side='left', padx=(0, 5))
+        labels = list(self.products)
+        selected = next((label for label, code in self.products.items() if code == str(product_id)), labels[0])
+        self.product_var = tk.StringVar(value=selected)
+        product_box = ttk.Combobox(controls, textvariable=self.product_var, values=labels,
+                                   state='readonly', style='Modern.TCombobox', width=40)
+        product_box.pack(side='left', padx=(0, 15))
+        product_box.bind('<<ComboboxSelected>>', lambda e: self.draw())
+
+        ttk.Label(controls, text="Period:", style='FieldLabel.TLabel').pack(side='left', padx=(0, 5))
+        self.period_var = tk.StringVar(value='Last Year')
+        period_box = ttk.Combobox(controls, textvariable=self.period_var, values=list(self.PERIODS),
+                                  state='readonly', style='Modern.TCombobox', width=15)
+        period_box.pack(side='left')
+        period_box.bind('<<ComboboxSelected>>', lambda e: self.draw())
+
+        self.status_label = ttk.Label(controls, text="", style='FieldLabel.TLabel')
+        self.status_label.pack(side='right')
+
+        self.chart_frame = ttk.Frame(self.dialog, style='Content.TFrame')
+        self.chart_frame.pack(fill='both', expand=True, padx=15, pady=(0, 15))
+
+        self.dialog.bind('<Escape>', lambda e: self.dialog.destroy())
+        self.draw()
+
+    def draw(self):
+        """Fetch the daily series and redraw the chart"""
+        start = time.perf_counter()
+        product_id = self.products[self.product_var.get()]
+        try:
+            series = self.main_app.ledger.stock_series(product_id, self.PERIODS[self.period_var.get()])
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load stock history: {str(e)}", parent=self.dialog)
+            return
+        query_ms = (time.perf_counter() - start) * 1000
+
+        if self.canvas is not None:
+            self.canvas.get_tk_widget().destroy()
+            plt.close(self.figure)
+
+        self.figure, ax = plt.subplots(figsize=(8, 4.5))
+        self.figure.patch.set_facecolor('white')
+        days = [datetime.strptime(day, '%Y-%m-%d') for day, _ in series]
+        stock = [level for _, level in series]
+        ax.step(days, stock, where='post', color='#3b82f6', linewidth=1.5)
+        ax.fill_between(days, stock, step='post', color='#3b82f6', alpha=0.1)
+        ax.axhline(0, color='#ef4444', linewidth=0.8, alpha=0.6)
+        ax.set_title(self.product_var.get(), fontsize=12, color='#1f2937')
+        ax.set_ylabel('Units in stock', fontsize=10, color='#374151')
+        ax.grid(alpha=0.3, linestyle='-', linewidth=0.5)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.tick_params(colors='#374151', labelsize=9)
+        self.figure.autofmt_xdate()
+        self.figure.tight_layout()
+
+        self.canvas = FigureCanvasTkAgg(self.figure, self.chart_frame)
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill='both', expand=True)
+
+        total_ms = (time.perf_counter() - start) * 1000
+        self.status_label.config(text=f"{len(series)} days, query {query_ms:.0f} ms, total {total_ms:.0f} ms")
+
+
 class EditCustomerDialog:
     """Dialog for editing customer information"""
     
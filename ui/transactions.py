@@ -0,0 +1,207 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from receipts import make_receipt, render_text, RECEIPT_WIDTH
+
+
+SEARCH_DELAY_MS = 150
+SEARCH_LIMIT = 50
+
+
+def receipt_for(detail):
+    """Rebuild a past sale's Receipt from its TransactionDetail"""
+    transaction, lines = detail.transaction, detail.lines
+    items = [{'product_id': line.product_id, 'product_name': line.product_name,
+              'unit_price': line.price, 'quantity': line.quantity, 'category': line.category}
+             for line in lines]
+    customer_name = lines[0].customer_name if lines else ''
+    customer_address = lines[0].customer_address if lines else ''
+    return make_receipt(transaction.transaction_id, items, transaction.payment_method,
+                        customer_name, customer_address, transaction.total_amount,
+                        lines[0].sale_date if lines else transaction.transaction_date)
+
+
+def show_receipt(parent, receipt, receipt_queue):
+    """Show a receipt's text in a window, with a button to print it"""
+    receipt_window = tk.Toplevel(parent)
+    receipt_window.title(f"Receipt {receipt.transaction_id}")
+    receipt_window.transient(parent)
+
+    text = render_text(receipt)
+    text_widget = tk.Text(receipt_window, width=RECEIPT_WIDTH + 2, height=min(text.count('\n') + 1, 40),
+                          font=('Courier', 10), bg='white', relief='flat', padx=10, pady=10)
+    text_widget.insert('1.0', text)
+    text_widget.configure(state='disabled')
+    text_widget.pack(fill='both', expand=True)
+
+    btn_frame = ttk.Frame(receipt_window)
+    btn_frame.pack(pady=10)
+    ttk.Button(btn_frame, text="Print Receipt",
+               command=lambda: (receipt_queue.submit(receipt), receipt_window.destroy()),
+               style='Primary.TButton').pack(side='left', padx=(0, 10))
+    ttk.Button(btn_frame, text="Close", command=receipt_window.destroy,
+               style='Secondary.TButton').pack(side='left')
+    receipt_window.focus_set()
+
+
+class TransactionLookupWindow:
+    """Non-modal window to find a past sale by transaction ID and reprint its receipt"""
+
+    def __init__(self, parent, main_app):
+        self.main_app = main_app
+        self.search_job = None
+        self.detail = None
+        try:
+            self.dialog = tk.Toplevel(parent)
+            self.dialog.title("Find Transaction")
+            self.dialog.geometry("1000x600")
+            self.dialog.transient(parent)
+            self.dialog.configure(bg='#ffffff')
+
+            # Center the dialog
+            self.dialog.update_idletasks()
+            x = (self.dialog.winfo_screenwidth() // 2) - (500)
+            y = (self.dialog.winfo_screenheight() // 2) - (300)
+            self.dialog.geometry(f"1000x600+{x}+{y}")
+
+            self.create_widgets()
+            self.search()
+        except Exception as e:
+            print(f"Error creating TransactionLookupWindow: {e}")
+            messagebox.showerror("Error", f"Failed to open transaction lookup: {str(e)}")
+
+    def create_widgets(self):
+        main_frame = ttk.Frame(self.dialog, padding="20", style='Content.TFrame')
+        main_frame.pack(fill='both', expand=True)
+
+        ttk.Label(main_frame, text="Find Transaction", style='DialogTitle.TLabel').pack(anchor='w')
+
+        search_frame = ttk.Frame(main_frame, style='Content.TFrame')
+        search_frame.pack(fill='x', pady=(10, 10))
+        ttk.Label(search_frame, text="Transaction ID:", style='FieldLabel.TLabel').pack(side='left', padx=(0, 10))
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=30,
+                                      style='Modern.TEntry')
+        self.search_entry.pack(side='left')
+        self.search_entry.bind('<KeyRelease>', self.schedule_search)
+        self.search_entry.bind('<Return>', self.open_exact)
+        self.status_label = ttk.Label(search_frame, text="", style='FieldLabel.TLabel')
+        self.status_label.pack(side='left', padx=(15, 0))
+
+        panes = ttk.Frame(main_frame, style='Content.TFrame')
+        panes.pack(fill='both', expand=True)
+
+        # Matching transactions, newest ID first
+        columns = ('Transaction ID', 'Date', 'Payment', 'Total')
+        self.transaction_tree = ttk.Treeview(panes, columns=columns, show='headings', selectmode='browse')
+        widths = {'Transaction ID': 160, 'Date': 140, 'Payment': 70, 'Total': 90}
+        for col in columns:
+            self.transaction_tree.heading(col, text=col)
+            self.transaction_tree.column(col, width=widths[col], anchor='e' if col == 'Total' else 'w')
+        self.transaction_tree.pack(side='left', fill='both', expand=True)
+        self.transaction_tree.bind('<<TreeviewSelect>>', self.on_select)
+        self.transaction_tree.bind('<Double-1>', lambda e: self.view_receipt())
+
+        # Lines of the selected transaction
+        lines_frame = ttk.Frame(panes, style='Content.TFrame')
+        lines_frame.pack(side='left', fill='both', expand=True, padx=(15, 0))
+        self.detail_label = ttk.Label(lines_frame, text="Select a transaction", style='FieldLabel.TLabel')
+        self.detail_label.pack(anchor='w', pady=(0, 5))
+        line_columns = ('Product', 'Qty', 'Price', 'Total')
+        self.line_tree = ttk.Treeview(lines_frame, columns=line_columns, show='headings')
+        line_widths = {'Product': 220, 'Qty': 50, 'Price': 80, 'Total': 90}
+        for col in line_columns:
+            self.line_tree.heading(col, text=col)
+            self.line_tree.column(col, width=line_widths[col], anchor='w' if col == 'Product' else 'e')
+        self.line_tree.pack(fill='both', expand=True)
+
+        button_frame = ttk.Frame(main_frame, style='Content.TFrame')
+        button_frame.pack(fill='x', pady=(15, 0))
+
+        ttk.Button(button_frame, text="Close", command=self.dialog.destroy,
+                   style='Secondary.TButton').pack(side='right', padx=(10, 0))
+        ttk.Button(button_frame, text="Reprint Receipt", command=self.reprint,
+                   style='Primary.TButton').pack(side='right', padx=(10, 0))
+        ttk.Button(button_frame, text="View Receipt", command=self.view_receipt,
+                   style='Secondary.TButton').pack(side='right')
+
+        self.dialog.bind('<Escape>', lambda e: self.dialog.destroy())
+        self.search_entry.focus_set()
+
+    def schedule_search(self, event=None):
+        """Search once typing pauses, not on every key"""
+        if event is not None and event.keysym in ('Return', 'KP_Enter'):
+            return
+        if self.search_job is not None:
+            self.dialog.after_cancel(self.search_job)
+        self.search_job = self.dialog.after(SEARCH_DELAY_MS, self.search)
+
+    def search(self):
+        """List the latest transactions whose ID starts with the typed text"""
+        self.search_job = None
+        transactions = self.main_app.search_transactions(self.search_var.get(), SEARCH_LIMIT)
+        self.transaction_tree.delete(*self.transaction_tree.get_children())
+        for transaction in transactions:
+            self.transaction_tree.insert('', 'end', iid=transaction.transaction_id, values=(
+                transaction.transaction_id, transaction.transaction_date[:16], transaction.payment_method,
+                f"₱{transaction.total_amount:,.2f}"))
+        more = f" (showing the first {SEARCH_LIMIT})" if len(transactions) == SEARCH_LIMIT else ""
+        self.status_label.config(text=f"{len(transactions)} found{more}")
+        if len(transactions) == 1:
+            self.transaction_tree.selection_set(transactions[0].transaction_id)
+
+    def open_exact(self, event=None):
+        """Enter: open the typed ID straight away, e.g. scanned off a printed receipt"""
+        if self.search_job is not None:
+            self.dialog.after_cancel(self.search_job)
+            self.search_job = None
+        transaction_id = self.search_var.get().strip().upper()
+        if not transaction_id:
+            return
+        if self.show_transaction(transaction_id):
+            if not self.transaction_tree.exists(transaction_id):
+                self.search()
+            self.transaction_tree.selection_set(transaction_id)
+            self.transaction_tree.see(transaction_id)
+        else:
+            self.search()
+
+    def on_select(self, event=None):
+        selection = self.transaction_tree.selection()
+        if selection and (self.detail is None or self.detail.transaction.transaction_id != selection[0]):
+            self.show_transaction(selection[0])
+
+    def show_transaction(self, transaction_id):
+        """Load and show a transaction's lines; returns False if there's no such sale"""
+        self.detail = self.main_app.get_transaction(transaction_id)
+        self.line_tree.delete(*self.line_tree.get_children())
+        if self.detail is None:
+            self.detail_label.config(text=f"No transaction {transaction_id}")
+            return False
+        lines = self.detail.lines
+        for line in lines:
+            self.line_tree.insert('', 'end', values=(line.product_name, line.quantity,
+                                                     f"₱{line.price:,.2f}", f"₱{line.total:,.2f}"))
+        customer = lines[0].customer_name if lines else ''
+        self.detail_label.config(text=f"{transaction_id}  {customer}".rstrip())
+        return True
+
+    def selected_receipt(self):
+        if self.detail is None:
+            messagebox.showwarning("No Selection", "Please select a transaction", parent=self.dialog)
+            return None
+        return receipt_for(self.detail)
+
+    def reprint(self):
+        """Queue the selected transaction's receipt on the receipt printer"""
+        receipt = self.selected_receipt()
+        if receipt is None:
+            return
+        self.main_app.receipt_queue.submit(receipt)
+        self.status_label.config(text=f"Receipt {receipt.transaction_id} sent to the printer")
+
+    def view_receipt(self):
+        """Show the selected transaction's receipt, with a button to print it"""
+        receipt = self.selected_receipt()
+        if receipt is not None:
+            show_receipt(self.dialog, receipt, self.main_app.receipt_queue)
@@ -0,0 +1,287 @@
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tkinter as tk
+from datetime import datetime
+
+
+PROFILE_ENV_VAR = 'BIKESHOP_PROFILE'
+PROFILE_FLAG = '--profile'
+
+
+def profiling_requested(argv=None):
+    """Check the command line flag and environment variable that turn profiling on"""
+    argv = sys.argv if argv is None else argv
+    return PROFILE_FLAG in argv or os.environ.get(PROFILE_ENV_VAR, '') not in ('', '0')
+
+
+def _callable_label(func):
+    """Get 'module.Class.method' for whatever Tk is about to call"""
+    while isinstance(func, functools.partial):
+        func = func.func
+
+    # Misc.after wraps the target in a local 'callit' closure; report the target
+    code = getattr(func, '__code__', None)
+    if code is not None and code.co_name == 'callit' and 'func' in code.co_freevars:
+        func = func.__closure__[code.co_freevars.index('func')].cell_contents
+        return _callable_label(func)
+
+    owner = getattr(func, '__self__', None)
+    if owner is not None and not isinstance(owner, type(sys)):
+        cls = type(owner)
+        return f"{cls.__module__}.{cls.__qualname__}.{func.__name__}"
+
+    module = getattr(func, '__module__', None) or type(func).__module__
+    name = getattr(func, '__qualname__', None) or type(func).__qualname__
+    if name.endswith('<lambda>') and code is not None:
+        name = f"{name}:{code.co_firstlineno}"
+    return f"{module}.{name}"
+
+
+def _frame_label(code):
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}.{code.co_qualname if hasattr(code, 'co_qualname') else code.co_name}"
+
+
+class UIProfiler:
+    """Opt-in event-loop profiler for the Tk app.
+
+    Every callable Tk registers (button commands, bindings, variable traces,
+    after() handlers, which includes matplotlib animation timers) is wrapped so
+    its duration is attributed to module.Class.method. A heartbeat after()
+    loop measures how late the event loop runs, and a sampling thread records
+    the Python stack of the main thread while a callback is running. On exit
+    the samples are written as collapsed stacks and speedscope JSON.
+    """
+
+    HEARTBEAT_MS = 50
+    HEARTBEAT_COMMAND = 'bikeshop_profiler_heartbeat'
+    STALL_MS = 100
+    SAMPLE_INTERVAL = 0.005
+
+    def __init__(self, root, output_dir='.'):
+        self.root = root
+        self.output_dir = output_dir
+        self.started = time.perf_counter()
+        self.callbacks = {}
+        self.stalls = []
+        self.heartbeat_lateness = []
+        self.samples = {}
+        self.lock = threading.Lock()
+        self.main_thread_id = threading.get_ident()
+        self._depth = 0
+        self._active_label = None
+        self._active_frame = None
+        self._original_register = None
+        self._last_beat = None
+        self._running = False
+        self._dumped = False
+
+    # Installation
+    def install(self):
+        """Start wrapping Tk callbacks, the heartbeat and the sampler"""
+        profiler = self
+        original_register = tk.Misc._register
+        self._original_register = original_register
+
+        def _register(widget, func, subst=None, needcleanup=1):
+            return original_register(widget, profiler.wrap(func, subst is not None), subst, needcleanup)
+
+        tk.Misc._register = _register
+        self._running = True
+
+        # Registered straight with Tcl so the heartbeat isn't profiled itself
+        self.root.tk.createcommand(self.HEARTBEAT_COMMAND, self._heartbeat)
+        self._last_beat = time.perf_counter()
+        self.root.tk.call('after', self.HEARTBEAT_MS, self.HEARTBEAT_COMMAND)
+
+        sampler = threading.Thread(target=self._sample_loop, name='ui-profiler-sampler', daemon=True)
+        sampler.start()
+
+        atexit.register(self.dump)
+        print(f"UI profiler enabled; results are written to {os.path.abspath(self.output_dir)} on exit")
+        return self
+
+    def uninstall(self):
+        """Stop wrapping new callbacks and stop sampling"""
+        self._running = False
+        if self._original_register is not None:
+            tk.Misc._register = self._original_register
+            self._original_register = None
+
+    def wrap(self, func, is_event=False):
+        """Wrap a callable so each call is timed and attributed"""
+        label = _callable_label(func)
+        code = getattr(func, '__code__', None)
+        if code is not None and code.co_name == 'callit':
+            label = f"[after] {label}"
+        elif is_event:
+            label = f"[event] {label}"
+        else:
+            label = f"[command] {label}"
+
+        profiler = self
+
+        def profiled(*args):
+            if profiler._depth:
+                return func(*args)
+
+            profiler._depth = 1
+            profiler._active_label = label
+            profiler._active_frame = sys._getframe()
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                elapsed = time.perf_counter() - start
+                profiler._active_frame = None
+                profiler._active_label = None
+                profiler._depth = 0
+                profiler._record_callback(label, elapsed)
+
+        try:
+            profiled.__name__ = func.__name__
+        except AttributeError:
+            profiled.__name__ = type(func).__name__
+        return profiled
+
+    # Measurements
+    def _record_callback(self, label, elapsed):
+        with self.lock:
+            entry = self.callbacks.get(label)
+            if entry is None:
+                entry = self.callbacks[label] = [0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] = max(entry[2], elapsed)
+            if elapsed * 1000 >= self.STALL_MS:
+                self.stalls.append((time.perf_counter() - self.started, label, elapsed))
+
+    def _heartbeat(self):
+        if not self._running:
+            return
+        now = time.perf_counter()
+        lateness = (now - self._last_beat) * 1000 - self.HEARTBEAT_MS
+        if lateness > 0:
+            self.heartbeat_lateness.append(lateness)
+        self._last_beat = now
+        try:
+            self.root.tk.call('after', self.HEARTBEAT_MS, self.HEARTBEAT_COMMAND)
+        except tk.TclError:
+            self._running = False
+
+    def _sample_loop(self):
+        while self._running:
+            time.sleep(self.SAMPLE_INTERVAL)
+            label = self._active_label
+            stop_frame = self._active_frame
+            if label is None or stop_frame is None:
+                continue
+
+            frame = sys._current_frames().get(self.main_thread_id)
+            stack = []
+            while frame is not None and frame is not stop_frame:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if frame is None:
+                # The callback finished while we were walking the stack
+                continue
+
+            stack.append(label)
+            stack.reverse()
+            key = tuple(stack)
+            with self.lock:
+                self.samples[key] = self.samples.get(key, 0) + 1
+
+    # Reporting
+    def summary(self, limit=15):
+        """Get (label, calls, total_ms, max_ms) for the most expensive callbacks"""
+        with self.lock:
+            rows = [(label, calls, total * 1000, longest * 1000)
+                    for label, (calls, total, longest) in self.callbacks.items()]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[:limit]
+
+    def _write_collapsed(self, path, samples, weight_ms):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(samples.items()):
+                line = ';'.join(frame.replace(';', ',') for frame in stack)
+                f.write(f"{line} {round(count * weight_ms)}\n")
+
+    def _write_speedscope(self, path, samples, weight_ms):
+        frames = []
+        frame_index = {}
+        profile_samples = []
+        weights = []
+        for stack, count in samples.items():
+            indexes = []
+            for name in stack:
+                if name not in frame_index:
+                    frame_index[name] = len(frames)
+                    frames.append({'name': name})
+                indexes.append(frame_index[name])
+            profile_samples.append(indexes)
+            weights.append(count * weight_ms)
+
+        document = {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': 'Bike Shop UI callbacks',
+            'exporter': 'bikeshop ui_profiler',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': 'Tk main thread',
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': profile_samples,
+                'weights': weights
+            }]
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f)
+
+    def dump(self):
+        """Write collapsed-stack and speedscope files plus a console summary"""
+        if self._dumped:
+            return
+        self._dumped = True
+        self.uninstall()
+
+        with self.lock:
+            samples = dict(self.samples)
+            stalls = list(self.stalls)
+        weight_ms = self.SAMPLE_INTERVAL * 1000
+
+        # Fall back to per-callback totals when the sampler saw nothing (very short sessions)
+        if not samples:
+            samples = {(label,): total_ms / weight_ms for label, _, total_ms, _ in self.summary(limit=None)}
+
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        base = os.path.join(self.output_dir, f"ui_profile_{stamp}")
+        try:
+            self._write_collapsed(base + '.collapsed.txt', samples, weight_ms)
+            self._write_speedscope(base + '.speedscope.json', samples, weight_ms)
+        except OSError as e:
+            print(f"Error writing UI profile: {e}")
+            return
+
+        lateness = sorted(self.heartbeat_lateness)
+        print(f"UI profile written to {base}.collapsed.txt and {base}.speedscope.json")
+        if lateness:
+            p95 = lateness[int(len(lateness) * 0.95) - 1] if len(lateness) >= 20 else lateness[-1]
+            print(f"Event loop lateness: max {lateness[-1]:.0f} ms, p95 {p95:.0f} ms, "
+                  f"{len(stalls)} callbacks over {self.STALL_MS} ms")
+        for label, calls, total_ms, max_ms in self.summary():
+            print(f"  {total_ms:9.1f} ms  {calls:6d} calls  max {max_ms:7.1f} ms  {label}")
+
+
+def start_profiler_if_requested(root, output_dir='.'):
+    """Install a UIProfiler on root when --profile or BIKESHOP_PROFILE is set"""
+    if not profiling_requested():
+        return None
+    return UIProfiler(root, output_dir).install()